@@ -0,0 +1,101 @@
+"""
+Alertas de abandono
+Genera en bloque AbandonmentAlert para los miembros con membresía activa que
+no vienen al gimnasio desde hace GymSettings.days_for_abandonment_alert días
+"""
+from datetime import timedelta
+
+from django.db.models import Exists, OuterRef, Q
+from django.utils import timezone
+
+from apps.common.dates import day_bounds
+
+DEFAULT_THRESHOLD_DAYS = 15
+CHUNK_SIZE = 2000
+# Una alerta en estos estados sigue abierta: no se crea otra para el mismo miembro
+OPEN_STATUSES = ('pending', 'contacted')
+
+
+def threshold_days():
+    """Días sin asistir configurados en GymSettings (o el valor por defecto)."""
+    from apps.analytics.models import GymSettings
+
+    days = GymSettings.objects.values_list('days_for_abandonment_alert', flat=True).first()
+    return days or DEFAULT_THRESHOLD_DAYS
+
+
+def candidates(days, today=None):
+    """
+    Miembros con membresía activa, sin acceso en los últimos `days` días y sin
+    alerta abierta. Una sola consulta: filtro por Member.last_access (o la fecha
+    de registro si nunca vino), semi-join con las membresías activas (IN sin
+    correlación, se resuelve una vez) y anti-join NOT EXISTS con las alertas.
+    """
+    from apps.members.models import Member
+    from apps.memberships.models import Membership
+    from .models import AbandonmentAlert
+
+    today = today or timezone.localdate()
+    # Último día en que una visita todavía cuenta como reciente
+    cutoff_day = today - timedelta(days=days - 1)
+
+    with_membership = Membership.objects.filter(
+        status='active', end_date__gte=today
+    ).values('member_id')
+    open_alert = AbandonmentAlert.objects.filter(member=OuterRef('pk'), status__in=OPEN_STATUSES)
+
+    return Member.objects.filter(
+        Q(last_access__lt=day_bounds(cutoff_day)[0])
+        | Q(last_access__isnull=True, joined_date__lt=cutoff_day),
+        pk__in=with_membership,
+    ).filter(~Exists(open_alert))
+
+
+def _days_inactive(last_access, joined_date, today):
+    since = timezone.localtime(last_access).date() if last_access else joined_date
+    return (today - since).days
+
+
+def generate_alerts(days=None, today=None, chunk_size=CHUNK_SIZE, dry_run=False):
+    """
+    Crea las alertas pendientes recorriendo los candidatos por bloques de id
+    (paginación por llave, sin OFFSET) y un bulk_create por bloque.
+
+    Args:
+        days: Umbral de inactividad (por defecto el de GymSettings)
+        today: Fecha de referencia
+        chunk_size: Miembros por bloque
+        dry_run: Solo contar, sin crear alertas
+
+    Returns:
+        dict: {'days', 'created', 'chunks'}
+    """
+    from .models import AbandonmentAlert
+
+    days = days or threshold_days()
+    today = today or timezone.localdate()
+    pending = candidates(days, today).order_by('pk')
+
+    created = chunks = 0
+    last_pk = 0
+    while True:
+        rows = list(
+            pending.filter(pk__gt=last_pk).values_list('pk', 'last_access', 'joined_date')[:chunk_size]
+        )
+        if not rows:
+            break
+        chunks += 1
+        last_pk = rows[-1][0]
+
+        alerts = [
+            AbandonmentAlert(member_id=pk, days_inactive=_days_inactive(last_access, joined_date, today))
+            for pk, last_access, joined_date in rows
+        ]
+        if not dry_run:
+            AbandonmentAlert.objects.bulk_create(alerts)
+        created += len(alerts)
+
+        if len(rows) < chunk_size:
+            break
+
+    return {'days': days, 'created': created, 'chunks': chunks}
@@ -3,7 +3,7 @@ Admin para Modelos de Acceso
 """
 
 from django.contrib import admin
-from .models import AccessLog, AbandonmentAlert
+from .models import AccessLog, AbandonmentAlert, AttendanceDay
 
 
 @admin.register(AccessLog)
@@ -19,3 +19,11 @@ class AbandonmentAlertAdmin(admin.ModelAdmin):
     list_display = ['member', 'days_inactive', 'status', 'created_at']
     list_filter = ['status', 'created_at']
     search_fields = ['member__user__email']
+
+
+@admin.register(AttendanceDay)
+class AttendanceDayAdmin(admin.ModelAdmin):
+    list_display = ['member', 'date', 'visits', 'classes_attended', 'first_entry', 'last_exit']
+    list_filter = ['date']
+    search_fields = ['member__user__email', 'member__user__first_name']
+    date_hierarchy = 'date'
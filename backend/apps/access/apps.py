@@ -5,3 +5,8 @@ class AccessConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.access'
     verbose_name = 'Acceso'
+
+    def ready(self):
+        """Conectar la invalidación del índice de membresías del check-in"""
+        from apps.access.checkin import connect_signals
+        connect_signals()
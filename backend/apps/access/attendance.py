@@ -0,0 +1,228 @@
+"""
+Asistencia diaria
+Mantiene AttendanceDay a partir de los accesos y las clases asistidas y expone
+las consultas de rachas
+"""
+from datetime import timedelta
+
+from django.apps import apps as global_apps
+from django.db import IntegrityError, transaction
+from django.db.models import Count, DateTimeField, F, Max, Min, Q, Value
+from django.db.models.functions import Coalesce, Greatest, Least, TruncDate
+from django.utils import timezone
+
+from apps.common.dates import day_bounds
+
+# Días hacia atrás que se revisan para calcular rachas
+STREAK_WINDOW = 366
+
+
+def _local_date(value):
+    return timezone.localtime(value).date() if timezone.is_aware(value) else value.date()
+
+
+def _upsert(member_id, day, values, initial):
+    """
+    Aplica values (expresiones F) a la fila del día; la crea con initial la primera vez.
+    """
+    from .models import AttendanceDay
+
+    rows = AttendanceDay.objects.filter(member_id=member_id, date=day)
+    values = {**values, 'updated_at': timezone.now()}
+
+    if rows.update(**values):
+        return
+
+    try:
+        with transaction.atomic():
+            AttendanceDay.objects.create(member_id=member_id, date=day, **initial)
+    except IntegrityError:
+        # Otra transacción creó la fila al mismo tiempo
+        rows.update(**values)
+
+
+def _visit_values(visits=0, first_entry=None, last_exit=None):
+    """Expresiones para sumar entradas y extender primera entrada / última salida, y valores iniciales."""
+    values, initial = {}, {}
+    if visits:
+        values['visits'] = F('visits') + visits
+        initial['visits'] = visits
+    if first_entry is not None:
+        moment = Value(first_entry, output_field=DateTimeField())
+        values['first_entry'] = Least(Coalesce('first_entry', moment), moment)
+        initial['first_entry'] = first_entry
+    if last_exit is not None:
+        moment = Value(last_exit, output_field=DateTimeField())
+        values['last_exit'] = Greatest(Coalesce('last_exit', moment), moment)
+        initial['last_exit'] = last_exit
+    return values, initial
+
+
+def add_visits(member_id, day, visits=0, first_entry=None, last_exit=None):
+    """Suma entradas al día del miembro y extiende su primera entrada / última salida."""
+    values, initial = _visit_values(visits, first_entry, last_exit)
+    if values:
+        _upsert(member_id, day, values, initial)
+
+
+def record_access(access_log):
+    """Suma un registro de acceso (entrada o salida) a la asistencia de su día."""
+    day = _local_date(access_log.timestamp)
+    if access_log.access_type == 'entry':
+        add_visits(access_log.member_id, day, visits=1, first_entry=access_log.timestamp)
+    else:
+        add_visits(access_log.member_id, day, last_exit=access_log.timestamp)
+
+
+def record_accesses(access_logs):
+    """
+    Versión por lotes de record_access: agrupa los registros por miembro y día,
+    crea de una vez las filas que falten y hace una sola actualización por grupo.
+    """
+    from .models import AttendanceDay
+
+    groups = {}
+    for log in access_logs:
+        key = (log.member_id, _local_date(log.timestamp))
+        group = groups.setdefault(key, {'visits': 0, 'first_entry': None, 'last_exit': None})
+        if log.access_type == 'entry':
+            group['visits'] += 1
+            if group['first_entry'] is None or log.timestamp < group['first_entry']:
+                group['first_entry'] = log.timestamp
+        elif group['last_exit'] is None or log.timestamp > group['last_exit']:
+            group['last_exit'] = log.timestamp
+    if not groups:
+        return
+
+    # Filas vacías para los días nuevos (las existentes se ignoran); así cada grupo es un UPDATE
+    AttendanceDay.objects.bulk_create(
+        [AttendanceDay(member_id=member_id, date=day) for member_id, day in groups],
+        ignore_conflicts=True
+    )
+    now = timezone.now()
+    for (member_id, day), group in groups.items():
+        values, _ = _visit_values(**group)
+        AttendanceDay.objects.filter(member_id=member_id, date=day).update(**values, updated_at=now)
+
+
+def record_class_attended(reservation):
+    """Suma una clase asistida al día de la clase."""
+    day = _local_date(reservation.gym_class.start_datetime)
+    _upsert(
+        reservation.member_id, day,
+        {'classes_attended': F('classes_attended') + 1},
+        {'classes_attended': 1},
+    )
+
+
+# ==================== CONSULTAS ====================
+
+def attendance_dates(member, since=None, until=None):
+    """Días con asistencia del miembro, del más reciente al más antiguo."""
+    from .models import AttendanceDay
+
+    days = AttendanceDay.objects.filter(member=member)
+    if since:
+        days = days.filter(date__gte=since)
+    if until:
+        days = days.filter(date__lte=until)
+    return days.order_by('-date').values_list('date', flat=True)
+
+
+def streaks(member, today=None):
+    """
+    Racha actual y mejor racha (días consecutivos con asistencia) dentro de
+    los últimos STREAK_WINDOW días. La racha actual sigue viva si el último
+    día asistido fue hoy o ayer.
+
+    Returns:
+        tuple: (actual, mejor)
+    """
+    today = today or timezone.localdate()
+    dates = list(attendance_dates(member, since=today - timedelta(days=STREAK_WINDOW), until=today))
+
+    # Rachas como (largo, día más antiguo), recorriendo del más reciente hacia atrás
+    runs = []
+    for day in dates:
+        if runs and runs[-1][1] - day == timedelta(days=1):
+            runs[-1] = (runs[-1][0] + 1, day)
+        else:
+            runs.append((1, day))
+
+    best = max((length for length, _ in runs), default=0)
+    current = runs[0][0] if dates and today - dates[0] <= timedelta(days=1) else 0
+    return current, best
+
+
+# ==================== RECONSTRUCCIÓN ====================
+
+def _months(start, end):
+    current = start.replace(day=1)
+    while current <= end:
+        next_month = (current + timedelta(days=32)).replace(day=1)
+        yield max(current, start), min(next_month - timedelta(days=1), end)
+        current = next_month
+
+
+def rebuild(start=None, end=None, apps=global_apps):
+    """
+    Recalcula AttendanceDay desde AccessLog y las reservas asistidas, mes a mes
+    (ambos extremos inclusive; sin rango se recalcula todo).
+
+    Args:
+        apps: Registro de modelos; las migraciones pasan el histórico
+
+    Returns:
+        int: Filas generadas
+    """
+    Reservation = apps.get_model('classes', 'Reservation')
+    AccessLog = apps.get_model('access', 'AccessLog')
+    AttendanceDay = apps.get_model('access', 'AttendanceDay')
+
+    if start is None:
+        first_access = AccessLog.objects.aggregate(first=Min('timestamp'))['first']
+        first_class = Reservation.objects.filter(status='attended').aggregate(
+            first=Min('gym_class__start_datetime')
+        )['first']
+        moments = [_local_date(value) for value in (first_access, first_class) if value]
+        if not moments:
+            return 0
+        start = min(moments)
+    end = end or timezone.localdate()
+
+    total = 0
+    for month_start, month_end in _months(start, end):
+        since, until = day_bounds(month_start, month_end)
+        rows = {}
+
+        accesses = AccessLog.objects.filter(timestamp__gte=since, timestamp__lt=until).annotate(
+            day=TruncDate('timestamp')
+        ).values('member_id', 'day').annotate(
+            visits=Count('id', filter=Q(access_type='entry')),
+            first_entry=Min('timestamp', filter=Q(access_type='entry')),
+            last_exit=Max('timestamp', filter=Q(access_type='exit')),
+        ).order_by()
+        for row in accesses:
+            rows[(row['member_id'], row['day'])] = AttendanceDay(
+                member_id=row['member_id'], date=row['day'], visits=row['visits'],
+                first_entry=row['first_entry'], last_exit=row['last_exit'],
+            )
+
+        classes = Reservation.objects.filter(
+            status='attended',
+            gym_class__start_datetime__gte=since,
+            gym_class__start_datetime__lt=until,
+        ).annotate(
+            day=TruncDate('gym_class__start_datetime')
+        ).values('member_id', 'day').annotate(count=Count('id')).order_by()
+        for row in classes:
+            key = (row['member_id'], row['day'])
+            if key not in rows:
+                rows[key] = AttendanceDay(member_id=row['member_id'], date=row['day'])
+            rows[key].classes_attended = row['count']
+
+        with transaction.atomic():
+            AttendanceDay.objects.filter(date__gte=month_start, date__lte=month_end).delete()
+            AttendanceDay.objects.bulk_create(rows.values(), batch_size=1000)
+        total += len(rows)
+    return total
@@ -0,0 +1,179 @@
+"""
+Check-in de torniquetes
+Valida escaneos contra un índice en memoria de membresías activas y los
+guarda por lotes: un bulk_create de AccessLog, un solo UPDATE de
+Member.last_access y un solo lote de auditoría por lote
+"""
+import threading
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Case, DateTimeField, Max, Value, When
+from django.db.models.functions import Coalesce, Greatest
+from django.db.models.signals import post_save, post_delete
+from django.utils import timezone
+
+from apps.common.bulk import bulk_operation
+
+GENERATION_KEY = 'checkin:memberships:gen'
+# Tolerancia para relojes de torniquetes adelantados
+MAX_CLOCK_SKEW = timedelta(minutes=5)
+
+REJECT_NO_MEMBERSHIP = 'Sin membresía activa'
+REJECT_UNKNOWN_MEMBER = 'Miembro no encontrado'
+REJECT_FUTURE = 'Fecha del escaneo en el futuro'
+
+
+class ActiveMembershipIndex:
+    """
+    {member_id: fecha de vencimiento} de las membresías activas, en memoria del proceso.
+
+    Se recarga (una consulta sobre el índice parcial de membresías activas)
+    cuando cambia alguna membresía en cualquier worker (generación en caché),
+    cuando cambia el día o cada CHECKIN_INDEX_TTL segundos.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._end_dates = {}
+        self._generation = None
+        self._day = None
+        self._loaded_at = 0.0
+
+    def _is_current(self, generation, today):
+        return (
+            generation == self._generation
+            and today == self._day
+            and time.monotonic() - self._loaded_at < settings.CHECKIN_INDEX_TTL
+        )
+
+    def _load(self, today):
+        from apps.memberships.models import Membership
+
+        rows = Membership.objects.filter(
+            status='active',
+            end_date__gte=today
+        ).values('member_id').annotate(valid_until=Max('end_date')).values_list('member_id', 'valid_until')
+        return dict(rows)
+
+    def snapshot(self):
+        """Retorna el índice vigente, recargándolo si hace falta."""
+        today = timezone.localdate()
+        generation = cache.get(GENERATION_KEY, 0)
+        if self._is_current(generation, today):
+            return self._end_dates
+
+        with self._lock:
+            if not self._is_current(generation, today):
+                self._end_dates = self._load(today)
+                self._generation = generation
+                self._day = today
+                self._loaded_at = time.monotonic()
+        return self._end_dates
+
+    def valid_until(self, member_id):
+        return self.snapshot().get(member_id)
+
+
+index = ActiveMembershipIndex()
+
+
+def invalidate_index(**kwargs):
+    """Obliga a todos los procesos a recargar el índice en su próximo escaneo."""
+    transaction.on_commit(lambda: cache.set(GENERATION_KEY, time.time_ns(), timeout=None))
+
+
+def connect_signals():
+    from apps.memberships.models import Membership
+
+    post_save.connect(invalidate_index, sender=Membership, dispatch_uid='checkin_index_membership_save')
+    post_delete.connect(invalidate_index, sender=Membership, dispatch_uid='checkin_index_membership_delete')
+
+
+def _touch_last_access(entries):
+    """Un solo UPDATE para todos los miembros del lote (sin retroceder last_access)."""
+    from apps.members.models import Member
+
+    latest = {}
+    for log in entries:
+        if log.member_id not in latest or log.timestamp > latest[log.member_id]:
+            latest[log.member_id] = log.timestamp
+    if not latest:
+        return
+
+    scanned_at = Case(
+        *(When(pk=member_id, then=Value(moment)) for member_id, moment in latest.items()),
+        output_field=DateTimeField()
+    )
+    Member.objects.filter(pk__in=latest).update(
+        last_access=Greatest(Coalesce('last_access', scanned_at), scanned_at)
+    )
+
+
+def ingest(scans, registered_by=None):
+    """
+    Valida y guarda un lote de escaneos.
+
+    Args:
+        scans: Lista de dicts con member_id, access_type ('entry' / 'exit')
+            y opcionalmente timestamp (hora del escaneo en el torniquete)
+        registered_by: Usuario del dispositivo
+
+    Returns:
+        list: Un resultado por escaneo, en el mismo orden:
+            {'member': id, 'access_type', 'accepted': bool, 'reason', 'valid_until'}
+    """
+    from apps.members.models import Member
+    from apps.members.summary import invalidate as invalidate_summary
+    from .attendance import record_accesses
+    from .models import AccessLog
+
+    now = timezone.now()
+    active = index.snapshot()
+
+    # Las salidas no exigen membresía, solo que el miembro exista
+    exit_ids = {scan['member_id'] for scan in scans if scan['access_type'] == 'exit'} - set(active)
+    known_exits = set(Member.objects.filter(pk__in=exit_ids).values_list('pk', flat=True)) if exit_ids else set()
+
+    results, logs = [], []
+    for scan in scans:
+        member_id = scan['member_id']
+        timestamp = scan.get('timestamp') or now
+        valid_until = active.get(member_id)
+
+        reason = None
+        if timestamp > now + MAX_CLOCK_SKEW:
+            reason = REJECT_FUTURE
+        elif scan['access_type'] == 'entry' and valid_until is None:
+            reason = REJECT_NO_MEMBERSHIP
+        elif scan['access_type'] == 'exit' and valid_until is None and member_id not in known_exits:
+            reason = REJECT_UNKNOWN_MEMBER
+
+        results.append({
+            'member': member_id,
+            'access_type': scan['access_type'],
+            'accepted': reason is None,
+            'reason': reason,
+            'valid_until': valid_until,
+        })
+        if reason is None:
+            logs.append(AccessLog(
+                member_id=member_id,
+                access_type=scan['access_type'],
+                timestamp=timestamp,
+                registered_by=registered_by,
+            ))
+
+    if logs:
+        with transaction.atomic(), bulk_operation(user=registered_by) as batch:
+            AccessLog.objects.bulk_create(logs)
+            batch.saved(logs, created=True)
+            _touch_last_access([log for log in logs if log.access_type == 'entry'])
+            record_accesses(logs)
+            member_ids = {log.member_id for log in logs}
+            transaction.on_commit(lambda: invalidate_summary(*member_ids))
+
+    return results
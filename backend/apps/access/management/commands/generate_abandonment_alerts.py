@@ -0,0 +1,44 @@
+"""
+Management command para generar alertas de abandono
+Corre a diario como trabajo programado (manage.py run_scheduler) o a mano:
+
+    python manage.py generate_abandonment_alerts
+    python manage.py generate_abandonment_alerts --days 30 --dry-run
+"""
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.access import abandonment
+
+
+class Command(BaseCommand):
+    help = 'Crea alertas de abandono para los miembros activos que dejaron de asistir'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, help='Días sin asistir (por defecto, el de la configuración del gimnasio)')
+        parser.add_argument('--chunk-size', type=int, default=abandonment.CHUNK_SIZE, help='Miembros por bloque')
+        parser.add_argument('--dry-run', action='store_true', help='Solo contar, sin crear alertas')
+
+    def handle(self, *args, **options):
+        if options['days'] is not None and options['days'] < 1:
+            raise CommandError('--days debe ser mayor que 0')
+        if options['chunk_size'] < 1:
+            raise CommandError('--chunk-size debe ser mayor que 0')
+
+        start = time.perf_counter()
+        result = abandonment.generate_alerts(
+            days=options['days'],
+            chunk_size=options['chunk_size'],
+            dry_run=options['dry_run']
+        )
+        elapsed = time.perf_counter() - start
+
+        summary = (
+            f"{result['created']} miembros sin asistir hace {result['days']}+ días "
+            f"({result['chunks']} bloques, {elapsed:.2f}s)"
+        )
+        if options['dry_run']:
+            self.stdout.write(self.style.WARNING(f'[dry-run] {summary}; no se crearon alertas'))
+        else:
+            self.stdout.write(self.style.SUCCESS(f'✅ Alertas creadas: {summary}'))
@@ -0,0 +1,150 @@
+"""
+Management command de prueba de carga del check-in de torniquetes
+Envía escaneos al endpoint POST /api/access/checkin/ contra la base de datos
+local y reporta la latencia por escaneo (p50 / p95 / p99)
+
+Ejemplo:
+    python manage.py load_test_checkin --scans 3000 --batch 1 --workers 4
+    python manage.py load_test_checkin --scans 3000 --batch 50
+
+Crea miembros con membresía activa temporales y los elimina al terminar.
+"""
+import logging
+import random
+import statistics
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections, connection
+from django.test.utils import override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from apps.access.models import AccessLog
+from apps.members.models import Member
+from apps.memberships.models import Membership, MembershipPlan
+from apps.users.models import User
+
+TARGET_P99_MS = 20
+
+
+def _percentile(values, percent):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * percent / 100))]
+
+
+class Command(BaseCommand):
+    help = 'Prueba de carga del check-in de torniquetes (latencia por escaneo)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scans', type=int, default=2000, help='Escaneos totales')
+        parser.add_argument('--members', type=int, default=500, help='Miembros distintos')
+        parser.add_argument('--batch', type=int, default=1, help='Escaneos por petición')
+        parser.add_argument('--workers', type=int, default=1, help='Torniquetes concurrentes')
+        parser.add_argument('--inactive', type=float, default=0.05, help='Proporción de miembros sin membresía')
+        parser.add_argument('--keep', action='store_true', help='No eliminar los datos creados')
+
+    def handle(self, *args, **options):
+        run_id = uuid.uuid4().hex[:8]
+        device, members = self.setup(run_id, options['members'], options['inactive'])
+        # Los rechazos (403) no deben llenar la consola con advertencias de django.request
+        request_logger = logging.getLogger('django.request')
+        previous_level = request_logger.level
+        request_logger.setLevel(logging.ERROR)
+
+        try:
+            batches = self.build_batches(members, options['scans'], options['batch'])
+            # ALLOWED_HOSTS de producción no incluye 'testserver'
+            with override_settings(ALLOWED_HOSTS=['*']):
+                self.send(device, batches[0])  # Calentar el índice y la conexión
+                latencies, accepted = self.run(device, batches, options['workers'])
+        finally:
+            request_logger.setLevel(previous_level)
+            if not options['keep']:
+                self.cleanup(run_id)
+
+        per_scan = [ms / size for ms, size in latencies]
+        total = sum(size for _, size in latencies)
+        p99 = _percentile(per_scan, 99)
+        self.stdout.write(
+            f'{total} escaneos en {len(latencies)} peticiones ({connection.vendor}), '
+            f'aceptados {accepted}\n'
+            f'  por escaneo: p50={_percentile(per_scan, 50):.2f} ms  '
+            f'p95={_percentile(per_scan, 95):.2f} ms  p99={p99:.2f} ms  '
+            f'media={statistics.mean(per_scan):.2f} ms'
+        )
+        if p99 > TARGET_P99_MS:
+            raise CommandError(f'p99 {p99:.2f} ms supera el objetivo de {TARGET_P99_MS} ms')
+        self.stdout.write(self.style.SUCCESS(f'✅ p99 por escaneo bajo {TARGET_P99_MS} ms'))
+
+    def setup(self, run_id, count, inactive):
+        device = User.objects.create_user(
+            username=f'turnstile_{run_id}', email=f'turnstile_{run_id}@example.com', is_staff=True
+        )
+        users = User.objects.bulk_create([
+            User(username=f'checkin_{run_id}_{i}', email=f'checkin_{run_id}_{i}@example.com')
+            for i in range(count)
+        ])
+        members = Member.objects.bulk_create([Member(user=user) for user in users])
+
+        plan, _ = MembershipPlan.objects.get_or_create(
+            name='Load test', defaults={'price': Decimal('1'), 'duration_days': 30}
+        )
+        today = timezone.localdate()
+        Membership.objects.bulk_create([
+            Membership(member=member, plan=plan, start_date=today, end_date=today + timedelta(days=30), status='active')
+            for member in members[int(count * inactive):]
+        ])
+        return device, members
+
+    def build_batches(self, members, scans, batch_size):
+        # Cada miembro entra y luego sale, como en una hora pico real
+        inside = set()
+        events = []
+        for _ in range(scans):
+            member = random.choice(members)
+            access_type = 'exit' if member.pk in inside else 'entry'
+            inside.symmetric_difference_update({member.pk})
+            events.append({'member': member.pk, 'access_type': access_type})
+        return [events[i:i + batch_size] for i in range(0, len(events), batch_size)]
+
+    def send(self, device, batch):
+        client = APIClient()
+        client.force_authenticate(device)
+        payload = batch[0] if len(batch) == 1 else {'scans': batch}
+        start = time.perf_counter()
+        response = client.post('/api/access/checkin/', payload, format='json')
+        elapsed = (time.perf_counter() - start) * 1000
+        if response.status_code not in (200, 403):
+            raise CommandError(f'Respuesta inesperada {response.status_code}: {response.content[:200]}')
+        data = response.json()
+        accepted = data['accepted'] if 'results' in data else int(data.get('accepted', False))
+        return elapsed, len(batch), accepted
+
+    def run(self, device, batches, workers):
+        def task(batch):
+            try:
+                return self.send(device, batch)
+            finally:
+                close_old_connections()
+                if workers > 1:
+                    connection.close()
+
+        if workers > 1:
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                results = list(pool.map(task, batches))
+        else:
+            results = [task(batch) for batch in batches]
+
+        return [(elapsed, size) for elapsed, size, _ in results], sum(accepted for *_, accepted in results)
+
+    def cleanup(self, run_id):
+        users = User.objects.filter(username__startswith=f'checkin_{run_id}_')
+        AccessLog.objects.filter(member__user__in=users).delete()
+        Membership.objects.filter(member__user__in=users).delete()
+        users.delete()
+        User.objects.filter(username=f'turnstile_{run_id}').delete()
@@ -0,0 +1,37 @@
+"""
+Management command para reconstruir la asistencia diaria (AttendanceDay)
+Usar después de cargas masivas o para corregir desfases (accesos eliminados
+o editados, reservas cambiadas con queryset.update())
+"""
+from datetime import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.access import attendance
+
+
+def _parse_date(value):
+    try:
+        return datetime.strptime(value, '%Y-%m-%d').date()
+    except ValueError:
+        raise CommandError(f'Fecha inválida: {value} (formato esperado YYYY-MM-DD)')
+
+
+class Command(BaseCommand):
+    help = 'Reconstruye AttendanceDay desde los registros de acceso y las reservas asistidas'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--start', help='Fecha inicial YYYY-MM-DD (inclusive)')
+        parser.add_argument('--end', help='Fecha final YYYY-MM-DD (inclusive)')
+    
+    def handle(self, *args, **options):
+        start = _parse_date(options['start']) if options['start'] else None
+        end = _parse_date(options['end']) if options['end'] else None
+        
+        if start and end and start > end:
+            raise CommandError('--start debe ser anterior o igual a --end')
+        
+        rows = attendance.rebuild(start, end)
+        
+        rango = f"{start or 'inicio'} → {end or 'hoy'}"
+        self.stdout.write(self.style.SUCCESS(f'✅ Asistencia reconstruida ({rango}): {rows} días'))
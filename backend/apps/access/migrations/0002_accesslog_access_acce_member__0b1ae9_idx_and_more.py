@@ -0,0 +1,24 @@
+# Generated by Django 5.2.18 on 2026-10-17 18:34
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('access', '0001_initial'),
+        ('members', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='accesslog',
+            index=models.Index(fields=['member', '-timestamp'], name='access_acce_member__0b1ae9_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='accesslog',
+            index=models.Index(fields=['-timestamp'], name='access_acce_timesta_0603e5_idx'),
+        ),
+    ]
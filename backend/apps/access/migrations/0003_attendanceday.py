@@ -0,0 +1,43 @@
+# Generated by Django 5.2.18 on 2026-10-17 18:49
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def backfill_attendance(apps, schema_editor):
+    from apps.access.attendance import rebuild
+
+    rebuild(apps=apps)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('access', '0002_accesslog_access_acce_member__0b1ae9_idx_and_more'),
+        ('classes', '0001_initial'),
+        ('members', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AttendanceDay',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(verbose_name='Fecha')),
+                ('visits', models.PositiveIntegerField(default=0, verbose_name='Entradas')),
+                ('first_entry', models.DateTimeField(blank=True, null=True, verbose_name='Primera entrada')),
+                ('last_exit', models.DateTimeField(blank=True, null=True, verbose_name='Última salida')),
+                ('classes_attended', models.PositiveIntegerField(default=0, verbose_name='Clases asistidas')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('member', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='attendance_days', to='members.member', verbose_name='Miembro')),
+            ],
+            options={
+                'verbose_name': 'Asistencia diaria',
+                'verbose_name_plural': 'Asistencias diarias',
+                'ordering': ['-date'],
+                'indexes': [models.Index(fields=['date'], name='access_atte_date_5fc00f_idx')],
+                'unique_together': {('member', 'date')},
+            },
+        ),
+        migrations.RunPython(backfill_attendance, migrations.RunPython.noop),
+    ]
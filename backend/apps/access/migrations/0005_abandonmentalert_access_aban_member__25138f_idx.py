@@ -0,0 +1,20 @@
+# Generated by Django 5.2.18 on 2026-10-17 19:00
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('access', '0004_accesslog_timestamp_default'),
+        ('members', '0002_member_members_mem_last_ac_8444ee_idx'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='abandonmentalert',
+            index=models.Index(fields=['member', 'status'], name='access_aban_member__25138f_idx'),
+        ),
+    ]
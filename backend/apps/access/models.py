@@ -3,11 +3,13 @@ Modelos de Control de Acceso (Asistencia)
 Sistema de Gestión de Gimnasio
 """
 
-from django.db import models
+from django.db import models, transaction
 from django.utils import timezone
 
+from apps.audit.tracking import AuditTrackedMixin
 
-class AccessLog(models.Model):
+
+class AccessLog(AuditTrackedMixin, models.Model):
     """Registro de accesos/asistencias al gimnasio"""
     
     ACCESS_TYPES = [
@@ -27,8 +29,9 @@ class AccessLog(models.Model):
         default='entry',
         verbose_name='Tipo de acceso'
     )
+    # default (no auto_now_add) para que los torniquetes puedan enviar la hora real del escaneo
     timestamp = models.DateTimeField(
-        auto_now_add=True,
+        default=timezone.now,
         verbose_name='Fecha y hora'
     )
     registered_by = models.ForeignKey(
@@ -47,18 +50,79 @@ class AccessLog(models.Model):
         verbose_name = 'Registro de Acceso'
         verbose_name_plural = 'Registros de Acceso'
         ordering = ['-timestamp']
+        indexes = [
+            models.Index(fields=['member', '-timestamp']),
+            models.Index(fields=['-timestamp']),
+        ]
     
     def __str__(self):
         return f"{self.member} - {self.get_access_type_display()} - {self.timestamp}"
     
     def save(self, *args, **kwargs):
-        super().save(*args, **kwargs)
+        from .attendance import record_access
+
+        adding = self._state.adding
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            # Los registros de acceso no se editan; solo los nuevos suman a la asistencia diaria
+            if adding:
+                record_access(self)
         # Actualizar último acceso del miembro
         if self.access_type == 'entry':
             self.member.last_access = self.timestamp
             self.member.save(update_fields=['last_access'])
 
 
+class AttendanceDay(models.Model):
+    """
+    Asistencia diaria por miembro (una fila por miembro y día).
+    Se mantiene incrementalmente desde AccessLog y Reservation.mark_attended;
+    rebuild_attendance la recalcula desde los eventos.
+    """
+    
+    member = models.ForeignKey(
+        'members.Member',
+        on_delete=models.CASCADE,
+        related_name='attendance_days',
+        verbose_name='Miembro'
+    )
+    date = models.DateField(
+        verbose_name='Fecha'
+    )
+    visits = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Entradas'
+    )
+    first_entry = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name='Primera entrada'
+    )
+    last_exit = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name='Última salida'
+    )
+    classes_attended = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Clases asistidas'
+    )
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        verbose_name = 'Asistencia diaria'
+        verbose_name_plural = 'Asistencias diarias'
+        ordering = ['-date']
+        # (member, date) también sirve para rachas e inactividad: recorre los días del miembro por índice
+        unique_together = ['member', 'date']
+        indexes = [
+            models.Index(fields=['date']),
+        ]
+    
+    def __str__(self):
+        return f"{self.member} - {self.date} ({self.visits} entradas, {self.classes_attended} clases)"
+
+
 class AbandonmentAlert(models.Model):
     """Alertas de abandono (miembros inactivos)"""
     
@@ -110,6 +174,9 @@ class AbandonmentAlert(models.Model):
         verbose_name = 'Alerta de Abandono'
         verbose_name_plural = 'Alertas de Abandono'
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['member', 'status']),
+        ]
     
     def __str__(self):
         return f"Alerta: {self.member} - {self.days_inactive} días inactivo"
@@ -41,3 +41,10 @@ class AbandonmentAlertSerializer(serializers.ModelSerializer):
             'resolved_by', 'notes'
         ]
         read_only_fields = ['created_at', 'resolved_at']
+
+
+class CheckInScanSerializer(serializers.Serializer):
+    """Un escaneo de torniquete"""
+    member = serializers.IntegerField(min_value=1)
+    access_type = serializers.ChoiceField(choices=AccessLog.ACCESS_TYPES, default='entry')
+    timestamp = serializers.DateTimeField(required=False)
@@ -0,0 +1,97 @@
+"""
+Unit tests for the nightly abandonment-alert generator.
+Tests verify the inactivity threshold, open-alert deduplication, chunking and dry runs.
+"""
+import pytest
+from datetime import datetime, time, timedelta
+from decimal import Decimal
+from django.core.management import call_command
+from django.utils import timezone
+from apps.access import abandonment
+from apps.access.models import AbandonmentAlert
+from apps.analytics.models import GymSettings
+from apps.members.models import Member
+from apps.memberships.models import Membership, MembershipPlan
+from apps.users.models import User
+
+TODAY = timezone.localdate()
+
+
+def make_member(username, last_seen_days_ago=None, active=True):
+    user = User.objects.create_user(username=username, email=f'{username}@gym.com', password='x')
+    last_access = None
+    if last_seen_days_ago is not None:
+        day = TODAY - timedelta(days=last_seen_days_ago)
+        last_access = timezone.make_aware(datetime.combine(day, time(18)))
+    member = Member.objects.create(user=user, last_access=last_access)
+    if active:
+        plan, _ = MembershipPlan.objects.get_or_create(
+            name='Mensual', defaults={'price': Decimal('30'), 'duration_days': 30}
+        )
+        Membership.objects.create(
+            member=member, plan=plan, start_date=TODAY - timedelta(days=40),
+            end_date=TODAY + timedelta(days=20), status='active'
+        )
+    return member
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+class TestAbandonmentAlerts:
+    """generate_alerts() and the management command."""
+
+    def test_only_active_members_past_threshold(self):
+        gone = make_member('gone', last_seen_days_ago=20)
+        make_member('regular', last_seen_days_ago=3)
+        make_member('edge', last_seen_days_ago=14)
+        make_member('cancelled', last_seen_days_ago=60, active=False)
+
+        result = abandonment.generate_alerts(days=15, today=TODAY)
+
+        assert result['created'] == 1
+        alert = AbandonmentAlert.objects.get()
+        assert (alert.member_id, alert.days_inactive, alert.status) == (gone.pk, 20, 'pending')
+
+    def test_members_who_never_came_count_from_joined_date(self):
+        newbie = make_member('newbie')
+
+        assert abandonment.generate_alerts(days=15, today=TODAY)['created'] == 0
+        assert abandonment.generate_alerts(days=15, today=TODAY + timedelta(days=16))['created'] == 1
+        assert AbandonmentAlert.objects.get().member_id == newbie.pk
+
+    def test_open_alerts_are_not_duplicated(self):
+        contacted = make_member('contacted', last_seen_days_ago=30)
+        resolved = make_member('resolved', last_seen_days_ago=30)
+        AbandonmentAlert.objects.create(member=contacted, days_inactive=20, status='contacted')
+        AbandonmentAlert.objects.create(member=resolved, days_inactive=20, status='resolved')
+
+        first = abandonment.generate_alerts(days=15, today=TODAY)
+        second = abandonment.generate_alerts(days=15, today=TODAY)
+
+        assert (first['created'], second['created']) == (1, 0)
+        assert AbandonmentAlert.objects.filter(member=resolved, status='pending').exists()
+
+    def test_chunks_use_constant_queries(self, django_assert_num_queries):
+        for i in range(7):
+            make_member(f'gone{i}', last_seen_days_ago=30)
+
+        # Por bloque: SELECT de candidatos + INSERT (el bloque incompleto termina el recorrido)
+        with django_assert_num_queries(3 * 2):
+            result = abandonment.generate_alerts(days=15, today=TODAY, chunk_size=3)
+
+        assert (result['created'], result['chunks']) == (7, 3)
+        assert AbandonmentAlert.objects.count() == 7
+
+    def test_threshold_comes_from_gym_settings(self):
+        GymSettings.objects.create(days_for_abandonment_alert=40)
+        make_member('gone', last_seen_days_ago=30)
+
+        assert abandonment.generate_alerts(today=TODAY) == {'days': 40, 'created': 0, 'chunks': 0}
+
+    def test_dry_run_creates_nothing(self, capsys):
+        make_member('gone', last_seen_days_ago=30)
+
+        call_command('generate_abandonment_alerts', '--days', '15', '--dry-run')
+
+        assert not AbandonmentAlert.objects.exists()
+        assert '[dry-run] 1 miembros' in capsys.readouterr().out
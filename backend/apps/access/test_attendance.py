@@ -0,0 +1,123 @@
+"""
+Unit tests for the daily attendance fact table.
+Tests verify incremental maintenance, rebuild parity and streaks.
+"""
+import pytest
+from datetime import date, timedelta
+from django.core.management import call_command
+from django.utils import timezone
+from apps.access import attendance
+from apps.access.models import AccessLog, AttendanceDay
+from apps.classes import booking
+from apps.classes.models import ClassType, GymClass
+from apps.members.models import Member
+from apps.users.models import User
+
+
+def make_member(username):
+    user = User.objects.create_user(username=username, email=f'{username}@gym.com', password='x')
+    return Member.objects.create(user=user)
+
+
+def log_access(member, access_type, moment):
+    log = AccessLog.objects.create(member=member, access_type=access_type)
+    # Mover el timestamp sin pasar por save(), como lo haría una carga histórica
+    AccessLog.objects.filter(pk=log.pk).update(timestamp=moment)
+    return log
+
+
+def add_days(member, *days):
+    AttendanceDay.objects.bulk_create([AttendanceDay(member=member, date=day, visits=1) for day in days])
+
+
+@pytest.fixture
+def athlete(db):
+    return make_member('regular')
+
+
+def snapshot():
+    return {
+        (row.member_id, row.date): (row.visits, row.first_entry, row.last_exit, row.classes_attended)
+        for row in AttendanceDay.objects.all()
+    }
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+class TestAttendanceMaintenance:
+    """AccessLog.save and mark_attended keep AttendanceDay current."""
+
+    def test_entries_and_exits_fold_into_one_day(self, athlete):
+        entry = AccessLog.objects.create(member=athlete, access_type='entry')
+        AccessLog.objects.create(member=athlete, access_type='entry')
+        exit_log = AccessLog.objects.create(member=athlete, access_type='exit')
+
+        day = AttendanceDay.objects.get(member=athlete)
+        assert day.date == timezone.localtime(entry.timestamp).date()
+        assert day.visits == 2
+        assert day.first_entry == entry.timestamp
+        assert day.last_exit == exit_log.timestamp
+
+    def test_editing_an_access_log_does_not_count_twice(self, athlete):
+        log = AccessLog.objects.create(member=athlete, access_type='entry')
+        log.notes = 'Olvidó el carnet'
+        log.save()
+
+        assert AttendanceDay.objects.get(member=athlete).visits == 1
+
+    def test_mark_attended_counts_the_class(self, athlete):
+        class_type = ClassType.objects.create(name='Boxeo')
+        start = timezone.now() - timedelta(hours=1)
+        gym_class = GymClass.objects.create(
+            class_type=class_type, title='Boxeo', start_datetime=start,
+            end_datetime=start + timedelta(hours=1), capacity=5
+        )
+        reservation = booking.book(gym_class, athlete)
+
+        assert reservation.mark_attended() is True
+        assert reservation.mark_attended() is False
+
+        day = AttendanceDay.objects.get(member=athlete, date=timezone.localtime(start).date())
+        assert (day.classes_attended, day.visits) == (1, 0)
+
+    def test_rebuild_matches_incremental(self, athlete):
+        other = make_member('other')
+        for member in (athlete, other):
+            AccessLog.objects.create(member=member, access_type='entry')
+            AccessLog.objects.create(member=member, access_type='exit')
+        AccessLog.objects.create(member=athlete, access_type='entry')
+        incremental = snapshot()
+
+        call_command('rebuild_attendance')
+
+        assert snapshot() == incremental
+
+    def test_rebuild_covers_history_by_month(self, athlete):
+        now = timezone.now()
+        log_access(athlete, 'entry', now - timedelta(days=70))
+        log_access(athlete, 'entry', now - timedelta(days=40))
+        AttendanceDay.objects.all().delete()
+
+        assert attendance.rebuild() == 2
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+class TestAttendanceQueries:
+    """Streaks read AttendanceDay only."""
+
+    def test_streaks(self, athlete, django_assert_num_queries):
+        today = date(2025, 3, 20)
+        add_days(athlete, *(today - timedelta(days=n) for n in (1, 2, 3, 10, 11, 12, 13, 14, 30)))
+
+        with django_assert_num_queries(1):
+            assert attendance.streaks(athlete, today) == (3, 5)
+
+    def test_streak_is_broken_after_a_missed_day(self, athlete):
+        today = date(2025, 3, 20)
+        add_days(athlete, today - timedelta(days=2), today - timedelta(days=3))
+
+        assert attendance.streaks(athlete, today) == (0, 2)
+
+    def test_no_attendance(self, athlete):
+        assert attendance.streaks(athlete) == (0, 0)
@@ -0,0 +1,182 @@
+"""
+Unit tests for turnstile check-in.
+Tests verify membership validation, batched writes, last_access coalescing and index invalidation.
+"""
+import pytest
+from datetime import timedelta
+from decimal import Decimal
+from django.utils import timezone
+from rest_framework.test import APIClient
+from apps.access import checkin
+from apps.access.models import AccessLog, AttendanceDay
+from apps.audit.models import AuditLog
+from apps.members.models import Member
+from apps.memberships.models import Membership, MembershipPlan
+from apps.users.models import User
+
+
+def make_member(username, active=True):
+    user = User.objects.create_user(username=username, email=f'{username}@gym.com', password='x')
+    member = Member.objects.create(user=user)
+    if active:
+        plan, _ = MembershipPlan.objects.get_or_create(
+            name='Mensual', defaults={'price': Decimal('30'), 'duration_days': 30}
+        )
+        today = timezone.localdate()
+        Membership.objects.create(
+            member=member, plan=plan, start_date=today, end_date=today + timedelta(days=30), status='active'
+        )
+    return member
+
+
+@pytest.fixture
+def device(db):
+    user = User.objects.create_user(username='turnstile', email='turnstile@gym.com', password='x', is_staff=True)
+    client = APIClient()
+    client.force_authenticate(user)
+    return client
+
+
+@pytest.fixture
+def fresh_index(monkeypatch):
+    index = checkin.ActiveMembershipIndex()
+    monkeypatch.setattr(checkin, 'index', index)
+    return index
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+class TestIngest:
+    """Validation and persistence of scan batches."""
+
+    def test_entry_requires_active_membership(self, fresh_index):
+        active = make_member('active')
+        lapsed = make_member('lapsed', active=False)
+
+        results = checkin.ingest([
+            {'member_id': active.pk, 'access_type': 'entry'},
+            {'member_id': lapsed.pk, 'access_type': 'entry'},
+        ])
+
+        assert [r['accepted'] for r in results] == [True, False]
+        assert results[0]['valid_until'] == timezone.localdate() + timedelta(days=30)
+        assert results[1]['reason'] == checkin.REJECT_NO_MEMBERSHIP
+        assert list(AccessLog.objects.values_list('member_id', flat=True)) == [active.pk]
+
+    def test_exit_only_requires_known_member(self, fresh_index):
+        lapsed = make_member('lapsed', active=False)
+
+        results = checkin.ingest([
+            {'member_id': lapsed.pk, 'access_type': 'exit'},
+            {'member_id': 999999, 'access_type': 'exit'},
+        ])
+
+        assert [r['accepted'] for r in results] == [True, False]
+        assert results[1]['reason'] == checkin.REJECT_UNKNOWN_MEMBER
+
+    def test_future_scans_are_rejected(self, fresh_index):
+        member = make_member('early')
+
+        result = checkin.ingest([{
+            'member_id': member.pk, 'access_type': 'entry',
+            'timestamp': timezone.now() + timedelta(hours=1),
+        }])[0]
+
+        assert result['reason'] == checkin.REJECT_FUTURE
+
+    def test_batch_writes_in_constant_queries(self, fresh_index, django_assert_num_queries):
+        members = [make_member(f'rush{i}') for i in range(20)]
+        fresh_index.snapshot()
+        scans = [{'member_id': m.pk, 'access_type': 'entry'} for m in members]
+
+        # AccessLog, last_access y días nuevos en bloque; un UPDATE de asistencia por miembro;
+        # auditoría: miembros y usuarios (object_repr) e INSERT
+        with django_assert_num_queries(3 + len(members) + 3 + 2):
+            checkin.ingest(scans)
+
+        assert AccessLog.objects.count() == 20
+        assert AuditLog.objects.filter(model_name='AccessLog', action='CREATE').count() == 20
+        assert AttendanceDay.objects.filter(date=timezone.localdate(), visits=1).count() == 20
+
+    def test_last_access_never_moves_backwards(self, fresh_index):
+        member = make_member('late')
+        now = timezone.now()
+
+        checkin.ingest([
+            {'member_id': member.pk, 'access_type': 'entry', 'timestamp': now - timedelta(minutes=10)},
+            {'member_id': member.pk, 'access_type': 'entry', 'timestamp': now - timedelta(minutes=30)},
+        ])
+        checkin.ingest([
+            {'member_id': member.pk, 'access_type': 'entry', 'timestamp': now - timedelta(hours=2)},
+        ])
+
+        member.refresh_from_db()
+        assert member.last_access == now - timedelta(minutes=10)
+        day = AttendanceDay.objects.get(member=member)
+        assert day.visits == 3
+        assert day.first_entry == now - timedelta(hours=2)
+
+    def test_membership_change_reloads_index(self, fresh_index, django_capture_on_commit_callbacks):
+        member = make_member('renewing', active=False)
+        assert fresh_index.valid_until(member.pk) is None
+
+        with django_capture_on_commit_callbacks(execute=True):
+            make_member('other')
+            Membership.objects.create(
+                member=member, plan=MembershipPlan.objects.get(name='Mensual'),
+                start_date=timezone.localdate(), end_date=timezone.localdate() + timedelta(days=7),
+                status='active'
+            )
+
+        assert fresh_index.valid_until(member.pk) == timezone.localdate() + timedelta(days=7)
+
+
+@pytest.mark.integration
+@pytest.mark.django_db
+class TestCheckInEndpoint:
+    """POST /api/access/checkin/"""
+
+    def test_single_scan_status_codes(self, device, fresh_index):
+        active = make_member('active')
+        lapsed = make_member('lapsed', active=False)
+
+        ok = device.post('/api/access/checkin/', {'member': active.pk}, format='json')
+        denied = device.post('/api/access/checkin/', {'member': lapsed.pk}, format='json')
+
+        assert ok.status_code == 200
+        assert ok.data['accepted'] is True
+        assert denied.status_code == 403
+        assert denied.data['reason'] == checkin.REJECT_NO_MEMBERSHIP
+
+    def test_batch_reports_each_scan(self, device, fresh_index):
+        active = make_member('active')
+        lapsed = make_member('lapsed', active=False)
+
+        response = device.post('/api/access/checkin/', {'scans': [
+            {'member': active.pk},
+            {'member': lapsed.pk},
+            {'member': active.pk, 'access_type': 'exit'},
+        ]}, format='json')
+
+        assert response.status_code == 200
+        assert (response.data['accepted'], response.data['rejected']) == (2, 1)
+        assert [r['accepted'] for r in response.data['results']] == [True, False, True]
+        audited = AuditLog.objects.filter(model_name='AccessLog')
+        assert list(audited.values_list('user__username', flat=True)) == ['turnstile', 'turnstile']
+
+    def test_batch_size_is_limited(self, device, fresh_index, settings):
+        settings.CHECKIN_MAX_BATCH = 2
+
+        response = device.post('/api/access/checkin/', {'scans': [{'member': 1}] * 3}, format='json')
+
+        assert response.status_code == 400
+
+    def test_members_cannot_check_in(self, fresh_index):
+        member = make_member('sneaky')
+        client = APIClient()
+        client.force_authenticate(member.user)
+
+        response = client.post('/api/access/checkin/', {'member': member.pk}, format='json')
+
+        assert response.status_code == 403
+        assert not AccessLog.objects.exists()
@@ -1,19 +1,27 @@
 """
 ViewSets para Acceso
 """
-from rest_framework import viewsets, permissions
+from django.conf import settings
+from rest_framework import viewsets, permissions, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
+from rest_framework.exceptions import ValidationError
 from django.utils import timezone
+from apps.common.dates import day_bounds
+from apps.common.pagination import KeysetPagination
 from .models import AccessLog, AbandonmentAlert
+from apps.common.permissions import can_manage_members
+from .checkin import ingest
 from .serializers import (
-    AccessLogSerializer, AccessLogCreateSerializer, AbandonmentAlertSerializer
+    AccessLogSerializer, AccessLogCreateSerializer, AbandonmentAlertSerializer, CheckInScanSerializer
 )
 
 
 class AccessLogViewSet(viewsets.ModelViewSet):
     queryset = AccessLog.objects.all()
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = KeysetPagination
+    cursor_ordering = '-timestamp'
     
     def get_serializer_class(self):
         if self.action == 'create':
@@ -27,19 +35,24 @@ class AccessLogViewSet(viewsets.ModelViewSet):
         if member_id:
             queryset = queryset.filter(member_id=member_id)
         
-        # Filtrar por fecha
+        # Filtrar por fecha (rango de datetimes para usar el índice de timestamp)
         date = self.request.query_params.get('date')
         if date:
-            queryset = queryset.filter(timestamp__date=date)
+            try:
+                start, end = day_bounds(date)
+            except ValueError:
+                raise ValidationError({'detail': 'Formato de fecha inválido. Use YYYY-MM-DD'})
+            queryset = queryset.filter(timestamp__gte=start, timestamp__lt=end)
         
         return queryset.order_by('-timestamp')
     
     @action(detail=False, methods=['get'])
     def today(self, request):
         """Accesos de hoy"""
-        today = timezone.now().date()
+        start, end = day_bounds(timezone.localdate())
         logs = AccessLog.objects.filter(
-            timestamp__date=today,
+            timestamp__gte=start,
+            timestamp__lt=end,
             access_type='entry'
         ).select_related('member__user')
         
@@ -48,6 +61,64 @@ class AccessLogViewSet(viewsets.ModelViewSet):
             'count': logs.count(),
             'logs': serializer.data
         })
+    
+    @action(detail=False, methods=['post'])
+    def checkin(self, request):
+        """
+        Check-in de torniquetes
+        POST /api/access/checkin/
+        
+        Body: un escaneo {"member": 12, "access_type": "entry", "timestamp": "..."}
+        o un lote {"scans": [...]} (p. ej. lo acumulado por el torniquete sin conexión).
+        
+        Un escaneo: 200 si se acepta, 403 si se rechaza.
+        Lote: 200 con el resultado de cada escaneo en el mismo orden.
+        """
+        if not (request.user.is_staff or can_manage_members(request.user)):
+            return Response({'detail': 'No tienes permisos'}, status=status.HTTP_403_FORBIDDEN)
+        
+        batch = isinstance(request.data, dict) and 'scans' in request.data
+        payload = request.data['scans'] if batch else [request.data]
+        if not isinstance(payload, list) or not payload:
+            raise ValidationError({'scans': 'Debe ser una lista no vacía'})
+        if len(payload) > settings.CHECKIN_MAX_BATCH:
+            raise ValidationError({'scans': f'Máximo {settings.CHECKIN_MAX_BATCH} escaneos por lote'})
+        
+        serializer = CheckInScanSerializer(data=payload, many=True)
+        serializer.is_valid(raise_exception=True)
+        scans = [
+            {'member_id': scan['member'], 'access_type': scan['access_type'], 'timestamp': scan.get('timestamp')}
+            for scan in serializer.validated_data
+        ]
+        results = ingest(scans, registered_by=request.user)
+        
+        if not batch:
+            result = results[0]
+            return Response(result, status=status.HTTP_200_OK if result['accepted'] else status.HTTP_403_FORBIDDEN)
+        
+        accepted = sum(1 for result in results if result['accepted'])
+        return Response({
+            'accepted': accepted,
+            'rejected': len(results) - accepted,
+            'results': results,
+        })
+    
+    @action(detail=False, methods=['get'])
+    def export(self, request):
+        """Exportar accesos a Excel o CSV (?export_format=csv), con los filtros de member_id y date"""
+        if not request.user.is_staff:
+            return Response({'detail': 'No tienes permisos'}, status=403)
+        
+        from apps.reports.exports import export_response, get_export_format
+        from apps.reports.specs import ACCESS_LOG_COLUMNS
+        
+        return export_response(
+            self.get_queryset(),
+            ACCESS_LOG_COLUMNS,
+            'accesos',
+            export_format=get_export_format(request),
+            title='Accesos'
+        )
 
 
 class AbandonmentAlertViewSet(viewsets.ModelViewSet):
@@ -0,0 +1,50 @@
+"""
+Management command para generar los snapshots de métricas (MetricSnapshot)
+Corre a diario como trabajo programado (período en curso y anterior); a mano
+sirve para la carga inicial:
+
+    python manage.py build_metric_snapshots --periods-back 104 --period weekly
+    python manage.py build_metric_snapshots --period monthly --date 2025-06-15
+"""
+import time
+from datetime import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.analytics import snapshots
+
+
+class Command(BaseCommand):
+    help = 'Genera los snapshots de métricas de los atletas por período'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--period', choices=snapshots.PERIOD_TYPES, help='Solo este tipo de período')
+        parser.add_argument('--date', help='Fecha dentro del último período a generar (YYYY-MM-DD; por defecto hoy)')
+        parser.add_argument('--periods-back', type=int, default=1, help='Períodos anteriores a generar')
+        parser.add_argument('--backend', choices=sorted(snapshots.BACKENDS), help='Cálculo (por defecto numpy si está instalado)')
+
+    def handle(self, *args, **options):
+        today = None
+        if options['date']:
+            try:
+                today = datetime.strptime(options['date'], '%Y-%m-%d').date()
+            except ValueError:
+                raise CommandError(f"Fecha inválida: {options['date']} (formato esperado YYYY-MM-DD)")
+        if options['periods_back'] < 0:
+            raise CommandError('--periods-back no puede ser negativo')
+
+        backend = options['backend'] or snapshots.default_backend()
+        period_types = [options['period']] if options['period'] else snapshots.PERIOD_TYPES
+
+        start = time.perf_counter()
+        total = snapshots.build_recent(
+            today=today,
+            period_types=period_types,
+            periods_back=options['periods_back'],
+            backend=backend
+        )
+        elapsed = time.perf_counter() - start
+
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ {total} snapshots ({', '.join(period_types)}; cálculo {backend}) en {elapsed:.2f}s"
+        ))
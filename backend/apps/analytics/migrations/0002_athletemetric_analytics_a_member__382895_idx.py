@@ -0,0 +1,20 @@
+# Generated by Django 5.2.18 on 2026-10-17 18:34
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0001_initial'),
+        ('members', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='athletemetric',
+            index=models.Index(fields=['member', 'metric_type', '-recorded_date'], name='analytics_a_member__382895_idx'),
+        ),
+    ]
@@ -165,6 +165,9 @@ class AthleteMetric(models.Model):
         verbose_name_plural = 'Métricas del Atleta'
         ordering = ['-recorded_date', '-created_at']
         # Un miembro puede tener múltiples registros del mismo tipo en el mismo día
+        indexes = [
+            models.Index(fields=['member', 'metric_type', '-recorded_date']),
+        ]
     
     def __str__(self):
         return f"{self.member} - {self.metric_type.name}: {self.value}"
@@ -0,0 +1,322 @@
+"""
+Snapshots de métricas
+Sistema de Gestión de Gimnasio
+
+Genera MetricSnapshot (semanal, mensual, trimestral, anual) a partir de
+AthleteMetric:
+
+- Una sola consulta ordenada por (miembro, métrica, fecha) trae las
+  mediciones del período.
+- Las estadísticas de cada serie (promedio, mínimo, máximo, último valor y
+  pendiente de la tendencia por día) se calculan en una pasada vectorizada con
+  NumPy si está instalado, o en Python puro.
+- Los snapshots se guardan con un solo bulk_create con upsert.
+
+metrics_data: {"<metric_type_id>": {"count", "avg", "min", "max", "last", "slope"}}
+"""
+from datetime import date, timedelta
+from itertools import groupby
+
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+try:
+    import numpy as np
+except ImportError:  # numpy es opcional
+    np = None
+
+PERIOD_TYPES = ('weekly', 'monthly', 'quarterly', 'yearly')
+PRECISION = 4
+
+
+def period_bounds(period_type, day):
+    """Primer y último día (inclusive) del período que contiene `day`."""
+    if period_type == 'weekly':
+        start = day - timedelta(days=day.weekday())
+        return start, start + timedelta(days=6)
+    if period_type == 'monthly':
+        start = day.replace(day=1)
+    elif period_type == 'quarterly':
+        start = date(day.year, 3 * ((day.month - 1) // 3) + 1, 1)
+    elif period_type == 'yearly':
+        start = date(day.year, 1, 1)
+    else:
+        raise ValueError(f'Tipo de período inválido: {period_type}')
+
+    months = {'monthly': 1, 'quarterly': 3, 'yearly': 12}[period_type]
+    month = start.month - 1 + months
+    next_start = date(start.year + month // 12, month % 12 + 1, 1)
+    return start, next_start - timedelta(days=1)
+
+
+def previous_period(period_type, day):
+    """Límites del período anterior al que contiene `day`."""
+    start, _ = period_bounds(period_type, day)
+    return period_bounds(period_type, start - timedelta(days=1))
+
+
+# ==================== ESTADÍSTICAS ====================
+
+def _round(value):
+    return round(float(value), PRECISION)
+
+
+def _stats(count, sum_x, sum_y, sum_xx, sum_xy, low, high, last):
+    # Pendiente de mínimos cuadrados (unidades por día); 0 si todas las mediciones son del mismo día
+    denominator = count * sum_xx - sum_x * sum_x
+    slope = (count * sum_xy - sum_x * sum_y) / denominator if denominator else 0.0
+    return {
+        'count': int(count),
+        'avg': _round(sum_y / count),
+        'min': _round(low),
+        'max': _round(high),
+        'last': _round(last),
+        'slope': _round(slope),
+    }
+
+
+def _series_stats_python(member_ids, metric_ids, days, values):
+    """Listas en paralelo, ordenadas por (miembro, métrica, fecha)."""
+    result = {}
+    position = 0
+    for key, group in groupby(zip(member_ids, metric_ids)):
+        count = sum(1 for _ in group)
+        xs = days[position:position + count]
+        ys = values[position:position + count]
+        position += count
+        result[key] = _stats(
+            count, sum(xs), sum(ys),
+            sum(x * x for x in xs), sum(x * y for x, y in zip(xs, ys)),
+            min(ys), max(ys), ys[-1]
+        )
+    return result
+
+
+def _series_stats_numpy(member_ids, metric_ids, days, values):
+    """Misma salida que _series_stats_python, con reduceat sobre los límites de cada serie."""
+    if not values:
+        return {}
+    members = np.asarray(member_ids)
+    metrics = np.asarray(metric_ids)
+    x = np.asarray(days, dtype=np.float64)
+    y = np.asarray(values, dtype=np.float64)
+
+    changed = (members[1:] != members[:-1]) | (metrics[1:] != metrics[:-1])
+    starts = np.concatenate(([0], np.flatnonzero(changed) + 1))
+    ends = np.append(starts[1:], len(y))
+
+    counts = ends - starts
+    sum_x = np.add.reduceat(x, starts)
+    sum_y = np.add.reduceat(y, starts)
+    denominator = counts * np.add.reduceat(x * x, starts) - sum_x * sum_x
+    numerator = counts * np.add.reduceat(x * y, starts) - sum_x * sum_y
+    slope = np.divide(numerator, denominator, out=np.zeros_like(numerator), where=denominator != 0)
+
+    columns = zip(
+        counts.tolist(),
+        np.round(sum_y / counts, PRECISION).tolist(),
+        np.round(np.minimum.reduceat(y, starts), PRECISION).tolist(),
+        np.round(np.maximum.reduceat(y, starts), PRECISION).tolist(),
+        np.round(y[ends - 1], PRECISION).tolist(),
+        np.round(slope, PRECISION).tolist(),
+    )
+    keys = zip(members[starts].tolist(), metrics[starts].tolist())
+    return {
+        key: {'count': count, 'avg': avg, 'min': low, 'max': high, 'last': last, 'slope': trend}
+        for key, (count, avg, low, high, last, trend) in zip(keys, columns)
+    }
+
+
+BACKENDS = {'python': _series_stats_python}
+if np is not None:
+    BACKENDS['numpy'] = _series_stats_numpy
+
+
+def default_backend():
+    return 'numpy' if 'numpy' in BACKENDS else 'python'
+
+
+# ==================== GENERACIÓN ====================
+
+def compute_period(start, end, backend=None):
+    """
+    Estadísticas por (miembro, métrica) de las mediciones entre start y end (inclusive).
+
+    Returns:
+        dict: {member_id: {metric_type_id: stats}}
+    """
+    from .models import AthleteMetric
+
+    rows = AthleteMetric.objects.filter(
+        recorded_date__gte=start, recorded_date__lte=end
+    ).order_by('member_id', 'metric_type_id', 'recorded_date', 'recorded_time', 'id').values_list(
+        'member_id', 'metric_type_id', 'recorded_date', 'value'
+    )
+
+    member_ids, metric_ids, days, values = [], [], [], []
+    for member_id, metric_type_id, recorded_date, value in rows.iterator(chunk_size=5000):
+        member_ids.append(member_id)
+        metric_ids.append(metric_type_id)
+        days.append((recorded_date - start).days)
+        values.append(float(value))
+
+    series = BACKENDS[backend or default_backend()](member_ids, metric_ids, days, values)
+    per_member = {}
+    for (member_id, metric_type_id), stats in series.items():
+        per_member.setdefault(member_id, {})[str(metric_type_id)] = stats
+    return per_member
+
+
+def build_period(period_type, day, backend=None):
+    """
+    Genera (o actualiza) los snapshots del período que contiene `day`.
+    Los snapshots de miembros que ya no tienen mediciones en el período se eliminan.
+
+    Returns:
+        int: Snapshots guardados
+    """
+    from .models import MetricSnapshot
+
+    start, end = period_bounds(period_type, day)
+    per_member = compute_period(start, end, backend)
+    now = timezone.now()
+
+    snapshots = [
+        MetricSnapshot(
+            member_id=member_id,
+            period_type=period_type,
+            period_start=start,
+            period_end=end,
+            metrics_data=metrics,
+            generated_at=now,
+        )
+        for member_id, metrics in per_member.items()
+    ]
+    with transaction.atomic():
+        MetricSnapshot.objects.bulk_create(
+            snapshots,
+            batch_size=1000,
+            update_conflicts=True,
+            unique_fields=['member', 'period_type', 'period_start'],
+            update_fields=['period_end', 'metrics_data', 'generated_at'],
+        )
+        # Lo que no se regeneró en esta pasada ya no tiene mediciones
+        MetricSnapshot.objects.filter(
+            period_type=period_type, period_start=start, generated_at__lt=now
+        ).delete()
+    return len(snapshots)
+
+
+def build_recent(today=None, period_types=PERIOD_TYPES, periods_back=1, backend=None):
+    """
+    Genera el período en curso y los `periods_back` anteriores de cada tipo
+    (el anterior se cierra con las mediciones cargadas tarde).
+
+    Returns:
+        int: Snapshots guardados
+    """
+    today = today or timezone.localdate()
+    total = 0
+    for period_type in period_types:
+        day = today
+        for _ in range(periods_back + 1):
+            total += build_period(period_type, day, backend)
+            day = previous_period(period_type, day)[0]
+    return total
+
+
+# ==================== LECTURA ====================
+
+def snapshot_series(member_id, metric_type_id, period_type, start, end):
+    """
+    Puntos (period_start, stats) de una métrica con snapshots de períodos
+    completos entre start y end (inclusive).
+    """
+    from .models import MetricSnapshot
+
+    key = str(metric_type_id)
+    rows = MetricSnapshot.objects.filter(
+        member_id=member_id,
+        period_type=period_type,
+        period_start__gte=start,
+        period_end__lte=end,
+    ).order_by('period_start').values_list('period_start', 'metrics_data')
+    return [(period_start, data[key]) for period_start, data in rows if key in data]
+
+
+def evolution_points(member_id, metric_type_id, period_type, start, end):
+    """
+    Un punto (inicio, stats) por período entre start y end (inclusive).
+
+    Los períodos completos salen de sus snapshots. Los que no tienen snapshot
+    para esta métrica (job iniciado tarde, una corrida perdida, mediciones
+    cargadas con fecha vieja) y el primer período, si empieza antes de start,
+    se calculan desde las mediciones en una consulta más; el período
+    recortado se fecha en start y no incluye mediciones anteriores.
+    """
+    from .models import AthleteMetric
+
+    first_start, first_end = period_bounds(period_type, start)
+    full_from = start if first_start == start else first_end + timedelta(days=1)
+
+    snapshot_points = dict(snapshot_series(member_id, metric_type_id, period_type, full_from, end))
+    if not snapshot_points:
+        return []
+
+    spans = []  # (fecha del punto, desde, hasta) a calcular desde las mediciones
+    if full_from > start:
+        spans.append((start, start, min(first_end, end)))
+    day = full_from
+    while True:
+        period_start, period_end = period_bounds(period_type, day)
+        if period_end > end:
+            break
+        if period_start not in snapshot_points:
+            spans.append((period_start, period_start, period_end))
+        day = period_end + timedelta(days=1)
+
+    raw_points = {}
+    if spans:
+        # Períodos faltantes consecutivos se piden como un solo rango
+        merged = []
+        for _, span_from, span_to in spans:
+            if merged and merged[-1][1] + timedelta(days=1) == span_from:
+                merged[-1][1] = span_to
+            else:
+                merged.append([span_from, span_to])
+        ranges = Q()
+        for span_from, span_to in merged:
+            ranges |= Q(recorded_date__gte=span_from, recorded_date__lte=span_to)
+        rows = AthleteMetric.objects.filter(
+            ranges, member_id=member_id, metric_type_id=metric_type_id
+        ).values_list('recorded_date', 'value')
+        values = {}
+        for recorded_date, value in rows:
+            label = next(label for label, span_from, span_to in spans if span_from <= recorded_date <= span_to)
+            values.setdefault(label, []).append(float(value))
+        raw_points = {
+            label: {
+                'count': len(ys), 'avg': _round(sum(ys) / len(ys)), 'min': _round(min(ys)), 'max': _round(max(ys)),
+            }
+            for label, ys in values.items()
+        }
+
+    return sorted({**snapshot_points, **raw_points}.items())
+
+
+def merge_stats(parts):
+    """
+    Combina estadísticas (avg, min, max, count) de tramos consecutivos, p. ej.
+    snapshots y el aggregate de las mediciones recientes.
+    """
+    parts = [part for part in parts if part and part['count']]
+    if not parts:
+        return {'avg': None, 'min': None, 'max': None, 'count': 0}
+    count = sum(part['count'] for part in parts)
+    return {
+        'avg': _round(sum(float(part['avg']) * part['count'] for part in parts) / count),
+        'min': _round(min(float(part['min']) for part in parts)),
+        'max': _round(max(float(part['max']) for part in parts)),
+        'count': count,
+    }
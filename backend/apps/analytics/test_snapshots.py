@@ -0,0 +1,213 @@
+"""
+Unit tests for metric snapshot generation.
+Tests verify period bounds, backend parity, bulk upserts and the snapshot-backed evolution endpoint.
+"""
+import pytest
+from datetime import date, timedelta
+from decimal import Decimal
+from django.utils import timezone
+from rest_framework.test import APIClient
+from apps.analytics import snapshots
+from apps.analytics.models import AthleteMetric, MetricSnapshot, MetricType
+from apps.members.models import Member
+from apps.users.models import User
+
+BACKENDS = sorted(snapshots.BACKENDS)
+
+
+def make_member(username):
+    user = User.objects.create_user(username=username, email=f'{username}@gym.com', password='x')
+    return Member.objects.create(user=user)
+
+
+def record(member, metric_type, day, value):
+    return AthleteMetric.objects.create(
+        member=member, metric_type=metric_type, recorded_date=day, value=Decimal(str(value))
+    )
+
+
+@pytest.fixture
+def weight(db):
+    return MetricType.objects.create(name='Peso', unit='kg')
+
+
+@pytest.mark.unit
+class TestPeriods:
+    """period_bounds() for each period type."""
+
+    @pytest.mark.parametrize('period_type, expected', [
+        ('weekly', (date(2025, 2, 10), date(2025, 2, 16))),
+        ('monthly', (date(2025, 2, 1), date(2025, 2, 28))),
+        ('quarterly', (date(2025, 1, 1), date(2025, 3, 31))),
+        ('yearly', (date(2025, 1, 1), date(2025, 12, 31))),
+    ])
+    def test_bounds(self, period_type, expected):
+        assert snapshots.period_bounds(period_type, date(2025, 2, 13)) == expected
+
+    def test_december_rolls_over(self):
+        assert snapshots.period_bounds('quarterly', date(2025, 11, 5)) == (date(2025, 10, 1), date(2025, 12, 31))
+        assert snapshots.previous_period('monthly', date(2025, 1, 5)) == (date(2024, 12, 1), date(2024, 12, 31))
+
+
+@pytest.mark.unit
+class TestSeriesStats:
+    """Both backends compute the same per-series statistics."""
+
+    SERIES = (
+        [1, 1, 1, 1, 2, 2, 3],
+        [7, 7, 9, 9, 7, 7, 7],
+        [0, 10, 0, 20, 3, 3, 5],
+        [80.0, 79.0, 10.0, 12.0, 55.5, 56.5, 42.0],
+    )
+
+    @pytest.mark.parametrize('backend', BACKENDS)
+    def test_stats(self, backend):
+        result = snapshots.BACKENDS[backend](*self.SERIES)
+
+        assert result[(1, 7)] == {'count': 2, 'avg': 79.5, 'min': 79.0, 'max': 80.0, 'last': 79.0, 'slope': -0.1}
+        assert result[(1, 9)]['slope'] == 0.1
+        # Mismo día: sin pendiente
+        assert result[(2, 7)]['slope'] == 0.0
+        assert result[(3, 7)]['count'] == 1
+
+    @pytest.mark.skipif('numpy' not in snapshots.BACKENDS, reason='numpy no instalado')
+    def test_backends_agree(self):
+        assert snapshots.BACKENDS['numpy'](*self.SERIES) == snapshots.BACKENDS['python'](*self.SERIES)
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+class TestBuildSnapshots:
+    """build_period() and build_recent()."""
+
+    @pytest.mark.parametrize('backend', BACKENDS)
+    def test_builds_one_snapshot_per_member(self, weight, backend):
+        ana, luis = make_member('ana'), make_member('luis')
+        for day, value in ((3, 70), (10, 69), (17, 68)):
+            record(ana, weight, date(2025, 3, day), value)
+        record(luis, weight, date(2025, 3, 5), 90)
+        record(luis, weight, date(2025, 4, 1), 91)
+
+        assert snapshots.build_period('monthly', date(2025, 3, 20), backend) == 2
+
+        snapshot = MetricSnapshot.objects.get(member=ana, period_type='monthly')
+        assert (snapshot.period_start, snapshot.period_end) == (date(2025, 3, 1), date(2025, 3, 31))
+        stats = snapshot.metrics_data[str(weight.pk)]
+        assert (stats['count'], stats['avg'], stats['last'], stats['slope']) == (3, 69.0, 68.0, round(-1 / 7, 4))
+        assert MetricSnapshot.objects.get(member=luis).metrics_data[str(weight.pk)]['count'] == 1
+
+    def test_rebuild_upserts_and_drops_stale(self, weight, django_assert_max_num_queries):
+        ana, luis = make_member('ana'), make_member('luis')
+        record(ana, weight, date(2025, 3, 3), 70)
+        stale = record(luis, weight, date(2025, 3, 3), 90)
+        snapshots.build_period('monthly', date(2025, 3, 3))
+
+        record(ana, weight, date(2025, 3, 4), 72)
+        stale.delete()
+        # Mediciones, upsert y borrado de los viejos, sin importar cuántos miembros haya
+        with django_assert_max_num_queries(6):
+            snapshots.build_period('monthly', date(2025, 3, 3))
+
+        assert list(MetricSnapshot.objects.values_list('member_id', flat=True)) == [ana.pk]
+        assert MetricSnapshot.objects.get().metrics_data[str(weight.pk)]['avg'] == 71.0
+
+    def test_build_recent_covers_current_and_previous_periods(self, weight):
+        ana = make_member('ana')
+        record(ana, weight, date(2025, 2, 20), 70)
+        record(ana, weight, date(2025, 3, 5), 71)
+
+        snapshots.build_recent(today=date(2025, 3, 6), period_types=['monthly'])
+
+        assert sorted(MetricSnapshot.objects.values_list('period_start', flat=True)) == [
+            date(2025, 2, 1), date(2025, 3, 1)
+        ]
+
+
+@pytest.mark.integration
+@pytest.mark.django_db
+class TestEvolution:
+    """GET /api/analytics/metrics/evolution/ reads snapshots for long ranges."""
+
+    def test_long_range_uses_snapshots_and_recent_rows(self, weight, settings):
+        settings.ANALYTICS_RAW_DAYS = 30
+        member = make_member('ana')
+        today = timezone.localdate()
+        old_day = snapshots.period_bounds('weekly', today - timedelta(days=200))[0]
+        record(member, weight, old_day, 80)
+        record(member, weight, old_day + timedelta(days=1), 82)
+        record(member, weight, today - timedelta(days=2), 75)
+        snapshots.build_period('weekly', old_day)
+        # Una medición vieja sin snapshot regenerado no se lee: el tramo viejo sale del snapshot
+        record(member, weight, old_day + timedelta(days=2), 1000)
+        client = APIClient()
+        client.force_authenticate(member.user)
+
+        response = client.get('/api/analytics/metrics/evolution/', {
+            'member_id': member.pk, 'metric_type': weight.pk, 'days': 365
+        })
+
+        assert response.status_code == 200
+        assert response.data['resolution']['snapshots'] == 'weekly'
+        assert response.data['values'] == [81.0, 75.0]
+        assert response.data['stats'] == {'avg': 79.0, 'min': 75.0, 'max': 82.0, 'count': 3}
+
+    def test_without_snapshots_falls_back_to_rows(self, weight, settings):
+        settings.ANALYTICS_RAW_DAYS = 30
+        member = make_member('ana')
+        record(member, weight, timezone.localdate() - timedelta(days=200), 80)
+        client = APIClient()
+        client.force_authenticate(member.user)
+
+        response = client.get('/api/analytics/metrics/evolution/', {
+            'member_id': member.pk, 'metric_type': weight.pk, 'days': 365
+        })
+
+        assert response.data['resolution']['snapshots'] is None
+        assert response.data['values'] == [80.0]
+
+    def test_periods_without_snapshot_come_from_rows(self, weight, settings):
+        settings.ANALYTICS_RAW_DAYS = 30
+        member = make_member('ana')
+        today = timezone.localdate()
+        covered = snapshots.period_bounds('weekly', today - timedelta(days=200))[0]
+        missed = covered + timedelta(days=14)
+        record(member, weight, covered, 80)
+        snapshots.build_period('weekly', covered)
+        # El job no corrió para esta semana
+        record(member, weight, missed, 90)
+        record(member, weight, missed + timedelta(days=1), 92)
+        client = APIClient()
+        client.force_authenticate(member.user)
+
+        response = client.get('/api/analytics/metrics/evolution/', {
+            'member_id': member.pk, 'metric_type': weight.pk, 'days': 365
+        })
+
+        assert response.data['dates'] == [covered.isoformat(), missed.isoformat()]
+        assert response.data['values'] == [80.0, 91.0]
+        assert response.data['stats']['count'] == 3
+
+    def test_first_period_is_clipped_to_the_range(self, weight, settings):
+        settings.ANALYTICS_RAW_DAYS = 30
+        member = make_member('ana')
+        today = timezone.localdate()
+        week_start = snapshots.period_bounds('weekly', today - timedelta(days=300))[0]
+        date_from = week_start + timedelta(days=3)
+        next_week = week_start + timedelta(days=7)
+        record(member, weight, week_start, 50)
+        record(member, weight, date_from, 70)
+        record(member, weight, next_week, 72)
+        snapshots.build_period('weekly', week_start)
+        snapshots.build_period('weekly', next_week)
+        client = APIClient()
+        client.force_authenticate(member.user)
+
+        response = client.get('/api/analytics/metrics/evolution/', {
+            'member_id': member.pk, 'metric_type': weight.pk, 'days': (today - date_from).days
+        })
+
+        # La medición anterior a date_from no entra aunque sea de la misma semana
+        assert response.data['resolution']['snapshots'] == 'weekly'
+        assert response.data['dates'] == [date_from.isoformat(), next_week.isoformat()]
+        assert response.data['values'] == [70.0, 72.0]
+        assert response.data['stats']['count'] == 2
@@ -4,6 +4,7 @@ ViewSets para Analytics del Atleta
 from rest_framework import viewsets, permissions
 from rest_framework.decorators import action
 from rest_framework.response import Response
+from django.conf import settings
 from django.db.models import Avg, Min, Max, Count
 from django.utils import timezone
 from datetime import timedelta
@@ -16,6 +17,9 @@ from .serializers import (
     PerformanceGoalSerializer, TrainingLogSerializer, GymSettingsSerializer,
     AuditLogSerializer
 )
+from .snapshots import evolution_points, merge_stats, period_bounds
+from apps.common import timeseries
+from apps.common.pagination import KeysetPagination
 
 
 class MetricTypeViewSet(viewsets.ModelViewSet):
@@ -28,6 +32,8 @@ class AthleteMetricViewSet(viewsets.ModelViewSet):
     queryset = AthleteMetric.objects.all()
     serializer_class = AthleteMetricSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = KeysetPagination
+    cursor_ordering = '-recorded_date'
     
     def get_queryset(self):
         user = self.request.user
@@ -48,38 +54,82 @@ class AthleteMetricViewSet(viewsets.ModelViewSet):
     
     @action(detail=False, methods=['get'])
     def evolution(self, request):
-        """Obtener evolución de una métrica para gráficas"""
+        """
+        Obtener evolución de una métrica para gráficas
+        
+        Los últimos ANALYTICS_RAW_DAYS días salen de las mediciones; para rangos
+        más largos lo anterior sale de los snapshots (un punto por semana o por
+        mes, con el promedio del período), sin recorrer las mediciones viejas.
+        El tramo de mediciones se reduce según ?resolution= y ?max_points=
+        (ver apps/common/timeseries.py).
+        """
         member_id = request.query_params.get('member_id')
         metric_type_id = request.query_params.get('metric_type')
-        days = int(request.query_params.get('days', 90))
+        try:
+            days = int(request.query_params.get('days', 90))
+        except ValueError:
+            return Response({'error': 'days debe ser un número'}, status=400)
+        try:
+            resolution, max_points = timeseries.parse_params(request.query_params)
+        except ValueError as exc:
+            return Response({'error': str(exc)}, status=400)
         
         if not member_id or not metric_type_id:
             return Response({'error': 'member_id y metric_type requeridos'}, status=400)
         
-        date_from = timezone.now().date() - timedelta(days=days)
+        today = timezone.localdate()
+        date_from = today - timedelta(days=days)
+        period_type = None
+        points = []
+        raw_from = date_from
+        
+        if days > settings.ANALYTICS_RAW_DAYS:
+            period_type = 'weekly' if days <= settings.ANALYTICS_WEEKLY_MAX_DAYS else 'monthly'
+            raw_from = period_bounds(period_type, today - timedelta(days=settings.ANALYTICS_RAW_DAYS))[0]
+            # Períodos sin snapshot se completan desde las mediciones; el primero se recorta a date_from
+            points = evolution_points(
+                member_id, metric_type_id, period_type, date_from, raw_from - timedelta(days=1)
+            )
+            if not points:
+                # Sin snapshots (aún no generados o sin mediciones viejas): todo desde las mediciones
+                period_type, raw_from = None, date_from
         
         metrics = AthleteMetric.objects.filter(
             member_id=member_id,
             metric_type_id=metric_type_id,
-            recorded_date__gte=date_from
-        ).order_by('recorded_date')
+            recorded_date__gte=raw_from
+        )
+        # Los snapshots ya están acotados (uno por período); el resto del presupuesto es para las mediciones
+        raw, bucket = timeseries.series(
+            metrics, 'recorded_date', [timeseries.Column('values', 'value')],
+            resolution, max(max_points - len(points), 3)
+        )
+        raw_stats = metrics.aggregate(
+            avg=Avg('value'),
+            min=Min('value'),
+            max=Max('value'),
+            count=Count('id')
+        )
+        
+        stats = merge_stats([point for _, point in points] + [raw_stats]) if points else raw_stats
         
         data = {
-            'dates': [m.recorded_date.isoformat() for m in metrics],
-            'values': [float(m.value) for m in metrics],
-            'stats': metrics.aggregate(
-                avg=Avg('value'),
-                min=Min('value'),
-                max=Max('value'),
-                count=Count('id')
-            )
+            'dates': [start.isoformat() for start, _ in points] + raw['dates'],
+            'values': [point['avg'] for _, point in points] + raw['values'],
+            'stats': stats,
+            'resolution': {
+                'snapshots': period_type,
+                'raw_from': raw_from.isoformat(),
+                'bucket': bucket,
+            },
         }
         
         return Response(data)
 
 
 class MetricSnapshotViewSet(viewsets.ModelViewSet):
-    queryset = MetricSnapshot.objects.all()
+    # member_name sale de member.user
+    queryset = MetricSnapshot.objects.select_related('member__user')
     serializer_class = MetricSnapshotSerializer
     permission_classes = [permissions.IsAuthenticated]
 
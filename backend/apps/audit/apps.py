@@ -10,5 +10,11 @@ class AuditConfig(AppConfig):
     verbose_name = 'Auditoría y Logs'
     
     def ready(self):
-        """Import signal handlers when app is ready."""
-        import apps.audit.signals  # noqa
+        """Connect signal handlers when app is ready."""
+        from apps.audit.signals import connect_signals
+        connect_signals()
+        from django.conf import settings
+        from .performance import install_serializer_timer
+
+        if getattr(settings, 'PERFORMANCE_MONITORING', True):
+            install_serializer_timer()
@@ -1,14 +1,22 @@
 """
 Audit Middleware
-Captures HTTP request context for audit logging
+Captures HTTP request context for audit logging, and per-request performance
 """
+import time
+from contextlib import ExitStack
+
+from django.db import connections
+
+from . import performance
 from .utils import set_current_request, clear_current_request
+from .writer import flush
 
 
 class AuditMiddleware:
     """
     Middleware to store the current request in thread-local storage.
     This allows signal handlers to access request information like IP and user agent.
+    Audit entries committed during the request are written in one batch at the end.
     """
     
     def __init__(self, get_response):
@@ -21,7 +29,42 @@ class AuditMiddleware:
         try:
             response = self.get_response(request)
         finally:
+            # Write the audit entries buffered during this request
+            flush()
             # Clear request from thread-local storage
             clear_current_request()
         
         return response
+
+
+class PerformanceMiddleware:
+    """
+    Companion to AuditMiddleware: profiles each request (see apps/audit/performance.py).
+    Placed before it so the audit flush is part of the measured time.
+    Disabled with PERFORMANCE_MONITORING = False.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not performance.is_enabled():
+            return self.get_response(request)
+
+        profile = performance.start()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(profile))
+                response = self.get_response(request)
+                # DRF renders lazily; render here so JSON encoding is inside the measurement
+                if hasattr(response, 'render') and not getattr(response, 'is_rendered', True):
+                    response.render()
+        finally:
+            performance.stop()
+
+        total_ms = (time.perf_counter() - profile.started) * 1000
+        if performance.exposes_server_timing(request):
+            response['Server-Timing'] = performance.server_timing(profile, total_ms)
+        performance.record(request, response, profile, total_ms)
+        return response
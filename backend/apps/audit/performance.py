@@ -0,0 +1,282 @@
+"""
+Request performance profiling
+Per-request wall time, query count, DB time, duplicate queries and serializer time
+
+PerformanceMiddleware (apps/audit/middleware.py) opens a RequestProfile for
+each request and installs a connection.execute_wrapper that times every
+query. At the end of the request:
+
+- Server-Timing headers are added for DEBUG or staff users (browser network panel)
+- Per-endpoint aggregates are updated (requests, time, queries, SQL fingerprints)
+- Requests slower than PERFORMANCE_SLOW_REQUEST_MS go to a ring buffer
+
+Everything is kept in process memory: each worker reports its own traffic,
+and a restart clears it. GET /api/audit/performance/ reads it.
+"""
+import re
+import threading
+import time
+from collections import Counter, defaultdict, deque
+
+from django.conf import settings
+from django.utils import timezone
+
+DEFAULT_SLOW_REQUEST_MS = 500
+DEFAULT_BUFFER_SIZE = 200
+# SQL fingerprints kept per endpoint; new ones beyond this are not tracked
+MAX_FINGERPRINTS = 50
+TOP_QUERIES = 5
+
+_local = threading.local()
+_lock = threading.Lock()
+_slow_requests = deque(maxlen=DEFAULT_BUFFER_SIZE)
+_endpoints = {}
+
+_NUMBER = re.compile(r'\b\d+(\.\d+)?\b')
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_IN_LIST = re.compile(r'\((?:\s*(?:%s|\?)\s*,)+\s*(?:%s|\?)\s*\)')
+_SPACES = re.compile(r'\s+')
+_ROUTE_GROUP = re.compile(r'\(\?P<(\w+)>[^)]*\)')
+
+
+def is_enabled():
+    return getattr(settings, 'PERFORMANCE_MONITORING', True)
+
+
+def get_slow_request_ms():
+    return getattr(settings, 'PERFORMANCE_SLOW_REQUEST_MS', DEFAULT_SLOW_REQUEST_MS)
+
+
+def fingerprint(sql):
+    """
+    Normalize a query so executions that differ only in values match.
+
+    Parameters are already placeholders; literals inlined by the ORM (LIMIT,
+    quoted strings) and IN lists of any length are collapsed too.
+    """
+    sql = _STRING.sub('?', sql)
+    sql = _NUMBER.sub('?', sql)
+    sql = _IN_LIST.sub('(...)', sql)
+    return _SPACES.sub(' ', sql).strip()
+
+
+def endpoint_name(request):
+    """'GET api/members/{pk}/' from the resolved URL pattern (ids and paths with the same route group together)."""
+    match = getattr(request, 'resolver_match', None)
+    if match is None:
+        return f'{request.method} (unresolved)'
+    route = _ROUTE_GROUP.sub(lambda m: '{%s}' % m.group(1), match.route)
+    return f'{request.method} {route.replace("^", "").replace("$", "")}'
+
+
+class RequestProfile:
+    """Measurements of the request being served in this thread."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.queries = []  # (fingerprint, ms)
+        self.serializer_ms = 0.0
+        self.serializer_depth = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        """connection.execute_wrapper hook: times the query and keeps its fingerprint."""
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries.append((fingerprint(sql), (time.perf_counter() - started) * 1000))
+
+    @property
+    def db_ms(self):
+        return sum(ms for _, ms in self.queries)
+
+    def duplicates(self):
+        """{fingerprint: executions} for queries run more than once (N+1 candidates)."""
+        counts = Counter(sql for sql, _ in self.queries)
+        return {sql: count for sql, count in counts.items() if count > 1}
+
+
+def start():
+    profile = RequestProfile()
+    _local.profile = profile
+    return profile
+
+
+def stop():
+    _local.profile = None
+
+
+def current():
+    return getattr(_local, 'profile', None)
+
+
+def exposes_server_timing(request):
+    """
+    Server-Timing reveals query counts and DB time: only in DEBUG or to Django staff users.
+
+    Checked after the view so DRF has already authenticated the user (JWT included).
+    """
+    if settings.DEBUG:
+        return True
+    user = getattr(request, 'user', None)
+    return bool(user and user.is_authenticated and user.is_staff)
+
+
+def server_timing(profile, total_ms):
+    """Server-Timing header value: total, db (with query count) and serializer."""
+    duplicated = sum(count - 1 for count in profile.duplicates().values())
+    return (
+        f'total;dur={total_ms:.1f}, '
+        f'db;dur={profile.db_ms:.1f};desc="{len(profile.queries)} queries, {duplicated} duplicated", '
+        f'serializer;dur={profile.serializer_ms:.1f}'
+    )
+
+
+def record(request, response, profile, total_ms):
+    """Add the request to the endpoint aggregates and, if slow, to the ring buffer."""
+    endpoint = endpoint_name(request)
+    duplicates = profile.duplicates()
+    per_query = defaultdict(float)
+    for sql, ms in profile.queries:
+        per_query[sql] += ms
+    slow = total_ms >= get_slow_request_ms()
+
+    with _lock:
+        stats = _endpoints.setdefault(endpoint, {
+            'requests': 0, 'slow_requests': 0, 'total_ms': 0.0, 'max_ms': 0.0,
+            'db_ms': 0.0, 'queries': 0, 'max_queries': 0, 'serializer_ms': 0.0, 'fingerprints': {},
+        })
+        stats['requests'] += 1
+        stats['slow_requests'] += slow
+        stats['total_ms'] += total_ms
+        stats['max_ms'] = max(stats['max_ms'], total_ms)
+        stats['db_ms'] += profile.db_ms
+        stats['queries'] += len(profile.queries)
+        stats['max_queries'] = max(stats['max_queries'], len(profile.queries))
+        stats['serializer_ms'] += profile.serializer_ms
+        for sql, ms in per_query.items():
+            query = stats['fingerprints'].get(sql)
+            if query is None:
+                if len(stats['fingerprints']) >= MAX_FINGERPRINTS:
+                    continue
+                query = stats['fingerprints'][sql] = {
+                    'executions': 0, 'total_ms': 0.0, 'duplicated_requests': 0, 'max_per_request': 0,
+                }
+            executions = duplicates.get(sql, 1)
+            query['executions'] += executions
+            query['total_ms'] += ms
+            query['duplicated_requests'] += executions > 1
+            query['max_per_request'] = max(query['max_per_request'], executions)
+
+        if slow:
+            if _slow_requests.maxlen != _buffer_size():
+                _resize(_buffer_size())
+            _slow_requests.append({
+                'timestamp': timezone.now().isoformat(),
+                'endpoint': endpoint,
+                'path': request.get_full_path(),
+                'status': response.status_code,
+                'total_ms': round(total_ms, 1),
+                'db_ms': round(profile.db_ms, 1),
+                'serializer_ms': round(profile.serializer_ms, 1),
+                'queries': len(profile.queries),
+                'duplicates': [
+                    {'sql': sql, 'count': count}
+                    for sql, count in sorted(duplicates.items(), key=lambda item: -item[1])
+                ],
+                'slowest_queries': [
+                    {'sql': sql, 'ms': round(ms, 2)}
+                    for sql, ms in sorted(per_query.items(), key=lambda item: -item[1])[:TOP_QUERIES]
+                ],
+            })
+
+
+def _buffer_size():
+    return getattr(settings, 'PERFORMANCE_BUFFER_SIZE', DEFAULT_BUFFER_SIZE)
+
+
+def _resize(size):
+    global _slow_requests
+    _slow_requests = deque(_slow_requests, maxlen=size)
+
+
+# ==================== SERIALIZER TIMING ====================
+
+def _timed_data(original):
+    """Wrap BaseSerializer.data so time spent building response data is charged to the request."""
+
+    def data(self):
+        profile = current()
+        if profile is None:
+            return original.fget(self)
+        profile.serializer_depth += 1
+        started = time.perf_counter()
+        try:
+            return original.fget(self)
+        finally:
+            profile.serializer_depth -= 1
+            # Nested serializers called from a SerializerMethodField are already inside the outer timer
+            if profile.serializer_depth == 0:
+                profile.serializer_ms += (time.perf_counter() - started) * 1000
+
+    data._performance_timed = True
+    return property(data)
+
+
+def install_serializer_timer():
+    """Patch rest_framework's BaseSerializer.data once (called from AuditConfig.ready)."""
+    from rest_framework.serializers import BaseSerializer
+
+    if not getattr(BaseSerializer.data.fget, '_performance_timed', False):
+        BaseSerializer.data = _timed_data(BaseSerializer.data)
+
+
+# ==================== READING ====================
+
+def get_endpoints(order_by='total_ms', limit=20, fingerprints=5):
+    """
+    Endpoints sorted by the given aggregate, with their most duplicated query patterns.
+
+    Args:
+        order_by: 'avg_ms', 'max_ms', 'total_ms', 'avg_queries' or 'duplicates'
+        limit: Endpoints to return
+        fingerprints: Query patterns per endpoint, most duplicated first
+    """
+    with _lock:
+        snapshot = [(name, dict(stats), dict(stats['fingerprints'])) for name, stats in _endpoints.items()]
+
+    rows = []
+    for name, stats, queries in snapshot:
+        requests = stats['requests']
+        patterns = sorted(
+            ({'sql': sql, **query, 'total_ms': round(query['total_ms'], 1)} for sql, query in queries.items()),
+            key=lambda query: (-query['duplicated_requests'], -query['max_per_request'], -query['total_ms']),
+        )
+        rows.append({
+            'endpoint': name,
+            'requests': requests,
+            'slow_requests': stats['slow_requests'],
+            'avg_ms': round(stats['total_ms'] / requests, 1),
+            'max_ms': round(stats['max_ms'], 1),
+            'total_ms': round(stats['total_ms'], 1),
+            'avg_db_ms': round(stats['db_ms'] / requests, 1),
+            'avg_serializer_ms': round(stats['serializer_ms'] / requests, 1),
+            'avg_queries': round(stats['queries'] / requests, 1),
+            'max_queries': stats['max_queries'],
+            'duplicates': sum(query['duplicated_requests'] for query in queries.values()),
+            'query_patterns': patterns[:fingerprints],
+        })
+    rows.sort(key=lambda row: -row[order_by])
+    return rows[:limit]
+
+
+def get_slow_requests(limit=50):
+    """Most recent slow requests first."""
+    with _lock:
+        return list(reversed(_slow_requests))[:limit]
+
+
+def reset():
+    with _lock:
+        _endpoints.clear()
+        _slow_requests.clear()
@@ -1,96 +1,122 @@
 """
 Django signals for automatic audit logging
 """
+from collections import defaultdict
+
+from django.apps import apps
+from django.db.models import prefetch_related_objects
 from django.db.models.signals import post_save, post_delete
 from django.contrib.auth.signals import user_logged_in, user_logged_out, user_login_failed
 from django.dispatch import receiver
 from django.utils import timezone
+from apps.common import bulk
 from .models import AuditLog, UserSession
 from .utils import (
+    AUDITED_MODELS,
+    build_log_entry,
     log_action, 
     get_model_changes, 
-    get_model_name, 
-    should_log_model,
+    get_model_name,
     get_current_request,
     get_client_ip,
     get_user_agent
 )
+from .writer import enqueue, enqueue_many
+from .tracking import reset_snapshot
+
+
+def connect_signals():
+    """
+    Connect the save/delete receivers to the audited models only.
+    
+    Unrelated models (AuditLog, notifications, rollups...) pay no dispatch cost.
+    """
+    for label in AUDITED_MODELS:
+        model = apps.get_model(label)
+        bulk.connect(post_save, log_model_save, sender=model, dispatch_uid=f'audit_{label}_save')
+        bulk.connect(post_delete, log_model_delete, sender=model, dispatch_uid=f'audit_{label}_delete')
 
 
-# Track instances before save to detect changes
-_pre_save_instances = {}
+def get_request_user(request):
+    return request.user if request and request.user.is_authenticated else None
 
 
-@receiver(post_save)
-def log_model_save(sender, instance, created, **kwargs):
+def log_model_save(sender, instance, created, update_fields=None, **kwargs):
     """
-    Automatically log CREATE and UPDATE actions for important models.
-    """
-    model_name = get_model_name(instance)
-    
-    # Skip audit log itself to prevent recursion
-    if model_name == 'AuditLog' or model_name == 'UserSession':
-        return
-    
-    # Only log specific models
-    if not should_log_model(model_name):
-        return
-    
-    # Get the user from request context
-    request = get_current_request()
-    user = request.user if request and request.user.is_authenticated else None
+    Automatically log CREATE and UPDATE actions for audited models.
     
+    UPDATE diffs come from the snapshot taken when the instance was loaded
+    (AuditTrackedMixin), so no extra SELECT is issued.
+    """
     # Determine action and changes
     if created:
         action = 'CREATE'
         changes = None
     else:
         action = 'UPDATE'
-        # Try to get the old instance from cache
-        cache_key = f"{model_name}_{instance.pk}"
-        old_instance = _pre_save_instances.get(cache_key)
-        changes = get_model_changes(instance, old_instance)
-        
-        # Clean up cache
-        if cache_key in _pre_save_instances:
-            del _pre_save_instances[cache_key]
+        changes = get_model_changes(instance, update_fields=update_fields)
+    
+    # The saved state is the baseline for the next save of this instance
+    reset_snapshot(instance, update_fields)
+    
+    # Inside a bulk operation the entry is written with the rest of the batch
+    operation = bulk.current()
+    if operation is not None:
+        operation.defer(flush_bulk_entries, (action, instance, changes, None))
+        return
     
     # Log the action
     log_action(
-        user=user,
+        user=get_request_user(get_current_request()),
         action=action,
         obj=instance,
         changes=changes
     )
 
 
-@receiver(post_delete)
 def log_model_delete(sender, instance, **kwargs):
     """
     Automatically log DELETE actions.
     """
-    model_name = get_model_name(instance)
-    
-    # Skip audit log itself
-    if model_name == 'AuditLog' or model_name == 'UserSession':
-        return
-    
-    # Only log specific models
-    if not should_log_model(model_name):
+    operation = bulk.current()
+    if operation is not None:
+        # The Collector clears instance.pk after the delete and related rows may be
+        # gone by the time the batch is written: keep id and repr from now
+        operation.defer(flush_bulk_entries, ('DELETE', instance, None, (instance.pk, str(instance)[:255])))
         return
     
-    # Get the user from request context
-    request = get_current_request()
-    user = request.user if request and request.user.is_authenticated else None
-    
     # Log the deletion
     log_action(
-        user=user,
+        user=get_request_user(get_current_request()),
         action='DELETE',
         obj=instance
     )
 
 
+def flush_bulk_entries(operation, items):
+    """Write the entries deferred by a bulk operation with a single commit hook."""
+    # object_repr reads related objects: load them per model, not per row
+    by_model = defaultdict(list)
+    for _, instance, _, deleted in items:
+        if deleted is None:
+            by_model[type(instance)].append(instance)
+    for model, instances in by_model.items():
+        relations = AUDITED_MODELS.get(model._meta.label, ())
+        if relations:
+            prefetch_related_objects(instances, *relations)
+    
+    request = get_current_request()
+    user = operation.user or get_request_user(request)
+    entries = []
+    for action, instance, changes, deleted in items:
+        entry = build_log_entry(request, user, action, obj=None if deleted else instance, changes=changes)
+        if deleted:
+            entry.model_name = get_model_name(instance)
+            entry.object_id, entry.object_repr = deleted
+        entries.append(entry)
+    enqueue_many(entries)
+
+
 @receiver(user_logged_in)
 def log_user_login(sender, request, user, **kwargs):
     """
@@ -160,7 +186,7 @@ def log_failed_login(sender, credentials, request, **kwargs):
     user_agent = get_user_agent(request)
     
     # Log failed login
-    AuditLog.objects.create(
+    enqueue(AuditLog(
         user=None,  # No user since login failed
         action='FAILED_LOGIN',
         model_name='User',
@@ -172,7 +198,7 @@ def log_failed_login(sender, credentials, request, **kwargs):
         extra_data={
             'attempted_email': credentials.get('email', 'Unknown')
         }
-    )
+    ))
 
 
 # Custom signals for business logic
@@ -0,0 +1,144 @@
+"""
+Tests for request performance profiling.
+Tests verify Server-Timing headers, duplicate query detection, the slow request buffer and the admin endpoint.
+"""
+import pytest
+from rest_framework.test import APIClient
+
+from apps.audit import performance
+from apps.notifications.models import Notification
+from apps.users.models import Role, User
+
+URL = '/api/audit/performance/'
+
+
+@pytest.fixture(autouse=True)
+def fresh_profiles():
+    performance.reset()
+    yield
+    performance.reset()
+
+
+def make_user(username, role_name):
+    role, _ = Role.objects.get_or_create(name=role_name)
+    return User.objects.create_user(username=username, email=f'{username}@gym.com', password='x', role=role)
+
+
+def client_for(user):
+    client = APIClient()
+    client.force_authenticate(user)
+    return client
+
+
+@pytest.mark.unit
+class TestFingerprint:
+    """Queries that differ only in values share a fingerprint."""
+
+    def test_collapses_literals_and_in_lists(self):
+        first = performance.fingerprint('SELECT * FROM "members" WHERE "id" IN (%s, %s) LIMIT 21')
+        second = performance.fingerprint("SELECT  *  FROM \"members\" WHERE \"id\" IN (%s, %s, %s) LIMIT 5")
+
+        assert first == second == 'SELECT * FROM "members" WHERE "id" IN (...) LIMIT ?'
+
+    def test_keeps_identifiers_with_digits(self):
+        assert performance.fingerprint('SELECT "t1"."id" FROM "t1"') == 'SELECT "t1"."id" FROM "t1"'
+
+
+@pytest.mark.integration
+@pytest.mark.django_db
+class TestPerformanceMiddleware:
+    """PerformanceMiddleware measures every request."""
+
+    def test_server_timing_header(self, settings):
+        settings.DEBUG = True
+        user = make_user('ana', 'member')
+        Notification.objects.create(user=user, title='Aviso', message='-')
+
+        response = client_for(user).get('/api/notifications/')
+
+        timing = response['Server-Timing']
+        assert timing.startswith('total;dur=')
+        assert 'db;dur=' in timing and 'serializer;dur=' in timing
+        assert '2 queries, 0 duplicated' in timing
+
+    def test_server_timing_is_hidden_outside_debug(self):
+        member = make_user('ana', 'member')
+        staff = make_user('root', 'admin')
+        staff.is_staff = True
+        staff.save()
+
+        assert 'Server-Timing' not in client_for(member).get('/api/notifications/')
+        assert 'Server-Timing' not in APIClient().get('/api/notifications/')
+        assert 'Server-Timing' in client_for(staff).get('/api/notifications/')
+        # Los agregados se registran igual para todos
+        assert performance.get_endpoints()[0]['requests'] == 3
+
+    def test_aggregates_per_route_and_detects_duplicates(self):
+        admin = make_user('root', 'admin')
+        client = client_for(admin)
+        for i in range(3):
+            make_user(f'socio{i}', 'member')
+
+        client.get('/api/users/')
+        client.get('/api/users/')
+
+        endpoint = next(
+            row for row in performance.get_endpoints(order_by='duplicates')
+            if row['endpoint'] == 'GET api/users/'
+        )
+        assert endpoint['requests'] == 2
+        assert endpoint['avg_queries'] > 0
+        assert endpoint['avg_serializer_ms'] > 0
+        # UserSerializer hace consultas por fila: el patrón repetido queda primero
+        assert endpoint['duplicates'] >= 2
+        assert endpoint['query_patterns'][0]['max_per_request'] > 1
+
+    def test_slow_requests_go_to_the_ring_buffer(self, settings):
+        settings.PERFORMANCE_SLOW_REQUEST_MS = 0
+        settings.PERFORMANCE_BUFFER_SIZE = 2
+        client = client_for(make_user('ana', 'member'))
+
+        for _ in range(3):
+            client.get('/api/notifications/')
+
+        slow = performance.get_slow_requests()
+        assert len(slow) == 2
+        assert slow[0]['endpoint'] == 'GET api/notifications/'
+        assert slow[0]['queries'] > 0 and slow[0]['slowest_queries']
+
+    def test_disabled_adds_nothing(self, settings):
+        settings.PERFORMANCE_MONITORING = False
+
+        response = client_for(make_user('ana', 'member')).get('/api/notifications/')
+
+        assert 'Server-Timing' not in response
+        assert performance.get_endpoints() == []
+
+
+@pytest.mark.integration
+@pytest.mark.django_db
+class TestPerformanceEndpoint:
+    """GET /api/audit/performance/ is admin-only."""
+
+    def test_admin_sees_ranked_endpoints(self):
+        client = client_for(make_user('root', 'admin'))
+        client.get('/api/notifications/')
+
+        response = client.get(URL, {'order_by': 'max_ms'})
+
+        assert response.status_code == 200
+        assert [row['endpoint'] for row in response.data['endpoints']] == ['GET api/notifications/']
+        assert client.get(f'{URL}slow/').status_code == 200
+        assert client.get(URL, {'order_by': 'nope'}).status_code == 400
+
+    def test_reset_clears_profiles(self):
+        client = client_for(make_user('root', 'admin'))
+        client.get('/api/notifications/')
+
+        assert client.post(f'{URL}reset/').status_code == 204
+        # Solo queda la propia llamada a reset, registrada al terminar
+        assert [row['endpoint'] for row in performance.get_endpoints()] == ['POST api/audit/performance/reset/']
+
+    @pytest.mark.parametrize('role', ['member', 'trainer', 'staff'])
+    def test_other_roles_are_forbidden(self, role):
+        assert client_for(make_user('ana', role)).get(URL).status_code == 403
@@ -0,0 +1,179 @@
+"""
+Tests for the audit pipeline.
+"""
+import pytest
+from django.db import transaction
+from django.test import RequestFactory
+
+from apps.audit import writer
+from apps.audit.models import AuditLog
+from apps.audit.utils import log_action, set_current_request, clear_current_request
+
+
+@pytest.fixture
+def fresh_stats():
+    writer.reset_stats()
+    writer.discard()
+    yield
+    writer.discard()
+    writer.reset_stats()
+
+
+@pytest.fixture
+def in_request():
+    """Simulate an active request so entries stay buffered until flush()."""
+    set_current_request(RequestFactory().get('/'))
+    yield
+    clear_current_request()
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+class TestAuditWriterSyncMode:
+    """AUDIT_LOG_MODE = 'sync'."""
+
+    def test_log_action_writes_immediately(self, fresh_stats):
+        entry = log_action(user=None, action='VIEW')
+
+        assert entry.pk is not None
+        assert AuditLog.objects.filter(action='VIEW').count() == 1
+        assert writer.get_stats()['written'] == 1
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+class TestAuditWriterBufferedMode:
+    """AUDIT_LOG_MODE = 'buffered'."""
+
+    @pytest.fixture(autouse=True)
+    def buffered(self, settings):
+        settings.AUDIT_LOG_MODE = 'buffered'
+
+    def test_entries_wait_for_commit(self, fresh_stats, in_request, django_capture_on_commit_callbacks):
+        with django_capture_on_commit_callbacks(execute=False) as callbacks:
+            log_action(user=None, action='CREATE')
+            log_action(user=None, action='UPDATE')
+
+        assert len(callbacks) == 2
+        assert AuditLog.objects.count() == 0
+        assert writer.get_stats()['pending'] == 0
+
+    def test_flush_writes_request_batch_in_one_query(
+        self, fresh_stats, in_request, django_capture_on_commit_callbacks, django_assert_num_queries
+    ):
+        with django_capture_on_commit_callbacks(execute=True):
+            for _ in range(5):
+                log_action(user=None, action='UPDATE')
+
+        assert AuditLog.objects.count() == 0
+        assert writer.get_stats()['pending'] == 5
+
+        with django_assert_num_queries(1):
+            assert writer.flush() == 5
+
+        stats = writer.get_stats()
+        assert AuditLog.objects.count() == 5
+        assert stats['last_flush_size'] == 5
+        assert stats['pending'] == 0
+
+    def test_rolled_back_savepoint_is_not_logged(self, fresh_stats, in_request, django_capture_on_commit_callbacks):
+        with django_capture_on_commit_callbacks(execute=True):
+            log_action(user=None, action='CREATE')
+            try:
+                with transaction.atomic():
+                    log_action(user=None, action='DELETE')
+                    raise ValueError('rollback')
+            except ValueError:
+                pass
+
+        writer.flush()
+
+        assert list(AuditLog.objects.values_list('action', flat=True)) == ['CREATE']
+
+    def test_without_request_entries_are_written_on_commit(self, fresh_stats, django_capture_on_commit_callbacks):
+        with django_capture_on_commit_callbacks(execute=True):
+            log_action(user=None, action='LOGOUT')
+
+        assert AuditLog.objects.filter(action='LOGOUT').count() == 1
+
+
+@pytest.mark.unit
+class TestAuditWriterBackpressure:
+    """Background writer queue limits."""
+
+    def test_full_queue_drops_and_counts(self, fresh_stats):
+        audit_writer = writer.AuditWriter(maxsize=1)  # Not started: nothing drains it
+
+        assert audit_writer.submit([AuditLog(action='VIEW')], timeout=0) is True
+        assert audit_writer.submit([AuditLog(action='VIEW'), AuditLog(action='VIEW')], timeout=0) is False
+
+        stats = writer.get_stats()
+        assert stats['queue_depth'] == 1
+        assert stats['dropped'] == 2
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+class TestAuditChangeTracking:
+    """UPDATE diffs come from the load-time snapshot, not from a SELECT."""
+
+    @pytest.fixture
+    def plan(self):
+        from apps.memberships.models import MembershipPlan
+        created = MembershipPlan.objects.create(name='Mensual', price='50.00', duration_days=30)
+        return MembershipPlan.objects.get(pk=created.pk)
+
+    def test_update_logs_changes_without_extra_queries(self, plan, django_assert_num_queries):
+        plan.price = '60.00'
+
+        # UPDATE + audit INSERT, no SELECT of the old row
+        with django_assert_num_queries(2):
+            plan.save()
+
+        log = AuditLog.objects.get(model_name='MembershipPlan', action='UPDATE')
+        assert log.changes['price'] == {'old': '50.00', 'new': '60.00'}
+
+    def test_update_fields_limits_the_diff(self, plan):
+        plan.price = '70.00'
+        plan.name = 'Mensual Plus'
+        plan.save(update_fields=['name'])
+
+        log = AuditLog.objects.get(model_name='MembershipPlan', action='UPDATE')
+        assert set(log.changes) == {'name'}
+
+        # The unsaved price change is still pending for the next diff
+        plan.save()
+        log = AuditLog.objects.filter(model_name='MembershipPlan', action='UPDATE').order_by('-id').first()
+        assert log.changes['price'] == {'old': '50.00', 'new': '70.00'}
+
+    def test_consecutive_saves_diff_against_last_save(self, plan):
+        plan.duration_days = 60
+        plan.save()
+        plan.duration_days = 90
+        plan.save()
+
+        log = AuditLog.objects.filter(model_name='MembershipPlan', action='UPDATE').order_by('-id').first()
+        assert log.changes['duration_days'] == {'old': '60', 'new': '90'}
+
+    def test_refresh_from_db_resets_the_baseline(self, plan):
+        from apps.memberships.models import MembershipPlan
+        MembershipPlan.objects.filter(pk=plan.pk).update(price='80.00', duration_days=45)
+
+        plan.refresh_from_db()
+        plan.name = 'Mensual Plus'
+        plan.save()
+
+        log = AuditLog.objects.get(model_name='MembershipPlan', action='UPDATE')
+        # updated_at (auto_now) always changes on a full save
+        assert set(log.changes) - {'updated_at'} == {'name'}
+
+    def test_refresh_of_some_fields_keeps_the_rest(self, plan):
+        from apps.memberships.models import MembershipPlan
+        MembershipPlan.objects.filter(pk=plan.pk).update(price='80.00')
+        plan.duration_days = 60
+
+        plan.refresh_from_db(fields=['price'])
+        plan.save()
+
+        log = AuditLog.objects.get(model_name='MembershipPlan', action='UPDATE')
+        assert set(log.changes) - {'updated_at'} == {'duration_days'}
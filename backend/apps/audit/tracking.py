@@ -0,0 +1,92 @@
+"""
+Field tracking for audited models
+Remembers the values loaded from the database so UPDATE diffs need no extra query
+"""
+import copy
+
+
+class AuditTrackedMixin:
+    """
+    Model mixin that snapshots field values when an instance is loaded.
+
+    The snapshot is keyed by attname (FKs are compared by id, so diffing
+    never touches related objects) and is refreshed after every save by
+    the audit post_save receiver.
+    """
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._audit_snapshot = {
+            name: _copy_value(value) for name, value in zip(field_names, values)
+        }
+        return instance
+
+    def refresh_from_db(self, using=None, fields=None, **kwargs):
+        """Reloaded values are the new baseline (also for deferred fields loaded on access)."""
+        super().refresh_from_db(using=using, fields=fields, **kwargs)
+
+        names = None if fields is None else set(fields)
+        snapshot = get_snapshot(self) or {}
+        deferred = self.get_deferred_fields()
+        for field in self._meta.concrete_fields:
+            if names is not None and field.name not in names and field.attname not in names:
+                continue
+            if field.attname not in deferred:
+                snapshot[field.attname] = _copy_value(getattr(self, field.attname))
+        self._audit_snapshot = snapshot
+
+
+def _copy_value(value):
+    # JSON fields can be mutated in place; keep our own copy
+    if isinstance(value, (dict, list)):
+        return copy.deepcopy(value)
+    return value
+
+
+def get_snapshot(instance):
+    """Return the tracked original values, or None if the instance is not tracked."""
+    return getattr(instance, '_audit_snapshot', None)
+
+
+def reset_snapshot(instance, update_fields=None):
+    """
+    Take the current field values as the new baseline (after a save).
+
+    With update_fields only those fields are refreshed: unsaved changes to
+    other fields must still show up in the next diff.
+    """
+    if not isinstance(instance, AuditTrackedMixin):
+        return
+
+    snapshot = get_snapshot(instance)
+    if snapshot is None or update_fields is None:
+        snapshot = {}
+        fields = instance._meta.concrete_fields
+    else:
+        fields = tracked_fields(instance, update_fields)
+
+    deferred = instance.get_deferred_fields()
+    for field in fields:
+        if field.attname not in deferred:
+            snapshot[field.attname] = _copy_value(getattr(instance, field.attname))
+    instance._audit_snapshot = snapshot
+
+
+def tracked_fields(instance, update_fields=None):
+    """
+    Fields that take part in the diff.
+
+    Args:
+        instance: Model instance
+        update_fields: Names passed to save(update_fields=...), if any
+    """
+    fields = []
+    for field in instance._meta.concrete_fields:
+        # Skip auto-generated fields and primary key
+        if field.auto_created or field.primary_key:
+            continue
+        if update_fields is not None and field.name not in update_fields and field.attname not in update_fields:
+            continue
+        fields.append(field)
+    return fields
@@ -3,11 +3,12 @@ URLs for Audit API
 """
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import AuditLogViewSet, UserSessionViewSet
+from .views import AuditLogViewSet, PerformanceViewSet, UserSessionViewSet
 
 router = DefaultRouter()
 router.register(r'logs', AuditLogViewSet, basename='auditlog')
 router.register(r'sessions', UserSessionViewSet, basename='usersession')
+router.register(r'performance', PerformanceViewSet, basename='performance')
 
 urlpatterns = [
     path('', include(router.urls)),
@@ -43,45 +43,47 @@ def get_user_agent(request):
     return request.META.get('HTTP_USER_AGENT', '')[:255]
 
 
-def get_model_changes(instance, old_instance=None):
+def get_model_changes(instance, old_instance=None, update_fields=None):
     """
-    Compare two model instances and return a dict of changes.
+    Compare a model instance with its previous state and return a dict of changes.
     
     Args:
         instance: Current instance
-        old_instance: Previous instance (if None, will try to fetch from DB)
+        old_instance: Previous instance (if None, the snapshot taken when the
+            instance was loaded is used; see apps.audit.tracking)
+        update_fields: Only diff these fields (as passed to save())
     
     Returns:
         dict: {field_name: {'old': old_value, 'new': new_value}}
+        None if nothing changed or the previous state is unknown.
+        Never queries the database.
     """
-    if old_instance is None:
-        # Try to fetch the old instance from database
-        try:
-            old_instance = instance.__class__.objects.get(pk=instance.pk)
-        except instance.__class__.DoesNotExist:
-            # This is a new instance
+    from .tracking import get_snapshot, tracked_fields
+    
+    if old_instance is not None:
+        old_values = {
+            field.attname: getattr(old_instance, field.attname, None)
+            for field in instance._meta.concrete_fields
+        }
+    else:
+        old_values = get_snapshot(instance)
+        if old_values is None:
+            # Not loaded from the DB (or model not tracked): nothing to compare
             return None
     
     changes = {}
     
-    # Get all fields except auto fields and relations
-    for field in instance._meta.fields:
-        field_name = field.name
-        
-        # Skip auto-generated fields
-        if field.auto_created:
-            continue
-        
-        # Skip primary key
-        if field.primary_key:
+    for field in tracked_fields(instance, update_fields):
+        # Deferred at load time: the original value is unknown
+        if field.attname not in old_values:
             continue
         
-        old_value = getattr(old_instance, field_name, None)
-        new_value = getattr(instance, field_name, None)
+        old_value = old_values[field.attname]
+        new_value = getattr(instance, field.attname, None)
         
         # Only record if changed
         if old_value != new_value:
-            changes[field_name] = {
+            changes[field.attname] = {
                 'old': str(old_value) if old_value is not None else None,
                 'new': str(new_value) if new_value is not None else None
             }
@@ -103,14 +105,26 @@ def log_action(user, action, obj=None, changes=None, extra_data=None, success=Tr
         error_message: Error message if failed
     
     Returns:
-        AuditLog instance
+        AuditLog instance (unsaved until the audit writer flushes it)
     """
-    from .models import AuditLog
+    from .writer import enqueue
     
-    # Get request context if available
-    request = get_current_request()
-    ip_address = get_client_ip(request) if request else None
-    user_agent = get_user_agent(request) if request else ''
+    entry = build_log_entry(
+        get_current_request(), user, action, obj=obj, changes=changes,
+        extra_data=extra_data, success=success, error_message=error_message,
+    )
+    
+    # Queue the log entry; it is written in batches after commit
+    return enqueue(entry)
+
+
+def build_log_entry(request, user, action, obj=None, changes=None, extra_data=None, success=True, error_message=''):
+    """
+    Build an unsaved AuditLog with the client info of the given request.
+    
+    Bulk operations resolve the request once and build every entry with it.
+    """
+    from .models import AuditLog
     
     # Prepare log data
     log_data = {
@@ -118,8 +132,8 @@ def log_action(user, action, obj=None, changes=None, extra_data=None, success=Tr
         'action': action,
         'changes': changes,
         'extra_data': extra_data,
-        'ip_address': ip_address,
-        'user_agent': user_agent,
+        'ip_address': get_client_ip(request) if request else None,
+        'user_agent': get_user_agent(request) if request else '',
         'success': success,
         'error_message': error_message,
     }
@@ -130,8 +144,24 @@ def log_action(user, action, obj=None, changes=None, extra_data=None, success=Tr
         log_data['object_id'] = obj.pk if hasattr(obj, 'pk') else None
         log_data['object_repr'] = str(obj)[:255]
     
-    # Create the log entry
-    return AuditLog.objects.create(**log_data)
+    return AuditLog(**log_data)
+
+
+# Models logged automatically on save/delete (receivers are connected per model),
+# with the relations their __str__ reads: bulk operations prefetch them for object_repr
+AUDITED_MODELS = {
+    'payments.Payment': ('member__user',),
+    'payments.Invoice': (),
+    'memberships.Membership': ('member__user', 'plan'),
+    'memberships.MembershipPlan': (),
+    'memberships.MembershipFreeze': ('membership__member__user', 'membership__plan'),
+    'members.Member': ('user',),
+    'classes.GymClass': (),
+    'classes.Reservation': ('member__user', 'gym_class'),
+    'users.User': (),
+    'staff.Staff': ('user',),
+    'access.AccessLog': ('member__user',),
+}
 
 
 def get_model_name(instance):
@@ -149,22 +179,7 @@ def should_log_model(model_name):
     Returns:
         bool: True if should be logged
     """
-    # Models to log
-    logged_models = [
-        'Payment',
-        'Invoice',
-        'Membership',
-        'MembershipPlan',
-        'MembershipFreeze',
-        'Member',
-        'GymClass',
-        'Reservation',
-        'User',
-        'Staff',
-        'AccessLog',
-    ]
-    
-    return model_name in logged_models
+    return model_name in {label.split('.')[1] for label in AUDITED_MODELS}
 
 
 def format_duration(duration):
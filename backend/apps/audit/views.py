@@ -3,6 +3,7 @@ ViewSets for Audit API
 """
 from rest_framework import viewsets, permissions, filters, status
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
 from django.db.models import Count, Q
 from django.utils import timezone
@@ -12,6 +13,10 @@ from .serializers import (
     AuditLogSerializer, AuditLogListSerializer,
     UserSessionSerializer, AuditStatsSerializer
 )
+from .writer import get_stats
+from . import performance
+from apps.common.permissions import is_admin
+from apps.common.pagination import KeysetPagination
 
 
 class IsAdminOrStaff(permissions.BasePermission):
@@ -21,6 +26,13 @@ class IsAdminOrStaff(permissions.BasePermission):
         return request.user and (request.user.is_staff or request.user.is_superuser)
 
 
+class IsAdmin(permissions.BasePermission):
+    """Only allow access to superusers and users with the admin role."""
+    
+    def has_permission(self, request, view):
+        return bool(request.user and request.user.is_authenticated and is_admin(request.user))
+
+
 class AuditLogViewSet(viewsets.ReadOnlyModelViewSet):
     """
     ViewSet for viewing audit logs.
@@ -32,6 +44,8 @@ class AuditLogViewSet(viewsets.ReadOnlyModelViewSet):
     filter_backends = [filters.OrderingFilter]
     ordering_fields = ['timestamp', 'action', 'model_name']
     ordering = ['-timestamp']
+    pagination_class = KeysetPagination
+    cursor_ordering = '-timestamp'
     
     def get_serializer_class(self):
         if self.action == 'list':
@@ -137,68 +151,27 @@ class AuditLogViewSet(viewsets.ReadOnlyModelViewSet):
         serializer = AuditStatsSerializer(stats_data)
         return Response(serializer.data)
     
+    @action(detail=False, methods=['get'])
+    def pipeline(self, request):
+        """Counters of the buffered audit writer (queue depth, flush sizes, drops)."""
+        return Response(get_stats())
+    
     @action(detail=False, methods=['get'])
     def export(self, request):
-        """Export audit logs to Excel."""
-        from openpyxl import Workbook
-        from openpyxl.styles import Font, Alignment, PatternFill
-        from django.http import HttpResponse
-        from datetime import datetime
+        """Export audit logs to Excel or CSV (?export_format=csv), streamed in chunks."""
+        from apps.reports.exports import export_response, get_export_format
+        from apps.reports.specs import AUDIT_LOG_COLUMNS
         
         # Get filtered queryset
         queryset = self.filter_queryset(self.get_queryset())
         
-        # Create workbook
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "Audit Logs"
-        
-        # Styles
-        header_fill = PatternFill(start_color="4F46E5", end_color="4F46E5", fill_type="solid")
-        header_font = Font(color="FFFFFF", bold=True)
-        
-        # Headers
-        headers = ['ID', 'Usuario', 'Acción', 'Modelo', 'Objeto', 'Timestamp', 'IP', 'Éxito']
-        ws.append(headers)
-        
-        # Apply style to headers
-        for cell in ws[1]:
-            cell.fill = header_fill
-            cell.font = header_font
-            cell.alignment = Alignment(horizontal='center')
-        
-        # Data
-        for log in queryset:
-            ws.append([
-                log.id,
-                log.user.get_full_name() if log.user else 'Sistema',
-                log.get_action_display(),
-                log.model_name,
-                log.object_repr,
-                log.timestamp.strftime('%Y-%m-%d %H:%M:%S'),
-                log.ip_address or '',
-                'Sí' if log.success else 'No'
-            ])
-        
-        # Adjust column widths
-        ws.column_dimensions['A'].width = 8
-        ws.column_dimensions['B'].width = 25
-        ws.column_dimensions['C'].width = 15
-        ws.column_dimensions['D'].width = 20
-        ws.column_dimensions['E'].width = 30
-        ws.column_dimensions['F'].width = 20
-        ws.column_dimensions['G'].width = 15
-        ws.column_dimensions['H'].width = 10
-        
-        # Prepare response
-        response = HttpResponse(
-            content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+        return export_response(
+            queryset,
+            AUDIT_LOG_COLUMNS,
+            'audit_logs',
+            export_format=get_export_format(request),
+            title='Audit Logs'
         )
-        filename = f'audit_logs_{datetime.now().strftime("%Y%m%d_%H%M%S")}.xlsx'
-        response['Content-Disposition'] = f'attachment; filename={filename}'
-        
-        wb.save(response)
-        return response
 
 
 class UserSessionViewSet(viewsets.ReadOnlyModelViewSet):
@@ -246,3 +219,44 @@ class UserSessionViewSet(viewsets.ReadOnlyModelViewSet):
         session.save()
         
         return Response({'detail': 'Sesión terminada exitosamente'})
+
+
+class PerformanceViewSet(viewsets.ViewSet):
+    """
+    Request profiling collected by PerformanceMiddleware in this worker process.
+    
+    list: endpoints ranked by ?order_by= (total_ms, avg_ms, max_ms, avg_queries,
+    duplicates) with their most duplicated query patterns.
+    slow: the slow request ring buffer, newest first.
+    """
+    
+    permission_classes = [IsAdmin]
+    ORDERINGS = ('total_ms', 'avg_ms', 'max_ms', 'avg_queries', 'duplicates')
+    
+    def _limit(self, request, default):
+        try:
+            return max(1, int(request.query_params.get('limit', default)))
+        except ValueError:
+            raise ValidationError({'limit': 'Debe ser un número entero'})
+    
+    def list(self, request):
+        order_by = request.query_params.get('order_by', 'total_ms')
+        if order_by not in self.ORDERINGS:
+            raise ValidationError({'order_by': f'Opciones: {", ".join(self.ORDERINGS)}'})
+        
+        return Response({
+            'enabled': performance.is_enabled(),
+            'slow_request_ms': performance.get_slow_request_ms(),
+            'endpoints': performance.get_endpoints(order_by=order_by, limit=self._limit(request, 20)),
+        })
+    
+    @action(detail=False, methods=['get'])
+    def slow(self, request):
+        """Slow requests with their duplicated and slowest queries."""
+        return Response(performance.get_slow_requests(limit=self._limit(request, 50)))
+    
+    @action(detail=False, methods=['post'])
+    def reset(self, request):
+        """Clear the aggregates and the slow request buffer."""
+        performance.reset()
+        return Response(status=status.HTTP_204_NO_CONTENT)
@@ -0,0 +1,258 @@
+"""
+Buffered audit log writer
+Collects audit entries and persists them in batches with bulk_create
+"""
+import atexit
+import logging
+import queue
+import threading
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+
+logger = logging.getLogger(__name__)
+
+# Write modes (settings.AUDIT_LOG_MODE)
+MODE_SYNC = 'sync'          # One INSERT per entry, immediately (tests, debugging)
+MODE_BUFFERED = 'buffered'  # Batched per request, written after commit
+MODE_ASYNC = 'async'        # Batched per request, written by a background thread
+
+DEFAULT_BATCH_SIZE = 500
+DEFAULT_QUEUE_MAXSIZE = 1000
+DEFAULT_PUT_TIMEOUT = 0.5
+
+# Per-thread buffer of entries whose transaction already committed
+_local = threading.local()
+
+_stats_lock = threading.Lock()
+_stats = {
+    'enqueued': 0,
+    'written': 0,
+    'flushes': 0,
+    'last_flush_size': 0,
+    'max_flush_size': 0,
+    'dropped': 0,
+    'queued': 0,
+}
+
+_writer = None
+_writer_lock = threading.Lock()
+
+
+def get_mode():
+    """Return the configured write mode."""
+    return getattr(settings, 'AUDIT_LOG_MODE', MODE_BUFFERED)
+
+
+def get_batch_size():
+    return getattr(settings, 'AUDIT_BATCH_SIZE', DEFAULT_BATCH_SIZE)
+
+
+def _incr(key, amount=1):
+    with _stats_lock:
+        _stats[key] += amount
+
+
+def _record_flush(size):
+    with _stats_lock:
+        _stats['flushes'] += 1
+        _stats['written'] += size
+        _stats['last_flush_size'] = size
+        _stats['max_flush_size'] = max(_stats['max_flush_size'], size)
+
+
+def _pending():
+    if not hasattr(_local, 'pending'):
+        _local.pending = []
+    return _local.pending
+
+
+def enqueue(entry):
+    """
+    Queue an unsaved AuditLog instance for writing.
+
+    In buffered/async modes the entry only reaches the buffer once the
+    surrounding transaction commits, so entries for rolled back writes
+    (including rolled back savepoints) are discarded automatically.
+
+    Returns:
+        The same AuditLog instance (without pk until it is flushed)
+    """
+    _incr('enqueued')
+
+    if get_mode() == MODE_SYNC:
+        entry.save()
+        _record_flush(1)
+        return entry
+
+    transaction.on_commit(lambda: _stage([entry]))
+    return entry
+
+
+def enqueue_many(entries):
+    """
+    Queue several unsaved AuditLog instances with a single commit hook.
+
+    Used by bulk operations (apps.common.bulk): in sync mode the whole set
+    is written with one bulk_create instead of one INSERT per entry.
+
+    Returns:
+        The list of entries
+    """
+    entries = list(entries)
+    if not entries:
+        return entries
+
+    _incr('enqueued', len(entries))
+
+    if get_mode() == MODE_SYNC:
+        _write(entries)
+        return entries
+
+    transaction.on_commit(lambda: _stage(entries))
+    return entries
+
+
+def _stage(entries):
+    """Move committed entries into the thread buffer."""
+    from .utils import get_current_request
+
+    pending = _pending()
+    pending.extend(entries)
+
+    # Outside a request (commands, shell) nobody flushes later, so write now.
+    if get_current_request() is None or len(pending) >= get_batch_size():
+        flush()
+
+
+def flush():
+    """
+    Write every buffered entry of the current thread.
+    Called by AuditMiddleware at the end of each request.
+
+    Returns:
+        int: Number of entries handed to the database or the writer thread
+    """
+    pending = _pending()
+    if not pending:
+        return 0
+
+    batch = list(pending)
+    pending.clear()
+
+    if get_mode() == MODE_ASYNC:
+        get_writer().submit(batch)
+    else:
+        _write(batch)
+    return len(batch)
+
+
+def discard():
+    """Drop the buffered entries of the current thread without writing them."""
+    pending = _pending()
+    count = len(pending)
+    pending.clear()
+    return count
+
+
+def _write(batch):
+    from .models import AuditLog
+
+    try:
+        AuditLog.objects.bulk_create(batch, batch_size=get_batch_size())
+    except Exception:
+        logger.exception('Could not write %s audit entries', len(batch))
+        _incr('dropped', len(batch))
+        return 0
+
+    _record_flush(len(batch))
+    return len(batch)
+
+
+class AuditWriter(threading.Thread):
+    """
+    Background thread that drains a bounded queue of audit batches.
+
+    When the queue is full, producers block for AUDIT_QUEUE_PUT_TIMEOUT
+    seconds (backpressure) and then drop the batch, counting it as dropped.
+    """
+
+    def __init__(self, maxsize=DEFAULT_QUEUE_MAXSIZE):
+        super().__init__(name='audit-writer', daemon=True)
+        self.queue = queue.Queue(maxsize=maxsize)
+
+    def submit(self, batch, timeout=None):
+        if timeout is None:
+            timeout = getattr(settings, 'AUDIT_QUEUE_PUT_TIMEOUT', DEFAULT_PUT_TIMEOUT)
+
+        try:
+            self.queue.put(batch, timeout=timeout)
+        except queue.Full:
+            logger.warning('Audit queue full, dropping %s entries', len(batch))
+            _incr('dropped', len(batch))
+            return False
+
+        _incr('queued', len(batch))
+        return True
+
+    def run(self):
+        while True:
+            batch = self.queue.get()
+
+            # Merge whatever else is waiting into one bulk insert
+            while len(batch) < get_batch_size():
+                try:
+                    batch.extend(self.queue.get_nowait())
+                    self.queue.task_done()
+                except queue.Empty:
+                    break
+
+            try:
+                _write(batch)
+            finally:
+                _incr('queued', -len(batch))
+                close_old_connections()
+                self.queue.task_done()
+
+    def drain(self):
+        """Block until every queued batch has been written."""
+        self.queue.join()
+
+
+def get_writer():
+    """Return the background writer, starting it on first use."""
+    global _writer
+
+    if _writer is None:
+        with _writer_lock:
+            if _writer is None:
+                writer = AuditWriter(
+                    maxsize=getattr(settings, 'AUDIT_QUEUE_MAXSIZE', DEFAULT_QUEUE_MAXSIZE)
+                )
+                writer.start()
+                atexit.register(writer.drain)
+                _writer = writer
+    return _writer
+
+
+def get_stats():
+    """
+    Pipeline counters for monitoring.
+
+    Returns:
+        dict: mode, queue depth (entries waiting for the writer thread),
+        pending entries in this thread, flush sizes and dropped entries
+    """
+    with _stats_lock:
+        data = dict(_stats)
+
+    data['mode'] = get_mode()
+    data['queue_depth'] = data.pop('queued')
+    data['pending'] = len(_pending())
+    return data
+
+
+def reset_stats():
+    with _stats_lock:
+        for key in _stats:
+            _stats[key] = 0
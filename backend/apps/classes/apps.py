@@ -5,3 +5,7 @@ class ClassesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.classes'
     verbose_name = 'Clases'
+    
+    def ready(self):
+        """Importar signals cuando la app esté lista"""
+        import apps.classes.signals  # noqa
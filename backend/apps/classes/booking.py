@@ -0,0 +1,167 @@
+"""
+Motor de reservas
+Reserva, cancela y promueve la lista de espera bajo un bloqueo de la fila de la clase
+"""
+from django.db import transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from apps.audit.tracking import reset_snapshot
+
+
+class BookingError(Exception):
+    """La reserva no se puede realizar (duplicada, clase cancelada, etc.)"""
+
+
+def _lock_class(gym_class_id):
+    """
+    Bloquea la fila de la clase hasta el final de la transacción.
+    Todas las operaciones sobre reservas de una misma clase se serializan aquí,
+    así que los contadores y las posiciones de espera leídos después son consistentes.
+    """
+    from .models import GymClass
+
+    return GymClass.objects.select_for_update().get(pk=gym_class_id)
+
+
+def _next_waitlist_position(gym_class):
+    from .models import Reservation
+
+    last = Reservation.objects.filter(
+        gym_class=gym_class,
+        status='waitlist'
+    ).aggregate(last=Max('waitlist_position'))['last']
+    return (last or 0) + 1
+
+
+def book(gym_class, member, **extra):
+    """
+    Reserva un cupo en la clase o, si está llena, agrega al miembro a la lista de espera.
+
+    Args:
+        gym_class: GymClass o su id
+        member: Member que reserva
+        extra: Otros campos de la reserva (p. ej. notas)
+
+    Returns:
+        Reservation: Reserva confirmada o en lista de espera
+
+    Raises:
+        BookingError: Si la clase está cancelada o el miembro ya tiene reserva activa
+    """
+    from .models import Reservation
+
+    gym_class_id = getattr(gym_class, 'pk', gym_class)
+
+    with transaction.atomic():
+        locked_class = _lock_class(gym_class_id)
+
+        if locked_class.is_cancelled:
+            raise BookingError('La clase está cancelada')
+
+        # Con la clase bloqueada, no puede aparecer otra reserva del mismo miembro
+        reservation = Reservation.objects.filter(gym_class=locked_class, member=member).first()
+        if reservation is not None:
+            if reservation.status == 'confirmed':
+                raise BookingError('Ya tienes una reserva confirmada para esta clase')
+            if reservation.status == 'waitlist':
+                raise BookingError('Ya estás en la lista de espera para esta clase')
+            if reservation.status != 'cancelled':
+                raise BookingError('Ya tienes una reserva para esta clase')
+            # Reutilizar la reserva cancelada (gym_class + member es único)
+            reservation.cancelled_at = None
+        else:
+            reservation = Reservation(gym_class=locked_class, member=member)
+
+        for field, value in extra.items():
+            setattr(reservation, field, value)
+
+        if locked_class.confirmed_count < locked_class.capacity:
+            reservation.status = 'confirmed'
+            reservation.waitlist_position = None
+        else:
+            reservation.status = 'waitlist'
+            reservation.waitlist_position = _next_waitlist_position(locked_class)
+
+        reservation.gym_class = locked_class
+        reservation.save()
+
+    return reservation
+
+
+def promote_next(gym_class):
+    """
+    Confirma al primero de la lista de espera si hay cupo.
+    Debe llamarse dentro de la transacción que tiene la clase bloqueada.
+
+    Returns:
+        Reservation promovida o None
+    """
+    from .models import Reservation
+
+    if gym_class.confirmed_count >= gym_class.capacity:
+        return None
+
+    next_in_line = Reservation.objects.filter(
+        gym_class=gym_class,
+        status='waitlist'
+    ).order_by('waitlist_position', 'reserved_at', 'id').first()
+
+    if next_in_line is None:
+        return None
+
+    next_in_line.gym_class = gym_class
+    next_in_line.status = 'confirmed'
+    next_in_line.waitlist_position = None
+    next_in_line.save()
+    return next_in_line
+
+
+def _transition(reservation, from_status, apply, promote=False, after=None):
+    """
+    Aplica un cambio de estado a la reserva con la clase bloqueada y, si se pide,
+    promueve la lista de espera en la misma transacción. after(reserva) corre
+    dentro de la transacción, después de guardar.
+    """
+    from .models import Reservation
+
+    with transaction.atomic():
+        locked_class = _lock_class(reservation.gym_class_id)
+        locked = Reservation.objects.get(pk=reservation.pk)
+
+        if locked.status != from_status:
+            return False
+
+        locked.gym_class = locked_class
+        apply(locked)
+        locked.save()
+        if after is not None:
+            after(locked)
+        if promote:
+            promote_next(locked_class)
+
+    # Reflejar el resultado en la instancia del llamador
+    for field in ('status', 'waitlist_position', 'cancelled_at', 'attended_at', 'updated_at'):
+        setattr(reservation, field, getattr(locked, field))
+    reset_snapshot(reservation)
+    return True
+
+
+def cancel(reservation):
+    """Cancela una reserva confirmada y promueve al siguiente en lista de espera."""
+    def apply(locked):
+        locked.status = 'cancelled'
+        locked.cancelled_at = timezone.now()
+
+    return _transition(reservation, 'confirmed', apply, promote=True)
+
+
+def mark_attended(reservation):
+    """Marca una reserva confirmada como asistida y la suma a la asistencia del día."""
+    from apps.access.attendance import record_class_attended
+
+    def apply(locked):
+        locked.status = 'attended'
+        locked.attended_at = timezone.now()
+
+    return _transition(reservation, 'confirmed', apply, after=record_class_attended)
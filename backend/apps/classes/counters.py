@@ -0,0 +1,109 @@
+"""
+Contadores de reservas por clase
+Mantiene GymClass.confirmed_count / waitlist_count con UPDATE atómicos (F())
+"""
+from django.db.models import Count, F, Q
+from django.utils import timezone
+
+from apps.audit.tracking import get_snapshot
+
+# Estado de la reserva -> contador de GymClass
+COUNTER_FIELDS = {
+    'confirmed': 'confirmed_count',
+    'waitlist': 'waitlist_count',
+}
+
+
+def get_previous_state(reservation):
+    """
+    (gym_class_id, status) tal como están en la base de datos antes de guardar.
+    Usa los valores cargados por AuditTrackedMixin; solo consulta la base si
+    la instancia no se obtuvo de un queryset.
+    """
+    from .models import Reservation
+
+    if reservation._state.adding or reservation.pk is None:
+        return None
+
+    snapshot = get_snapshot(reservation)
+    if snapshot is None or 'status' not in snapshot or 'gym_class_id' not in snapshot:
+        snapshot = Reservation.objects.filter(pk=reservation.pk).values('gym_class_id', 'status').first()
+        if snapshot is None:
+            return None
+
+    return snapshot['gym_class_id'], snapshot['status']
+
+
+def get_saved_state(reservation, previous=None, update_fields=None):
+    """(gym_class_id, status) que quedó guardado; con update_fields el resto conserva el valor anterior"""
+    gym_class_id, status = reservation.gym_class_id, reservation.status
+    if previous is not None and update_fields is not None:
+        update_fields = set(update_fields)
+        if 'gym_class' not in update_fields and 'gym_class_id' not in update_fields:
+            gym_class_id = previous[0]
+        if 'status' not in update_fields:
+            status = previous[1]
+    return gym_class_id, status
+
+
+def _adjust(gym_class_id, status, delta, reservation=None):
+    from .models import GymClass, Reservation
+
+    field = COUNTER_FIELDS.get(status)
+    if field is None or gym_class_id is None:
+        return
+
+    # updated_at también, para que el ETag del calendario refleje los cupos
+    GymClass.objects.filter(pk=gym_class_id).update(**{field: F(field) + delta, 'updated_at': timezone.now()})
+
+    # Mantener al día la clase ya cargada en la reserva (p. ej. para la respuesta de la API)
+    if reservation is not None and Reservation.gym_class.is_cached(reservation):
+        gym_class = reservation.gym_class
+        if gym_class.pk == gym_class_id:
+            setattr(gym_class, field, getattr(gym_class, field) + delta)
+
+
+def apply_status_change(previous, current, reservation=None):
+    """Resta la reserva del contador anterior y la suma al nuevo."""
+    if previous == current:
+        return
+    if previous is not None:
+        _adjust(previous[0], previous[1], -1, reservation)
+    if current is not None:
+        _adjust(current[0], current[1], 1, reservation)
+
+
+def reconcile(queryset=None, dry_run=False):
+    """
+    Recalcula los contadores desde las reservas y corrige los que no coinciden.
+
+    Args:
+        queryset: Clases a revisar (por defecto todas)
+        dry_run: Solo reportar, sin corregir
+
+    Returns:
+        list: [(gym_class_id, (confirmed, waitlist) guardado, (confirmed, waitlist) real), ...]
+    """
+    from .models import GymClass
+
+    if queryset is None:
+        queryset = GymClass.objects.all()
+
+    drifted = queryset.annotate(
+        real_confirmed=Count('reservations', filter=Q(reservations__status='confirmed')),
+        real_waitlist=Count('reservations', filter=Q(reservations__status='waitlist')),
+    ).exclude(
+        confirmed_count=F('real_confirmed'),
+        waitlist_count=F('real_waitlist'),
+    ).values_list('id', 'confirmed_count', 'waitlist_count', 'real_confirmed', 'real_waitlist')
+
+    fixes = []
+    for class_id, confirmed, waitlist, real_confirmed, real_waitlist in drifted:
+        fixes.append((class_id, (confirmed, waitlist), (real_confirmed, real_waitlist)))
+        if not dry_run:
+            GymClass.objects.filter(pk=class_id).update(
+                confirmed_count=real_confirmed,
+                waitlist_count=real_waitlist,
+                updated_at=timezone.now(),
+            )
+    return fixes
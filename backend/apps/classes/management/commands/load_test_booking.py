@@ -0,0 +1,132 @@
+"""
+Management command de prueba de carga del motor de reservas
+Lanza reservas concurrentes contra una clase y verifica que no haya sobreventa
+
+Ejemplo:
+    python manage.py load_test_booking --bookings 300 --capacity 20 --workers 50
+
+Crea una clase y miembros temporales y los elimina al terminar.
+Pensado para PostgreSQL; en SQLite las escrituras se serializan por archivo y
+los errores "database is locked" se reintentan.
+"""
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import OperationalError, close_old_connections, connection
+from django.utils import timezone
+
+from apps.classes import booking
+from apps.classes.models import ClassType, GymClass, Reservation
+from apps.members.models import Member
+from apps.users.models import User
+
+
+def _with_retry(func, *args):
+    for attempt in range(50):
+        try:
+            return func(*args)
+        except OperationalError as exc:
+            if connection.vendor != 'sqlite' or 'locked' not in str(exc):
+                raise
+            time.sleep(0.01 * (attempt + 1))
+    raise CommandError('La base de datos siguió bloqueada después de 50 intentos')
+
+
+class Command(BaseCommand):
+    help = 'Prueba de carga: reservas y cancelaciones concurrentes sobre una misma clase'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--bookings', type=int, default=300, help='Reservas concurrentes')
+        parser.add_argument('--capacity', type=int, default=20, help='Capacidad de la clase')
+        parser.add_argument('--workers', type=int, default=50, help='Hilos concurrentes')
+        parser.add_argument('--cancellations', type=int, default=10, help='Cancelaciones concurrentes tras reservar')
+        parser.add_argument('--keep', action='store_true', help='No eliminar los datos creados')
+
+    def handle(self, *args, **options):
+        run_id = uuid.uuid4().hex[:8]
+        gym_class, members = self.setup(run_id, options['bookings'], options['capacity'])
+
+        try:
+            start = time.perf_counter()
+            self.run_concurrently(
+                options['workers'],
+                lambda member: _with_retry(booking.book, gym_class.pk, member),
+                members
+            )
+            elapsed = time.perf_counter() - start
+            self.stdout.write(
+                f'{len(members)} reservas en {elapsed:.2f}s ({len(members) / elapsed:.0f}/s)'
+            )
+            self.verify(gym_class, options['capacity'], len(members))
+
+            to_cancel = list(Reservation.objects.filter(
+                gym_class=gym_class, status='confirmed'
+            )[:options['cancellations']])
+            self.run_concurrently(
+                options['workers'],
+                lambda reservation: _with_retry(booking.cancel, reservation),
+                to_cancel
+            )
+            self.stdout.write(f'{len(to_cancel)} cancelaciones concurrentes')
+            self.verify(gym_class, options['capacity'], len(members) - len(to_cancel))
+        finally:
+            if not options['keep']:
+                self.cleanup(gym_class, members)
+
+        self.stdout.write(self.style.SUCCESS('✅ Sin sobreventa ni posiciones de espera duplicadas'))
+
+    def setup(self, run_id, bookings, capacity):
+        class_type, _ = ClassType.objects.get_or_create(name='Load test')
+        start = timezone.now() + timedelta(days=1)
+        gym_class = GymClass.objects.create(
+            class_type=class_type,
+            title=f'Load test {run_id}',
+            start_datetime=start,
+            end_datetime=start + timedelta(minutes=45),
+            capacity=capacity,
+        )
+        users = User.objects.bulk_create([
+            User(username=f'load_{run_id}_{i}', email=f'load_{run_id}_{i}@example.com')
+            for i in range(bookings)
+        ])
+        members = Member.objects.bulk_create([Member(user=user) for user in users])
+        return gym_class, members
+
+    def run_concurrently(self, workers, func, items):
+        def task(item):
+            try:
+                return func(item)
+            finally:
+                close_old_connections()
+                connection.close()
+
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            list(pool.map(task, items))
+
+    def verify(self, gym_class, capacity, active):
+        reservations = Reservation.objects.filter(gym_class=gym_class)
+        confirmed = reservations.filter(status='confirmed').count()
+        positions = list(reservations.filter(status='waitlist').values_list('waitlist_position', flat=True))
+        gym_class.refresh_from_db()
+
+        self.stdout.write(
+            f'  confirmadas={confirmed} espera={len(positions)} '
+            f'contadores=({gym_class.confirmed_count}, {gym_class.waitlist_count})'
+        )
+
+        errors = []
+        if confirmed != min(capacity, active):
+            errors.append(f'confirmadas {confirmed}, se esperaban {min(capacity, active)}')
+        if len(positions) != len(set(positions)):
+            errors.append('posiciones de espera duplicadas')
+        if (gym_class.confirmed_count, gym_class.waitlist_count) != (confirmed, len(positions)):
+            errors.append('los contadores de la clase no coinciden con las reservas')
+        if errors:
+            raise CommandError('; '.join(errors))
+
+    def cleanup(self, gym_class, members):
+        User.objects.filter(member_profile__in=members).delete()
+        gym_class.delete()
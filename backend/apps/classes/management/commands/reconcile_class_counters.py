@@ -0,0 +1,34 @@
+"""
+Management command para reparar los contadores de reservas de las clases
+Necesario si se modifican reservas con queryset.update() o directamente en la base de datos
+"""
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from apps.classes import counters
+from apps.classes.models import GymClass
+
+
+class Command(BaseCommand):
+    help = 'Recalcula GymClass.confirmed_count y waitlist_count desde las reservas'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--upcoming', action='store_true', help='Solo clases futuras')
+        parser.add_argument('--dry-run', action='store_true', help='Solo mostrar diferencias')
+    
+    def handle(self, *args, **options):
+        queryset = GymClass.objects.all()
+        if options['upcoming']:
+            queryset = queryset.filter(start_datetime__gte=timezone.now())
+        
+        fixes = counters.reconcile(queryset, dry_run=options['dry_run'])
+        
+        for class_id, stored, real in fixes:
+            self.stdout.write(
+                f'  Clase #{class_id}: confirmadas {stored[0]} → {real[0]}, espera {stored[1]} → {real[1]}'
+            )
+        
+        if options['dry_run']:
+            self.stdout.write(self.style.WARNING(f'⚠️ {len(fixes)} clases con contadores desfasados (sin cambios)'))
+        else:
+            self.stdout.write(self.style.SUCCESS(f'✅ {len(fixes)} clases corregidas'))
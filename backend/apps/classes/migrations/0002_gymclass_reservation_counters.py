@@ -0,0 +1,40 @@
+# Generated by Django 5.2.18 on 2026-10-17 18:30
+
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_counters(apps, schema_editor):
+    GymClass = apps.get_model('classes', 'GymClass')
+    Reservation = apps.get_model('classes', 'Reservation')
+
+    def count(status):
+        return Coalesce(Subquery(
+            Reservation.objects.filter(gym_class=OuterRef('pk'), status=status)
+            .order_by().values('gym_class').annotate(total=Count('id')).values('total'),
+            output_field=IntegerField()
+        ), 0)
+
+    GymClass.objects.update(confirmed_count=count('confirmed'), waitlist_count=count('waitlist'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('classes', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='gymclass',
+            name='confirmed_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Reservas confirmadas'),
+        ),
+        migrations.AddField(
+            model_name='gymclass',
+            name='waitlist_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='En lista de espera'),
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
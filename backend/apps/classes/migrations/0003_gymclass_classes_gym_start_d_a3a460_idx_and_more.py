@@ -0,0 +1,35 @@
+# Generated by Django 5.2.18 on 2026-10-17 18:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('classes', '0002_gymclass_reservation_counters'),
+        ('members', '0001_initial'),
+        ('staff', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='gymclass',
+            index=models.Index(fields=['start_datetime'], name='classes_gym_start_d_a3a460_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='gymclass',
+            index=models.Index(fields=['instructor', 'start_datetime'], name='classes_gym_instruc_6e4a3b_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='reservation',
+            index=models.Index(fields=['member', 'status'], name='classes_res_member__201d8f_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='reservation',
+            index=models.Index(fields=['gym_class', 'status'], name='classes_res_gym_cla_ba4716_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='reservation',
+            index=models.Index(condition=models.Q(('status', 'waitlist')), fields=['gym_class', 'waitlist_position'], name='reservation_waitlist_idx'),
+        ),
+    ]
@@ -3,9 +3,11 @@ Modelos de Clases y Reservas
 Sistema de Gestión de Gimnasio
 """
 
-from django.db import models
+from django.db import models, transaction
 from django.utils import timezone
 
+from apps.audit.tracking import AuditTrackedMixin
+
 
 class ClassType(models.Model):
     """Tipos de clases disponibles (Yoga, Spinning, CrossFit, etc.)"""
@@ -54,7 +56,7 @@ class ClassType(models.Model):
         return self.name
 
 
-class GymClass(models.Model):
+class GymClass(AuditTrackedMixin, models.Model):
     """Clase programada en el gimnasio"""
     
     class_type = models.ForeignKey(
@@ -105,6 +107,17 @@ class GymClass(models.Model):
         blank=True,
         verbose_name='Motivo de cancelación'
     )
+    # Contadores desnormalizados, mantenidos por Reservation.save() (ver counters.py)
+    confirmed_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='Reservas confirmadas'
+    )
+    waitlist_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='En lista de espera'
+    )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
@@ -112,28 +125,39 @@ class GymClass(models.Model):
         verbose_name = 'Clase'
         verbose_name_plural = 'Clases'
         ordering = ['start_datetime']
+        indexes = [
+            models.Index(fields=['start_datetime']),
+            models.Index(fields=['instructor', 'start_datetime']),
+        ]
     
     def __str__(self):
         return f"{self.title} - {self.start_datetime.strftime('%d/%m/%Y %H:%M')}"
     
+    def save(self, *args, **kwargs):
+        # Los contadores solo se modifican con UPDATE ... F(); guardar una instancia
+        # cargada antes de una reserva no debe sobrescribirlos con valores viejos
+        if not self._state.adding and kwargs.get('update_fields') is None:
+            from .counters import COUNTER_FIELDS
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in COUNTER_FIELDS.values()
+            ]
+        super().save(*args, **kwargs)
+    
     @property
     def confirmed_reservations_count(self):
-        return self.reservations.filter(status='confirmed').count()
+        return self.confirmed_count
     
     @property
     def available_spots(self):
-        return self.capacity - self.confirmed_reservations_count
+        return self.capacity - self.confirmed_count
     
     @property
     def is_full(self):
         return self.available_spots <= 0
-    
-    @property
-    def waitlist_count(self):
-        return self.reservations.filter(status='waitlist').count()
 
 
-class Reservation(models.Model):
+class Reservation(AuditTrackedMixin, models.Model):
     """Reserva/Inscripción de un miembro a una clase"""
     
     STATUS_CHOICES = [
@@ -189,39 +213,40 @@ class Reservation(models.Model):
         verbose_name_plural = 'Reservas'
         unique_together = ['gym_class', 'member']
         ordering = ['-reserved_at']
+        indexes = [
+            models.Index(fields=['member', 'status']),
+            models.Index(fields=['gym_class', 'status']),
+            # Siguiente en lista de espera (booking.promote_next)
+            models.Index(
+                fields=['gym_class', 'waitlist_position'],
+                condition=models.Q(status='waitlist'),
+                name='reservation_waitlist_idx'
+            ),
+        ]
     
     def __str__(self):
         return f"{self.member} - {self.gym_class.title} ({self.get_status_display()})"
     
+    def save(self, *args, **kwargs):
+        """Guarda la reserva y ajusta los contadores de la clase en la misma transacción"""
+        from .counters import get_previous_state, get_saved_state, apply_status_change
+        
+        previous = get_previous_state(self)
+        update_fields = kwargs.get('update_fields')
+        
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            apply_status_change(previous, get_saved_state(self, previous, update_fields), self)
+    
     def cancel(self):
-        """Cancela la reserva y promueve al siguiente en lista de espera"""
-        if self.status == 'confirmed':
-            self.status = 'cancelled'
-            self.cancelled_at = timezone.now()
-            self.save()
-            
-            # Promover al siguiente en lista de espera
-            next_in_line = Reservation.objects.filter(
-                gym_class=self.gym_class,
-                status='waitlist'
-            ).order_by('waitlist_position').first()
-            
-            if next_in_line:
-                next_in_line.status = 'confirmed'
-                next_in_line.waitlist_position = None
-                next_in_line.save()
-            
-            return True
-        return False
+        """Cancela la reserva y promueve al siguiente en lista de espera (en la misma transacción)"""
+        from .booking import cancel
+        return cancel(self)
     
     def mark_attended(self):
         """Marca la reserva como asistida"""
-        if self.status == 'confirmed':
-            self.status = 'attended'
-            self.attended_at = timezone.now()
-            self.save()
-            return True
-        return False
+        from .booking import mark_attended
+        return mark_attended(self)
 
 
 class Routine(models.Model):
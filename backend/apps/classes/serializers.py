@@ -2,9 +2,22 @@
 Serializers para Clases
 """
 from rest_framework import serializers
+from .booking import BookingError, book
 from .models import ClassType, GymClass, Reservation, Routine, RoutineAssignment
 
 
+def book_reservation(validated_data):
+    """Crea la reserva con el motor de reservas y traduce sus errores a errores de validación"""
+    data = dict(validated_data)
+    gym_class = data.pop('gym_class')
+    member = data.pop('member', None)
+    data.pop('status', None)
+    try:
+        return book(gym_class, member, **data)
+    except BookingError as exc:
+        raise serializers.ValidationError({'detail': str(exc)})
+
+
 class ClassTypeSerializer(serializers.ModelSerializer):
     class Meta:
         model = ClassType
@@ -60,18 +73,8 @@ class ReservationCreateSerializer(serializers.ModelSerializer):
         fields = ['gym_class']  # Solo gym_class es requerido
     
     def create(self, validated_data):
-        gym_class = validated_data['gym_class']
-        
-        # Verificar si la clase está llena
-        if gym_class.is_full:
-            # Agregar a lista de espera
-            waitlist_count = gym_class.reservations.filter(status='waitlist').count()
-            validated_data['status'] = 'waitlist'
-            validated_data['waitlist_position'] = waitlist_count + 1
-        else:
-            validated_data['status'] = 'confirmed'
-        
-        return super().create(validated_data)
+        # Confirmar o agregar a lista de espera con la clase bloqueada (ver booking.py)
+        return book_reservation(validated_data)
 
 
 class ReservationSerializer(serializers.ModelSerializer):
@@ -118,18 +121,8 @@ class ReservationSerializer(serializers.ModelSerializer):
         return attrs
     
     def create(self, validated_data):
-        gym_class = validated_data['gym_class']
-        
-        # Verificar si la clase está llena
-        if gym_class.is_full:
-            # Agregar a lista de espera
-            waitlist_count = gym_class.reservations.filter(status='waitlist').count()
-            validated_data['status'] = 'waitlist'
-            validated_data['waitlist_position'] = waitlist_count + 1
-        else:
-            validated_data['status'] = 'confirmed'
-        
-        return super().create(validated_data)
+        # Confirmar o agregar a lista de espera con la clase bloqueada (ver booking.py)
+        return book_reservation(validated_data)
 
 
 class RoutineSerializer(serializers.ModelSerializer):
@@ -0,0 +1,16 @@
+"""
+Signals de Clases
+Mantienen los contadores de GymClass cuando se eliminan reservas
+"""
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+
+from .models import Reservation
+from .counters import get_previous_state, get_saved_state, apply_status_change
+
+
+@receiver(post_delete, sender=Reservation)
+def remove_reservation_from_counters(sender, instance, **kwargs):
+    """Resta la reserva eliminada del contador de su clase"""
+    previous = get_previous_state(instance) or get_saved_state(instance)
+    apply_status_change(previous, None)
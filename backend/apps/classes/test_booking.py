@@ -0,0 +1,113 @@
+"""
+Unit tests for the reservation booking engine.
+Tests verify capacity, waitlist ordering, promotion and concurrent bookings.
+"""
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from django.db import connection
+from django.utils import timezone
+from apps.classes import booking
+from apps.classes.models import ClassType, GymClass, Reservation
+from apps.members.models import Member
+from apps.users.models import User
+
+
+@pytest.fixture
+def small_class(db):
+    class_type = ClassType.objects.create(name='Spinning')
+    start = timezone.now() + timedelta(days=1)
+    return GymClass.objects.create(
+        class_type=class_type,
+        title='Spinning',
+        start_datetime=start,
+        end_datetime=start + timedelta(minutes=45),
+        capacity=2,
+    )
+
+
+def make_members(count):
+    users = User.objects.bulk_create([
+        User(username=f'booker{i}', email=f'booker{i}@gym.com') for i in range(count)
+    ])
+    return Member.objects.bulk_create([Member(user=user) for user in users])
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+class TestBookingEngine:
+    """Sequential behaviour of book() and cancel()."""
+
+    def test_overflow_goes_to_ordered_waitlist(self, small_class):
+        results = [booking.book(small_class, member) for member in make_members(5)]
+
+        assert [r.status for r in results] == ['confirmed', 'confirmed', 'waitlist', 'waitlist', 'waitlist']
+        assert [r.waitlist_position for r in results[2:]] == [1, 2, 3]
+
+    def test_duplicate_booking_is_rejected(self, small_class):
+        member = make_members(1)[0]
+        booking.book(small_class, member)
+
+        with pytest.raises(booking.BookingError):
+            booking.book(small_class, member)
+
+    def test_cancel_promotes_first_in_line(self, small_class):
+        first, second, third, fourth = [booking.book(small_class, m) for m in make_members(4)]
+
+        assert first.cancel() is True
+
+        assert first.status == 'cancelled'
+        statuses = dict(Reservation.objects.values_list('pk', 'status'))
+        assert statuses[third.pk] == 'confirmed'
+        assert statuses[fourth.pk] == 'waitlist'
+        small_class.refresh_from_db()
+        assert (small_class.confirmed_count, small_class.waitlist_count) == (2, 1)
+
+    def test_cancelled_member_can_book_again(self, small_class):
+        member = make_members(1)[0]
+        reservation = booking.book(small_class, member)
+        reservation.cancel()
+
+        again = booking.book(small_class, member)
+
+        assert again.pk == reservation.pk
+        assert again.status == 'confirmed'
+        assert again.cancelled_at is None
+
+    def test_attendance_does_not_promote(self, small_class):
+        first, _, third = [booking.book(small_class, m) for m in make_members(3)]
+
+        first.mark_attended()
+
+        assert Reservation.objects.get(pk=third.pk).status == 'waitlist'
+
+    def test_cancelled_class_cannot_be_booked(self, small_class):
+        small_class.is_cancelled = True
+        small_class.save()
+
+        with pytest.raises(booking.BookingError):
+            booking.book(small_class, make_members(1)[0])
+
+
+@pytest.mark.integration
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.skipif(connection.vendor != 'postgresql', reason='Row locks need PostgreSQL')
+class TestConcurrentBooking:
+    """Bursts of bookings on one class must never overbook it."""
+
+    def test_no_overbooking_under_concurrency(self, small_class):
+        members = make_members(60)
+
+        def book(member):
+            try:
+                return booking.book(small_class.pk, member)
+            finally:
+                connection.close()
+
+        with ThreadPoolExecutor(max_workers=20) as pool:
+            list(pool.map(book, members))
+
+        reservations = Reservation.objects.filter(gym_class=small_class)
+        positions = list(reservations.filter(status='waitlist').values_list('waitlist_position', flat=True))
+        assert reservations.filter(status='confirmed').count() == small_class.capacity
+        assert sorted(positions) == list(range(1, len(members) - small_class.capacity + 1))
@@ -0,0 +1,110 @@
+"""
+Unit tests for the denormalized reservation counters on GymClass.
+Tests verify counters follow reservation transitions and can be reconciled.
+"""
+import pytest
+from datetime import timedelta
+from django.core.management import call_command
+from django.utils import timezone
+from apps.classes.models import ClassType, GymClass, Reservation
+from apps.classes.serializers import GymClassListSerializer, GymClassSerializer
+from apps.members.models import Member
+from apps.users.models import User
+
+
+@pytest.fixture
+def spin_class(db):
+    class_type = ClassType.objects.create(name='Spinning')
+    start = timezone.now() + timedelta(days=1)
+    return GymClass.objects.create(
+        class_type=class_type,
+        title='Spinning',
+        start_datetime=start,
+        end_datetime=start + timedelta(minutes=45),
+        capacity=2,
+    )
+
+
+def new_member(name):
+    return Member.objects.create(user=User.objects.create_user(username=name, email=f'{name}@gym.com'))
+
+
+def counters(gym_class):
+    gym_class.refresh_from_db()
+    return gym_class.confirmed_count, gym_class.waitlist_count
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+class TestGymClassCounters:
+    """Counters are kept by Reservation.save() and deletes."""
+
+    def test_create_updates_counters(self, spin_class):
+        Reservation.objects.create(gym_class=spin_class, member=new_member('a'), status='confirmed')
+        Reservation.objects.create(gym_class=spin_class, member=new_member('b'), status='waitlist')
+
+        assert counters(spin_class) == (1, 1)
+
+    def test_cancel_promotes_waitlist(self, spin_class):
+        confirmed = Reservation.objects.create(gym_class=spin_class, member=new_member('a'), status='confirmed')
+        Reservation.objects.create(gym_class=spin_class, member=new_member('b'), status='waitlist', waitlist_position=1)
+
+        Reservation.objects.get(pk=confirmed.pk).cancel()
+
+        assert counters(spin_class) == (1, 0)
+
+    def test_mark_attended_releases_confirmed_count(self, spin_class):
+        reservation = Reservation.objects.create(gym_class=spin_class, member=new_member('a'))
+
+        Reservation.objects.get(pk=reservation.pk).mark_attended()
+
+        assert counters(spin_class) == (0, 0)
+
+    def test_delete_updates_counters(self, spin_class):
+        reservation = Reservation.objects.create(gym_class=spin_class, member=new_member('a'))
+
+        Reservation.objects.get(pk=reservation.pk).delete()
+
+        assert counters(spin_class) == (0, 0)
+
+    def test_stale_class_save_keeps_counters(self, spin_class):
+        stale = GymClass.objects.get(pk=spin_class.pk)
+        Reservation.objects.create(gym_class=spin_class, member=new_member('a'))
+
+        stale.title = 'Spinning avanzado'
+        stale.save()
+
+        assert counters(spin_class) == (1, 0)
+
+    def test_serializers_do_not_query_reservations(self, spin_class, django_assert_num_queries):
+        Reservation.objects.create(gym_class=spin_class, member=new_member('a'))
+        Reservation.objects.create(gym_class=spin_class, member=new_member('b'))
+        classes = list(GymClass.objects.select_related('class_type', 'instructor__user'))
+
+        with django_assert_num_queries(0):
+            data = GymClassSerializer(classes[0]).data
+            GymClassListSerializer(classes, many=True).data
+
+        assert data['confirmed_reservations_count'] == 2
+        assert data['available_spots'] == 0
+        assert data['is_full'] is True
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+class TestReconcileClassCounters:
+    """reconcile_class_counters repairs drift."""
+
+    def test_reconcile_fixes_drift(self, spin_class):
+        Reservation.objects.create(gym_class=spin_class, member=new_member('a'))
+        Reservation.objects.create(gym_class=spin_class, member=new_member('b'), status='waitlist')
+
+        # queryset.update() bypasses save(), so counters drift
+        Reservation.objects.filter(status='waitlist').update(status='confirmed')
+        GymClass.objects.filter(pk=spin_class.pk).update(waitlist_count=5)
+
+        call_command('reconcile_class_counters', dry_run=True)
+        assert counters(spin_class) == (1, 5)
+
+        call_command('reconcile_class_counters')
+        assert counters(spin_class) == (2, 0)
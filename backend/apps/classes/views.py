@@ -4,8 +4,11 @@ ViewSets para Clases
 from rest_framework import viewsets, permissions, status, filters
 from rest_framework.decorators import action
 from rest_framework.response import Response
+from rest_framework.exceptions import ValidationError
 from django_filters.rest_framework import DjangoFilterBackend
 from django.utils import timezone
+from apps.common.dates import day_bounds
+from apps.common.mixins import ConditionalGetMixin
 from .models import ClassType, GymClass, Reservation, Routine, RoutineAssignment
 from .serializers import (
     ClassTypeSerializer, GymClassSerializer, GymClassListSerializer,
@@ -13,7 +16,7 @@ from .serializers import (
 )
 
 
-class ClassTypeViewSet(viewsets.ModelViewSet):
+class ClassTypeViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     queryset = ClassType.objects.all()
     serializer_class = ClassTypeSerializer
     permission_classes = [permissions.IsAuthenticated]
@@ -24,8 +27,10 @@ class ClassTypeViewSet(viewsets.ModelViewSet):
         return ClassType.objects.all()
 
 
-class GymClassViewSet(viewsets.ModelViewSet):
+class GymClassViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     queryset = GymClass.objects.all()
+    # El calendario muestra el tipo de clase y el nombre del instructor; los cupos cambian updated_at vía counters
+    last_modified_fields = ('updated_at', 'class_type__updated_at', 'instructor__user__updated_at')
     permission_classes = [permissions.IsAuthenticated]
     filter_backends = [DjangoFilterBackend, filters.OrderingFilter]
     filterset_fields = ['class_type', 'instructor', 'is_cancelled']
@@ -50,19 +55,22 @@ class GymClassViewSet(viewsets.ModelViewSet):
         date_from = self.request.query_params.get('date_from')
         date_to = self.request.query_params.get('date_to')
         
-        if date_from and date_to:
-            # Si se especifican ambas fechas, usarlas exactamente
-            queryset = queryset.filter(
-                start_datetime__date__gte=date_from,
-                start_datetime__date__lte=date_to
-            )
-        elif date_from:
-            # Solo fecha de inicio
-            queryset = queryset.filter(start_datetime__date__gte=date_from)
-        elif date_to:
-            # Solo fecha de fin
-            queryset = queryset.filter(start_datetime__date__lte=date_to)
-        else:
+        # Rangos de datetimes (no start_datetime__date) para usar el índice de start_datetime
+        try:
+            if date_from and date_to:
+                # Si se especifican ambas fechas, usarlas exactamente
+                start, end = day_bounds(date_from, date_to)
+                queryset = queryset.filter(start_datetime__gte=start, start_datetime__lt=end)
+            elif date_from:
+                # Solo fecha de inicio
+                queryset = queryset.filter(start_datetime__gte=day_bounds(date_from)[0])
+            elif date_to:
+                # Solo fecha de fin
+                queryset = queryset.filter(start_datetime__lt=day_bounds(date_to)[1])
+        except ValueError:
+            raise ValidationError({'detail': 'Formato de fecha inválido. Use YYYY-MM-DD'})
+        
+        if not (date_from or date_to):
             # Sin filtros de fecha: mostrar solo futuras por defecto
             if self.action == 'list':
                 queryset = queryset.filter(start_datetime__gte=timezone.now())
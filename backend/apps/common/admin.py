@@ -0,0 +1,27 @@
+"""
+Admin para Modelos Comunes
+"""
+
+from django.contrib import admin
+from .models import ExchangeRate, ScheduledJob, JobRun
+
+
+@admin.register(ExchangeRate)
+class ExchangeRateAdmin(admin.ModelAdmin):
+    list_display = ['currency', 'rate', 'rate_date', 'fetched_at', 'source']
+    readonly_fields = ['fetched_at']
+
+
+@admin.register(ScheduledJob)
+class ScheduledJobAdmin(admin.ModelAdmin):
+    list_display = ['name', 'enabled', 'interval_seconds', 'next_run_at', 'last_run_at', 'last_status', 'last_duration_ms', 'locked_by']
+    list_filter = ['enabled', 'last_status']
+    readonly_fields = ['locked_until', 'locked_by', 'last_run_at', 'last_status', 'last_duration_ms']
+
+
+@admin.register(JobRun)
+class JobRunAdmin(admin.ModelAdmin):
+    list_display = ['job', 'started_at', 'status', 'duration_ms', 'rows', 'node']
+    list_filter = ['status', 'job']
+    date_hierarchy = 'started_at'
+    readonly_fields = ['job', 'started_at', 'duration_ms', 'status', 'rows', 'error', 'node']
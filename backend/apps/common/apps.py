@@ -3,3 +3,8 @@ from django.apps import AppConfig
 class CommonConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.common'
+
+    def ready(self):
+        """Conectar la invalidación de la caché del dashboard"""
+        from apps.common.dashboard_cache import connect_signals
+        connect_signals()
@@ -0,0 +1,226 @@
+"""
+Benchmark de la API REST
+Sistema de Gestión de Gimnasio
+
+Recorre todas las rutas GET de los routers de DRF (list, detail y acciones
+@action) con el cliente de pruebas y mide, por endpoint:
+
+- queries: consultas SQL con la caché vacía (determinista, no depende de la máquina)
+- time_ms: mediana de varias repeticiones
+- bytes: tamaño del cuerpo de la respuesta
+- status: código HTTP
+
+compare() contrasta el resultado con un baseline JSON versionado para que CI
+falle cuando un cambio agrega consultas (un N+1 nuevo) o vuelve un endpoint
+notablemente más lento o pesado. Ver manage.py benchmark_api.
+"""
+import json
+import re
+import statistics
+import time
+
+from django.core.cache import cache
+from django.db import connection, reset_queries
+from django.test.utils import CaptureQueriesContext
+from django.urls import URLPattern, URLResolver, get_resolver
+
+# Parámetros que algunas acciones exigen para responder 200
+QUERY_PARAMS = {
+    'api/analytics/metrics/evolution/': {'member_id': '{member}', 'metric_type': '{metric_type}'},
+    'api/analytics/training-logs/weekly_summary/': {'member_id': '{member}'},
+    'api/progress/exercise-logs/exercise_history/': {'exercise_id': '{exercise}'},
+}
+# Diferencias de tiempo menores a esto son ruido, sin importar el porcentaje
+TIME_FLOOR_MS = 25
+GROUP = re.compile(r'\(\?P<(\w+)>[^)]*\)')
+
+
+class Route:
+    """
+    Una ruta GET de un ViewSet.
+
+    Args:
+        template: Ruta con marcadores, p. ej. 'api/members/{pk}/'
+        view: Clase del ViewSet
+        action: Nombre del método que atiende el GET (list, retrieve, stats...)
+    """
+
+    def __init__(self, template, view, action):
+        self.template = template
+        self.view = view
+        self.action = action
+        self.kwargs = re.findall(r'\{(\w+)\}', template)
+
+    @property
+    def is_detail(self):
+        return bool(self.kwargs)
+
+    @property
+    def list_template(self):
+        """Ruta del listado del mismo ViewSet (de donde sale el pk de las rutas de detalle)."""
+        return self.template.split('{')[0]
+
+    def __repr__(self):
+        return f'<Route {self.template} {self.action}>'
+
+
+def _clean(regex):
+    return regex.lstrip('^').rstrip('$').replace('\\', '')
+
+
+def discover_routes(resolver=None, prefix=''):
+    """Rutas GET de todos los ViewSets registrados en routers, sin sufijos de formato."""
+    resolver = resolver or get_resolver()
+    routes = []
+    for pattern in resolver.url_patterns:
+        raw = str(pattern.pattern)
+        if isinstance(pattern, URLResolver):
+            routes.extend(discover_routes(pattern, prefix + _clean(raw)))
+            continue
+        if not isinstance(pattern, URLPattern) or '<format>' in raw:
+            continue
+        callback = pattern.callback
+        actions = getattr(callback, 'actions', None)
+        if not actions or 'get' not in actions:
+            continue
+        template = GROUP.sub(lambda match: '{%s}' % match.group(1), prefix + _clean(raw))
+        routes.append(Route(template, callback.cls, actions['get']))
+    return routes
+
+
+def _rows(data):
+    if isinstance(data, dict) and isinstance(data.get('results'), list):
+        return data['results']
+    return data if isinstance(data, list) else []
+
+
+def sample_values():
+    """Ids reales para completar los parámetros de QUERY_PARAMS."""
+    from apps.analytics.models import MetricType
+    from apps.members.models import Member
+    from apps.workouts.models import Exercise
+    return {
+        'member': Member.objects.values_list('id', flat=True).first() or 1,
+        'metric_type': MetricType.objects.values_list('id', flat=True).first() or 1,
+        'exercise': Exercise.objects.values_list('id', flat=True).first() or 1,
+    }
+
+
+def body_size(response):
+    """Bytes del cuerpo; las exportaciones en streaming se consumen completas."""
+    if getattr(response, 'streaming', False):
+        return sum(len(chunk) for chunk in response.streaming_content)
+    return len(response.content)
+
+
+def measure(client, url, params=None, repeat=3):
+    """Consultas con caché vacía, mediana del tiempo, tamaño y estado de un GET."""
+    cache.clear()
+    # queries_log tiene tope (9000): lleno, CaptureQueriesContext contaría 0
+    reset_queries()
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(url, params)
+        # Las exportaciones en streaming consultan mientras se consumen
+        size = body_size(response)
+    # Se lee ya: cada request siguiente vacía queries_log (señal request_started)
+    queries = len(context.captured_queries)
+    timings = []
+    for _ in range(repeat):
+        cache.clear()
+        started = time.perf_counter()
+        body_size(client.get(url, params))
+        timings.append((time.perf_counter() - started) * 1000)
+    return response, {
+        'queries': queries,
+        'time_ms': round(statistics.median(timings), 2) if timings else None,
+        'bytes': size,
+        'status': response.status_code,
+    }
+
+
+def run(user, routes=None, only=None, repeat=3):
+    """
+    Ejecuta el benchmark autenticado como user.
+
+    Las rutas de detalle usan el primer id del listado de su ViewSet; si el
+    listado viene vacío se omiten.
+
+    Returns:
+        dict: {plantilla de la ruta: métricas}
+    """
+    from rest_framework.test import APIClient
+
+    client = APIClient()
+    client.force_authenticate(user)
+    # Un 500 queda registrado como estado en lugar de cortar la corrida
+    client.raise_request_exception = False
+    routes = [r for r in (routes or discover_routes()) if not only or r.template.startswith(only)]
+    values = sample_values()
+    first_ids = {}
+    results = {}
+
+    # Primero los listados: dan los ids para las rutas de detalle
+    for route in sorted(routes, key=lambda r: (r.is_detail, r.template)):
+        if route.is_detail:
+            if route.kwargs != ['pk'] or first_ids.get(route.list_template) is None:
+                continue
+            url = '/' + route.template.format(pk=first_ids[route.list_template])
+        else:
+            url = '/' + route.template
+        params = {
+            key: value.format(**values)
+            for key, value in QUERY_PARAMS.get(route.template, {}).items()
+        }
+        response, metrics = measure(client, url, params, repeat)
+        results[route.template] = metrics
+
+        if not route.is_detail and response.status_code == 200 and not response.streaming:
+            rows = _rows(response.json())
+            first_ids.setdefault(route.template, rows[0].get('id') if rows and isinstance(rows[0], dict) else None)
+    return results
+
+
+def compare(baseline, results, threshold=0.2, time_threshold=1.0):
+    """
+    Regresiones respecto del baseline.
+
+    Args:
+        baseline: {ruta: métricas} guardado en el JSON versionado
+        results: {ruta: métricas} de la corrida actual
+        threshold: Aumento relativo de tamaño tolerado (0.2 = 20 %)
+        time_threshold: Aumento relativo de tiempo tolerado, o None para no comparar tiempos
+
+    Returns:
+        list[str]: Una línea por regresión; vacía si no hay
+    """
+    problems = []
+    for template, before in sorted(baseline.items()):
+        after = results.get(template)
+        if after is None:
+            continue
+        if after['status'] != before['status'] and after['status'] >= 400:
+            problems.append(f'{template}: estado {before["status"]} → {after["status"]}')
+        if before['status'] >= 500:
+            # Un error en el baseline no es referencia de consultas ni tamaño
+            continue
+        if after['queries'] > before['queries']:
+            problems.append(f'{template}: consultas {before["queries"]} → {after["queries"]}')
+        if after['bytes'] > before['bytes'] * (1 + threshold):
+            problems.append(f'{template}: tamaño {before["bytes"]} → {after["bytes"]} bytes')
+        if time_threshold is not None and before.get('time_ms') is not None and after.get('time_ms') is not None:
+            limit = max(before['time_ms'] * (1 + time_threshold), before['time_ms'] + TIME_FLOOR_MS)
+            if after['time_ms'] > limit:
+                problems.append(f'{template}: tiempo {before["time_ms"]} → {after["time_ms"]} ms')
+    return problems
+
+
+def load_baseline(path):
+    with open(path, encoding='utf-8') as file:
+        return json.load(file)
+
+
+def save_baseline(path, scale, results):
+    data = {'scale': scale, 'vendor': connection.vendor, 'endpoints': results}
+    with open(path, 'w', encoding='utf-8') as file:
+        json.dump(data, file, indent=2, sort_keys=True, ensure_ascii=False)
+        file.write('\n')
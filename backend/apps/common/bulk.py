@@ -0,0 +1,109 @@
+"""
+Operaciones masivas sin efectos secundarios por instancia
+Sistema de Gestión de Gimnasio
+
+Los receivers de auditoría y notificaciones se registran con connect() en
+lugar de @receiver. Dentro de bulk_operation() esos receivers no escriben:
+anotan lo necesario y al cerrar el bloque cada uno emite un solo lote
+(un bulk_create de AuditLog, un bulk_create de Notification).
+
+bulk_create() y bulk_update() no emiten signals; sus filas se anotan a mano
+con saved() / deleted() para que también se auditen y notifiquen:
+
+    with transaction.atomic(), bulk_operation(user=admin) as batch:
+        for payment in pending:
+            payment.status = 'completed'
+            payment.save()                      # diferido, sin INSERT de auditoría
+        Payment.objects.bulk_update(otros, ['status'])
+        batch.saved(otros, update_fields=['status'])
+
+Los bloques anidados se unen al exterior. Si el bloque termina con una
+excepción los efectos pendientes se descartan.
+"""
+import threading
+from collections import defaultdict
+from contextlib import contextmanager
+
+from django.db.models.signals import post_delete, post_save
+
+_local = threading.local()
+
+# (signal, modelo) -> receivers que se pueden diferir
+_receivers = defaultdict(list)
+
+
+def connect(signal, receiver, sender, dispatch_uid):
+    """
+    Conecta un receiver a un modelo concreto y lo registra como diferible.
+
+    Así saved() / deleted() pueden reproducirlo para filas escritas sin signals.
+    """
+    signal.connect(receiver, sender=sender, dispatch_uid=dispatch_uid)
+    if receiver not in _receivers[signal, sender]:
+        _receivers[signal, sender].append(receiver)
+
+
+class BulkOperation:
+    """Efectos pendientes de la operación masiva en curso en este hilo."""
+
+    def __init__(self, user=None):
+        self.user = user
+        self._pending = {}  # flush -> [elementos], en orden de llegada
+
+    def defer(self, flush, item):
+        """Anota un elemento; flush(operation, items) se llama una vez al cerrar."""
+        self._pending.setdefault(flush, []).append(item)
+
+    def saved(self, instances, created=False, update_fields=None):
+        """Anota filas escritas con bulk_create (created=True) o bulk_update."""
+        self._replay(post_save, instances, created=created, update_fields=update_fields)
+
+    def deleted(self, instances):
+        """Anota filas borradas sin signals (SQL directo, _raw_delete)."""
+        self._replay(post_delete, instances)
+
+    def _replay(self, signal, instances, **kwargs):
+        for instance in instances:
+            sender = type(instance)
+            for receiver in _receivers.get((signal, sender), ()):
+                receiver(sender=sender, instance=instance, **kwargs)
+
+    def flush(self):
+        pending, self._pending = self._pending, {}
+        for flush, items in pending.items():
+            flush(self, items)
+
+    def discard(self):
+        self._pending.clear()
+
+
+def current():
+    """Operación masiva activa en este hilo, o None."""
+    return getattr(_local, 'operation', None)
+
+
+@contextmanager
+def bulk_operation(user=None):
+    """
+    Suspende los efectos por instancia de los receivers registrados con connect().
+
+    Args:
+        user: Usuario al que se atribuye la auditoría (por defecto el del request)
+    """
+    outer = current()
+    if outer is not None:
+        yield outer
+        return
+
+    operation = _local.operation = BulkOperation(user=user)
+    try:
+        yield operation
+    except BaseException:
+        operation.discard()
+        raise
+    else:
+        # Los flush escriben con los receivers ya reactivados
+        _local.operation = None
+        operation.flush()
+    finally:
+        _local.operation = None
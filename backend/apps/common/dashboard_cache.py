@@ -0,0 +1,249 @@
+"""
+Caché de métricas del dashboard
+Sistema de Gestión de Gimnasio
+
+Cada métrica (conteo o suma) vive en su propia clave con un TTL corto y se
+invalida cuando cambia alguno de los modelos de los que depende.
+
+- Invalidación: cada métrica tiene una generación; los signals de sus modelos
+  la renuevan tras el commit y las claves de la generación anterior dejan de
+  leerse. Un cálculo que termina después de una invalidación escribe en la
+  generación vieja y nunca se sirve.
+- Single-flight: ante un fallo de caché solo quien obtiene el lock (cache.add)
+  calcula la métrica; los demás esperan su resultado.
+- Contadores de aciertos, fallos y esperas por métrica en get_stats().
+"""
+import time
+from datetime import timedelta
+
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+
+KEY_PREFIX = 'dashboard'
+LOCK_TIMEOUT = 30  # Si el proceso que calcula muere, el lock expira solo
+WAIT_INTERVAL = 0.05
+WAIT_TIMEOUT = 5
+
+_registry = {}
+
+
+class Metric:
+    def __init__(self, name, compute, depends_on, ttl=None):
+        self.name = name
+        self.compute = compute
+        self.depends_on = tuple(depends_on)
+        self.ttl = ttl
+
+    def get_ttl(self):
+        return self.ttl if self.ttl is not None else settings.DASHBOARD_CACHE_TTL
+
+
+def register(name, depends_on, ttl=None):
+    """
+    Registra una métrica. La función recibe la fecha local de hoy.
+
+    Args:
+        name: Nombre de la métrica
+        depends_on: Modelos ('app_label.Model') cuyos cambios la invalidan
+        ttl: Segundos en caché (por defecto DASHBOARD_CACHE_TTL)
+    """
+    def decorator(func):
+        _registry[name] = Metric(name, func, depends_on, ttl)
+        return func
+    return decorator
+
+
+# ==================== MÉTRICAS ====================
+
+@register('members_total', depends_on=['members.Member'])
+def members_total(today):
+    from apps.members.models import Member
+    return Member.objects.count()
+
+
+@register('members_active', depends_on=['members.Member'])
+def members_active(today):
+    from apps.members.models import Member
+    return Member.objects.filter(subscription_status='active').count()
+
+
+@register('members_new_month', depends_on=['members.Member'])
+def members_new_month(today):
+    from apps.members.models import Member
+    return Member.objects.filter(joined_date__gte=today.replace(day=1), joined_date__lte=today).count()
+
+
+@register('memberships_expiring', depends_on=['memberships.Membership'])
+def memberships_expiring(today):
+    """Membresías activas que vencen en los próximos 7 días"""
+    from apps.memberships.models import Membership
+    return Membership.objects.filter(
+        status='active',
+        end_date__gte=today,
+        end_date__lte=today + timedelta(days=7)
+    ).count()
+
+
+@register('revenue_month', depends_on=['payments.Payment'])
+def revenue_month(today):
+    from apps.payments.rollups import revenue_totals
+    return revenue_totals(today.replace(day=1), today)['total']
+
+
+@register('revenue_today', depends_on=['payments.Payment'])
+def revenue_today(today):
+    from apps.payments.rollups import revenue_totals
+    return revenue_totals(today, today)['total']
+
+
+@register('payments_pending', depends_on=['payments.Payment'])
+def payments_pending(today):
+    from apps.payments.models import Payment
+    return Payment.objects.filter(status='pending').count()
+
+
+@register('reservations_today', depends_on=['classes.Reservation', 'classes.GymClass'])
+def reservations_today(today):
+    from apps.classes.models import Reservation
+    from apps.common.dates import day_bounds
+
+    start, end = day_bounds(today)
+    return Reservation.objects.filter(
+        gym_class__start_datetime__gte=start,
+        gym_class__start_datetime__lt=end,
+        status='confirmed'
+    ).count()
+
+
+# ==================== LECTURA ====================
+
+def _generation_key(name):
+    return f'{KEY_PREFIX}:gen:{name}'
+
+
+def _value_key(name, generation, today):
+    return f'{KEY_PREFIX}:value:{name}:{generation}:{today.isoformat()}'
+
+
+def _stat_key(kind, name):
+    return f'{KEY_PREFIX}:stats:{kind}:{name}'
+
+
+def _count(kind, name):
+    key = _stat_key(kind, name)
+    try:
+        cache.incr(key)
+    except ValueError:
+        # Primera vez (o la clave fue expulsada); add evita pisar un incr concurrente
+        if not cache.add(key, 1, timeout=None):
+            cache.incr(key)
+
+
+def _compute_once(metric, key, today):
+    """Calcula la métrica una sola vez aunque haya muchos fallos concurrentes."""
+    lock_key = f'{key}:lock'
+
+    if cache.add(lock_key, 1, LOCK_TIMEOUT):
+        try:
+            # Otro proceso pudo haberla calculado justo antes de soltar su lock
+            value = cache.get(key)
+            if value is None:
+                value = metric.compute(today)
+                cache.set(key, value, metric.get_ttl())
+            return value
+        finally:
+            cache.delete(lock_key)
+
+    _count('waits', metric.name)
+    deadline = time.monotonic() + WAIT_TIMEOUT
+    while time.monotonic() < deadline:
+        time.sleep(WAIT_INTERVAL)
+        value = cache.get(key)
+        if value is not None:
+            return value
+
+    # Quien calculaba tardó demasiado: calcular sin cachear
+    return metric.compute(today)
+
+
+def get_metrics(*names, today=None):
+    """
+    Lee varias métricas del dashboard (desde caché cuando es posible).
+
+    Returns:
+        dict: {nombre: valor}
+    """
+    from django.utils import timezone
+
+    today = today or timezone.localdate()
+    metrics = [_registry[name] for name in names]
+
+    generations = cache.get_many([_generation_key(m.name) for m in metrics])
+    keys = {
+        m.name: _value_key(m.name, generations.get(_generation_key(m.name), 0), today)
+        for m in metrics
+    }
+    cached = cache.get_many(list(keys.values()))
+
+    result = {}
+    for metric in metrics:
+        key = keys[metric.name]
+        if key in cached:
+            _count('hits', metric.name)
+            result[metric.name] = cached[key]
+        else:
+            _count('misses', metric.name)
+            result[metric.name] = _compute_once(metric, key, today)
+    return result
+
+
+def get_stats():
+    """
+    Aciertos, fallos y esperas (single-flight) por métrica.
+
+    Returns:
+        dict: {nombre: {'hits', 'misses', 'waits', 'hit_rate'}}
+    """
+    kinds = ('hits', 'misses', 'waits')
+    values = cache.get_many([_stat_key(kind, name) for name in _registry for kind in kinds])
+
+    stats = {}
+    for name in _registry:
+        counts = {kind: values.get(_stat_key(kind, name), 0) for kind in kinds}
+        lookups = counts['hits'] + counts['misses']
+        counts['hit_rate'] = round(counts['hits'] / lookups, 3) if lookups else None
+        stats[name] = counts
+    return stats
+
+
+# ==================== INVALIDACIÓN ====================
+
+def invalidate(*names):
+    """Renueva la generación de las métricas (todas si no se indican)."""
+    names = names or tuple(_registry)
+    generation = time.time_ns()
+    cache.set_many({_generation_key(name): generation for name in names}, timeout=None)
+
+
+def metrics_for_model(model):
+    label = model._meta.label
+    return [m.name for m in _registry.values() if label in m.depends_on]
+
+
+def _invalidate_model(sender, **kwargs):
+    names = metrics_for_model(sender)
+    # Tras el commit: invalidar antes dejaría que otra petición recalcule con datos viejos
+    transaction.on_commit(lambda: invalidate(*names))
+
+
+def connect_signals():
+    """Conecta la invalidación a los modelos de los que dependen las métricas."""
+    labels = {label for metric in _registry.values() for label in metric.depends_on}
+    for label in labels:
+        model = apps.get_model(label)
+        uid = f'dashboard_cache_{label}'
+        post_save.connect(_invalidate_model, sender=model, dispatch_uid=f'{uid}_save')
+        post_delete.connect(_invalidate_model, sender=model, dispatch_uid=f'{uid}_delete')
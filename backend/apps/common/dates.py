@@ -0,0 +1,34 @@
+"""
+Utilidades de fechas para consultas
+Sistema de Gestión de Gimnasio
+"""
+from datetime import datetime, time, timedelta
+
+from django.utils import timezone
+
+
+def day_bounds(start_date, end_date=None):
+    """
+    Rango [inicio, fin) en datetimes con zona horaria local para filtrar
+    campos DateTimeField por día.
+
+    A diferencia de campo__date=..., un rango usa los índices del campo.
+
+    Args:
+        start_date: date (o 'YYYY-MM-DD') del primer día
+        end_date: date (o 'YYYY-MM-DD') del último día, inclusive (por defecto start_date)
+
+    Returns:
+        tuple: (datetime inicio, datetime fin exclusivo)
+    """
+    if isinstance(start_date, str):
+        start_date = datetime.strptime(start_date, '%Y-%m-%d').date()
+    if end_date is None:
+        end_date = start_date
+    elif isinstance(end_date, str):
+        end_date = datetime.strptime(end_date, '%Y-%m-%d').date()
+
+    tz = timezone.get_current_timezone()
+    start = timezone.make_aware(datetime.combine(start_date, time.min), tz)
+    end = timezone.make_aware(datetime.combine(end_date + timedelta(days=1), time.min), tz)
+    return start, end
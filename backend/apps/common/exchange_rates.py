@@ -0,0 +1,233 @@
+"""
+Servicio de tasa de cambio BCV
+Sistema de Gestión de Gimnasio
+
+La última tasa válida se guarda en ExchangeRate y en caché. Las peticiones
+siempre responden con ella (aunque esté vieja) y, si pasó BCV_RATE_MAX_AGE,
+disparan una actualización en segundo plano (stale-while-revalidate). Solo
+el primer arranque, sin ninguna tasa guardada, espera a bcv.org.ve.
+
+La actualización también puede programarse: manage.py refresh_exchange_rate
+"""
+import logging
+import re
+import threading
+from datetime import date, datetime
+from decimal import Decimal, InvalidOperation
+
+import requests
+from django.conf import settings
+from django.core.cache import cache
+from django.db import close_old_connections
+from django.utils import timezone
+
+try:
+    import lxml.html
+except ImportError:  # lxml es opcional
+    lxml = None
+
+logger = logging.getLogger(__name__)
+
+BCV_URL = 'https://www.bcv.org.ve/'
+CURRENCY = 'USD'
+CACHE_KEY = 'bcv_usd_rate'
+CACHE_TIMEOUT = 60 * 60 * 24 * 7  # La frescura se controla con fetched_at, no con el TTL
+LOCK_KEY = 'bcv_usd_rate:refresh'
+LOCK_TIMEOUT = 60
+REQUEST_TIMEOUT = 10
+RATE_PRECISION = Decimal('0.00000001')
+REQUEST_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml',
+    'Accept-Language': 'es-ES,es;q=0.9,en;q=0.8',
+}
+
+# ==================== PARSER ====================
+
+# El bloque del dólar es <div id="dolar"> ... <strong> 36,25410000 </strong>
+_USD_ANCHOR = 'id="dolar"'
+_STRONG_NUMBER_RE = re.compile(r'<strong>\s*([\d.,]+)\s*</strong>')
+# Respaldo si cambia el id del bloque: "USD </span> ... <strong> número"
+_USD_LABEL_RE = re.compile(r'\bUSD\s*</span>.{0,300}?<strong>\s*([\d.,]+)\s*</strong>', re.S | re.I)
+_DATE_RE = re.compile(r'date-display-single[^>]*content="(\d{4})-(\d{2})-(\d{2})')
+_ISO_DATE_RE = re.compile(r'(\d{4})-(\d{2})-(\d{2})')
+_NON_NUMBER_RE = re.compile(r'[^\d,.]')
+_ANCHOR_WINDOW = 1000
+
+
+def parse_rate(text):
+    """Parsea el valor de tasa (formato venezolano: 339,14950000) a Decimal."""
+    if not text:
+        return None
+    cleaned = _NON_NUMBER_RE.sub('', text).replace('.', '').replace(',', '.')
+    try:
+        rate = Decimal(cleaned)
+    except InvalidOperation:
+        return None
+    return rate if rate > 0 else None
+
+
+def _parse_date(match):
+    if match is None:
+        return None
+    try:
+        return date(*(int(part) for part in match.groups()))
+    except ValueError:
+        return None
+
+
+def _parse_regex(html):
+    start = html.find(_USD_ANCHOR)
+    match = None
+    if start != -1:
+        match = _STRONG_NUMBER_RE.search(html, start, start + _ANCHOR_WINDOW)
+    if match is None:
+        match = _USD_LABEL_RE.search(html)
+    if match is None:
+        return None, None
+    return parse_rate(match.group(1)), _parse_date(_DATE_RE.search(html))
+
+
+def _parse_lxml(html):
+    tree = lxml.html.fromstring(html)
+    values = tree.xpath('//div[@id="dolar"]//strong/text()')
+    if not values:
+        values = tree.xpath('//span[normalize-space()="USD"]/ancestor::div[contains(@class, "row")][1]//strong/text()')
+    if not values:
+        return None, None
+    dates = tree.xpath('//span[contains(@class, "date-display-single")]/@content')
+    return parse_rate(values[0]), _parse_date(_ISO_DATE_RE.match(dates[0]) if dates else None)
+
+
+PARSERS = {'regex': _parse_regex}
+if lxml is not None:
+    PARSERS['lxml'] = _parse_lxml
+
+
+def parse_bcv_html(html):
+    """
+    Extrae la tasa USD y la fecha valor del HTML de bcv.org.ve.
+
+    Primero una búsqueda anclada en el bloque del dólar con expresiones
+    precompiladas (no recorre el documento completo); si el diseño cambió,
+    usa lxml cuando está instalado.
+
+    Returns:
+        tuple: (Decimal | None, date | None)
+    """
+    rate, rate_date = _parse_regex(html)
+    if rate is None and lxml is not None:
+        rate, rate_date = _parse_lxml(html)
+    return rate, rate_date
+
+
+# ==================== SERVICIO ====================
+
+def fetch_bcv_usd_rate():
+    """
+    Descarga y parsea la tasa USD del BCV.
+
+    Returns:
+        tuple: (Decimal | None, date | None); (None, None) si falla
+    """
+    try:
+        resp = requests.get(BCV_URL, headers=REQUEST_HEADERS, timeout=REQUEST_TIMEOUT)
+        resp.raise_for_status()
+        rate, rate_date = parse_bcv_html(resp.text)
+        if rate is None:
+            logger.warning('No se encontró la tasa USD en el HTML del BCV')
+        return rate, rate_date
+    except requests.RequestException as e:
+        logger.warning('Error fetching BCV: %s', e)
+    except Exception as e:
+        logger.exception('Error parsing BCV: %s', e)
+    return None, None
+
+
+def _to_data(exchange_rate):
+    return {
+        # Mismo formato recién obtenida o leída de la base (8 decimales, como la publica el BCV)
+        'usd_rate': str(Decimal(exchange_rate.rate).quantize(RATE_PRECISION)),
+        'date': exchange_rate.rate_date.isoformat() if exchange_rate.rate_date else None,
+        'fetched_at': exchange_rate.fetched_at.isoformat(),
+    }
+
+
+def _is_stale(data):
+    fetched_at = datetime.fromisoformat(data['fetched_at'])
+    return (timezone.now() - fetched_at).total_seconds() > settings.BCV_RATE_MAX_AGE
+
+
+def refresh_rate():
+    """
+    Obtiene la tasa del BCV y, si es válida, la guarda en la base de datos y en caché.
+    Si falla se conserva la última tasa válida.
+
+    Returns:
+        dict | None: Datos guardados o None si no se pudo obtener
+    """
+    from .models import ExchangeRate
+
+    rate, rate_date = fetch_bcv_usd_rate()
+    if rate is None:
+        return None
+
+    exchange_rate, _ = ExchangeRate.objects.update_or_create(
+        currency=CURRENCY,
+        defaults={'rate': rate, 'rate_date': rate_date, 'fetched_at': timezone.now()}
+    )
+    data = _to_data(exchange_rate)
+    cache.set(CACHE_KEY, data, CACHE_TIMEOUT)
+    return data
+
+
+def _refresh_locked():
+    """refresh_rate() si ningún otro proceso lo está haciendo."""
+    if not cache.add(LOCK_KEY, 1, LOCK_TIMEOUT):
+        return None
+    try:
+        return refresh_rate()
+    finally:
+        cache.delete(LOCK_KEY)
+
+
+def _refresh_in_thread():
+    try:
+        _refresh_locked()
+    finally:
+        close_old_connections()
+
+
+def refresh_in_background():
+    """Lanza la actualización en un hilo; la petición actual no espera."""
+    if not settings.BCV_BACKGROUND_REFRESH:
+        return
+    threading.Thread(target=_refresh_in_thread, name='bcv-refresh', daemon=True).start()
+
+
+def get_usd_rate():
+    """
+    Tasa USD para responder ya: caché, luego base de datos y, solo si nunca se
+    obtuvo una, bcv.org.ve.
+
+    Returns:
+        dict | None: {'usd_rate', 'date', 'fetched_at', 'stale'}
+    """
+    from .models import ExchangeRate
+
+    data = cache.get(CACHE_KEY)
+    if data is None:
+        exchange_rate = ExchangeRate.objects.filter(currency=CURRENCY).first()
+        if exchange_rate is not None:
+            data = _to_data(exchange_rate)
+            cache.set(CACHE_KEY, data, CACHE_TIMEOUT)
+
+    if data is None:
+        data = _refresh_locked()
+        if data is None:
+            return None
+    elif _is_stale(data):
+        refresh_in_background()
+        return {**data, 'stale': True}
+
+    return {**data, 'stale': False}
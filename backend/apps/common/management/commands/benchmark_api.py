@@ -0,0 +1,102 @@
+"""
+Management command de benchmark de la API REST
+Crea una base de datos de pruebas, la llena con apps.common.seeds.scale y mide
+consultas, tiempo y tamaño de cada endpoint GET (apps.common.benchmark).
+Compara contra el baseline versionado y termina con error si hay regresiones.
+
+Ejemplo:
+    python manage.py benchmark_api                      # escala ci, compara con el baseline
+    python manage.py benchmark_api --update-baseline    # regrabar el baseline tras un cambio intencional
+    python manage.py benchmark_api --scale full --keepdb --no-time --only api/payments/
+"""
+import time
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import setup_test_environment, teardown_test_environment
+
+from apps.common import benchmark
+from apps.common.seeds import scale
+
+FIXTURES = Path(__file__).resolve().parents[2] / 'fixtures'
+
+
+class Command(BaseCommand):
+    help = 'Mide consultas, tiempo y tamaño de cada endpoint GET y compara con el baseline'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scale', choices=sorted(scale.SCALES), default='ci', help='Volumen de datos')
+        parser.add_argument('--seed', type=int, default=0, help='Semilla de los datos generados')
+        parser.add_argument('--baseline', help='JSON de referencia (por defecto fixtures/benchmark_<scale>.json)')
+        parser.add_argument('--update-baseline', action='store_true', help='Guardar esta corrida como baseline')
+        parser.add_argument('--threshold', type=float, default=0.2, help='Aumento de tamaño tolerado (0.2 = 20 %%)')
+        parser.add_argument('--time-threshold', type=float, default=1.0, help='Aumento de tiempo tolerado (1.0 = el doble)')
+        parser.add_argument('--no-time', action='store_true', help='No comparar tiempos (máquinas distintas a la del baseline)')
+        parser.add_argument('--only', help='Prefijo de las rutas a medir (p. ej. api/payments/)')
+        parser.add_argument('--repeat', type=int, default=3, help='Repeticiones para la mediana del tiempo')
+        parser.add_argument('--keepdb', action='store_true', help='Conservar la base de pruebas y sus datos entre corridas')
+
+    def handle(self, *args, **options):
+        path = Path(options['baseline'] or FIXTURES / f'benchmark_{options["scale"]}.json')
+        if not options['update_baseline'] and not path.exists():
+            raise CommandError(f'No existe el baseline {path}; generarlo con --update-baseline')
+
+        setup_test_environment()
+        old_name = connection.settings_dict['NAME']
+        connection.creation.create_test_db(verbosity=0, autoclobber=True, keepdb=options['keepdb'])
+        try:
+            results = self.measure(options)
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0, keepdb=options['keepdb'])
+            teardown_test_environment()
+
+        if options['update_baseline']:
+            # Un 5xx en el baseline deja la ruta sin control de consultas ni tamaño
+            errors = sorted(route for route, metrics in results.items() if metrics['status'] >= 500)
+            if errors:
+                raise CommandError(f'No se guarda un baseline con errores 5xx: {", ".join(errors)}')
+            benchmark.save_baseline(path, options['scale'], results)
+            self.stdout.write(self.style.SUCCESS(f'✅ Baseline guardado en {path} ({len(results)} endpoints)'))
+            return
+
+        baseline = benchmark.load_baseline(path)
+        if baseline.get('vendor') != connection.vendor:
+            self.stdout.write(self.style.WARNING(
+                f'⚠️  Baseline grabado en {baseline.get("vendor")}, corrida en {connection.vendor}'
+            ))
+        endpoints = baseline['endpoints']
+        if options['only']:
+            endpoints = {k: v for k, v in endpoints.items() if k.startswith(options['only'])}
+        problems = benchmark.compare(
+            endpoints, results,
+            threshold=options['threshold'],
+            time_threshold=None if options['no_time'] else options['time_threshold'],
+        )
+        for template in sorted(set(results) - set(endpoints)):
+            self.stdout.write(self.style.WARNING(f'⚠️  {template}: sin baseline'))
+
+        if problems:
+            for problem in problems:
+                self.stdout.write(self.style.ERROR(f'❌ {problem}'))
+            raise CommandError(f'{len(problems)} regresiones respecto de {path}')
+        self.stdout.write(self.style.SUCCESS(f'✅ Sin regresiones en {len(results)} endpoints'))
+
+    def measure(self, options):
+        from apps.users.models import User
+
+        if not scale.has_data():
+            self.stdout.write(f'Generando datos ({options["scale"]})...')
+            start = time.perf_counter()
+            scale.seed(**scale.SCALES[options['scale']], seed=options['seed'], log=self.stdout.write)
+            self.stdout.write(f'  {time.perf_counter() - start:.1f} s')
+
+        admin = User.objects.get(username=f'{scale.PREFIX}_admin')
+        results = benchmark.run(admin, only=options['only'], repeat=options['repeat'])
+
+        for template, metrics in sorted(results.items()):
+            self.stdout.write(
+                f'  {metrics["status"]} {metrics["queries"]:4d} q {metrics["time_ms"]:9.2f} ms '
+                f'{metrics["bytes"]:9d} B  {template}'
+            )
+        return results
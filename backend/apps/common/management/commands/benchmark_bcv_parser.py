@@ -0,0 +1,45 @@
+"""
+Management command de benchmark del parser de la tasa BCV
+Mide cada motor disponible sobre el HTML de ejemplo en apps/common/fixtures
+
+Ejemplo:
+    python manage.py benchmark_bcv_parser --iterations 2000
+"""
+import time
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.common.exchange_rates import PARSERS, parse_bcv_html
+
+FIXTURE = Path(__file__).resolve().parents[2] / 'fixtures' / 'bcv_home.html'
+
+
+class Command(BaseCommand):
+    help = 'Benchmark del parser de la tasa BCV sobre un HTML local'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=1000, help='Repeticiones por motor')
+        parser.add_argument('--file', default=str(FIXTURE), help='HTML a parsear (por defecto la copia local de bcv.org.ve)')
+
+    def handle(self, *args, **options):
+        html = Path(options['file']).read_text(encoding='utf-8')
+        iterations = options['iterations']
+
+        expected = parse_bcv_html(html)
+        if expected[0] is None:
+            raise CommandError('El HTML no contiene la tasa USD')
+        self.stdout.write(f'{len(html) / 1024:.1f} KB, tasa {expected[0]} ({expected[1]})')
+
+        for name, parse in PARSERS.items():
+            if parse(html) != expected:
+                raise CommandError(f'{name}: resultado distinto a parse_bcv_html')
+
+            start = time.perf_counter()
+            for _ in range(iterations):
+                parse(html)
+            elapsed = time.perf_counter() - start
+
+            self.stdout.write(f'  {name:<6} {elapsed / iterations * 1_000_000:8.1f} µs/parse')
+
+        self.stdout.write(self.style.SUCCESS('✅ Benchmark completado'))
@@ -0,0 +1,88 @@
+"""
+Management command para auditar los planes de las consultas calientes
+Ejecuta EXPLAIN sobre cada consulta de apps.common.query_catalog y marca
+los recorridos secuenciales (tablas sin índice aplicable)
+
+Ejemplo:
+    python manage.py explain_queries --verbose
+    python manage.py explain_queries --disable-seqscan --fail-on-seqscan
+"""
+import re
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from apps.common.query_catalog import get_catalog, sample_params
+
+# PostgreSQL: "Seq Scan on payments"; SQLite: "SCAN payments" (sin "USING ... INDEX")
+SEQ_SCAN_PATTERNS = {
+    'postgresql': re.compile(r'Seq Scan on (\w+)'),
+    'sqlite': re.compile(r'\bSCAN (\w+)'),
+}
+
+
+def find_seq_scans(plan, vendor):
+    """Retorna las tablas que el plan recorre completas."""
+    pattern = SEQ_SCAN_PATTERNS.get(vendor)
+    if pattern is None:
+        return []
+    scans = []
+    for line in plan.splitlines():
+        match = pattern.search(line)
+        if match and 'INDEX' not in line.upper():
+            scans.append(match.group(1))
+    return scans
+
+
+class Command(BaseCommand):
+    help = 'Ejecuta EXPLAIN sobre las consultas calientes y reporta recorridos secuenciales'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--verbose', action='store_true', help='Mostrar el plan completo de cada consulta')
+        parser.add_argument(
+            '--disable-seqscan',
+            action='store_true',
+            help='PostgreSQL: SET enable_seqscan = off, para ver si existe un índice aplicable aun con tablas pequeñas'
+        )
+        parser.add_argument('--fail-on-seqscan', action='store_true', help='Terminar con error si hay recorridos secuenciales')
+        parser.add_argument('--only', help='Prefijo de las consultas a revisar (p. ej. payments.)')
+
+    def handle(self, *args, **options):
+        vendor = connection.vendor
+        params = sample_params()
+        catalog = [q for q in get_catalog() if not options['only'] or q.name.startswith(options['only'])]
+        flagged = []
+
+        # Transacción con rollback para que SET enable_seqscan no quede en la conexión
+        with transaction.atomic():
+            if options['disable_seqscan'] and vendor == 'postgresql':
+                with connection.cursor() as cursor:
+                    cursor.execute('SET LOCAL enable_seqscan = off')
+
+            for query in catalog:
+                plan = query.build(params).explain()
+                scans = [t for t in find_seq_scans(plan, vendor) if t not in query.allow_scans]
+
+                if scans:
+                    flagged.append(query.name)
+                    self.stdout.write(self.style.WARNING(
+                        f'⚠️  {query.name}: recorrido secuencial en {", ".join(sorted(set(scans)))}  [{query.source}]'
+                    ))
+                else:
+                    self.stdout.write(f'✓ {query.name}  [{query.source}]')
+
+                if options['verbose']:
+                    for line in plan.splitlines():
+                        self.stdout.write(f'    {line}')
+
+            transaction.set_rollback(True)
+
+        if flagged:
+            message = f'{len(flagged)} de {len(catalog)} consultas con recorridos secuenciales'
+            if vendor == 'postgresql' and not options['disable_seqscan']:
+                message += ' (en tablas pequeñas el planner puede preferirlos; probar con --disable-seqscan)'
+            if options['fail_on_seqscan']:
+                raise CommandError(message)
+            self.stdout.write(self.style.WARNING(message))
+        else:
+            self.stdout.write(self.style.SUCCESS(f'✅ {len(catalog)} consultas usan índices'))
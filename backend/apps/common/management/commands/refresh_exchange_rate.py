@@ -0,0 +1,24 @@
+"""
+Management command para actualizar la tasa de cambio BCV
+También corre cada hora como trabajo programado (manage.py run_scheduler); con
+BCV_BACKGROUND_REFRESH=False ninguna petición dispara la descarga
+
+Ejemplo:
+    python manage.py refresh_exchange_rate
+"""
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.common.exchange_rates import refresh_rate
+
+
+class Command(BaseCommand):
+    help = 'Descarga la tasa USD del BCV y la guarda como última tasa válida'
+
+    def handle(self, *args, **options):
+        data = refresh_rate()
+        if data is None:
+            raise CommandError('No se pudo obtener la tasa del BCV; se conserva la última tasa guardada')
+
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ Tasa USD: {data['usd_rate']} (fecha valor: {data['date'] or 'sin fecha'})"
+        ))
@@ -0,0 +1,82 @@
+"""
+Management command que ejecuta los trabajos programados
+Un proceso por nodo; varios nodos pueden correrlo a la vez (cada trabajo
+lo toma uno solo)
+
+Ejemplo:
+    python manage.py run_scheduler               # bucle
+    python manage.py run_scheduler --once        # una vuelta (p. ej. desde cron)
+    python manage.py run_scheduler --job renewal_reminders
+    python manage.py run_scheduler --list
+"""
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections
+from django.utils import timezone
+
+from apps.common import scheduler
+from apps.common.models import ScheduledJob
+
+
+class Command(BaseCommand):
+    help = 'Ejecuta los trabajos periódicos vencidos (mantenimiento, recordatorios, tasa BCV)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help='Una sola vuelta y salir')
+        parser.add_argument('--interval', type=int, help='Segundos entre vueltas (por defecto SCHEDULER_POLL_INTERVAL)')
+        parser.add_argument('--job', help='Ejecutar este trabajo ahora, aunque no esté vencido')
+        parser.add_argument('--list', action='store_true', help='Listar los trabajos y su última ejecución')
+
+    def handle(self, *args, **options):
+        if options['list']:
+            return self.list_jobs()
+        if options['job']:
+            return self.run_one(options['job'])
+
+        interval = options['interval'] or settings.SCHEDULER_POLL_INTERVAL
+        if interval < 1:
+            raise CommandError('--interval debe ser mayor que 0')
+
+        self.stdout.write(f'Scheduler en {scheduler.node_name()} ({len(scheduler.get_jobs())} trabajos)')
+        try:
+            while True:
+                close_old_connections()
+                for run in scheduler.run_pending():
+                    self.report(run)
+                if options['once']:
+                    break
+                time.sleep(interval)
+        except KeyboardInterrupt:
+            self.stdout.write('Scheduler detenido')
+
+    def run_one(self, name):
+        if name not in scheduler.get_jobs():
+            raise CommandError(f"Trabajo desconocido: {name} (disponibles: {', '.join(sorted(scheduler.get_jobs()))})")
+        scheduler.sync_jobs()
+        run = scheduler.run_job(name, force=True)
+        if run is None:
+            raise CommandError(f'{name} está desactivado o en ejecución en otro nodo')
+        self.report(run)
+        if run.status == 'failed':
+            raise CommandError(run.error.strip().splitlines()[-1])
+
+    def report(self, run):
+        line = f'{run.job.name}: {run.duration_ms} ms, filas={run.rows if run.rows is not None else "-"}'
+        if run.status == 'success':
+            self.stdout.write(self.style.SUCCESS(f'✅ {line}'))
+        else:
+            self.stdout.write(self.style.ERROR(f'❌ {line}: {run.error.strip().splitlines()[-1]}'))
+
+    def list_jobs(self):
+        scheduler.sync_jobs()
+        jobs = scheduler.get_jobs()
+        for row in ScheduledJob.objects.all():
+            status = row.get_last_status_display() or 'nunca'
+            last = f'{timezone.localtime(row.last_run_at):%Y-%m-%d %H:%M} ({status}, {row.last_duration_ms} ms)' if row.last_run_at else status
+            upcoming = f'{timezone.localtime(row.next_run_at):%Y-%m-%d %H:%M}' if row.next_run_at else 'siguiente vuelta'
+            state = '' if row.enabled else ' [desactivado]'
+            description = jobs[row.name].description if row.name in jobs else '(no registrado)'
+            self.stdout.write(f'{row.name}{state}: cada {row.interval_seconds}s, última {last}, próxima: {upcoming}')
+            self.stdout.write(f'    {description}')
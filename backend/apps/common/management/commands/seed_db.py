@@ -3,6 +3,7 @@ import importlib
 from django.core.management.base import BaseCommand
 from django.conf import settings
 from django.db import transaction
+from apps.common.bulk import bulk_operation
 
 class Command(BaseCommand):
     help = 'Poblar la base de datos con datos iniciales (Seeders)'
@@ -26,7 +27,8 @@ class Command(BaseCommand):
             try:
                 module = importlib.import_module(module_name)
                 if hasattr(module, 'seed'):
-                    with transaction.atomic():
+                    # Auditoría y notificaciones en un lote por seeder
+                    with transaction.atomic(), bulk_operation():
                         result = module.seed()
                     self.stdout.write(self.style.SUCCESS(f"[OK] {seeder_name} completado"))
                 else:
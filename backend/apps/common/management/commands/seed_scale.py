@@ -0,0 +1,60 @@
+"""
+Management command para generar datos a escala (apps.common.seeds.scale)
+Miembros, membresías, pagos, clases, reservas, accesos, sesiones de
+entrenamiento y métricas con bulk_create por lotes, o COPY en PostgreSQL.
+
+Ejemplo:
+    python manage.py seed_scale                                  # escala ci
+    python manage.py seed_scale --scale full --copy              # ~2.5M filas en PostgreSQL
+    python manage.py seed_scale --members 50000 --payments 5000000 --seed 42
+"""
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from apps.common.seeds import scale
+
+COUNTS = ('members', 'classes_per_week', 'weeks', 'payments', 'access_logs', 'workout_sessions', 'metrics')
+
+
+class Command(BaseCommand):
+    help = 'Genera un conjunto de datos grande y reproducible para profiling y benchmarks'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scale', choices=sorted(scale.SCALES), default='ci', help='Volúmenes base')
+        for name in COUNTS:
+            parser.add_argument(f'--{name.replace("_", "-")}', type=int, help=f'Sobrescribe {name} de la escala')
+        parser.add_argument('--seed', type=int, default=0, help='Semilla: la misma semilla genera los mismos datos')
+        parser.add_argument(
+            '--batch-size', type=int,
+            help=f'Filas por INSERT (por defecto {scale.BATCH_SIZE}) o COPY ({scale.COPY_BATCH_SIZE})'
+        )
+        parser.add_argument('--copy', action='store_true', help='Cargar con COPY FROM STDIN (solo PostgreSQL)')
+
+    def handle(self, *args, **options):
+        if options['copy'] and connection.vendor != 'postgresql':
+            raise CommandError('--copy requiere PostgreSQL')
+        if scale.has_data():
+            raise CommandError(
+                f'Ya hay datos a escala (usuarios {scale.PREFIX}_*); usar una base de datos vacía'
+            )
+
+        counts = dict(scale.SCALES[options['scale']])
+        counts.update({name: options[name] for name in COUNTS if options[name] is not None})
+        self.stdout.write(', '.join(f'{name}={value}' for name, value in counts.items()))
+
+        start = time.perf_counter()
+        created = scale.seed(
+            **counts,
+            seed=options['seed'],
+            batch_size=options['batch_size'],
+            copy=options['copy'],
+            log=self.stdout.write,
+        )
+        elapsed = time.perf_counter() - start
+
+        total = sum(created.values())
+        self.stdout.write(self.style.SUCCESS(
+            f'✅ {total} filas en {elapsed:.1f} s ({total / elapsed:,.0f} filas/s)'
+        ))
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-17 18:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ExchangeRate',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('currency', models.CharField(max_length=3, unique=True, verbose_name='Moneda')),
+                ('rate', models.DecimalField(decimal_places=8, max_digits=18, verbose_name='Tasa (Bs por unidad)')),
+                ('rate_date', models.DateField(blank=True, null=True, verbose_name='Fecha valor')),
+                ('source', models.CharField(default='bcv.org.ve', max_length=100, verbose_name='Fuente')),
+                ('fetched_at', models.DateTimeField(verbose_name='Obtenida el')),
+            ],
+            options={
+                'verbose_name': 'Tasa de cambio',
+                'verbose_name_plural': 'Tasas de cambio',
+            },
+        ),
+    ]
@@ -0,0 +1,53 @@
+# Generated by Django 5.2.18 on 2026-10-17 19:13
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('common', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ScheduledJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, unique=True, verbose_name='Nombre')),
+                ('interval_seconds', models.PositiveIntegerField(verbose_name='Intervalo (segundos)')),
+                ('enabled', models.BooleanField(default=True, verbose_name='Activo')),
+                ('next_run_at', models.DateTimeField(blank=True, help_text='Vacío: se ejecuta en la próxima vuelta del scheduler', null=True, verbose_name='Próxima ejecución')),
+                ('locked_until', models.DateTimeField(blank=True, null=True, verbose_name='Bloqueado hasta')),
+                ('locked_by', models.CharField(blank=True, max_length=200, verbose_name='Bloqueado por')),
+                ('last_run_at', models.DateTimeField(blank=True, null=True, verbose_name='Última ejecución')),
+                ('last_status', models.CharField(blank=True, choices=[('success', 'Exitoso'), ('failed', 'Fallido')], max_length=20, verbose_name='Último estado')),
+                ('last_duration_ms', models.PositiveIntegerField(blank=True, null=True, verbose_name='Última duración (ms)')),
+            ],
+            options={
+                'verbose_name': 'Trabajo programado',
+                'verbose_name_plural': 'Trabajos programados',
+                'ordering': ['name'],
+            },
+        ),
+        migrations.CreateModel(
+            name='JobRun',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('started_at', models.DateTimeField(verbose_name='Inicio')),
+                ('duration_ms', models.PositiveIntegerField(verbose_name='Duración (ms)')),
+                ('status', models.CharField(choices=[('success', 'Exitoso'), ('failed', 'Fallido')], max_length=20, verbose_name='Estado')),
+                ('rows', models.PositiveIntegerField(blank=True, null=True, verbose_name='Filas procesadas')),
+                ('error', models.TextField(blank=True, verbose_name='Error')),
+                ('node', models.CharField(blank=True, max_length=200, verbose_name='Nodo')),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='runs', to='common.scheduledjob', verbose_name='Trabajo')),
+            ],
+            options={
+                'verbose_name': 'Ejecución de trabajo',
+                'verbose_name_plural': 'Ejecuciones de trabajos',
+                'ordering': ['-started_at'],
+                'indexes': [models.Index(fields=['job', '-started_at'], name='common_jobr_job_id_6dbf3f_idx'), models.Index(fields=['started_at'], name='common_jobr_started_e0909c_idx')],
+            },
+        ),
+    ]
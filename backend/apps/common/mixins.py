@@ -0,0 +1,90 @@
+"""
+Mixins comunes para ViewSets
+Sistema de Gestión de Gimnasio
+"""
+import hashlib
+
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
+
+
+class ConditionalGetMixin:
+    """
+    GET condicional (ETag / Last-Modified) para ViewSets de lectura frecuente.
+
+    Antes de serializar calcula max(updated_at) y la cantidad de filas del
+    queryset filtrado en una sola consulta. Si el cliente envía el mismo ETag
+    (If-None-Match) se responde 304 sin serializar nada.
+
+    La cantidad de filas detecta eliminaciones, que no cambian max(updated_at);
+    por eso los listados solo usan ETag y Last-Modified se envía en el detalle.
+
+    Atributos:
+        last_modified_fields: Campos de fecha a considerar, incluidos los de
+            relaciones que aparecen en la respuesta (p. ej. 'class_type__updated_at')
+        conditional_actions: Acciones con GET condicional
+    """
+    last_modified_fields = ('updated_at',)
+    conditional_actions = ('list', 'retrieve')
+
+    def get_conditional_queryset(self):
+        queryset = self.filter_queryset(self.get_queryset())
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        if lookup_url_kwarg in self.kwargs:
+            queryset = queryset.filter(**{self.lookup_field: self.kwargs[lookup_url_kwarg]})
+        return queryset.order_by()
+
+    def get_conditional_state(self):
+        """
+        Returns:
+            tuple: (etag, last_modified) o (None, None) si no aplica
+        """
+        aggregates = {f'last_{i}': Max(field) for i, field in enumerate(self.last_modified_fields)}
+        state = self.get_conditional_queryset().aggregate(rows=Count('pk'), **aggregates)
+
+        if self.action == 'retrieve' and not state['rows']:
+            return None, None  # Dejar que la vista responda 404
+
+        dates = [state[key] for key in aggregates if state[key] is not None]
+        last_modified = max(dates) if dates else None
+
+        fingerprint = '|'.join([
+            self.request.get_full_path(),
+            str(self.request.user.pk),
+            str(state['rows']),
+            *(str(state[key]) for key in aggregates),
+        ])
+        etag = quote_etag(hashlib.md5(fingerprint.encode(), usedforsecurity=False).hexdigest())
+
+        if self.action != 'retrieve':
+            last_modified = None
+        return etag, last_modified
+
+    def dispatch_conditional(self, handler, request, *args, **kwargs):
+        if request.method not in ('GET', 'HEAD') or self.action not in self.conditional_actions:
+            return handler(request, *args, **kwargs)
+
+        etag, last_modified = self.get_conditional_state()
+        if etag is None:
+            return handler(request, *args, **kwargs)
+
+        timestamp = int(last_modified.timestamp()) if last_modified else None
+        response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+        if response is None:
+            response = handler(request, *args, **kwargs)
+            if response.status_code != 200:
+                return response
+
+        response['ETag'] = etag
+        if timestamp is not None:
+            response['Last-Modified'] = http_date(timestamp)
+        # El navegador puede guardar la respuesta pero debe revalidarla siempre
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.dispatch_conditional(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.dispatch_conditional(super().retrieve, request, *args, **kwargs)
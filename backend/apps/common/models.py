@@ -0,0 +1,154 @@
+"""
+Modelos Comunes
+Sistema de Gestión de Gimnasio
+"""
+from django.db import models
+
+
+class ExchangeRate(models.Model):
+    """Última tasa de cambio válida obtenida de la fuente oficial (BCV)"""
+
+    currency = models.CharField(
+        max_length=3,
+        unique=True,
+        verbose_name='Moneda'
+    )
+    rate = models.DecimalField(
+        max_digits=18,
+        decimal_places=8,
+        verbose_name='Tasa (Bs por unidad)'
+    )
+    rate_date = models.DateField(
+        null=True,
+        blank=True,
+        verbose_name='Fecha valor'
+    )
+    source = models.CharField(
+        max_length=100,
+        default='bcv.org.ve',
+        verbose_name='Fuente'
+    )
+    fetched_at = models.DateTimeField(
+        verbose_name='Obtenida el'
+    )
+
+    class Meta:
+        verbose_name = 'Tasa de cambio'
+        verbose_name_plural = 'Tasas de cambio'
+
+    def __str__(self):
+        return f"{self.currency} {self.rate} ({self.fetched_at:%Y-%m-%d %H:%M})"
+
+
+class ScheduledJob(models.Model):
+    """
+    Trabajo periódico registrado en apps.common.scheduler.
+    La fila guarda la programación (editable desde el admin) y el bloqueo
+    que garantiza que un solo nodo lo ejecute a la vez.
+    """
+
+    STATUS_CHOICES = [
+        ('success', 'Exitoso'),
+        ('failed', 'Fallido'),
+    ]
+
+    name = models.CharField(
+        max_length=100,
+        unique=True,
+        verbose_name='Nombre'
+    )
+    interval_seconds = models.PositiveIntegerField(
+        verbose_name='Intervalo (segundos)'
+    )
+    enabled = models.BooleanField(
+        default=True,
+        verbose_name='Activo'
+    )
+    next_run_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name='Próxima ejecución',
+        help_text='Vacío: se ejecuta en la próxima vuelta del scheduler'
+    )
+    locked_until = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name='Bloqueado hasta'
+    )
+    locked_by = models.CharField(
+        max_length=200,
+        blank=True,
+        verbose_name='Bloqueado por'
+    )
+    last_run_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name='Última ejecución'
+    )
+    last_status = models.CharField(
+        max_length=20,
+        choices=STATUS_CHOICES,
+        blank=True,
+        verbose_name='Último estado'
+    )
+    last_duration_ms = models.PositiveIntegerField(
+        null=True,
+        blank=True,
+        verbose_name='Última duración (ms)'
+    )
+
+    class Meta:
+        verbose_name = 'Trabajo programado'
+        verbose_name_plural = 'Trabajos programados'
+        ordering = ['name']
+
+    def __str__(self):
+        return self.name
+
+
+class JobRun(models.Model):
+    """Historial de ejecuciones de los trabajos programados"""
+
+    job = models.ForeignKey(
+        ScheduledJob,
+        on_delete=models.CASCADE,
+        related_name='runs',
+        verbose_name='Trabajo'
+    )
+    started_at = models.DateTimeField(
+        verbose_name='Inicio'
+    )
+    duration_ms = models.PositiveIntegerField(
+        verbose_name='Duración (ms)'
+    )
+    status = models.CharField(
+        max_length=20,
+        choices=ScheduledJob.STATUS_CHOICES,
+        verbose_name='Estado'
+    )
+    rows = models.PositiveIntegerField(
+        null=True,
+        blank=True,
+        verbose_name='Filas procesadas'
+    )
+    error = models.TextField(
+        blank=True,
+        verbose_name='Error'
+    )
+    node = models.CharField(
+        max_length=200,
+        blank=True,
+        verbose_name='Nodo'
+    )
+
+    class Meta:
+        verbose_name = 'Ejecución de trabajo'
+        verbose_name_plural = 'Ejecuciones de trabajos'
+        ordering = ['-started_at']
+        indexes = [
+            models.Index(fields=['job', '-started_at']),
+            models.Index(fields=['started_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.job} {self.started_at:%Y-%m-%d %H:%M} ({self.get_status_display()})"
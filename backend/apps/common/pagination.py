@@ -0,0 +1,165 @@
+"""
+Paginación de listados
+Sistema de Gestión de Gimnasio
+
+KeysetPagination para tablas que solo crecen (auditoría, accesos,
+notificaciones, pagos, logs de ejercicios, mediciones):
+
+- ?page=N (por defecto): paginación por número de página de siempre, con
+  COUNT(*) y OFFSET; el costo crece con N.
+- ?cursor= (vacío para la primera página): paginación por clave (fecha, id).
+  Cada página filtra "después de la última fila vista" sobre el índice de la
+  fecha, así que la página N cuesta lo mismo que la primera, y no hay COUNT.
+- ?count=approx (en cualquiera de los dos modos): agrega el total aproximado
+  (estimación del planificador en PostgreSQL, o un COUNT guardado en caché)
+  para las pantallas que necesitan mostrar totales.
+
+La vista indica el campo de fecha con `cursor_ordering` (p. ej. '-timestamp');
+en modo cursor el orden siempre es (campo, id), sin importar ?ordering=.
+"""
+import base64
+import hashlib
+import json
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import Q
+from django.utils.functional import cached_property
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+def _planner_rows(queryset, connection):
+    """Filas que estima el planificador de PostgreSQL para el queryset."""
+    sql, params = queryset.query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]['Plan']['Plan Rows'])
+
+
+def approximate_count(queryset):
+    """
+    Cantidad aproximada de filas de un queryset sin contarlas en cada request.
+
+    En PostgreSQL se usa la estimación del planificador (EXPLAIN); si estima
+    menos de PAGINATION_EXACT_COUNT_BELOW filas se cuenta exacto, que es barato
+    y evita estimaciones malas en tablas chicas. En otros motores se cuenta
+    exacto y se guarda en caché PAGINATION_COUNT_CACHE_TTL segundos.
+    """
+    queryset = queryset.order_by()
+    connection = connections[queryset.db]
+    if connection.vendor == 'postgresql':
+        estimate = _planner_rows(queryset, connection)
+        return estimate if estimate >= settings.PAGINATION_EXACT_COUNT_BELOW else queryset.count()
+
+    sql, params = queryset.query.sql_with_params()
+    key = 'pagination:count:' + hashlib.md5(f'{sql}|{params}'.encode(), usedforsecurity=False).hexdigest()
+    count = cache.get(key)
+    if count is None:
+        count = queryset.count()
+        cache.set(key, count, settings.PAGINATION_COUNT_CACHE_TTL)
+    return count
+
+
+class ApproximateCountPaginator(Paginator):
+    """Paginator de Django con count aproximado (ver approximate_count)."""
+
+    @cached_property
+    def count(self):
+        return approximate_count(self.object_list)
+
+
+class KeysetPagination(PageNumberPagination):
+    """
+    Paginación por número de página o por cursor (fecha, id); ver el docstring del módulo.
+
+    Atributos de la vista:
+        cursor_ordering: Campo de fecha del cursor, con '-' para orden descendente
+    """
+    cursor_query_param = 'cursor'
+    count_query_param = 'count'
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.approximate = request.query_params.get(self.count_query_param) == 'approx'
+        self.keyset = self.cursor_query_param in request.query_params
+        if not self.keyset:
+            self.django_paginator_class = ApproximateCountPaginator if self.approximate else Paginator
+            return super().paginate_queryset(queryset, request, view)
+
+        ordering = view.cursor_ordering
+        self.field = queryset.model._meta.get_field(ordering.lstrip('-'))
+        page_size = self.get_page_size(request)
+        position, reverse = self.decode_cursor(request)
+        self.total = approximate_count(queryset) if self.approximate else None
+
+        # "Hacia adelante" es hacia abajo si el orden es descendente; el cursor previous invierte el sentido
+        descending = ordering.startswith('-') != reverse
+        name = self.field.name
+        lookup = 'lt' if descending else 'gt'
+        queryset = queryset.order_by(*((f'-{name}', '-pk') if descending else (name, 'pk')))
+        if position is not None:
+            value, pk = position
+            queryset = queryset.filter(Q(**{f'{name}__{lookup}': value}) | Q(**{name: value, f'pk__{lookup}': pk}))
+
+        rows = list(queryset[:page_size + 1])
+        has_more = len(rows) > page_size
+        rows = rows[:page_size]
+        if reverse:
+            rows.reverse()
+            has_next, has_previous = True, has_more
+        else:
+            has_next, has_previous = has_more, position is not None
+
+        self.next_position = self.row_position(rows[-1]) if rows and has_next else None
+        self.previous_position = self.row_position(rows[0]) if rows and has_previous else None
+        return rows
+
+    def row_position(self, row):
+        return self.field.value_to_string(row), row.pk
+
+    def decode_cursor(self, request):
+        """(posición, reverse) del cursor; posición None en la primera página."""
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None, False
+        try:
+            data = json.loads(base64.urlsafe_b64decode(encoded.encode()))
+            value = self.field.to_python(data['v'])
+            return (value, int(data['pk'])), bool(data.get('r'))
+        except (ValueError, TypeError, KeyError, ValidationError):
+            raise NotFound('Cursor inválido')
+
+    def encode_cursor(self, position, reverse=False):
+        value, pk = position
+        data = json.dumps({'v': value, 'pk': pk, 'r': int(reverse)}, separators=(',', ':'))
+        url = remove_query_param(self.request.build_absolute_uri(), self.page_query_param)
+        return replace_query_param(url, self.cursor_query_param, base64.urlsafe_b64encode(data.encode()).decode())
+
+    def get_next_link(self):
+        if not self.keyset:
+            return super().get_next_link()
+        return self.encode_cursor(self.next_position) if self.next_position else None
+
+    def get_previous_link(self):
+        if not self.keyset:
+            return super().get_previous_link()
+        return self.encode_cursor(self.previous_position, reverse=True) if self.previous_position else None
+
+    def get_paginated_response(self, data):
+        if not self.keyset:
+            return super().get_paginated_response(data)
+        body = {'next': self.get_next_link(), 'previous': self.get_previous_link(), 'results': data}
+        if self.total is not None:
+            body['count'] = self.total
+        return Response(body)
@@ -0,0 +1,165 @@
+"""
+Catálogo de consultas calientes
+Sistema de Gestión de Gimnasio
+
+Reproduce los filtros que usan las vistas y servicios más frecuentes, para
+revisar con EXPLAIN (manage.py explain_queries) que cada uno tenga índice.
+Al agregar una consulta frecuente nueva, agregarla aquí.
+"""
+from datetime import timedelta
+
+from django.utils import timezone
+
+from apps.common.dates import day_bounds
+
+
+class CatalogQuery:
+    """
+    Args:
+        name: Identificador corto (app.consulta)
+        source: Vista o servicio que la ejecuta
+        build: Función que recibe los parámetros de ejemplo y retorna el queryset
+        allow_scans: Tablas pequeñas donde un recorrido completo es aceptable
+    """
+
+    def __init__(self, name, source, build, allow_scans=()):
+        self.name = name
+        self.source = source
+        self.build = build
+        self.allow_scans = tuple(allow_scans)
+
+
+def sample_params():
+    """Ids reales de la base de datos (o 1 si está vacía) para que el planner use estadísticas reales."""
+    from apps.members.models import Member
+    from apps.users.models import User
+    from apps.classes.models import GymClass
+    from apps.staff.models import Staff
+    from apps.analytics.models import MetricType
+
+    now = timezone.now()
+    return {
+        'now': now,
+        'today': timezone.localdate(),
+        'member_id': Member.objects.values_list('id', flat=True).first() or 1,
+        'user_id': User.objects.values_list('id', flat=True).first() or 1,
+        'gym_class_id': GymClass.objects.values_list('id', flat=True).first() or 1,
+        'staff_id': Staff.objects.values_list('id', flat=True).first() or 1,
+        'metric_type_id': MetricType.objects.values_list('id', flat=True).first() or 1,
+    }
+
+
+def get_catalog():
+    from apps.access.models import AccessLog
+    from apps.analytics.models import AthleteMetric
+    from apps.audit.models import AuditLog
+    from apps.classes.models import GymClass, Reservation
+    from apps.memberships.models import Membership
+    from apps.notifications.models import Notification
+    from apps.payments.models import Payment, DailyRevenueRollup
+
+    return [
+        CatalogQuery(
+            'classes.calendar',
+            'GymClassViewSet.list (?date_from&date_to)',
+            lambda p: GymClass.objects.filter(
+                start_datetime__gte=day_bounds(p['today'])[0],
+                start_datetime__lt=day_bounds(p['today'] + timedelta(days=6))[1]
+            ).order_by('start_datetime'),
+        ),
+        CatalogQuery(
+            'classes.trainer_upcoming',
+            'StaffViewSet.my_stats / my_classes',
+            lambda p: GymClass.objects.filter(
+                instructor_id=p['staff_id'], start_datetime__gte=p['now'], is_cancelled=False
+            ).order_by('start_datetime'),
+        ),
+        CatalogQuery(
+            'reservations.member_upcoming',
+            'UserViewSet.stats',
+            lambda p: Reservation.objects.filter(
+                member_id=p['member_id'],
+                status__in=['confirmed', 'waitlist'],
+                gym_class__start_datetime__gte=p['now']
+            ),
+        ),
+        CatalogQuery(
+            'reservations.waitlist_next',
+            'booking.promote_next',
+            lambda p: Reservation.objects.filter(
+                gym_class_id=p['gym_class_id'], status='waitlist'
+            ).order_by('waitlist_position'),
+        ),
+        CatalogQuery(
+            'payments.pending',
+            'PaymentViewSet.pending_count / list?status=pending',
+            lambda p: Payment.objects.filter(status='pending').order_by('-payment_date'),
+        ),
+        CatalogQuery(
+            'payments.completed_range',
+            'PaymentViewSet.export_report',
+            lambda p: Payment.objects.filter(
+                status='completed', payment_date__gte=p['now'] - timedelta(days=30)
+            ).order_by('-payment_date'),
+        ),
+        CatalogQuery(
+            'payments.member_history',
+            'PaymentViewSet.my_payments',
+            lambda p: Payment.objects.filter(member_id=p['member_id']).order_by('-payment_date'),
+        ),
+        CatalogQuery(
+            'payments.revenue_rollup',
+            'rollups.revenue_totals',
+            lambda p: DailyRevenueRollup.objects.filter(
+                status='completed', date__gte=p['today'].replace(day=1), date__lte=p['today']
+            ),
+        ),
+        CatalogQuery(
+            'memberships.expiring',
+            'MembershipViewSet.expiring / reminders.send_renewal_reminders',
+            lambda p: Membership.objects.filter(
+                status='active', end_date__gte=p['today'], end_date__lte=p['today'] + timedelta(days=7)
+            ),
+        ),
+        CatalogQuery(
+            'memberships.member_active',
+            'UserViewSet.stats',
+            lambda p: Membership.objects.filter(member_id=p['member_id'], status='active'),
+        ),
+        CatalogQuery(
+            'access.member_history',
+            'AccessLogViewSet.list?member_id',
+            lambda p: AccessLog.objects.filter(member_id=p['member_id']).order_by('-timestamp'),
+        ),
+        CatalogQuery(
+            'access.today',
+            'AccessLogViewSet.today',
+            lambda p: AccessLog.objects.filter(
+                timestamp__gte=day_bounds(p['today'])[0],
+                timestamp__lt=day_bounds(p['today'])[1],
+                access_type='entry'
+            ),
+        ),
+        CatalogQuery(
+            'notifications.unread',
+            'NotificationViewSet.unread_count',
+            lambda p: Notification.objects.filter(user_id=p['user_id'], is_read=False).order_by('-created_at'),
+        ),
+        CatalogQuery(
+            'notifications.inbox',
+            'NotificationViewSet.list',
+            lambda p: Notification.objects.filter(user_id=p['user_id']).order_by('-created_at'),
+        ),
+        CatalogQuery(
+            'analytics.metric_history',
+            'AthleteMetricViewSet.evolution',
+            lambda p: AthleteMetric.objects.filter(
+                member_id=p['member_id'], metric_type_id=p['metric_type_id']
+            ).order_by('-recorded_date'),
+        ),
+        CatalogQuery(
+            'audit.recent',
+            'AuditLogViewSet.list',
+            lambda p: AuditLog.objects.order_by('-timestamp')[:50],
+        ),
+    ]
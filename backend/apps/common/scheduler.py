@@ -0,0 +1,225 @@
+"""
+Trabajos programados
+Sistema de Gestión de Gimnasio
+
+Registro de tareas periódicas de mantenimiento que ejecuta
+manage.py run_scheduler, sin cron ni servicios externos.
+
+- Programación: cada trabajo registrado tiene una fila ScheduledJob con su
+  intervalo y próxima ejecución (editables desde el admin).
+- Un solo nodo por trabajo: antes de ejecutar, el nodo toma el trabajo con un
+  UPDATE condicional (locked_until vencido); el bloqueo expira solo si el nodo
+  muere, así que no hace falta limpiarlo a mano.
+- Historial: cada ejecución queda en JobRun con duración, filas procesadas y
+  el traceback si falló.
+
+Los trabajos retornan el número de filas procesadas (o None).
+"""
+import logging
+import os
+import socket
+import time
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+DAY = 24 * 60 * 60
+
+_registry = {}
+
+
+class Job:
+    def __init__(self, name, func, every, lock_timeout=None, description=''):
+        self.name = name
+        self.func = func
+        self.every = every
+        self.lock_timeout = lock_timeout
+        self.description = description
+
+    def get_lock_timeout(self):
+        return self.lock_timeout if self.lock_timeout is not None else settings.SCHEDULER_LOCK_TIMEOUT
+
+
+def register(name, every, lock_timeout=None):
+    """
+    Registra un trabajo periódico.
+
+    Args:
+        name: Nombre del trabajo (clave de ScheduledJob)
+        every: Intervalo en segundos (valor inicial; se puede cambiar en el admin)
+        lock_timeout: Segundos que el nodo retiene el trabajo (por defecto SCHEDULER_LOCK_TIMEOUT);
+            debe ser mayor que la duración esperada del trabajo
+    """
+    def decorator(func):
+        _registry[name] = Job(name, func, every, lock_timeout, (func.__doc__ or '').strip())
+        return func
+    return decorator
+
+
+def get_jobs():
+    return dict(_registry)
+
+
+def node_name():
+    return f'{socket.gethostname()}:{os.getpid()}'
+
+
+# ==================== TRABAJOS ====================
+
+@register('renewal_reminders', every=DAY)
+def renewal_reminders():
+    """Recordatorios de renovación de membresías"""
+    from apps.notifications.reminders import send_renewal_reminders
+    return send_renewal_reminders()['created']
+
+
+@register('abandonment_alerts', every=DAY)
+def abandonment_alerts():
+    """Alertas de abandono de miembros inactivos"""
+    from apps.access.abandonment import generate_alerts
+    return generate_alerts()['created']
+
+
+@register('refresh_exchange_rate', every=60 * 60, lock_timeout=5 * 60)
+def refresh_exchange_rate():
+    """Tasa de cambio USD del BCV"""
+    from apps.common.exchange_rates import refresh_rate
+    if refresh_rate() is None:
+        raise RuntimeError('No se pudo obtener la tasa del BCV; se conserva la última tasa guardada')
+    return 1
+
+
+@register('reconcile_class_counters', every=DAY)
+def reconcile_class_counters():
+    """Corrige contadores de cupos de clases desfasados"""
+    from apps.classes.counters import reconcile
+    return len(reconcile())
+
+
+@register('metric_snapshots', every=DAY)
+def metric_snapshots():
+    """Snapshots de métricas del período en curso y el anterior"""
+    from apps.analytics.snapshots import build_recent
+    return build_recent()
+
+
+@register('prune_job_runs', every=DAY)
+def prune_job_runs():
+    """Elimina el historial de ejecuciones más viejo que SCHEDULER_RUN_RETENTION_DAYS"""
+    from .models import JobRun
+    cutoff = timezone.now() - timedelta(days=settings.SCHEDULER_RUN_RETENTION_DAYS)
+    deleted, _ = JobRun.objects.filter(started_at__lt=cutoff).delete()
+    return deleted
+
+
+# ==================== EJECUCIÓN ====================
+
+def sync_jobs():
+    """Crea las filas de los trabajos registrados que aún no existen (una consulta)."""
+    from .models import ScheduledJob
+
+    ScheduledJob.objects.bulk_create(
+        [ScheduledJob(name=job.name, interval_seconds=job.every) for job in _registry.values()],
+        ignore_conflicts=True
+    )
+
+
+def _unlocked(now):
+    return Q(locked_until__isnull=True) | Q(locked_until__lt=now)
+
+
+def _due(now):
+    return Q(next_run_at__isnull=True) | Q(next_run_at__lte=now)
+
+
+def _acquire(job, node, now, force=False):
+    """Toma el trabajo si está libre (y vencido, salvo force). True si este nodo lo obtuvo."""
+    from .models import ScheduledJob
+
+    rows = ScheduledJob.objects.filter(_unlocked(now), name=job.name, enabled=True)
+    if not force:
+        rows = rows.filter(_due(now))
+    return rows.update(
+        locked_until=now + timedelta(seconds=job.get_lock_timeout()),
+        locked_by=node
+    ) == 1
+
+
+def run_job(name, force=False, node=None):
+    """
+    Ejecuta un trabajo si ningún otro nodo lo tiene tomado.
+
+    Args:
+        name: Nombre del trabajo registrado
+        force: Ejecutar aunque no esté vencido (sigue respetando el bloqueo)
+        node: Identificador del nodo (por defecto host:pid)
+
+    Returns:
+        JobRun | None: Ejecución registrada, o None si no se ejecutó
+    """
+    from .models import JobRun, ScheduledJob
+
+    job = _registry[name]
+    node = node or node_name()
+    if not _acquire(job, node, timezone.now(), force=force):
+        return None
+
+    started_at = timezone.now()
+    start = time.perf_counter()
+    rows, error = None, ''
+    try:
+        rows = job.func()
+    except Exception:
+        error = traceback.format_exc()
+        logger.exception('Trabajo programado %s falló', name)
+    duration_ms = int((time.perf_counter() - start) * 1000)
+    status = 'failed' if error else 'success'
+
+    scheduled = ScheduledJob.objects.get(name=name)
+    run = JobRun.objects.create(
+        job=scheduled,
+        started_at=started_at,
+        duration_ms=duration_ms,
+        status=status,
+        rows=rows,
+        error=error,
+        node=node,
+    )
+    # Liberar solo si el bloqueo sigue siendo de este nodo (pudo vencer y pasar a otro)
+    ScheduledJob.objects.filter(pk=scheduled.pk, locked_by=node).update(
+        locked_until=None,
+        locked_by='',
+        last_run_at=started_at,
+        last_status=status,
+        last_duration_ms=duration_ms,
+        next_run_at=started_at + timedelta(seconds=scheduled.interval_seconds),
+    )
+    return run
+
+
+def run_pending(node=None):
+    """
+    Ejecuta, uno tras otro, los trabajos vencidos que este nodo logre tomar.
+
+    Returns:
+        list: JobRun de los trabajos ejecutados
+    """
+    from .models import ScheduledJob
+
+    sync_jobs()
+    now = timezone.now()
+    due = ScheduledJob.objects.filter(
+        _due(now), _unlocked(now), enabled=True, name__in=list(_registry)
+    ).order_by('next_run_at', 'name').values_list('name', flat=True)
+
+    runs = []
+    for name in list(due):
+        run = run_job(name, node=node)
+        if run is not None:
+            runs.append(run)
+    return runs
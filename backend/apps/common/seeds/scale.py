@@ -0,0 +1,472 @@
+"""
+Datos a escala para benchmarks y profiling
+Sistema de Gestión de Gimnasio
+
+Genera volúmenes parecidos a producción (miles de miembros, cientos de
+clases por semana, millones de pagos y accesos) en segundos o pocos minutos:
+
+- Inserción por lotes, sin señales ni save() por fila; los agregados
+  derivados (rollup de ingresos, contadores de cupos, asistencia diaria,
+  snapshots de métricas) se reconstruyen al final con sus funciones de recálculo.
+- En PostgreSQL, bulk_create; con copy=True cada lote viaja en un
+  COPY ... FROM STDIN (varias veces más rápido en tablas de millones de filas).
+- En SQLite, un INSERT preparado con executemany (bulk_create queda limitado
+  a ~50 filas por sentencia por el tope de parámetros).
+- Un solo hash de contraseña para todos los usuarios ('benchmark').
+- Aleatoriedad con random.Random(seed): la misma semilla produce los mismos datos.
+
+Los usuarios generados empiezan con PREFIX, así se detecta si ya hay datos a escala.
+Ver manage.py seed_scale.
+"""
+import io
+import json
+import random
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+from functools import partial
+from itertools import islice
+from operator import attrgetter
+
+from django.contrib.auth.hashers import make_password
+from django.db import DEFAULT_DB_ALIAS, connection, connections, models, transaction
+from django.db.models import OuterRef, Subquery
+from django.utils import timezone
+
+SCALES = {
+    # Suficiente para que un N+1 se note y CI corra en segundos
+    'ci': {
+        'members': 200, 'classes_per_week': 50, 'weeks': 2, 'payments': 2_000, 'access_logs': 2_000,
+        'workout_sessions': 500, 'metrics': 2_000,
+    },
+    'full': {
+        'members': 10_000, 'classes_per_week': 500, 'weeks': 4, 'payments': 1_000_000,
+        'access_logs': 1_000_000, 'workout_sessions': 100_000, 'metrics': 200_000,
+    },
+}
+PREFIX = 'scale'
+PASSWORD = 'benchmark'
+BATCH_SIZE = 5000
+# Un COPY por lote: menos viajes y menos sentencias que INSERT (unos 6 MB de texto por lote)
+COPY_BATCH_SIZE = 50_000
+DAYS_OF_HISTORY = 365
+LOGS_PER_SESSION = 3
+PLAIN_FIELDS = {
+    'BooleanField', 'CharField', 'TextField', 'ForeignKey', 'OneToOneField',
+    'IntegerField', 'BigIntegerField', 'SmallIntegerField',
+    'PositiveIntegerField', 'PositiveSmallIntegerField', 'PositiveBigIntegerField',
+}
+# Campos que en COPY se escriben con str() / isoformat() sin escapar
+COPY_NUMBER_FIELDS = {
+    'ForeignKey', 'OneToOneField', 'IntegerField', 'BigIntegerField', 'SmallIntegerField',
+    'PositiveIntegerField', 'PositiveSmallIntegerField', 'PositiveBigIntegerField', 'DecimalField',
+}
+COPY_DATE_FIELDS = {'DateField', 'DateTimeField'}
+COPY_TEXT_FIELDS = {'CharField', 'TextField', 'EmailField', 'SlugField'}
+# Snapshots a reconstruir por tipo de período (un año de historia)
+SNAPSHOT_PERIODS = {'weekly': 53, 'monthly': 12, 'quarterly': 4, 'yearly': 1}
+
+
+def _batches(rows, size):
+    rows = iter(rows)
+    while True:
+        batch = list(islice(rows, size))
+        if not batch:
+            return
+        yield batch
+
+
+def _bulk(model, rows, batch_size=BATCH_SIZE):
+    """Inserta un iterable de instancias por lotes, sin cargarlo entero en memoria."""
+    total = 0
+    for batch in _batches(rows, batch_size):
+        model.objects.bulk_create(batch, batch_size=batch_size)
+        total += len(batch)
+    return total
+
+
+def _db_value(field, obj, db):
+    """Valor listo para el driver, como lo prepara bulk_create (incluye auto_now/auto_now_add)."""
+    value = field.pre_save(obj, True)
+    if isinstance(field, models.JSONField):
+        return None if value is None else json.dumps(value)
+    return field.get_db_prep_save(value, db)
+
+
+def _row_getter(fields, db):
+    """
+    Función instancia -> valores de la fila.
+
+    Los campos sin conversión (texto, enteros, booleanos, claves foráneas)
+    se leen directo del atributo; fechas, decimales y JSON pasan por
+    _db_value. En tablas de millones de filas es la mayor parte del tiempo.
+    """
+    getters = [
+        attrgetter(field.attname) if field.get_internal_type() in PLAIN_FIELDS
+        else partial(_db_value, field, db=db)
+        for field in fields
+    ]
+    return lambda obj: [getter(obj) for getter in getters]
+
+
+def _insert_columns(model):
+    """
+    Campos, función de fila, destino del INSERT/COPY y la conexión real.
+
+    Se resuelve connections[...] una vez: el proxy django.db.connection hace
+    una búsqueda thread-local por acceso, y aquí se accede una vez por valor.
+    """
+    db = connections[DEFAULT_DB_ALIAS]
+    fields = [field for field in model._meta.concrete_fields if not field.primary_key]
+    columns = ', '.join(db.ops.quote_name(field.column) for field in fields)
+    return fields, _row_getter(fields, db), f'{db.ops.quote_name(model._meta.db_table)} ({columns})', db
+
+
+def _executemany(model, rows, batch_size=BATCH_SIZE):
+    """
+    Como _bulk, con un solo INSERT preparado y executemany por lote.
+
+    En SQLite bulk_create parte cada lote en INSERTs de ~50 filas (límite de
+    999 parámetros) y compila el SQL de cada uno; executemany lo evita.
+    """
+    fields, row, target, db = _insert_columns(model)
+    sql = f'INSERT INTO {target} VALUES ({", ".join(["%s"] * len(fields))})'
+    total = 0
+    with db.cursor() as cursor:
+        for batch in _batches(rows, batch_size):
+            cursor.executemany(sql, [row(obj) for obj in batch])
+            total += len(batch)
+    return total
+
+
+def _copy_text(value):
+    """Valor en el formato de texto de COPY (\\N es NULL)."""
+    if value is None:
+        return '\\N'
+    if isinstance(value, bool):
+        return 't' if value else 'f'
+    if isinstance(value, (date, time)):
+        return value.isoformat()
+    return str(value).replace('\\', '\\\\').replace('\t', '\\t').replace('\n', '\\n').replace('\r', '\\r')
+
+
+def _copy_encoder(field, db):
+    """
+    Función instancia -> texto COPY de un campo.
+
+    PostgreSQL interpreta el texto de COPY, así que fechas, decimales y enteros
+    se escriben directo con isoformat() / str(), sin get_db_prep_save.
+    auto_now / auto_now_add se resuelven una vez (misma marca en toda la carga).
+    El resto pasa por _db_value y _copy_text.
+    """
+    kind = field.get_internal_type()
+    if getattr(field, 'auto_now', False) or getattr(field, 'auto_now_add', False):
+        text = _copy_text(timezone.now() if kind == 'DateTimeField' else date.today())
+        return lambda obj: text
+
+    attname = field.attname
+    if kind in COPY_NUMBER_FIELDS:
+        def encode(obj):
+            value = getattr(obj, attname)
+            return '\\N' if value is None else str(value)
+    elif kind in COPY_DATE_FIELDS:
+        def encode(obj):
+            value = getattr(obj, attname)
+            return '\\N' if value is None else value.isoformat()
+    elif kind == 'BooleanField':
+        def encode(obj):
+            value = getattr(obj, attname)
+            return '\\N' if value is None else ('t' if value else 'f')
+    elif kind in COPY_TEXT_FIELDS:
+        def encode(obj):
+            value = getattr(obj, attname)
+            if value is None:
+                return '\\N'
+            if '\\' in value or '\t' in value or '\n' in value or '\r' in value:
+                return _copy_text(value)
+            return value
+    else:
+        def encode(obj):
+            return _copy_text(_db_value(field, obj, db))
+    return encode
+
+
+def _copy(model, rows, batch_size=COPY_BATCH_SIZE):
+    """Como _bulk, pero cada lote viaja en un COPY FROM STDIN (solo PostgreSQL/psycopg2)."""
+    fields, _, target, db = _insert_columns(model)
+    encoders = [_copy_encoder(field, db) for field in fields]
+    sql = f'COPY {target} FROM STDIN'
+    total = 0
+    with db.cursor() as cursor:
+        for batch in _batches(rows, batch_size):
+            buffer = io.StringIO()
+            buffer.writelines(
+                '\t'.join([encode(obj) for encode in encoders]) + '\n' for obj in batch
+            )
+            buffer.seek(0)
+            cursor.copy_expert(sql, buffer)
+            total += len(batch)
+    return total
+
+
+def has_data():
+    from apps.users.models import User
+    return User.objects.filter(username__startswith=f'{PREFIX}_').exists()
+
+
+def seed(members, classes_per_week, weeks, payments, access_logs, workout_sessions=0, metrics=0,
+         seed=0, batch_size=None, copy=False, log=None):
+    """
+    Genera el conjunto de datos.
+
+    Args:
+        members: Miembros (cada uno con una membresía)
+        classes_per_week: Clases por semana
+        weeks: Semanas de clases desde el lunes de la semana en curso
+        payments: Pagos, repartidos en el último año
+        access_logs: Registros de acceso, repartidos en el último año
+        workout_sessions: Sesiones de entrenamiento, con LOGS_PER_SESSION ejercicios cada una
+        metrics: Mediciones de AthleteMetric, repartidas en el último año
+        seed: Semilla de random (mismos argumentos y semilla, mismos datos)
+        batch_size: Filas por INSERT o COPY (por defecto BATCH_SIZE, o COPY_BATCH_SIZE con copy)
+        copy: Usar COPY en lugar de INSERT (requiere PostgreSQL)
+        log: Función que recibe mensajes de avance (p. ej. self.stdout.write)
+
+    Returns:
+        dict: Filas creadas por tabla
+    """
+    from apps.access import attendance
+    from apps.access.models import AccessLog
+    from apps.analytics import snapshots
+    from apps.analytics.models import AthleteMetric, MetricType
+    from apps.classes import counters
+    from apps.classes.models import ClassType, GymClass, Reservation
+    from apps.members.models import Member
+    from apps.memberships.models import Membership, MembershipPlan
+    from apps.payments import rollups
+    from apps.payments.models import Payment
+    from apps.progress.models import ExerciseLog, WorkoutSession
+    from apps.staff.models import Staff
+    from apps.users.models import Role, User
+    from apps.workouts.models import Exercise, MuscleGroup
+
+    if copy and connection.vendor != 'postgresql':
+        raise ValueError('COPY solo está disponible en PostgreSQL')
+
+    rng = random.Random(seed)
+    log = log or (lambda message: None)
+    batch_size = batch_size or (COPY_BATCH_SIZE if copy else BATCH_SIZE)
+    if copy:
+        insert = _copy
+    elif connection.vendor == 'sqlite':
+        insert = _executemany
+    else:
+        # En PostgreSQL bulk_create ya arma INSERTs de miles de filas; executemany
+        # de psycopg2 haría un viaje por fila
+        insert = _bulk
+    now = timezone.now()
+    today = timezone.localdate()
+    tz = timezone.get_current_timezone()
+    created = {}
+
+    def random_moment(days):
+        return now - timedelta(seconds=rng.randrange(days * 24 * 60 * 60))
+
+    with transaction.atomic():
+        roles = {name: Role.objects.get_or_create(name=name)[0] for name in ('admin', 'trainer', 'member')}
+        password = make_password(PASSWORD)
+        trainers = max(10, members // 200)
+
+        def users():
+            yield User(
+                username=f'{PREFIX}_admin', email=f'{PREFIX}_admin@gym.com', password=password,
+                role=roles['admin'], is_staff=True, is_superuser=True
+            )
+            for i in range(trainers):
+                yield User(
+                    username=f'{PREFIX}_trainer_{i:05d}', email=f'{PREFIX}_trainer_{i:05d}@gym.com',
+                    password=password, role=roles['trainer'], first_name='Entrenador', last_name=str(i)
+                )
+            for i in range(members):
+                yield User(
+                    username=f'{PREFIX}_member_{i:06d}', email=f'{PREFIX}_member_{i:06d}@gym.com',
+                    password=password, role=roles['member'], first_name='Miembro', last_name=str(i)
+                )
+
+        created['users'] = insert(User, users(), batch_size)
+        trainer_user_ids = list(User.objects.filter(
+            username__startswith=f'{PREFIX}_trainer_').order_by('username').values_list('id', flat=True))
+        member_user_ids = list(User.objects.filter(
+            username__startswith=f'{PREFIX}_member_').order_by('username').values_list('id', flat=True))
+
+        created['staff'] = insert(Staff, (
+            Staff(user_id=user_id, staff_type='trainer', is_instructor=True, hire_date=today - timedelta(days=400))
+            for user_id in trainer_user_ids
+        ), batch_size)
+        created['members'] = insert(Member, (
+            Member(
+                user_id=user_id,
+                subscription_status='active',
+                joined_date=today - timedelta(days=rng.randrange(2 * DAYS_OF_HISTORY)),
+                last_access=random_moment(60),
+            )
+            for user_id in member_user_ids
+        ), batch_size)
+        staff_ids = list(Staff.objects.filter(
+            user_id__in=trainer_user_ids).order_by('id').values_list('id', flat=True))
+        member_ids = list(Member.objects.filter(
+            user_id__in=member_user_ids).order_by('id').values_list('id', flat=True))
+        log(f'  usuarios: {created["users"]}, miembros: {created["members"]}')
+
+        plans = [
+            MembershipPlan.objects.get_or_create(
+                name=f'Plan {name} ({PREFIX})', defaults={'price': Decimal(price), 'duration_days': days}
+            )[0]
+            for name, price, days in (('Mensual', '30.00', 30), ('Trimestral', '80.00', 90), ('Anual', '300.00', 365))
+        ]
+
+        def memberships():
+            for member_id in member_ids:
+                plan = rng.choice(plans)
+                start = today - timedelta(days=rng.randrange(plan.duration_days + 60))
+                end = start + timedelta(days=plan.duration_days)
+                yield Membership(
+                    member_id=member_id, plan=plan, start_date=start, end_date=end,
+                    status='active' if end >= today else 'expired'
+                )
+
+        created['memberships'] = insert(Membership, memberships(), batch_size)
+        membership_by_member = dict(Membership.objects.filter(
+            member_id__in=member_ids).values_list('member_id', 'id'))
+
+        class_types = [
+            ClassType.objects.get_or_create(name=f'{name} ({PREFIX})')[0]
+            for name in ('Spinning', 'Yoga', 'Funcional', 'Crossfit', 'Pilates')
+        ]
+        monday = today - timedelta(days=today.weekday())
+
+        def classes():
+            for week in range(weeks):
+                for i in range(classes_per_week):
+                    day = monday + timedelta(days=7 * week + i % 7)
+                    start = timezone.make_aware(datetime.combine(day, time(6 + i % 14)), tz)
+                    class_type = class_types[i % len(class_types)]
+                    yield GymClass(
+                        class_type=class_type, instructor_id=rng.choice(staff_ids), title=class_type.name,
+                        start_datetime=start, end_datetime=start + timedelta(hours=1), capacity=20
+                    )
+
+        created['classes'] = insert(GymClass, classes(), batch_size)
+        class_ids = list(GymClass.objects.filter(
+            class_type__in=class_types).order_by('id').values_list('id', flat=True))
+
+        def reservations():
+            for class_id in class_ids:
+                for member_id in rng.sample(member_ids, min(12, len(member_ids))):
+                    yield Reservation(gym_class_id=class_id, member_id=member_id, status='confirmed')
+
+        created['reservations'] = insert(Reservation, reservations(), batch_size)
+        log(f'  clases: {created["classes"]}, reservas: {created["reservations"]}')
+
+        methods = ['cash', 'card', 'transfer', 'mobile']
+
+        def payment_rows():
+            for _ in range(payments):
+                member_id = rng.choice(member_ids)
+                yield Payment(
+                    member_id=member_id,
+                    membership_id=membership_by_member.get(member_id),
+                    amount=Decimal(rng.choice(('30.00', '80.00', '300.00'))),
+                    payment_method=rng.choice(methods),
+                    status='completed' if rng.random() < 0.9 else 'pending',
+                    payment_date=random_moment(DAYS_OF_HISTORY),
+                )
+
+        created['payments'] = insert(Payment, payment_rows(), batch_size)
+        log(f'  pagos: {created["payments"]}')
+
+        def access_rows():
+            for i in range(access_logs):
+                yield AccessLog(
+                    member_id=rng.choice(member_ids),
+                    access_type='entry' if i % 2 == 0 else 'exit',
+                    timestamp=random_moment(DAYS_OF_HISTORY),
+                )
+
+        created['access_logs'] = insert(AccessLog, access_rows(), batch_size)
+        log(f'  accesos: {created["access_logs"]}')
+
+        groups = [
+            MuscleGroup.objects.get_or_create(name=f'{name} ({PREFIX})')[0]
+            for name in ('Pecho', 'Espalda', 'Piernas', 'Hombros', 'Brazos')
+        ]
+        exercise_ids = [
+            Exercise.objects.get_or_create(
+                name=f'Ejercicio {i} ({PREFIX})',
+                defaults={'muscle_group': groups[i % len(groups)], 'created_by_id': staff_ids[0]}
+            )[0].id
+            for i in range(20)
+        ]
+        sessions_start = WorkoutSession.objects.order_by('-id').values_list('id', flat=True).first() or 0
+
+        def sessions():
+            for _ in range(workout_sessions):
+                moment = random_moment(DAYS_OF_HISTORY)
+                yield WorkoutSession(
+                    member_id=rng.choice(member_ids), date=moment, day_of_week=moment.isoweekday(),
+                    completed=True, duration_minutes=rng.randrange(30, 91)
+                )
+
+        created['workout_sessions'] = insert(WorkoutSession, sessions(), batch_size)
+        session_ids = list(WorkoutSession.objects.filter(
+            id__gt=sessions_start).order_by('id').values_list('id', flat=True))
+
+        def exercise_logs():
+            for session_id in session_ids:
+                for exercise_id in rng.sample(exercise_ids, LOGS_PER_SESSION):
+                    sets, reps = rng.randrange(3, 6), rng.randrange(6, 13)
+                    yield ExerciseLog(
+                        session_id=session_id, exercise_id=exercise_id,
+                        planned_sets=sets, planned_reps=reps, actual_sets=sets, actual_reps=reps,
+                        weight_used=Decimal(rng.randrange(10, 120))
+                    )
+
+        created['exercise_logs'] = insert(ExerciseLog, exercise_logs(), batch_size)
+        # completed_at es auto_now_add: se alinea con la sesión en un solo UPDATE
+        ExerciseLog.objects.filter(session_id__gt=sessions_start).update(completed_at=Subquery(
+            WorkoutSession.objects.filter(pk=OuterRef('session_id')).values('date')[:1]
+        ))
+        log(f'  sesiones: {created["workout_sessions"]}, ejercicios: {created["exercise_logs"]}')
+
+        metric_types = [
+            MetricType.objects.get_or_create(
+                name=f'{name} ({PREFIX})', defaults={'category': category, 'unit': unit}
+            )[0]
+            for name, category, unit in (
+                ('Peso corporal', 'body_composition', 'kg'),
+                ('Sentadilla 1RM', 'strength', 'kg'),
+                ('% Grasa corporal', 'body_composition', 'percent'),
+            )
+        ]
+        metric_ranges = [(60, 100), (60, 180), (10, 30)]
+
+        def athlete_metrics():
+            for _ in range(metrics):
+                index = rng.randrange(len(metric_types))
+                low, high = metric_ranges[index]
+                yield AthleteMetric(
+                    member_id=rng.choice(member_ids), metric_type=metric_types[index],
+                    value=Decimal(rng.randrange(low * 10, high * 10)) / 10,
+                    recorded_date=today - timedelta(days=rng.randrange(DAYS_OF_HISTORY)),
+                )
+
+        created['metrics'] = insert(AthleteMetric, athlete_metrics(), batch_size)
+        log(f'  métricas: {created["metrics"]}')
+
+        # Agregados que normalmente mantienen save(), las señales y el scheduler
+        rollups.rebuild()
+        counters.reconcile()
+        attendance.rebuild()
+        for period_type, periods_back in SNAPSHOT_PERIODS.items():
+            if metrics:
+                snapshots.build_recent(today, period_types=(period_type,), periods_back=periods_back)
+    return created
@@ -0,0 +1,48 @@
+"""
+Mixins comunes para Serializers
+Sistema de Gestión de Gimnasio
+"""
+
+
+class PrefetchAwareMixin:
+    """
+    Contadores de relaciones que reutilizan lo que el queryset ya trajo.
+
+    En un listado, obj.relacion.count() hace una consulta por fila aunque la
+    vista haya usado prefetch_related('relacion'). count_related() busca, en
+    orden:
+
+    1. Una anotación del queryset (p. ej. .annotate(exercise_count=Count(...)))
+    2. La caché de prefetch_related de la relación (filtrada en Python)
+    3. Una consulta COUNT, para instancias sueltas (create, acciones de detalle)
+    """
+
+    @staticmethod
+    def get_prefetched(obj, relation):
+        """Filas prefetcheadas de la relación, o None si la vista no la prefetcheó."""
+        cache = getattr(obj, '_prefetched_objects_cache', {})
+        if relation in cache:
+            return list(cache[relation])
+        return None
+
+    def count_related(self, obj, relation, annotation=None, **filters):
+        """
+        Cantidad de filas de obj.<relation> que cumplen filters (igualdad de campos).
+
+        Args:
+            obj: Instancia del modelo
+            relation: Nombre del manager inverso o many-to-many (p. ej. 'exercises')
+            annotation: Atributo anotado por la vista con el mismo conteo, si existe
+            **filters: Igualdades campo=valor para contar solo parte de la relación
+        """
+        if annotation and hasattr(obj, annotation):
+            return getattr(obj, annotation)
+
+        prefetched = self.get_prefetched(obj, relation)
+        if prefetched is not None:
+            return sum(
+                1 for item in prefetched
+                if all(getattr(item, field) == value for field, value in filters.items())
+            )
+
+        return getattr(obj, relation).filter(**filters).count()
@@ -0,0 +1,89 @@
+"""
+Unit tests for the REST benchmark harness.
+Tests verify route discovery, per-endpoint measurements and regression detection against a baseline.
+"""
+import pytest
+from apps.common import benchmark
+from apps.common.seeds import scale
+from apps.users.models import User
+
+
+def metrics(queries=2, time_ms=5.0, size=1000, status=200):
+    return {'queries': queries, 'time_ms': time_ms, 'bytes': size, 'status': status}
+
+
+class TestCompare:
+    """compare() flags regressions and ignores noise."""
+
+    def test_identical_run_has_no_problems(self):
+        baseline = {'api/members/': metrics()}
+
+        assert benchmark.compare(baseline, {'api/members/': metrics()}) == []
+
+    def test_any_extra_query_is_a_regression(self):
+        problems = benchmark.compare({'api/members/': metrics(queries=2)}, {'api/members/': metrics(queries=3)})
+
+        assert problems == ['api/members/: consultas 2 → 3']
+
+    def test_size_and_time_use_thresholds(self):
+        baseline = {'api/payments/': metrics(time_ms=100.0, size=1000)}
+
+        assert benchmark.compare(baseline, {'api/payments/': metrics(time_ms=190.0, size=1150)}) == []
+        problems = benchmark.compare(baseline, {'api/payments/': metrics(time_ms=210.0, size=1300)})
+        assert len(problems) == 2
+
+    def test_small_time_differences_are_noise(self):
+        baseline = {'api/roles/': metrics(time_ms=1.0)}
+
+        assert benchmark.compare(baseline, {'api/roles/': metrics(time_ms=20.0)}) == []
+        assert benchmark.compare(baseline, {'api/roles/': metrics(time_ms=50.0)}, time_threshold=None) == []
+
+    def test_status_change_to_an_error_is_a_regression(self):
+        baseline = {'api/staff/': metrics(), 'api/payments/chart_data/': metrics(queries=0, status=500)}
+        results = {'api/staff/': metrics(status=500), 'api/payments/chart_data/': metrics(queries=4)}
+
+        assert benchmark.compare(baseline, results) == ['api/staff/: estado 200 → 500']
+
+
+class TestDiscoverRoutes:
+    """Every router GET route is found, without format suffixes."""
+
+    def test_finds_list_detail_and_actions(self):
+        routes = {route.template: route for route in benchmark.discover_routes()}
+
+        assert routes['api/members/'].action == 'list'
+        assert routes['api/members/{pk}/'].is_detail
+        assert routes['api/members/{pk}/'].list_template == 'api/members/'
+        assert routes['api/payments/stats/'].action == 'stats'
+        assert not any('format' in template for template in routes)
+
+
+@pytest.mark.integration
+@pytest.mark.django_db
+class TestRun:
+    """run() measures list and detail routes on seeded data."""
+
+    def test_measures_list_and_detail(self):
+        scale.seed(members=5, classes_per_week=3, weeks=1, payments=20, access_logs=20)
+        admin = User.objects.get(username=f'{scale.PREFIX}_admin')
+
+        results = benchmark.run(admin, only='api/payments/', repeat=1)
+
+        assert results['api/payments/']['status'] == 200
+        assert results['api/payments/']['queries'] > 0
+        assert results['api/payments/{pk}/']['status'] == 200
+        assert results['api/payments/']['bytes'] > results['api/payments/{pk}/']['bytes']
+
+    def test_seed_is_deterministic(self):
+        from django.db import transaction
+        from apps.payments.models import Payment
+
+        with transaction.atomic():
+            scale.seed(members=5, classes_per_week=3, weeks=1, payments=20, access_logs=0, seed=7)
+            first = list(Payment.objects.order_by('pk').values_list('amount', 'payment_method', 'status'))
+            transaction.set_rollback(True)
+
+        scale.seed(members=5, classes_per_week=3, weeks=1, payments=20, access_logs=0, seed=7)
+        second = list(Payment.objects.order_by('pk').values_list('amount', 'payment_method', 'status'))
+
+        assert first == second
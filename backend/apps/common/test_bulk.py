@@ -0,0 +1,165 @@
+"""
+Unit tests for bulk operations (apps.common.bulk).
+Tests verify per-model receivers and that audit and notification side effects are batched.
+"""
+import pytest
+from datetime import timedelta
+from decimal import Decimal
+from django.db.models.signals import post_save
+from django.utils import timezone
+from apps.audit.models import AuditLog
+from apps.audit.signals import log_model_save
+from apps.classes.models import ClassType, GymClass, Reservation
+from apps.common.bulk import bulk_operation, current
+from apps.members.models import Member
+from apps.memberships.models import MembershipPlan
+from apps.notifications.models import Notification
+from apps.payments.models import Payment
+from apps.users.models import User
+
+
+@pytest.fixture
+def spin_class(db):
+    class_type = ClassType.objects.create(name='Spinning')
+    start = timezone.now() + timedelta(days=1)
+    return GymClass.objects.create(
+        class_type=class_type,
+        title='Spinning',
+        start_datetime=start,
+        end_datetime=start + timedelta(minutes=45),
+        capacity=50,
+    )
+
+
+def new_members(count):
+    return [
+        Member.objects.create(user=User.objects.create_user(username=f'm{i}', email=f'm{i}@gym.com'))
+        for i in range(count)
+    ]
+
+
+def new_payment(member, status='pending'):
+    return Payment.objects.create(member=member, amount=Decimal('30.00'), payment_method='cash', status=status)
+
+
+@pytest.mark.unit
+class TestPerSenderReceivers:
+    """Audit receivers are only connected to audited models."""
+
+    def test_unrelated_models_have_no_audit_receiver(self):
+        assert log_model_save in post_save._live_receivers(Payment)[0]
+        assert log_model_save not in post_save._live_receivers(Notification)[0]
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+class TestBulkOperation:
+    """bulk_operation() defers audit entries and notifications to one batch each."""
+
+    def test_per_instance_saves_still_audit_and_notify(self, spin_class):
+        member = new_members(1)[0]
+
+        Reservation.objects.create(gym_class=spin_class, member=member, status='confirmed')
+
+        assert AuditLog.objects.filter(model_name='Reservation', action='CREATE').count() == 1
+        notification = Notification.objects.get(user=member.user)
+        assert notification.message.startswith('Reservaste Spinning para el')
+
+    def test_side_effects_are_written_once_at_exit(self, spin_class):
+        members = new_members(5)
+        AuditLog.objects.all().delete()
+
+        with bulk_operation():
+            for member in members:
+                Reservation.objects.create(gym_class=spin_class, member=member, status='confirmed')
+            assert not AuditLog.objects.exists()
+            assert not Notification.objects.exists()
+
+        assert AuditLog.objects.filter(model_name='Reservation', action='CREATE').count() == 5
+        assert Notification.objects.count() == 5
+
+    def test_flush_does_not_query_per_row(self, spin_class, django_assert_num_queries):
+        members = new_members(5)
+        AuditLog.objects.all().delete()
+        reservations = Reservation.objects.bulk_create(
+            Reservation(gym_class_id=spin_class.pk, member_id=member.pk, status='confirmed') for member in members
+        )
+
+        # Notificaciones: miembros, clase e INSERT; auditoría: miembros, usuarios y clase (object_repr) e INSERT
+        with django_assert_num_queries(7):
+            with bulk_operation() as batch:
+                batch.saved(reservations, created=True)
+
+        assert AuditLog.objects.filter(model_name='Reservation').count() == 5
+        assert set(Notification.objects.values_list('user_id', flat=True)) == {m.user_id for m in members}
+
+    def test_bulk_update_is_audited_with_changes(self):
+        payments = [new_payment(member) for member in new_members(3)]
+        AuditLog.objects.all().delete()
+        payments = list(Payment.objects.all())
+        for payment in payments:
+            payment.status = 'completed'
+
+        with bulk_operation() as batch:
+            Payment.objects.bulk_update(payments, ['status'])
+            batch.saved(payments, update_fields=['status'])
+
+        entries = AuditLog.objects.filter(model_name='Payment', action='UPDATE')
+        assert entries.count() == 3
+        assert entries.first().changes == {'status': {'old': 'pending', 'new': 'completed'}}
+        assert Notification.objects.filter(title='✅ Pago Aprobado').count() == 3
+
+    def test_user_is_attributed_to_entries(self, spin_class):
+        admin = User.objects.create_user(username='admin', email='admin@gym.com')
+        member = new_members(1)[0]
+
+        with bulk_operation(user=admin):
+            Reservation.objects.create(gym_class=spin_class, member=member, status='confirmed')
+
+        assert AuditLog.objects.get(model_name='Reservation').user == admin
+
+    def test_nested_blocks_join_the_outer_one(self, spin_class):
+        member = new_members(1)[0]
+
+        with bulk_operation() as outer:
+            with bulk_operation() as inner:
+                Reservation.objects.create(gym_class=spin_class, member=member, status='confirmed')
+            assert inner is outer
+            assert not Notification.objects.exists()
+
+        assert Notification.objects.count() == 1
+        assert current() is None
+
+    def test_error_discards_pending_side_effects(self, spin_class):
+        member = new_members(1)[0]
+
+        with pytest.raises(ValueError):
+            with bulk_operation():
+                Reservation.objects.create(gym_class=spin_class, member=member, status='confirmed')
+                raise ValueError('import roto')
+
+        assert current() is None
+        assert not Notification.objects.exists()
+        assert not AuditLog.objects.filter(model_name='Reservation').exists()
+
+    def test_deletes_keep_the_object_id(self):
+        plan = MembershipPlan.objects.create(name='Mensual', price=Decimal('30.00'), duration_days=30)
+        plan_id = plan.pk
+
+        with bulk_operation():
+            plan.delete()
+
+        entry = AuditLog.objects.get(action='DELETE')
+        assert (entry.model_name, entry.object_id) == ('MembershipPlan', plan_id)
+        assert entry.object_repr.startswith('Mensual')
+
+    def test_payment_notifies_only_on_status_change(self):
+        payment = new_payment(new_members(1)[0])
+
+        payment.status = 'completed'
+        payment.save()
+        payment.notes = 'Referencia corregida'
+        payment.save()
+        Payment.objects.get(pk=payment.pk).save()
+
+        assert Notification.objects.filter(title='✅ Pago Aprobado').count() == 1
@@ -0,0 +1,118 @@
+"""
+Integration tests for conditional GET on read-heavy endpoints.
+Tests verify ETags change with the data and unchanged responses return 304.
+"""
+import pytest
+from datetime import timedelta
+from decimal import Decimal
+from django.utils import timezone
+from rest_framework.test import APIClient
+from apps.classes import booking
+from apps.classes.models import ClassType, GymClass
+from apps.members.models import Member
+from apps.memberships.models import MembershipPlan
+from apps.staff.models import Staff
+from apps.users.models import User
+from apps.workouts.models import Exercise, MuscleGroup
+
+
+@pytest.fixture
+def client(db):
+    user = User.objects.create_user(username='reader', email='reader@gym.com', password='x')
+    api = APIClient()
+    api.force_authenticate(user)
+    return api
+
+
+@pytest.fixture
+def plan(db):
+    return MembershipPlan.objects.create(name='Mensual', price=Decimal('30'), duration_days=30)
+
+
+@pytest.mark.integration
+@pytest.mark.django_db
+class TestConditionalGet:
+    """ConditionalGetMixin on plans, class types and the class calendar."""
+
+    def test_unchanged_list_returns_304_without_serializing(self, client, plan, django_assert_num_queries):
+        first = client.get('/api/memberships/plans/')
+        etag = first['ETag']
+
+        # Solo la consulta de max(updated_at)/count
+        with django_assert_num_queries(1):
+            second = client.get('/api/memberships/plans/', HTTP_IF_NONE_MATCH=etag)
+
+        assert second.status_code == 304
+        assert second['ETag'] == etag
+
+    def test_update_and_delete_change_the_etag(self, client, plan):
+        other = MembershipPlan.objects.create(name='Anual', price=Decimal('300'), duration_days=365)
+        etag = client.get('/api/memberships/plans/')['ETag']
+
+        plan.price = Decimal('35')
+        plan.save()
+        updated = client.get('/api/memberships/plans/', HTTP_IF_NONE_MATCH=etag)
+        assert updated.status_code == 200
+
+        other.delete()
+        deleted = client.get('/api/memberships/plans/', HTTP_IF_NONE_MATCH=updated['ETag'])
+        assert deleted.status_code == 200
+
+    def test_detail_sends_last_modified(self, client, plan):
+        response = client.get(f'/api/memberships/plans/{plan.pk}/')
+
+        assert response.status_code == 200
+        assert 'Last-Modified' in response
+        repeat = client.get(
+            f'/api/memberships/plans/{plan.pk}/',
+            HTTP_IF_MODIFIED_SINCE=response['Last-Modified']
+        )
+        assert repeat.status_code == 304
+
+    def test_missing_detail_is_still_404(self, client):
+        assert client.get('/api/classes/types/999/').status_code == 404
+
+    def test_booking_changes_the_calendar_etag(self, client):
+        class_type = ClassType.objects.create(name='Yoga')
+        start = timezone.now() + timedelta(days=1)
+        gym_class = GymClass.objects.create(
+            class_type=class_type, title='Yoga', start_datetime=start,
+            end_datetime=start + timedelta(hours=1), capacity=5
+        )
+        member = Member.objects.create(
+            user=User.objects.create_user(username='yogi', email='yogi@gym.com', password='x')
+        )
+        # updated_at tiene que avanzar aunque la prueba corra en el mismo microsegundo
+        GymClass.objects.filter(pk=gym_class.pk).update(updated_at=start - timedelta(days=2))
+        etag = client.get('/api/classes/')['ETag']
+
+        booking.book(gym_class, member)
+
+        assert client.get('/api/classes/', HTTP_IF_NONE_MATCH=etag).status_code == 200
+
+    def test_renaming_the_instructor_changes_the_calendar_etag(self, client):
+        coach = User.objects.create_user(username='coach', email='coach@gym.com', password='x', first_name='Ana')
+        instructor = Staff.objects.create(user=coach, hire_date=timezone.localdate())
+        start = timezone.now() + timedelta(days=1)
+        GymClass.objects.create(
+            class_type=ClassType.objects.create(name='Yoga'), instructor=instructor, title='Yoga',
+            start_datetime=start, end_datetime=start + timedelta(hours=1), capacity=5
+        )
+        User.objects.filter(pk=coach.pk).update(updated_at=start - timedelta(days=2))
+        etag = client.get('/api/classes/')['ETag']
+
+        coach.first_name = 'Ana María'
+        coach.save()
+
+        assert client.get('/api/classes/', HTTP_IF_NONE_MATCH=etag).status_code == 200
+
+    def test_renaming_the_muscle_group_changes_the_exercises_etag(self, client):
+        group = MuscleGroup.objects.create(name='Pecho')
+        Exercise.objects.create(name='Press de banca', muscle_group=group)
+        MuscleGroup.objects.filter(pk=group.pk).update(updated_at=timezone.now() - timedelta(days=2))
+        etag = client.get('/api/workouts/exercises/')['ETag']
+
+        group.name = 'Pectorales'
+        group.save()
+
+        assert client.get('/api/workouts/exercises/', HTTP_IF_NONE_MATCH=etag).status_code == 200
@@ -0,0 +1,117 @@
+"""
+Unit tests for the dashboard metrics cache.
+Tests verify hits and misses, signal-driven invalidation and single-flight computation.
+"""
+import pytest
+import threading
+import time
+from decimal import Decimal
+from django.utils import timezone
+from rest_framework.test import APIClient
+from apps.common import dashboard_cache
+from apps.members.models import Member
+from apps.payments.models import Payment
+from apps.users.models import User
+
+
+@pytest.fixture
+def cache_member(db):
+    user = User.objects.create_user(username='cached', email='cached@gym.com', password='x')
+    return Member.objects.create(user=user)
+
+
+@pytest.fixture
+def slow_metric():
+    """Metric that counts its computations and takes a while to finish."""
+    calls = []
+
+    def compute(today):
+        calls.append(today)
+        time.sleep(0.2)
+        return 42
+
+    dashboard_cache._registry['test_slow'] = dashboard_cache.Metric('test_slow', compute, [])
+    yield calls
+    del dashboard_cache._registry['test_slow']
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+class TestDashboardCache:
+    """get_metrics() caching and invalidation."""
+
+    def test_second_read_is_a_hit(self, cache_member, django_assert_num_queries):
+        dashboard_cache.get_metrics('members_total')
+
+        with django_assert_num_queries(0):
+            assert dashboard_cache.get_metrics('members_total') == {'members_total': 1}
+
+        stats = dashboard_cache.get_stats()['members_total']
+        assert (stats['hits'], stats['misses'], stats['hit_rate']) == (1, 1, 0.5)
+
+    def test_model_change_invalidates_dependent_metrics(self, cache_member, django_capture_on_commit_callbacks):
+        dashboard_cache.get_metrics('members_total', 'payments_pending')
+
+        with django_capture_on_commit_callbacks(execute=True):
+            Payment.objects.create(member=cache_member, amount=Decimal('10'), status='pending')
+
+        assert dashboard_cache.get_metrics('payments_pending') == {'payments_pending': 1}
+        stats = dashboard_cache.get_stats()
+        assert stats['payments_pending']['misses'] == 2
+        assert stats['members_total']['misses'] == 1
+
+    def test_invalidation_waits_for_commit(self, cache_member, django_capture_on_commit_callbacks):
+        dashboard_cache.get_metrics('payments_pending')
+
+        with django_capture_on_commit_callbacks(execute=False) as callbacks:
+            Payment.objects.create(member=cache_member, amount=Decimal('10'), status='pending')
+
+        assert dashboard_cache.get_metrics('payments_pending') == {'payments_pending': 0}
+        assert len(callbacks) >= 1
+
+    def test_concurrent_misses_compute_once(self, slow_metric):
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(dashboard_cache.get_metrics('test_slow')))
+            for _ in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(slow_metric) == 1
+        assert results == [{'test_slow': 42}] * 8
+        assert dashboard_cache.get_stats()['test_slow']['waits'] == 7
+
+    def test_metric_keys_roll_over_with_the_day(self, slow_metric):
+        today = timezone.localdate()
+        dashboard_cache.get_metrics('test_slow', today=today)
+        dashboard_cache.get_metrics('test_slow', today=today.replace(year=today.year - 1))
+
+        assert len(slow_metric) == 2
+
+
+@pytest.mark.integration
+@pytest.mark.django_db
+class TestDashboardEndpoints:
+    """Dashboards read their aggregates from the cache."""
+
+    def test_staff_dashboard_is_served_from_cache(self, django_assert_max_num_queries):
+        admin = User.objects.create_user(username='boss', email='boss@gym.com', password='x', is_staff=True)
+        client = APIClient()
+        client.force_authenticate(admin)
+
+        first = client.get('/api/staff/dashboard/')
+        assert first.status_code == 200
+
+        # Solo queda la lista de clases de hoy
+        with django_assert_max_num_queries(1):
+            second = client.get('/api/staff/dashboard/')
+        assert second.json() == first.json()
+
+    def test_cache_stats_require_admin(self, cache_member):
+        client = APIClient()
+        client.force_authenticate(cache_member.user)
+
+        assert client.get('/api/users/dashboard_cache_stats/').status_code == 403
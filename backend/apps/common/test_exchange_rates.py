@@ -0,0 +1,119 @@
+"""
+Unit tests for the BCV exchange rate service.
+Tests verify the parser against a local page and stale-while-revalidate serving.
+"""
+import pytest
+from datetime import date, timedelta
+from decimal import Decimal
+from pathlib import Path
+from django.core.cache import cache
+from django.utils import timezone
+from rest_framework.test import APIClient
+from apps.common import exchange_rates
+from apps.common.models import ExchangeRate
+
+FIXTURE = Path(__file__).parent / 'fixtures' / 'bcv_home.html'
+
+
+@pytest.fixture
+def bcv_html():
+    return FIXTURE.read_text(encoding='utf-8')
+
+
+@pytest.fixture
+def fake_fetch(monkeypatch):
+    """Replace the network call; the list holds the rates to return in order."""
+    rates = []
+
+    def fetch():
+        rate = rates.pop(0) if rates else None
+        return (rate, date(2024, 3, 12)) if rate is not None else (None, None)
+
+    monkeypatch.setattr(exchange_rates, 'fetch_bcv_usd_rate', fetch)
+    return rates
+
+
+@pytest.fixture
+def sync_refresh(monkeypatch):
+    """Run the background refresh inline so it shares the test transaction."""
+    calls = []
+
+    def refresh():
+        calls.append(1)
+        exchange_rates._refresh_locked()
+
+    monkeypatch.setattr(exchange_rates, 'refresh_in_background', refresh)
+    return calls
+
+
+@pytest.mark.unit
+class TestBcvParser:
+    """parse_bcv_html() on a saved copy of bcv.org.ve."""
+
+    @pytest.mark.parametrize('engine', sorted(exchange_rates.PARSERS))
+    def test_each_engine_reads_usd_not_other_currencies(self, bcv_html, engine):
+        rate, rate_date = exchange_rates.PARSERS[engine](bcv_html)
+
+        assert rate == Decimal('36.25410000')
+        assert rate_date == date(2024, 3, 12)
+
+    def test_falls_back_to_usd_label(self, bcv_html):
+        rate, _ = exchange_rates.parse_bcv_html(bcv_html.replace('id="dolar"', 'id="usd-block"'))
+
+        assert rate == Decimal('36.25410000')
+
+    def test_page_without_rate(self):
+        assert exchange_rates.parse_bcv_html('<html><body>Mantenimiento</body></html>') == (None, None)
+
+    @pytest.mark.parametrize('text, expected', [
+        ('339,14950000', Decimal('339.14950000')),
+        (' 1.234,50 ', Decimal('1234.50')),
+        ('', None),
+        ('0,00', None),
+    ])
+    def test_parse_rate(self, text, expected):
+        assert exchange_rates.parse_rate(text) == expected
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+class TestRateService:
+    """get_usd_rate() serves the last good rate and revalidates in the background."""
+
+    def test_first_request_fetches_and_persists(self, fake_fetch, sync_refresh):
+        fake_fetch.append(Decimal('36.25'))
+
+        data = exchange_rates.get_usd_rate()
+
+        assert data['usd_rate'] == '36.25000000'
+        assert data['stale'] is False
+        assert ExchangeRate.objects.get(currency='USD').rate == Decimal('36.25')
+        assert sync_refresh == []
+
+    def test_stale_rate_is_served_and_refreshed(self, fake_fetch, sync_refresh, settings):
+        settings.BCV_RATE_MAX_AGE = 60
+        ExchangeRate.objects.create(
+            currency='USD', rate=Decimal('35'), fetched_at=timezone.now() - timedelta(hours=2)
+        )
+        fake_fetch.append(Decimal('36'))
+
+        data = exchange_rates.get_usd_rate()
+
+        assert (data['usd_rate'], data['stale']) == ('35.00000000', True)
+        assert sync_refresh == [1]
+        assert exchange_rates.get_usd_rate()['usd_rate'] == '36.00000000'
+
+    def test_failed_refresh_keeps_last_good_rate(self, fake_fetch, sync_refresh, settings):
+        settings.BCV_RATE_MAX_AGE = 60
+        ExchangeRate.objects.create(
+            currency='USD', rate=Decimal('35'), fetched_at=timezone.now() - timedelta(hours=2)
+        )
+
+        assert exchange_rates.get_usd_rate()['usd_rate'] == '35.00000000'
+        cache.clear()
+        assert exchange_rates.get_usd_rate()['usd_rate'] == '35.00000000'
+
+    def test_endpoint_503_when_never_fetched(self, fake_fetch):
+        response = APIClient().get('/api/exchange-rate/bcv/')
+
+        assert response.status_code == 503
@@ -0,0 +1,102 @@
+"""
+Unit tests for keyset (cursor) pagination.
+Tests verify cursor walks with timestamp ties, previous links, constant page cost and approximate counts.
+"""
+import pytest
+from datetime import timedelta
+from django.core.cache import cache
+from django.utils import timezone
+from rest_framework.test import APIClient
+from apps.notifications.models import Notification
+from apps.users.models import User
+
+URL = '/api/notifications/'
+
+
+@pytest.fixture
+def inbox(db):
+    """A user with 25 notifications; groups of five share the same created_at."""
+    cache.clear()
+    user = User.objects.create_user(username='ana', email='ana@gym.com', password='x')
+    Notification.objects.bulk_create([
+        Notification(user=user, title=f'Aviso {i}', message='-') for i in range(25)
+    ])
+    base = timezone.now()
+    for notification in Notification.objects.all():
+        Notification.objects.filter(pk=notification.pk).update(
+            created_at=base - timedelta(minutes=notification.pk // 5)
+        )
+    client = APIClient()
+    client.force_authenticate(user)
+    return client
+
+
+def walk(client, url, params=None):
+    pages = []
+    response = client.get(url, params)
+    while True:
+        assert response.status_code == 200
+        pages.append(response.data)
+        if not response.data['next']:
+            return pages
+        response = client.get(response.data['next'])
+
+
+@pytest.mark.integration
+@pytest.mark.django_db
+class TestKeysetPagination:
+    """?cursor= mode on NotificationViewSet."""
+
+    def test_walks_every_row_once_in_order(self, inbox):
+        pages = walk(inbox, URL, {'cursor': '', 'page_size': 7})
+
+        ids = [row['id'] for page in pages for row in page['results']]
+        expected = list(Notification.objects.order_by('-created_at', '-pk').values_list('pk', flat=True))
+        assert ids == expected
+        assert [len(page['results']) for page in pages] == [7, 7, 7, 4]
+        assert 'count' not in pages[0]
+        assert pages[0]['previous'] is None
+
+    def test_previous_link_returns_the_previous_page(self, inbox):
+        first = inbox.get(URL, {'cursor': '', 'page_size': 7}).data
+        second = inbox.get(first['next']).data
+
+        back = inbox.get(second['previous']).data
+
+        assert [row['id'] for row in back['results']] == [row['id'] for row in first['results']]
+        assert back['previous'] is None
+        assert back['next'] is not None
+
+    def test_deep_page_costs_the_same_as_the_first(self, inbox, django_assert_num_queries):
+        pages = walk(inbox, URL, {'cursor': '', 'page_size': 5})
+
+        # La página de la notificación más vieja: mismo número de consultas, sin COUNT ni OFFSET
+        with django_assert_num_queries(1):
+            inbox.get(URL, {'cursor': '', 'page_size': 5})
+        with django_assert_num_queries(1) as last:
+            inbox.get(pages[-2]['next'])
+        assert not any('COUNT' in query['sql'] or 'OFFSET' in query['sql'] for query in last.captured_queries)
+
+    def test_invalid_cursor_is_not_found(self, inbox):
+        assert inbox.get(URL, {'cursor': 'no-es-un-cursor'}).status_code == 404
+
+
+@pytest.mark.integration
+@pytest.mark.django_db
+class TestApproximateCount:
+    """?count=approx in both pagination modes."""
+
+    def test_cursor_mode_adds_cached_count(self, inbox, django_assert_num_queries):
+        assert inbox.get(URL, {'cursor': '', 'count': 'approx'}).data['count'] == 25
+
+        # Segunda vez el total sale de la caché: solo la consulta de la página
+        with django_assert_num_queries(1):
+            response = inbox.get(URL, {'cursor': '', 'count': 'approx'})
+        assert response.data['count'] == 25
+
+    def test_page_mode_keeps_exact_count_by_default(self, inbox):
+        response = inbox.get(URL, {'page': 2})
+
+        assert response.data['count'] == 25
+        assert len(response.data['results']) == 5
+        assert inbox.get(URL, {'page': 2, 'count': 'approx'}).data['count'] == 25
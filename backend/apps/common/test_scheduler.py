@@ -0,0 +1,100 @@
+"""
+Unit tests for the periodic job scheduler.
+Tests verify scheduling, single-node locking, run history and failure recording.
+"""
+import pytest
+from datetime import timedelta
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.utils import timezone
+from apps.common import scheduler
+from apps.common.models import JobRun, ScheduledJob
+
+
+@pytest.fixture
+def jobs(monkeypatch):
+    """Replace the registry with test jobs that record their calls."""
+    calls = []
+    monkeypatch.setattr(scheduler, '_registry', {})
+
+    @scheduler.register('count_rows', every=60)
+    def count_rows():
+        calls.append('count_rows')
+        return 3
+
+    @scheduler.register('broken', every=60)
+    def broken():
+        calls.append('broken')
+        raise ValueError('sin conexión')
+
+    return calls
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+class TestScheduler:
+    """run_pending(), run_job() and run_scheduler."""
+
+    def test_due_jobs_run_once_per_interval(self, jobs):
+        first = scheduler.run_pending(node='a')
+        second = scheduler.run_pending(node='a')
+
+        assert sorted(run.job.name for run in first) == ['broken', 'count_rows']
+        assert second == []
+        job = ScheduledJob.objects.get(name='count_rows')
+        assert job.next_run_at == job.last_run_at + timedelta(seconds=60)
+        assert (job.locked_by, job.locked_until) == ('', None)
+
+    def test_runs_record_rows_timing_and_failures(self, jobs):
+        scheduler.run_pending(node='a')
+
+        ok = JobRun.objects.get(job__name='count_rows')
+        failed = JobRun.objects.get(job__name='broken')
+        assert (ok.status, ok.rows, ok.node) == ('success', 3, 'a')
+        assert ok.duration_ms >= 0
+        assert failed.status == 'failed'
+        assert 'ValueError: sin conexión' in failed.error
+        # Un fallo también reprograma: no se reintenta en cada vuelta
+        assert ScheduledJob.objects.get(name='broken').next_run_at > timezone.now()
+
+    def test_locked_job_runs_on_one_node_only(self, jobs):
+        scheduler.sync_jobs()
+        ScheduledJob.objects.filter(name='count_rows').update(
+            locked_by='b', locked_until=timezone.now() + timedelta(minutes=5)
+        )
+
+        assert scheduler.run_job('count_rows', node='a') is None
+        assert scheduler.run_job('count_rows', force=True, node='a') is None
+        assert jobs == []
+
+    def test_expired_lock_is_taken_over(self, jobs):
+        scheduler.sync_jobs()
+        ScheduledJob.objects.filter(name='count_rows').update(
+            locked_by='dead', locked_until=timezone.now() - timedelta(seconds=1)
+        )
+
+        assert scheduler.run_job('count_rows', node='a').node == 'a'
+
+    def test_disabled_jobs_are_skipped(self, jobs):
+        scheduler.sync_jobs()
+        ScheduledJob.objects.filter(name='broken').update(enabled=False)
+
+        assert [run.job.name for run in scheduler.run_pending(node='a')] == ['count_rows']
+
+    def test_prune_job_runs_keeps_recent_history(self, settings):
+        settings.SCHEDULER_RUN_RETENTION_DAYS = 30
+        job = ScheduledJob.objects.create(name='prune_job_runs', interval_seconds=60)
+        now = timezone.now()
+        for days in (1, 45):
+            JobRun.objects.create(job=job, started_at=now - timedelta(days=days), duration_ms=1, status='success')
+
+        assert scheduler.prune_job_runs() == 1
+        assert JobRun.objects.count() == 1
+
+    def test_command_runs_a_job_on_demand(self, jobs, capsys):
+        call_command('run_scheduler', '--job', 'count_rows')
+
+        assert jobs == ['count_rows']
+        assert 'count_rows' in capsys.readouterr().out
+        with pytest.raises(CommandError, match='sin conexión'):
+            call_command('run_scheduler', '--job', 'broken')
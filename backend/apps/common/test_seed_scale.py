@@ -0,0 +1,98 @@
+"""
+Unit tests for the scale seeder and the seed_scale command.
+Tests verify row counts, overrides, derived aggregates and the COPY text encoding per column.
+"""
+import pytest
+from datetime import datetime, timezone as dt_timezone
+from decimal import Decimal
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from apps.common.seeds import scale
+
+SMALL = [
+    '--members', '20', '--classes-per-week', '4', '--weeks', '1', '--payments', '50',
+    '--access-logs', '40', '--workout-sessions', '10', '--metrics', '60',
+]
+
+
+@pytest.mark.integration
+@pytest.mark.django_db
+class TestSeedScaleCommand:
+    """manage.py seed_scale with explicit counts."""
+
+    def test_creates_requested_rows(self):
+        from apps.access.models import AccessLog
+        from apps.analytics.models import AthleteMetric, MetricSnapshot
+        from apps.classes.models import GymClass, Reservation
+        from apps.members.models import Member
+        from apps.payments.models import DailyRevenueRollup, Payment
+        from apps.progress.models import ExerciseLog, WorkoutSession
+
+        call_command('seed_scale', *SMALL)
+
+        assert Member.objects.count() == 20
+        assert GymClass.objects.count() == 4
+        assert Reservation.objects.count() == 4 * 12
+        assert (Payment.objects.count(), AccessLog.objects.count()) == (50, 40)
+        assert WorkoutSession.objects.count() == 10
+        assert ExerciseLog.objects.count() == 10 * scale.LOGS_PER_SESSION
+        assert AthleteMetric.objects.count() == 60
+        # Agregados derivados reconstruidos al final
+        assert DailyRevenueRollup.objects.exists()
+        assert MetricSnapshot.objects.exists()
+        assert GymClass.objects.filter(confirmed_count=12).count() == 4
+
+    def test_exercise_logs_share_their_session_date(self):
+        from apps.progress.models import ExerciseLog
+
+        call_command('seed_scale', *SMALL)
+
+        log = ExerciseLog.objects.select_related('session').first()
+        assert log.completed_at == log.session.date
+
+    def test_refuses_to_seed_twice(self):
+        call_command('seed_scale', *SMALL)
+
+        with pytest.raises(CommandError):
+            call_command('seed_scale', *SMALL)
+
+    def test_copy_requires_postgresql(self):
+        with pytest.raises(CommandError):
+            call_command('seed_scale', '--copy', *SMALL)
+
+
+class TestCopyText:
+    """Values are encoded in PostgreSQL COPY text format."""
+
+    def test_null_bool_and_dates(self):
+        moment = datetime(2025, 3, 1, 10, 30, tzinfo=dt_timezone.utc)
+
+        assert scale._copy_text(None) == '\\N'
+        assert scale._copy_text(True) == 't'
+        assert scale._copy_text(moment) == '2025-03-01T10:30:00+00:00'
+        assert scale._copy_text(Decimal('80.00')) == '80.00'
+
+    def test_escapes_separators(self):
+        assert scale._copy_text('a\tb\nc\\d') == 'a\\tb\\nc\\\\d'
+
+    def test_column_encoders(self):
+        from django.db import connection
+        from apps.payments.models import Payment
+
+        moment = datetime(2025, 3, 1, 10, 30, tzinfo=dt_timezone.utc)
+        payment = Payment(
+            member_id=7, amount=Decimal('80.00'), payment_method='card',
+            status='completed', payment_date=moment, notes='a\tb'
+        )
+        fields = {field.name: field for field in Payment._meta.concrete_fields}
+
+        def encode(name):
+            return scale._copy_encoder(fields[name], connection)(payment)
+
+        assert [encode(name) for name in ('member', 'membership', 'amount', 'payment_method')] == [
+            '7', '\\N', '80.00', 'card'
+        ]
+        assert encode('payment_date') == '2025-03-01T10:30:00+00:00'
+        assert encode('notes') == 'a\\tb'
+        # auto_now_add: una marca fija, en ISO con zona horaria
+        assert datetime.fromisoformat(encode('created_at')).tzinfo is not None
@@ -0,0 +1,194 @@
+"""
+Unit tests for the shared chart time-series layer.
+Tests verify LTTB downsampling, SQL bucketing, auto resolution and the bounded evolution endpoints.
+"""
+import pytest
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from django.db.models import Max, Sum
+from django.utils import timezone
+from rest_framework.test import APIClient
+from apps.common import timeseries
+from apps.members.models import Member
+from apps.progress.models import ExerciseLog, ProgressLog, WorkoutSession
+from apps.users.models import Role, User
+from apps.workouts.models import Exercise, MuscleGroup
+
+
+def make_member(username):
+    role, _ = Role.objects.get_or_create(name='member')
+    user = User.objects.create_user(username=username, email=f'{username}@gym.com', password='x', role=role)
+    # El rol member crea el perfil por señal
+    return Member.objects.get(user=user)
+
+
+def log_weights(member, start, weights):
+    ProgressLog.objects.bulk_create([
+        ProgressLog(member=member, date=start + timedelta(days=i), weight=Decimal(str(weight)), height=Decimal('180'))
+        for i, weight in enumerate(weights)
+    ])
+
+
+WEIGHT = [timeseries.Column('weight', 'weight')]
+
+
+@pytest.mark.unit
+class TestLttb:
+    """lttb() point selection."""
+
+    def test_keeps_endpoints_and_threshold(self):
+        xs = list(range(100))
+        ys = [(x % 10) * 1.0 for x in xs]
+
+        selected = timeseries.lttb(xs, ys, 12)
+
+        assert len(selected) == 12
+        assert (selected[0], selected[-1]) == (0, 99)
+        assert selected == sorted(selected)
+
+    def test_keeps_spikes(self):
+        ys = [1.0] * 50
+        ys[23] = 40.0
+
+        assert 23 in timeseries.lttb(list(range(50)), ys, 5)
+
+    def test_short_series_untouched(self):
+        assert timeseries.lttb([1, 2, 3], [1, 2, 3], 10) == [0, 1, 2]
+
+
+@pytest.mark.unit
+class TestParseParams:
+    """parse_params() validation and capping."""
+
+    def test_defaults_and_cap(self, settings):
+        settings.TIMESERIES_DEFAULT_POINTS = 500
+        settings.TIMESERIES_MAX_POINTS = 1000
+
+        assert timeseries.parse_params({}) == ('auto', 500)
+        assert timeseries.parse_params({'resolution': 'week', 'max_points': '5000'}) == ('week', 1000)
+
+    @pytest.mark.parametrize('params', [{'resolution': 'hour'}, {'max_points': 'x'}, {'max_points': '2'}])
+    def test_invalid(self, params):
+        with pytest.raises(ValueError):
+            timeseries.parse_params(params)
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+class TestSeries:
+    """series() for raw rows, SQL buckets and auto resolution."""
+
+    def test_raw_is_columnar(self):
+        member = make_member('ana')
+        log_weights(member, date(2025, 3, 3), [80, 79.5])
+
+        data, resolution = timeseries.series(ProgressLog.objects.all(), 'date', WEIGHT, 'raw', 10)
+
+        assert resolution == 'raw'
+        assert data == {'dates': ['2025-03-03', '2025-03-04'], 'weight': [80.0, 79.5]}
+
+    def test_week_and_month_buckets_aggregate_in_sql(self, django_assert_num_queries):
+        member = make_member('ana')
+        # Lunes 3 de marzo: dos semanas completas y un día de la tercera
+        log_weights(member, date(2025, 3, 3), [80] * 7 + [78] * 7 + [70])
+        columns = [timeseries.Column('weight', 'weight'), timeseries.Column('top', 'weight', Max)]
+
+        with django_assert_num_queries(1):
+            weekly, _ = timeseries.series(ProgressLog.objects.all(), 'date', columns, 'week', 10)
+        monthly, _ = timeseries.series(ProgressLog.objects.all(), 'date', WEIGHT, 'month', 10)
+
+        assert weekly == {
+            'dates': ['2025-03-03', '2025-03-10', '2025-03-17'],
+            'weight': [80.0, 78.0, 70.0],
+            'top': [80.0, 78.0, 70.0],
+        }
+        assert monthly == {'dates': ['2025-03-01'], 'weight': [round((560 + 546 + 70) / 15, 2)]}
+
+    def test_datetime_field_buckets_by_local_day(self):
+        member = make_member('ana')
+        exercise = Exercise.objects.create(name='Press', muscle_group=MuscleGroup.objects.create(name='Pecho'))
+        tz = timezone.get_current_timezone()
+        for hour in (8, 19):
+            session = WorkoutSession.objects.create(
+                member=member, date=timezone.make_aware(datetime(2025, 3, 3, hour), tz)
+            )
+            ExerciseLog.objects.create(
+                session=session, exercise=exercise, planned_sets=3, planned_reps=10,
+                actual_sets=3, actual_reps=10, weight_used=Decimal('50')
+            )
+        columns = [timeseries.Column('sets', 'actual_sets', Sum)]
+
+        data, _ = timeseries.series(ExerciseLog.objects.all(), 'session__date', columns, 'day', 10)
+
+        assert data == {'dates': ['2025-03-03'], 'sets': [6.0]}
+
+    def test_auto_picks_raw_then_coarser_buckets(self):
+        member = make_member('ana')
+        log_weights(member, date(2024, 1, 1), [70 + i % 5 for i in range(400)])
+        logs = ProgressLog.objects.all()
+
+        assert timeseries.series(logs, 'date', WEIGHT, 'auto', 400)[1] == 'raw'
+        assert timeseries.series(logs, 'date', WEIGHT, 'auto', 100)[1] == 'week'
+        data, resolution = timeseries.series(logs, 'date', WEIGHT, 'auto', 20)
+        assert resolution == 'month'
+        assert len(data['dates']) == 14
+
+    def test_output_never_exceeds_max_points(self):
+        member = make_member('ana')
+        log_weights(member, date(2024, 1, 1), [70 + i % 5 for i in range(400)])
+
+        for resolution in ('raw', 'day', 'week', 'month'):
+            data, _ = timeseries.series(ProgressLog.objects.all(), 'date', WEIGHT, resolution, 8)
+            assert len(data['dates']) == len(data['weight']) <= 8
+            assert data['dates'][0] <= '2024-01-01'
+
+
+@pytest.mark.integration
+@pytest.mark.django_db
+class TestEndpoints:
+    """Progress evolution and exercise history use the shared layer."""
+
+    def test_progress_evolution_is_bounded(self):
+        member = make_member('ana')
+        log_weights(member, timezone.localdate() - timedelta(days=299), [81] * 300)
+        client = APIClient()
+        client.force_authenticate(member.user)
+
+        response = client.get('/api/progress/logs/evolution/', {'days': 365, 'max_points': 50})
+
+        assert response.status_code == 200
+        assert response.data['resolution'] == {'bucket': 'week'}
+        assert len(response.data['dates']) <= 50
+        assert response.data['weight'][0] == 81.0
+        assert response.data['bmi'][0] == 25.0
+        assert 'height' not in response.data
+
+    def test_exercise_history_query_count_is_constant(self, django_assert_num_queries):
+        member = make_member('ana')
+        exercise = Exercise.objects.create(name='Sentadilla', muscle_group=MuscleGroup.objects.create(name='Piernas'))
+        now = timezone.now()
+        for i in range(30):
+            session = WorkoutSession.objects.create(member=member, date=now - timedelta(days=i))
+            ExerciseLog.objects.create(
+                session=session, exercise=exercise, planned_sets=3, planned_reps=5,
+                actual_sets=3, actual_reps=5, weight_used=Decimal(100 + i)
+            )
+        client = APIClient()
+        client.force_authenticate(member.user)
+
+        # Perfil del miembro, conteo de auto y la serie: no una consulta por fila
+        with django_assert_num_queries(3):
+            response = client.get('/api/progress/exercise-logs/exercise_history/', {'exercise_id': exercise.pk})
+
+        assert response.data['resolution'] == {'bucket': 'raw'}
+        assert response.data['weights'][0] == 129.0
+        assert response.data['total_volume'][-1] == 1500.0
+
+    def test_invalid_resolution_is_rejected(self):
+        member = make_member('ana')
+        client = APIClient()
+        client.force_authenticate(member.user)
+
+        response = client.get('/api/progress/logs/evolution/', {'resolution': 'hour'})
+
+        assert response.status_code == 400
@@ -0,0 +1,51 @@
+"""
+Unit tests for common query helpers.
+Tests verify day ranges and the EXPLAIN audit over the hot query catalog.
+"""
+import pytest
+from datetime import date, timedelta
+from io import StringIO
+from django.core.management import call_command
+from django.utils import timezone
+from apps.common.dates import day_bounds
+from apps.common.management.commands.explain_queries import find_seq_scans
+
+
+@pytest.mark.unit
+class TestDayBounds:
+    """day_bounds() returns an aware half-open range."""
+
+    def test_single_day(self):
+        start, end = day_bounds(date(2025, 3, 10))
+
+        assert timezone.is_aware(start)
+        assert timezone.localtime(start).date() == date(2025, 3, 10)
+        assert end - start == timedelta(days=1)
+
+    def test_string_range_includes_last_day(self):
+        start, end = day_bounds('2025-03-01', '2025-03-31')
+
+        assert timezone.localtime(end).date() == date(2025, 4, 1)
+
+    def test_invalid_string_raises(self):
+        with pytest.raises(ValueError):
+            day_bounds('10/03/2025')
+
+
+@pytest.mark.unit
+class TestExplainQueries:
+    """explain_queries flags full table scans."""
+
+    def test_find_seq_scans(self):
+        assert find_seq_scans('Seq Scan on payments_payment  (cost=0.00..1.00)', 'postgresql') == ['payments_payment']
+        assert find_seq_scans('SCAN payments_payment', 'sqlite') == ['payments_payment']
+        assert find_seq_scans('SCAN audit_auditlog USING INDEX audit_idx', 'sqlite') == []
+        assert find_seq_scans('SEARCH payments_payment USING INDEX idx (status=?)', 'sqlite') == []
+
+    @pytest.mark.django_db
+    def test_hot_queries_use_indexes(self):
+        out = StringIO()
+
+        call_command('explain_queries', '--fail-on-seqscan', stdout=out)
+
+        assert 'consultas usan índices' in out.getvalue()
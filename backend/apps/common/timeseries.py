@@ -0,0 +1,163 @@
+"""
+Series de tiempo para gráficas
+Sistema de Gestión de Gimnasio
+
+Capa común de los endpoints de evolución (progreso físico, historial de
+ejercicios, métricas del atleta). La respuesta queda acotada a `max_points`
+puntos sin importar cuánto historial tenga el miembro:
+
+- resolution=day|week|month: agrupa en SQL (Trunc + agregados), un punto por período.
+- resolution=raw: las filas tal cual; si pasan de max_points se reducen con
+  LTTB (Largest-Triangle-Three-Buckets), que conserva picos y forma de la curva.
+- resolution=auto (por defecto): raw si las filas caben; si no, el período
+  más fino cuyo número de puntos cabe en max_points.
+
+Formato columnar: {'dates': [...], '<columna>': [...], ...}, una lista por columna.
+"""
+from datetime import datetime
+
+from django.conf import settings
+from django.db.models import Avg, Count, DateField, Max, Min
+from django.db.models.functions import Trunc
+
+RESOLUTIONS = ('auto', 'raw', 'day', 'week', 'month')
+# Días mínimos por punto de cada período, para estimar cuántos puntos salen en modo auto
+BUCKET_DAYS = {'day': 1, 'week': 7, 'month': 28}
+PRECISION = 2
+
+
+class Column:
+    """Columna de una serie: expresión por fila y agregado al agrupar por período."""
+
+    def __init__(self, name, expression, aggregate=Avg):
+        self.name = name
+        self.expression = expression
+        self.aggregate = aggregate
+
+
+def parse_params(query_params):
+    """
+    Lee resolution y max_points de los query params.
+
+    Returns:
+        tuple: (resolution, max_points), max_points limitado a TIMESERIES_MAX_POINTS
+
+    Raises:
+        ValueError: Si algún parámetro es inválido (mensaje para el cliente)
+    """
+    resolution = query_params.get('resolution', 'auto')
+    if resolution not in RESOLUTIONS:
+        raise ValueError(f"resolution debe ser uno de: {', '.join(RESOLUTIONS)}")
+    try:
+        max_points = int(query_params.get('max_points', settings.TIMESERIES_DEFAULT_POINTS))
+    except ValueError:
+        raise ValueError('max_points debe ser un número')
+    if max_points < 3:
+        raise ValueError('max_points debe ser al menos 3')
+    return resolution, min(max_points, settings.TIMESERIES_MAX_POINTS)
+
+
+def _x(value):
+    """Posición en días de una fecha o fecha y hora."""
+    if isinstance(value, datetime):
+        return value.timestamp() / 86400
+    return value.toordinal()
+
+
+def _number(value):
+    return None if value is None else round(float(value), PRECISION)
+
+
+def lttb(xs, ys, threshold):
+    """
+    Índices de los `threshold` puntos que elige Largest-Triangle-Three-Buckets.
+
+    Conserva el primero y el último; de cada tramo intermedio elige el punto que
+    forma el triángulo de mayor área con el elegido anterior y el promedio del
+    tramo siguiente.
+    """
+    n = len(xs)
+    if threshold >= n or threshold < 3:
+        return list(range(n))
+
+    every = (n - 2) / (threshold - 2)
+    selected = [0]
+    a = 0
+    for i in range(threshold - 2):
+        start = int(i * every) + 1
+        end = int((i + 1) * every) + 1
+        next_end = min(int((i + 2) * every) + 1, n)
+        avg_x = sum(xs[end:next_end]) / (next_end - end)
+        avg_y = sum(ys[end:next_end]) / (next_end - end)
+
+        best, best_area = start, -1.0
+        for j in range(start, end):
+            area = abs((xs[a] - avg_x) * (ys[j] - ys[a]) - (xs[a] - xs[j]) * (avg_y - ys[a]))
+            if area > best_area:
+                best, best_area = j, area
+        selected.append(best)
+        a = best
+    selected.append(n - 1)
+    return selected
+
+
+def auto_resolution(queryset, date_field, max_points):
+    """raw si las filas caben en max_points; si no, el período más fino que cabe."""
+    summary = queryset.order_by().aggregate(
+        count=Count('pk'), first=Min(date_field), last=Max(date_field)
+    )
+    if summary['count'] <= max_points:
+        return 'raw'
+    span = _x(summary['last']) - _x(summary['first'])
+    for kind in ('day', 'week'):
+        # +2: el primer y el último período pueden quedar incompletos
+        if span // BUCKET_DAYS[kind] + 2 <= max_points:
+            return kind
+    return 'month'
+
+
+def series(queryset, date_field, columns, resolution='auto', max_points=None):
+    """
+    Serie columnar de un queryset ordenada por fecha.
+
+    Args:
+        queryset: Filas ya filtradas (miembro, rango de fechas, ...)
+        date_field: Campo de fecha (DateField o DateTimeField; admite lookups como 'session__date')
+        columns: Lista de Column; la primera guía la reducción LTTB
+        resolution: 'auto', 'raw', 'day', 'week' o 'month'
+        max_points: Máximo de puntos (por defecto TIMESERIES_DEFAULT_POINTS)
+
+    Returns:
+        tuple: (datos columnares, resolución usada)
+    """
+    max_points = max_points or settings.TIMESERIES_DEFAULT_POINTS
+    if resolution == 'auto':
+        resolution = auto_resolution(queryset, date_field, max_points)
+
+    if resolution == 'raw':
+        rows = queryset.order_by(date_field, 'pk').values_list(
+            date_field, *[column.expression for column in columns]
+        )
+    else:
+        # Alias propios: un agregado no puede llamarse como un campo del modelo
+        aggregates = {f'ts_{i}': column.aggregate(column.expression) for i, column in enumerate(columns)}
+        rows = queryset.annotate(
+            ts_bucket=Trunc(date_field, resolution, output_field=DateField())
+        ).order_by().values('ts_bucket').annotate(**aggregates).order_by('ts_bucket').values_list(
+            'ts_bucket', *aggregates
+        )
+    rows = list(rows)
+
+    if len(rows) > max_points:
+        xs = [_x(row[0]) for row in rows]
+        # Los huecos de la columna guía toman el último valor conocido (solo para elegir puntos)
+        ys, last = [], 0.0
+        for row in rows:
+            last = float(row[1]) if row[1] is not None else last
+            ys.append(last)
+        rows = [rows[i] for i in lttb(xs, ys, max_points)]
+
+    data = {'dates': [row[0].isoformat() for row in rows]}
+    for position, column in enumerate(columns, 1):
+        data[column.name] = [_number(row[position]) for row in rows]
+    return data, resolution
@@ -5,3 +5,8 @@ class MembersConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.members'
     verbose_name = 'Miembros'
+
+    def ready(self):
+        """Conectar la invalidación del resumen cacheado del miembro"""
+        from apps.members.summary import connect_signals
+        connect_signals()
@@ -5,6 +5,7 @@ from django.core.management.base import BaseCommand
 from django.db import transaction
 from apps.users.models import User
 from apps.members.models import Member
+from apps.common.bulk import bulk_operation
 
 
 class Command(BaseCommand):
@@ -48,7 +49,7 @@ class Command(BaseCommand):
         
         # Crear perfiles de miembro
         created_count = 0
-        with transaction.atomic():
+        with transaction.atomic(), bulk_operation():
             for user in users_without_profile:
                 try:
                     Member.objects.create(user=user)
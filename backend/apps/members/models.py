@@ -6,8 +6,10 @@ Sistema de Gestión de Gimnasio
 from django.db import models
 from django.utils import timezone
 
+from apps.audit.tracking import AuditTrackedMixin
 
-class Member(models.Model):
+
+class Member(AuditTrackedMixin, models.Model):
     """Perfil extendido para miembros/clientes del gimnasio"""
     
     GENDER_CHOICES = [
@@ -86,6 +88,10 @@ class Member(models.Model):
         verbose_name = 'Miembro'
         verbose_name_plural = 'Miembros'
         ordering = ['-created_at']
+        indexes = [
+            # Alertas de abandono: miembros sin acceso desde una fecha
+            models.Index(fields=['last_access']),
+        ]
     
     def __str__(self):
         return f"{self.user.get_full_name()} - {self.get_subscription_status_display()}"
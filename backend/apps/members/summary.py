@@ -0,0 +1,214 @@
+"""
+Resumen del miembro ("me")
+Sistema de Gestión de Gimnasio
+
+Todo lo que muestra la pantalla de inicio del miembro en tres consultas: una
+sobre Member con agregaciones condicionales y subconsultas, otra con las
+próximas clases y otra con los días de asistencia (rachas). Se cachea por miembro y se invalida cuando cambian sus
+reservas, accesos, membresías, sesiones de entrenamiento o registros de progreso.
+"""
+import time
+from datetime import datetime, time as dtime, timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, IntegerField, OuterRef, Q, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+from django.db.models.signals import post_save, post_delete
+from django.utils import timezone
+
+from apps.access.attendance import streaks
+from apps.common.dates import day_bounds
+
+CACHE_PREFIX = 'member_summary'
+UPCOMING_LIMIT = 5
+ACTIVE_RESERVATION_STATUSES = ['confirmed', 'waitlist']
+
+
+def _subquery_count(queryset):
+    """Conteo como subconsulta (evita multiplicar filas al combinar varias relaciones)"""
+    counted = queryset.order_by().values('member').annotate(total=Count('pk')).values('total')
+    return Coalesce(Subquery(counted, output_field=IntegerField()), Value(0))
+
+
+def _classes_attended(since):
+    """Clases asistidas desde el día indicado, sumadas sobre AttendanceDay"""
+    from apps.access.models import AttendanceDay
+
+    total = AttendanceDay.objects.filter(member=OuterRef('pk'), date__gte=since).order_by().values(
+        'member'
+    ).annotate(total=Sum('classes_attended')).values('total')
+    return Coalesce(Subquery(total, output_field=IntegerField()), Value(0))
+
+
+def compute_summary(member, now=None):
+    """
+    Calcula el resumen del miembro sin caché.
+
+    Returns:
+        dict: membership, reservations, attendance, streak y activity
+    """
+    from apps.classes.models import Reservation
+    from apps.memberships.models import Membership
+    from apps.members.models import Member
+    from apps.progress.models import ProgressLog, WorkoutSession
+
+    now = now or timezone.now()
+    today = timezone.localdate(now)
+    month_start = day_bounds(today.replace(day=1))[0]
+
+    active_membership = Membership.objects.filter(member=OuterRef('pk'), status='active')
+    latest_progress = ProgressLog.objects.filter(member=OuterRef('pk')).order_by('-date')
+    start = 'reservations__gym_class__start_datetime'
+
+    row = Member.objects.filter(pk=member.pk).annotate(
+        upcoming=Count('reservations', filter=Q(
+            reservations__status__in=ACTIVE_RESERVATION_STATUSES, **{f'{start}__gte': now}
+        )),
+        attended_month=_classes_attended(today.replace(day=1)),
+        attended_30_days=_classes_attended(today - timedelta(days=30)),
+        membership_end=Subquery(active_membership.values('end_date')[:1]),
+        membership_plan=Subquery(active_membership.values('plan__name')[:1]),
+        sessions_month=_subquery_count(WorkoutSession.objects.filter(member=OuterRef('pk'), date__gte=month_start)),
+        last_progress_date=Subquery(latest_progress.values('date')[:1]),
+        current_weight=Subquery(latest_progress.values('weight')[:1]),
+    ).values(
+        'upcoming', 'attended_month', 'attended_30_days', 'membership_end',
+        'membership_plan', 'sessions_month', 'last_progress_date', 'current_weight'
+    ).get()
+
+    upcoming = Reservation.objects.filter(
+        member=member,
+        gym_class__start_datetime__gte=now,
+        status__in=ACTIVE_RESERVATION_STATUSES
+    ).select_related(
+        'gym_class__class_type', 'gym_class__instructor__user'
+    ).order_by('gym_class__start_datetime')[:UPCOMING_LIMIT]
+
+    upcoming_list = []
+    for reservation in upcoming:
+        gym_class = reservation.gym_class
+        upcoming_list.append({
+            'id': reservation.id,
+            'class_name': gym_class.class_type.name if gym_class.class_type else gym_class.title,
+            'trainer_name': gym_class.instructor.user.get_full_name() if gym_class.instructor else 'Sin asignar',
+            'start_datetime': gym_class.start_datetime,
+            'date': gym_class.start_datetime.strftime('%d/%m/%Y'),
+            'time': gym_class.start_datetime.strftime('%I:%M %p'),
+        })
+
+    membership_end = row['membership_end']
+    days_remaining = (membership_end - today).days if membership_end else None
+
+    return {
+        'membership': {
+            'is_active': membership_end is not None,
+            'plan_name': row['membership_plan'],
+            'end_date': membership_end,
+            'days_remaining': days_remaining,
+            'expiring_soon': days_remaining is not None and days_remaining <= 7,
+        },
+        'reservations': {
+            'upcoming': row['upcoming'],
+            'list': upcoming_list,
+        },
+        'attendance': {
+            'month': row['attended_month'],
+            'last_30_days': row['attended_30_days'],
+        },
+        'streak': dict(zip(('current', 'best'), streaks(member, today))),
+        'activity': {
+            'sessions_this_month': row['sessions_month'],
+            'last_progress_date': row['last_progress_date'],
+            'current_weight': row['current_weight'],
+        },
+    }
+
+
+# ==================== CACHÉ ====================
+
+def _generation_key(member_id):
+    return f'{CACHE_PREFIX}:gen:{member_id}'
+
+
+def _ttl(summary, now):
+    """
+    Segundos que el resumen sigue siendo válido sin escrituras: hasta que empiece
+    la próxima clase (deja de ser "próxima") o hasta medianoche (cambian los días
+    restantes y los conteos del mes), sin pasar de MEMBER_SUMMARY_CACHE_TTL.
+    """
+    limits = [settings.MEMBER_SUMMARY_CACHE_TTL]
+
+    midnight = timezone.make_aware(
+        datetime.combine(timezone.localdate(now) + timedelta(days=1), dtime.min)
+    )
+    limits.append((midnight - now).total_seconds())
+
+    upcoming = summary['reservations']['list']
+    if upcoming:
+        limits.append((upcoming[0]['start_datetime'] - now).total_seconds())
+
+    return max(1, int(min(limits)))
+
+
+def get_summary(member):
+    """
+    Resumen del miembro desde caché (o calculado y cacheado).
+
+    Args:
+        member: Member
+
+    Returns:
+        dict: Ver compute_summary
+    """
+    generation = cache.get(_generation_key(member.pk), 0)
+    key = f'{CACHE_PREFIX}:{member.pk}:{generation}'
+
+    summary = cache.get(key)
+    if summary is None:
+        now = timezone.now()
+        summary = compute_summary(member, now)
+        cache.set(key, summary, _ttl(summary, now))
+    return summary
+
+
+def invalidate(*member_ids):
+    """Descarta el resumen cacheado de los miembros indicados."""
+    generation = time.time_ns()
+    cache.set_many({_generation_key(member_id): generation for member_id in member_ids}, timeout=None)
+
+
+# ==================== INVALIDACIÓN ====================
+
+def _invalidate_on_commit(member_ids):
+    member_ids = [member_id for member_id in member_ids if member_id is not None]
+    if member_ids:
+        transaction.on_commit(lambda: invalidate(*member_ids))
+
+
+def _member_changed(sender, instance, **kwargs):
+    _invalidate_on_commit([instance.member_id])
+
+
+def _class_changed(sender, instance, created=False, **kwargs):
+    """Cancelar o mover una clase cambia la lista de próximas clases de sus inscritos"""
+    if created:
+        return
+    from apps.classes.models import Reservation
+    _invalidate_on_commit(list(
+        Reservation.objects.filter(gym_class=instance).values_list('member_id', flat=True)
+    ))
+
+
+def connect_signals():
+    """Conecta la invalidación a los modelos que alimentan el resumen."""
+    from django.apps import apps
+
+    for label in ('classes.Reservation', 'access.AccessLog', 'memberships.Membership',
+                  'progress.WorkoutSession', 'progress.ProgressLog'):
+        model = apps.get_model(label)
+        post_save.connect(_member_changed, sender=model, dispatch_uid=f'member_summary_{label}_save')
+        post_delete.connect(_member_changed, sender=model, dispatch_uid=f'member_summary_{label}_delete')
+
+    post_save.connect(_class_changed, sender=apps.get_model('classes.GymClass'), dispatch_uid='member_summary_gymclass_save')
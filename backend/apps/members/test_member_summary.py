@@ -0,0 +1,123 @@
+"""
+Unit tests for the cached member summary.
+Tests verify the summary query budget, per-member caching and invalidation.
+"""
+import pytest
+from datetime import timedelta
+from decimal import Decimal
+from django.utils import timezone
+from rest_framework.test import APIClient
+from apps.classes import booking
+from apps.classes.models import ClassType, GymClass
+from apps.members import summary
+from apps.members.models import Member
+from apps.memberships.models import Membership, MembershipPlan
+from apps.progress.models import ProgressLog, WorkoutSession
+from apps.users.models import User
+
+
+def make_member(username):
+    user = User.objects.create_user(username=username, email=f'{username}@gym.com', password='x')
+    return Member.objects.create(user=user)
+
+
+def make_class(start, capacity=10):
+    class_type, _ = ClassType.objects.get_or_create(name='Funcional')
+    return GymClass.objects.create(
+        class_type=class_type, title='Funcional', start_datetime=start,
+        end_datetime=start + timedelta(hours=1), capacity=capacity
+    )
+
+
+@pytest.fixture
+def athlete(db):
+    member = make_member('athlete')
+    plan = MembershipPlan.objects.create(name='Mensual', price=Decimal('30'), duration_days=30)
+    today = timezone.localdate()
+    Membership.objects.create(
+        member=member, plan=plan, start_date=today - timedelta(days=25),
+        end_date=today + timedelta(days=5), status='active'
+    )
+    now = timezone.now()
+    for days in (1, 2):
+        booking.book(make_class(now + timedelta(days=days)), member)
+    past = booking.book(make_class(now - timedelta(hours=3)), member)
+    past.mark_attended()
+    WorkoutSession.objects.create(member=member, date=now)
+    ProgressLog.objects.create(member=member, date=timezone.localdate(), weight=Decimal('72.5'))
+    return member
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+class TestMemberSummary:
+    """compute_summary() and get_summary()."""
+
+    def test_summary_in_three_queries(self, athlete, django_assert_num_queries):
+        with django_assert_num_queries(3):
+            data = summary.compute_summary(athlete)
+
+        assert data['membership']['plan_name'] == 'Mensual'
+        assert data['membership']['days_remaining'] == 5
+        assert data['membership']['expiring_soon'] is True
+        assert data['reservations']['upcoming'] == 2
+        assert len(data['reservations']['list']) == 2
+        assert data['attendance'] == {'month': 1, 'last_30_days': 1}
+        assert data['streak'] == {'current': 1, 'best': 1}
+        assert data['activity']['sessions_this_month'] == 1
+        assert data['activity']['current_weight'] == Decimal('72.5')
+
+    def test_second_read_is_cached(self, athlete, django_assert_num_queries):
+        first = summary.get_summary(athlete)
+
+        with django_assert_num_queries(0):
+            assert summary.get_summary(athlete) == first
+
+    def test_own_writes_invalidate_only_that_member(self, athlete, django_capture_on_commit_callbacks):
+        other = make_member('other')
+        summary.get_summary(athlete)
+        other_summary = summary.get_summary(other)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            booking.book(make_class(timezone.now() + timedelta(days=3)), athlete)
+
+        assert summary.get_summary(athlete)['reservations']['upcoming'] == 3
+        assert summary.cache.get(f'{summary.CACHE_PREFIX}:gen:{other.pk}') is None
+        assert summary.get_summary(other) == other_summary
+
+    def test_cache_expires_when_next_class_starts(self, athlete, settings):
+        settings.MEMBER_SUMMARY_CACHE_TTL = 60 * 60 * 24
+        now = timezone.now()
+        booking.book(make_class(now + timedelta(minutes=10)), athlete)
+
+        data = summary.compute_summary(athlete, now)
+
+        assert summary._ttl(data, now) <= 10 * 60
+
+
+@pytest.mark.integration
+@pytest.mark.django_db
+class TestMemberSummaryEndpoints:
+    """stats and dashboard_stats read the cached summary."""
+
+    def test_stats_and_dashboard_share_the_summary(self, athlete, django_assert_max_num_queries):
+        client = APIClient()
+        client.force_authenticate(athlete.user)
+
+        stats = client.get('/api/users/stats/').json()
+        assert stats['reservations']['upcoming'] == 2
+        assert stats['attendance']['month'] >= 0
+
+        with django_assert_max_num_queries(1):
+            dashboard = client.get('/api/users/dashboard_stats/').json()
+        assert dashboard['next_class']['has_reservation'] is True
+        assert dashboard['activity']['current_weight'] == 72.5
+
+    def test_me_summary(self, athlete):
+        client = APIClient()
+        client.force_authenticate(athlete.user)
+
+        response = client.get('/api/users/me/summary/')
+
+        assert response.status_code == 200
+        assert response.json()['membership']['plan_name'] == 'Mensual'
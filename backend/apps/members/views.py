@@ -49,6 +49,24 @@ class MemberViewSet(viewsets.ModelViewSet):
             'active_percentage': round(active / total * 100, 1) if total > 0 else 0
         })
     
+    @action(detail=False, methods=['get'])
+    def export(self, request):
+        """Exportar miembros a Excel o CSV (?export_format=csv)"""
+        if not request.user.is_staff:
+            return Response({'detail': 'No tienes permisos'}, status=403)
+        
+        from apps.reports.exports import export_response, get_export_format
+        from apps.reports.specs import MEMBER_COLUMNS
+        
+        queryset = self.filter_queryset(Member.objects.all())
+        return export_response(
+            queryset,
+            MEMBER_COLUMNS,
+            'miembros',
+            export_format=get_export_format(request),
+            title='Miembros'
+        )
+    
     @action(detail=False, methods=['get'])
     def expiring_soon(self, request):
         """Miembros con membresía por vencer en 7 días"""
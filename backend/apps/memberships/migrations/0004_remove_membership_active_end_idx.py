@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-17 20:42
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('memberships', '0003_membership_memberships_status_e653e8_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='membership',
+            name='membership_active_end_idx',
+        ),
+    ]
@@ -7,8 +7,10 @@ from django.db import models
 from django.utils import timezone
 from datetime import timedelta
 
+from apps.audit.tracking import AuditTrackedMixin
 
-class MembershipPlan(models.Model):
+
+class MembershipPlan(AuditTrackedMixin, models.Model):
     """Planes de membresía disponibles (Mensual, Trimestral, Anual, etc.)"""
     
     name = models.CharField(
@@ -62,7 +64,7 @@ class MembershipPlan(models.Model):
         return f"{self.name} - ${self.price} ({self.duration_days} días)"
 
 
-class Membership(models.Model):
+class Membership(AuditTrackedMixin, models.Model):
     """Membresía activa de un miembro"""
     
     STATUS_CHOICES = [
@@ -126,6 +128,11 @@ class Membership(models.Model):
         verbose_name = 'Membresía'
         verbose_name_plural = 'Membresías'
         ordering = ['-start_date']
+        indexes = [
+            # Membresías activas por vencer (status='active' y rango de end_date)
+            models.Index(fields=['status', 'end_date']),
+            models.Index(fields=['member', 'status']),
+        ]
     
     def __str__(self):
         return f"{self.member} - {self.plan.name} ({self.get_status_display()})"
@@ -165,7 +172,7 @@ class Membership(models.Model):
         return False
 
 
-class MembershipFreeze(models.Model):
+class MembershipFreeze(AuditTrackedMixin, models.Model):
     """Historial de congelaciones de membresía"""
     
     membership = models.ForeignKey(
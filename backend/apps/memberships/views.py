@@ -4,6 +4,7 @@ ViewSets para Membresías
 from rest_framework import viewsets, permissions, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
+from apps.common.mixins import ConditionalGetMixin
 from .models import MembershipPlan, Membership, MembershipFreeze
 from .serializers import (
     MembershipPlanSerializer, MembershipSerializer,
@@ -11,7 +12,7 @@ from .serializers import (
 )
 
 
-class MembershipPlanViewSet(viewsets.ModelViewSet):
+class MembershipPlanViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     queryset = MembershipPlan.objects.all()
     serializer_class = MembershipPlanSerializer
     permission_classes = [permissions.IsAuthenticated]
@@ -113,6 +114,23 @@ class MembershipViewSet(viewsets.ModelViewSet):
         serializer = self.get_serializer(expiring_memberships, many=True)
         return Response(serializer.data)
     
+    @action(detail=False, methods=['get'])
+    def export(self, request):
+        """Exportar membresías a Excel o CSV (?export_format=csv)"""
+        if not request.user.is_staff:
+            return Response({'detail': 'No tienes permisos'}, status=403)
+        
+        from apps.reports.exports import export_response, get_export_format
+        from apps.reports.specs import MEMBERSHIP_COLUMNS
+        
+        return export_response(
+            self.get_queryset(),
+            MEMBERSHIP_COLUMNS,
+            'membresias',
+            export_format=get_export_format(request),
+            title='Membresías'
+        )
+    
     @action(detail=True, methods=['post'])
     def freeze(self, request, pk=None):
         """Congelar membresía con validación de límite"""
@@ -1,6 +1,6 @@
 """Admin para Notificaciones"""
 from django.contrib import admin
-from .models import NotificationTemplate, Notification, EmailLog, WhatsAppLog, NotificationPreference
+from .models import NotificationTemplate, Notification, ReminderLog, EmailLog, WhatsAppLog, NotificationPreference
 
 @admin.register(NotificationTemplate)
 class NotificationTemplateAdmin(admin.ModelAdmin):
@@ -12,6 +12,11 @@ class NotificationAdmin(admin.ModelAdmin):
     list_display = ['user', 'title', 'notification_type', 'is_read', 'created_at']
     list_filter = ['notification_type', 'is_read', 'created_at']
 
+@admin.register(ReminderLog)
+class ReminderLogAdmin(admin.ModelAdmin):
+    list_display = ['membership', 'kind', 'due_date', 'created_at']
+    list_filter = ['kind', 'due_date']
+
 @admin.register(EmailLog)
 class EmailLogAdmin(admin.ModelAdmin):
     list_display = ['recipient_email', 'subject', 'status', 'sent_at']
@@ -5,3 +5,8 @@ class NotificationsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.notifications'
     verbose_name = 'Notificaciones'
+
+    def ready(self):
+        """Conectar la generación automática de notificaciones"""
+        from apps.notifications.signals import connect_signals
+        connect_signals()
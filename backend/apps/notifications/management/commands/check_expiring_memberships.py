@@ -1,52 +1,51 @@
 """
 Management command para notificar membresías próximas a vencer
-Ejecutar diariamente con cron o task scheduler
+Corre a diario como trabajo programado (manage.py run_scheduler); se puede repetir sin duplicar avisos
 """
-from django.core.management.base import BaseCommand
-from django.utils import timezone
-from datetime import timedelta
-from apps.memberships.models import Membership
-from apps.notifications.models import Notification
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.notifications import reminders
+
+
+def _parse_offsets(value):
+    try:
+        offsets = [int(part) for part in value.split(',') if part.strip()]
+    except ValueError:
+        raise CommandError(f'Plazos inválidos: {value} (ej.: 7,3,1)')
+    if not offsets or min(offsets) < 0:
+        raise CommandError('Los plazos deben ser días no negativos')
+    return offsets
 
 
 class Command(BaseCommand):
-    help = 'Notifica a usuarios con membresías que vencen en 7 días'
-    
+    help = 'Notifica a usuarios con membresías por vencer (varios plazos antes del vencimiento)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--offsets', help='Días antes del vencimiento, separados por coma (por defecto, los configurados)')
+        parser.add_argument('--chunk-size', type=int, default=reminders.CHUNK_SIZE, help='Membresías por bloque')
+        parser.add_argument('--dry-run', action='store_true', help='Solo contar, sin crear notificaciones')
+
     def handle(self, *args, **options):
-        """
-        Buscar membresías activas que vencen exactamente en 7 días
-        y crear notificaciones
-        """
-        seven_days = timezone.now().date() + timedelta(days=7)
-        
-        expiring_memberships = Membership.objects.filter(
-            end_date=seven_days,
-            status='active'
-        ).select_related('member__user', 'plan')
-        
-        created_count = 0
-        
-        for membership in expiring_memberships:
-            # Verificar que no se haya notificado ya
-            existing = Notification.objects.filter(
-                user=membership.member.user,
-                notification_type='warning',
-                title__contains='Membresía por Vencer',
-                created_at__gte=timezone.now() - timedelta(days=1)
-            ).exists()
-            
-            if not existing:
-                Notification.objects.create(
-                    user=membership.member.user,
-                    title='⚠️ Membresía por Vencer',
-                    message=f'Tu membresía {membership.plan.name} vence el {membership.end_date.strftime("%d/%m/%Y")}. Renuévala para seguir disfrutando de todos los beneficios.',
-                    notification_type='warning',
-                    link='/memberships'
-                )
-                created_count += 1
-        
-        self.stdout.write(
-            self.style.SUCCESS(
-                f'✅ {created_count} notificaciones de vencimiento creadas'
-            )
+        if options['chunk_size'] < 1:
+            raise CommandError('--chunk-size debe ser mayor que 0')
+        offsets = _parse_offsets(options['offsets']) if options['offsets'] else None
+
+        start = time.perf_counter()
+        result = reminders.send_renewal_reminders(
+            offsets=offsets,
+            chunk_size=options['chunk_size'],
+            dry_run=options['dry_run']
+        )
+        elapsed = time.perf_counter() - start
+
+        rate = result['created'] / elapsed if elapsed else 0
+        summary = (
+            f"{result['created']} recordatorios (plazos {', '.join(map(str, result['offsets']))} días; "
+            f"{result['chunks']} bloques en {elapsed:.2f}s, {rate:.0f}/s)"
         )
+        if options['dry_run']:
+            self.stdout.write(self.style.WARNING(f'[dry-run] {summary}; no se crearon notificaciones'))
+        else:
+            self.stdout.write(self.style.SUCCESS(f'✅ {summary}'))
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.18 on 2026-10-17 19:10
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('memberships', '0003_membership_memberships_status_e653e8_idx_and_more'),
+        ('notifications', '0002_notification_notificatio_user_id_f2ad08_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReminderLog',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(help_text='Ej.: renewal_7d (7 días antes del vencimiento)', max_length=30, verbose_name='Tipo de recordatorio')),
+                ('due_date', models.DateField(help_text='Vencimiento al que se refiere el recordatorio', verbose_name='Fecha de vencimiento')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('membership', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='reminder_logs', to='memberships.membership', verbose_name='Membresía')),
+                ('notification', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='notifications.notification', verbose_name='Notificación')),
+            ],
+            options={
+                'verbose_name': 'Recordatorio Enviado',
+                'verbose_name_plural': 'Recordatorios Enviados',
+                'ordering': ['-created_at'],
+                'unique_together': {('membership', 'kind', 'due_date')},
+            },
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-17 20:43
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notifications', '0004_notification_notificatio_user_id_05b4bc_idx'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='notification',
+            name='notificatio_user_id_f2ad08_idx',
+        ),
+    ]
@@ -112,6 +112,17 @@ class Notification(models.Model):
         verbose_name = 'Notificación'
         verbose_name_plural = 'Notificaciones'
         ordering = ['-created_at']
+        # Un índice por forma de consulta: la tabla recibe muchos INSERT
+        indexes = [
+            # Bandeja completa paginada por cursor
+            models.Index(fields=['user', '-created_at']),
+            # Contador y bandeja de no leídas
+            models.Index(
+                fields=['user', '-created_at'],
+                condition=models.Q(is_read=False),
+                name='notification_unread_idx'
+            ),
+        ]
     
     def __str__(self):
         return f"{self.title} - {self.user}"
@@ -123,6 +134,47 @@ class Notification(models.Model):
             self.save()
 
 
+class ReminderLog(models.Model):
+    """
+    Recordatorios ya enviados. La clave (membresía, tipo, fecha) hace que el
+    motor de recordatorios se pueda ejecutar varias veces sin duplicar avisos.
+    """
+    
+    membership = models.ForeignKey(
+        'memberships.Membership',
+        on_delete=models.CASCADE,
+        related_name='reminder_logs',
+        verbose_name='Membresía'
+    )
+    kind = models.CharField(
+        max_length=30,
+        verbose_name='Tipo de recordatorio',
+        help_text='Ej.: renewal_7d (7 días antes del vencimiento)'
+    )
+    due_date = models.DateField(
+        verbose_name='Fecha de vencimiento',
+        help_text='Vencimiento al que se refiere el recordatorio'
+    )
+    notification = models.ForeignKey(
+        Notification,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='+',
+        verbose_name='Notificación'
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        verbose_name = 'Recordatorio Enviado'
+        verbose_name_plural = 'Recordatorios Enviados'
+        ordering = ['-created_at']
+        unique_together = ['membership', 'kind', 'due_date']
+    
+    def __str__(self):
+        return f"{self.kind} - {self.membership} ({self.due_date})"
+
+
 class EmailLog(models.Model):
     """Historial de emails enviados"""
     
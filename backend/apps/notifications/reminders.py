@@ -0,0 +1,160 @@
+"""
+Recordatorios de renovación
+Avisa a los miembros antes de que venza su membresía en varios plazos
+(p. ej. 7, 3 y 1 días antes), en bloque y sin duplicar avisos
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Exists, OuterRef
+from django.utils import timezone
+
+DEFAULT_FIRST_REMINDER_DAYS = 7
+CHUNK_SIZE = 1000
+# Reintentos de un bloque que choca con una ejecución concurrente
+MAX_CHUNK_ATTEMPTS = 3
+
+
+def reminder_offsets():
+    """
+    Plazos en días antes del vencimiento, de mayor a menor: el de GymSettings
+    más los seguimientos de RENEWAL_REMINDER_FOLLOWUPS que sean menores.
+    """
+    from apps.analytics.models import GymSettings
+
+    first = GymSettings.objects.values_list('days_for_renewal_reminder', flat=True).first()
+    first = first or DEFAULT_FIRST_REMINDER_DAYS
+    followups = {days for days in settings.RENEWAL_REMINDER_FOLLOWUPS if 0 <= days < first}
+    return sorted({first} | followups, reverse=True)
+
+
+def kind_for(offset):
+    return f'renewal_{offset}d'
+
+
+def due_offset(days_left, offsets):
+    """
+    Plazo que corresponde a una membresía: el más cercano ya alcanzado.
+    Con 5 días restantes y plazos (7, 3, 1) corresponde el de 7, así un día
+    sin ejecutar el comando no hace perder el aviso.
+    """
+    return min(offset for offset in offsets if offset >= days_left)
+
+
+def _message(plan_name, end_date, days_left):
+    if days_left == 0:
+        when = 'hoy'
+    elif days_left == 1:
+        when = 'mañana'
+    else:
+        when = f'el {end_date.strftime("%d/%m/%Y")}'
+    return (
+        f'Tu membresía {plan_name} vence {when}. '
+        f'Renuévala para seguir disfrutando de todos los beneficios.'
+    )
+
+
+def _unsent(due):
+    """Avisos del bloque que todavía no tienen ReminderLog (una consulta)"""
+    from .models import ReminderLog
+
+    sent = set(ReminderLog.objects.filter(
+        membership_id__in=[pk for pk, _, _ in due]
+    ).values_list('membership_id', 'kind', 'due_date'))
+    return [(key, value) for key, value in due.items() if key not in sent]
+
+
+def _send(pending):
+    """Crea las notificaciones y su ReminderLog en una transacción"""
+    from .models import Notification, ReminderLog
+
+    with transaction.atomic():
+        notifications = Notification.objects.bulk_create([
+            Notification(
+                user_id=user_id,
+                title='⚠️ Membresía por Vencer',
+                message=message,
+                notification_type='warning',
+                link='/memberships'
+            )
+            for _, (user_id, message) in pending
+        ])
+        ReminderLog.objects.bulk_create([
+            ReminderLog(membership_id=pk, kind=kind, due_date=due_date, notification=notification)
+            for ((pk, kind, due_date), _), notification in zip(pending, notifications)
+        ])
+
+
+def send_renewal_reminders(offsets=None, today=None, chunk_size=CHUNK_SIZE, dry_run=False):
+    """
+    Crea las notificaciones de renovación pendientes.
+
+    Recorre las membresías activas que vencen dentro del plazo mayor por bloques
+    de id (paginación por llave) y, por bloque: una consulta de ReminderLog
+    para descartar los avisos ya enviados y dos bulk_create (notificaciones y
+    su ReminderLog) en una transacción. La clave única (membresía, tipo, fecha)
+    hace que repetir la ejecución no duplique avisos; si una ejecución
+    concurrente registra antes parte del bloque, este se revierte y se
+    reintenta sin esos avisos. Si la membresía se renueva, el nuevo
+    vencimiento vuelve a tener sus recordatorios.
+
+    Args:
+        offsets: Días antes del vencimiento (por defecto reminder_offsets())
+        today: Fecha de referencia
+        chunk_size: Membresías por bloque
+        dry_run: Solo contar, sin crear notificaciones
+
+    Returns:
+        dict: {'offsets', 'created', 'chunks'}
+    """
+    from apps.memberships.models import Membership
+    from .models import NotificationPreference
+
+    offsets = sorted(set(offsets or reminder_offsets()), reverse=True)
+    today = today or timezone.localdate()
+
+    # Anti-join con quienes desactivaron los recordatorios de renovación
+    opted_out = NotificationPreference.objects.filter(
+        user=OuterRef('member__user'), renewal_reminders=False
+    )
+    expiring = Membership.objects.filter(
+        status='active',
+        end_date__gte=today,
+        end_date__lte=today + timedelta(days=offsets[0])
+    ).filter(~Exists(opted_out)).order_by('pk').values_list(
+        'pk', 'end_date', 'member__user_id', 'plan__name'
+    )
+
+    created = chunks = 0
+    last_pk = 0
+    while True:
+        rows = list(expiring.filter(pk__gt=last_pk)[:chunk_size])
+        if not rows:
+            break
+        chunks += 1
+        last_pk = rows[-1][0]
+
+        due = {}
+        for pk, end_date, user_id, plan_name in rows:
+            days_left = (end_date - today).days
+            key = (pk, kind_for(due_offset(days_left, offsets)), end_date)
+            due[key] = (user_id, _message(plan_name, end_date, days_left))
+
+        for attempt in range(1, MAX_CHUNK_ATTEMPTS + 1):
+            pending = _unsent(due)
+            if not pending or dry_run:
+                break
+            try:
+                _send(pending)
+                break
+            except IntegrityError:
+                # Otra ejecución registró parte del bloque entre la consulta y el INSERT
+                if attempt == MAX_CHUNK_ATTEMPTS:
+                    raise
+        created += len(pending)
+
+        if len(rows) < chunk_size:
+            break
+
+    return {'offsets': offsets, 'created': created, 'chunks': chunks}
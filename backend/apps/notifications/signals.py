@@ -1,51 +1,118 @@
 """Signals para auto-generación de notificaciones"""
 from django.db.models.signals import post_save
-from django.dispatch import receiver
+from django.utils import timezone
+from django.utils.dateformat import format as date_format
+from apps.audit.tracking import get_snapshot
+from apps.common import bulk
+from apps.members.models import Member
 from apps.payments.models import Payment
-from apps.classes.models import Reservation
+from apps.classes.models import GymClass, Reservation
 from .models import Notification
 
 
-@receiver(post_save, sender=Payment)
+def connect_signals():
+    """Conecta los receivers solo a los modelos que generan notificaciones"""
+    bulk.connect(post_save, notify_payment_status, sender=Payment, dispatch_uid='notifications_payment_save')
+    bulk.connect(post_save, notify_class_reservation, sender=Reservation, dispatch_uid='notifications_reservation_save')
+
+
 def notify_payment_status(sender, instance, created, **kwargs):
     """
     Notificar cuando un pago cambia a completed o cancelled
+
+    Solo en la transición: el estado anterior sale del snapshot de
+    AuditTrackedMixin, que el receiver de auditoría renueva después
+    (NotificationsConfig está antes que AuditConfig en INSTALLED_APPS).
     """
-    if not created and instance.status in ['completed', 'cancelled']:
-        # Solo notificar si el estado cambió ahora
-        if instance.status == 'completed':
-            Notification.objects.create(
-                user=instance.member.user,
-                title='✅ Pago Aprobado',
-                message=f'Tu pago de ${instance.amount} ha sido aprobado exitosamente.',
-                notification_type='success',
-                link=f'/payments/{instance.id}'
-            )
-        elif instance.status == 'cancelled' and instance.rejection_reason:
-            Notification.objects.create(
-                user=instance.member.user,
-                title='❌ Pago Rechazado',
-                message=f'Tu pago de ${instance.amount} fue rechazado. Motivo: {instance.rejection_reason}',
-                notification_type='error',
-                link=f'/payments/{instance.id}'
-            )
+    if created or instance.status not in ['completed', 'cancelled']:
+        return
+
+    snapshot = get_snapshot(instance) or {}
+    if snapshot.get('status') == instance.status:
+        return
+
+    # En una operación masiva se notifica todo el lote al cerrar
+    operation = bulk.current()
+    if operation is not None:
+        operation.defer(_flush_payments, instance)
+    else:
+        create_payment_notifications([instance])
 
 
-@receiver(post_save, sender=Reservation)
 def notify_class_reservation(sender, instance, created, **kwargs):
     """
     Notificar cuando se reserva una clase
     """
-    if created and instance.status == 'confirmed':
-        from django.utils.dateformat import format as date_format
-        
-        class_date = date_format(instance.gym_class.date, 'd/m/Y')
-        class_time = instance.gym_class.start_time.strftime('%H:%M')
-        
-        Notification.objects.create(
-            user=instance.member.user,
+    if not created or instance.status != 'confirmed':
+        return
+
+    operation = bulk.current()
+    if operation is not None:
+        operation.defer(_flush_reservations, instance)
+    else:
+        create_reservation_notifications([instance])
+
+
+def _flush_payments(operation, payments):
+    create_payment_notifications(payments)
+
+
+def _flush_reservations(operation, reservations):
+    create_reservation_notifications(reservations)
+
+
+def _member_user_ids(instances):
+    """user_id del miembro de cada instancia: una sola consulta para los miembros no cargados"""
+    pending = {obj.member_id for obj in instances if not type(obj).member.is_cached(obj)}
+    user_ids = dict(Member.objects.filter(pk__in=pending).values_list('pk', 'user_id')) if pending else {}
+    for obj in instances:
+        if type(obj).member.is_cached(obj):
+            user_ids[obj.member_id] = obj.member.user_id
+    return user_ids
+
+
+def create_payment_notifications(payments):
+    """Crea con un solo INSERT las notificaciones de pagos aprobados o rechazados"""
+    user_ids = _member_user_ids(payments)
+    notifications = []
+    for payment in payments:
+        if payment.status == 'completed':
+            notifications.append(Notification(
+                user_id=user_ids[payment.member_id],
+                title='✅ Pago Aprobado',
+                message=f'Tu pago de ${payment.amount} ha sido aprobado exitosamente.',
+                notification_type='success',
+                link=f'/payments/{payment.id}'
+            ))
+        elif payment.status == 'cancelled' and payment.rejection_reason:
+            notifications.append(Notification(
+                user_id=user_ids[payment.member_id],
+                title='❌ Pago Rechazado',
+                message=f'Tu pago de ${payment.amount} fue rechazado. Motivo: {payment.rejection_reason}',
+                notification_type='error',
+                link=f'/payments/{payment.id}'
+            ))
+    return Notification.objects.bulk_create(notifications)
+
+
+def create_reservation_notifications(reservations):
+    """Crea con un solo INSERT las notificaciones de clases reservadas"""
+    user_ids = _member_user_ids(reservations)
+    pending = {r.gym_class_id for r in reservations if not Reservation.gym_class.is_cached(r)}
+    classes = GymClass.objects.select_related('class_type').in_bulk(pending) if pending else {}
+
+    notifications = []
+    for reservation in reservations:
+        gym_class = classes.get(reservation.gym_class_id) or reservation.gym_class
+        start = timezone.localtime(gym_class.start_datetime)
+        class_date = date_format(start, 'd/m/Y')
+        class_time = start.strftime('%H:%M')
+
+        notifications.append(Notification(
+            user_id=user_ids[reservation.member_id],
             title='📅 Clase Reservada',
-            message=f'Reservaste {instance.gym_class.class_type.name} para el {class_date} a las {class_time}.',
+            message=f'Reservaste {gym_class.class_type.name} para el {class_date} a las {class_time}.',
             notification_type='success',
             link='/classes/my-reservations'
-        )
+        ))
+    return Notification.objects.bulk_create(notifications)
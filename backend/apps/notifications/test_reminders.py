@@ -0,0 +1,122 @@
+"""
+Unit tests for the renewal reminder engine.
+Tests verify reminder offsets, catch-up after missed runs, idempotent and concurrent re-runs and opt-outs.
+"""
+import pytest
+from datetime import timedelta
+from decimal import Decimal
+from django.core.management import call_command
+from django.utils import timezone
+from apps.analytics.models import GymSettings
+from apps.members.models import Member
+from apps.memberships.models import Membership, MembershipPlan
+from apps.notifications import reminders
+from apps.notifications.models import Notification, NotificationPreference, ReminderLog
+from apps.users.models import User
+
+TODAY = timezone.localdate()
+OFFSETS = [7, 3, 1]
+
+
+def make_membership(username, days_left):
+    user = User.objects.create_user(username=username, email=f'{username}@gym.com', password='x')
+    member = Member.objects.create(user=user)
+    plan, _ = MembershipPlan.objects.get_or_create(
+        name='Mensual', defaults={'price': Decimal('30'), 'duration_days': 30}
+    )
+    return Membership.objects.create(
+        member=member, plan=plan, start_date=TODAY - timedelta(days=20),
+        end_date=TODAY + timedelta(days=days_left), status='active'
+    )
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+class TestRenewalReminders:
+    """send_renewal_reminders() and check_expiring_memberships."""
+
+    def test_offsets_come_from_gym_settings(self, settings):
+        settings.RENEWAL_REMINDER_FOLLOWUPS = [3, 1, 10]
+        GymSettings.objects.create(days_for_renewal_reminder=5)
+
+        assert reminders.reminder_offsets() == [5, 3, 1]
+
+    def test_each_membership_gets_its_current_offset(self):
+        week = make_membership('week', 7)
+        missed = make_membership('missed', 5)
+        tomorrow = make_membership('tomorrow', 1)
+        make_membership('later', 12)
+
+        result = reminders.send_renewal_reminders(offsets=OFFSETS, today=TODAY)
+
+        assert result['created'] == 3
+        kinds = dict(ReminderLog.objects.values_list('membership_id', 'kind'))
+        assert kinds == {week.pk: 'renewal_7d', missed.pk: 'renewal_7d', tomorrow.pk: 'renewal_1d'}
+        assert Notification.objects.get(user=tomorrow.member.user).message.startswith('Tu membresía Mensual vence mañana')
+
+    def test_reruns_are_idempotent(self):
+        make_membership('week', 7)
+
+        first = reminders.send_renewal_reminders(offsets=OFFSETS, today=TODAY)
+        second = reminders.send_renewal_reminders(offsets=OFFSETS, today=TODAY)
+        next_day = reminders.send_renewal_reminders(offsets=OFFSETS, today=TODAY + timedelta(days=1))
+
+        assert (first['created'], second['created'], next_day['created']) == (1, 0, 0)
+        assert Notification.objects.count() == 1
+
+    def test_followups_and_renewals_send_again(self):
+        membership = make_membership('week', 7)
+        reminders.send_renewal_reminders(offsets=OFFSETS, today=TODAY)
+
+        assert reminders.send_renewal_reminders(offsets=OFFSETS, today=TODAY + timedelta(days=4))['created'] == 1
+
+        membership.end_date += timedelta(days=30)
+        membership.save()
+        assert reminders.send_renewal_reminders(offsets=OFFSETS, today=TODAY + timedelta(days=30))['created'] == 1
+        assert list(ReminderLog.objects.order_by('created_at', 'id').values_list('kind', flat=True)) == [
+            'renewal_7d', 'renewal_3d', 'renewal_7d'
+        ]
+
+    def test_opted_out_users_are_skipped(self):
+        membership = make_membership('quiet', 3)
+        NotificationPreference.objects.create(user=membership.member.user, renewal_reminders=False)
+
+        assert reminders.send_renewal_reminders(offsets=OFFSETS, today=TODAY)['created'] == 0
+
+    def test_chunks_use_constant_queries(self, django_assert_num_queries):
+        for i in range(5):
+            make_membership(f'soon{i}', 3)
+
+        # Por bloque: membresías, ReminderLog enviados y dos bulk_create (con SAVEPOINT / RELEASE)
+        with django_assert_num_queries(2 * (2 + 4)):
+            result = reminders.send_renewal_reminders(offsets=OFFSETS, today=TODAY, chunk_size=3)
+
+        assert (result['created'], result['chunks']) == (5, 2)
+        assert ReminderLog.objects.filter(notification__isnull=False).count() == 5
+
+    def test_concurrent_run_retries_the_chunk(self, monkeypatch):
+        raced = make_membership('raced', 7)
+        other = make_membership('other', 7)
+        unsent = reminders._unsent
+
+        def other_run_logs_first(due):
+            pending = unsent(due)
+            if not ReminderLog.objects.exists():
+                # Otra ejecución registra el aviso entre la consulta y el INSERT
+                ReminderLog.objects.create(membership=raced, kind='renewal_7d', due_date=raced.end_date)
+            return pending
+
+        monkeypatch.setattr(reminders, '_unsent', other_run_logs_first)
+        result = reminders.send_renewal_reminders(offsets=OFFSETS, today=TODAY)
+
+        assert result['created'] == 1
+        assert list(Notification.objects.values_list('user_id', flat=True)) == [other.member.user_id]
+        assert ReminderLog.objects.count() == 2
+
+    def test_command_dry_run(self, capsys):
+        make_membership('week', 7)
+
+        call_command('check_expiring_memberships', '--offsets', '7,3', '--dry-run')
+
+        assert not Notification.objects.exists()
+        assert '[dry-run] 1 recordatorios' in capsys.readouterr().out
@@ -5,6 +5,7 @@ from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from .models import Notification, NotificationPreference
 from .serializers import NotificationSerializer, NotificationPreferenceSerializer
+from apps.common.pagination import KeysetPagination
 
 
 class NotificationViewSet(viewsets.ReadOnlyModelViewSet):
@@ -14,10 +15,12 @@ class NotificationViewSet(viewsets.ReadOnlyModelViewSet):
     """
     serializer_class = NotificationSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = KeysetPagination
+    cursor_ordering = '-created_at'
     
     def get_queryset(self):
         """Solo notificaciones del usuario actual"""
-        return Notification.objects.filter(user=self.request.user)
+        return Notification.objects.filter(user=self.request.user).select_related('user')
     
     @action(detail=False, methods=['get'])
     def unread_count(self, request):
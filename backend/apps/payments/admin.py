@@ -3,7 +3,7 @@ Admin para Modelos de Pagos
 """
 
 from django.contrib import admin
-from .models import Payment, Invoice
+from .models import Payment, Invoice, DailyRevenueRollup
 
 
 @admin.register(Payment)
@@ -21,3 +21,11 @@ class InvoiceAdmin(admin.ModelAdmin):
     list_filter = ['issued_date']
     search_fields = ['invoice_number']
     readonly_fields = ['invoice_number', 'created_at']
+
+
+@admin.register(DailyRevenueRollup)
+class DailyRevenueRollupAdmin(admin.ModelAdmin):
+    list_display = ['date', 'payment_method', 'status', 'total_amount', 'payment_count', 'updated_at']
+    list_filter = ['status', 'payment_method']
+    date_hierarchy = 'date'
+    readonly_fields = ['date', 'payment_method', 'status', 'total_amount', 'payment_count', 'updated_at']
@@ -5,3 +5,7 @@ class PaymentsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.payments'
     verbose_name = 'Pagos'
+    
+    def ready(self):
+        """Importar signals cuando la app esté lista"""
+        import apps.payments.signals  # noqa
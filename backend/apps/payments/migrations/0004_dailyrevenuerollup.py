@@ -0,0 +1,57 @@
+# Generated by Django 5.2.18 on 2026-10-17 18:23
+
+from django.db import migrations, models
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncDate
+
+
+def backfill_rollup(apps, schema_editor):
+    Payment = apps.get_model('payments', 'Payment')
+    DailyRevenueRollup = apps.get_model('payments', 'DailyRevenueRollup')
+
+    rows = Payment.objects.annotate(
+        day=TruncDate('payment_date')
+    ).values('day', 'payment_method', 'status').annotate(
+        total=Sum('amount'),
+        count=Count('id')
+    ).order_by()
+
+    DailyRevenueRollup.objects.bulk_create([
+        DailyRevenueRollup(
+            date=row['day'],
+            payment_method=row['payment_method'],
+            status=row['status'],
+            total_amount=row['total'] or 0,
+            payment_count=row['count'],
+        )
+        for row in rows
+    ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('payments', '0003_payment_payment_type'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyRevenueRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(verbose_name='Fecha')),
+                ('payment_method', models.CharField(choices=[('cash', 'Efectivo'), ('card', 'Tarjeta'), ('transfer', 'Transferencia'), ('mobile', 'Pago Móvil'), ('other', 'Otro')], max_length=20, verbose_name='Método de pago')),
+                ('status', models.CharField(choices=[('pending', 'Pendiente'), ('completed', 'Completado'), ('cancelled', 'Cancelado'), ('refunded', 'Reembolsado')], max_length=20, verbose_name='Estado')),
+                ('total_amount', models.DecimalField(decimal_places=2, default=0, max_digits=14, verbose_name='Monto total')),
+                ('payment_count', models.IntegerField(default=0, verbose_name='Cantidad de pagos')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Resumen diario de ingresos',
+                'verbose_name_plural': 'Resúmenes diarios de ingresos',
+                'ordering': ['-date'],
+                'unique_together': {('date', 'payment_method', 'status')},
+            },
+        ),
+        migrations.RunPython(backfill_rollup, migrations.RunPython.noop),
+    ]
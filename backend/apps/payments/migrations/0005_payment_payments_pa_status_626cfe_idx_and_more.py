@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-17 18:34
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('members', '0001_initial'),
+        ('memberships', '0003_membership_memberships_status_e653e8_idx_and_more'),
+        ('payments', '0004_dailyrevenuerollup'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='payment',
+            index=models.Index(fields=['status', '-payment_date'], name='payments_pa_status_626cfe_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='payment',
+            index=models.Index(fields=['member', '-payment_date'], name='payments_pa_member__79f7b7_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='payment',
+            index=models.Index(condition=models.Q(('status', 'pending')), fields=['-payment_date'], name='payment_pending_idx'),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-17 19:29
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('members', '0002_member_members_mem_last_ac_8444ee_idx'),
+        ('memberships', '0003_membership_memberships_status_e653e8_idx_and_more'),
+        ('payments', '0005_payment_payments_pa_status_626cfe_idx_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='payment',
+            index=models.Index(fields=['-payment_date'], name='payments_pa_payment_60e7bc_idx'),
+        ),
+    ]
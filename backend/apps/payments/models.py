@@ -3,12 +3,14 @@ Modelos de Pagos y Facturación
 Sistema de Gestión de Gimnasio
 """
 
-from django.db import models
+from django.db import models, transaction
 from django.utils import timezone
 import uuid
 
+from apps.audit.tracking import AuditTrackedMixin
 
-class Payment(models.Model):
+
+class Payment(AuditTrackedMixin, models.Model):
     """Registro de pagos"""
     
     PAYMENT_METHODS = [
@@ -126,10 +128,33 @@ class Payment(models.Model):
         verbose_name = 'Pago'
         verbose_name_plural = 'Pagos'
         ordering = ['-payment_date']
+        indexes = [
+            models.Index(fields=['status', '-payment_date']),
+            models.Index(fields=['member', '-payment_date']),
+            # Listado completo paginado por cursor
+            models.Index(fields=['-payment_date']),
+            # Bandeja de aprobación: pocos pagos pendientes entre millones
+            models.Index(
+                fields=['-payment_date'],
+                condition=models.Q(status='pending'),
+                name='payment_pending_idx'
+            ),
+        ]
     
     def __str__(self):
         return f"Pago #{self.id} - {self.member} - ${self.amount}"
     
+    def save(self, *args, **kwargs):
+        """Guarda el pago y ajusta el rollup diario de ingresos en la misma transacción"""
+        from .rollups import get_previous_state, get_saved_state, apply_payment_change
+        
+        previous = get_previous_state(self)
+        update_fields = kwargs.get('update_fields')
+        
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            apply_payment_change(previous, get_saved_state(self, previous, update_fields))
+    
     def complete(self):
         """Marca el pago como completado"""
         if self.status == 'pending':
@@ -160,7 +185,7 @@ class Payment(models.Model):
         return False
 
 
-class Invoice(models.Model):
+class Invoice(AuditTrackedMixin, models.Model):
     """Factura/Comprobante"""
     
     payment = models.OneToOneField(
@@ -214,3 +239,43 @@ class Invoice(models.Model):
             # Generar número de factura único
             self.invoice_number = f"FAC-{timezone.now().strftime('%Y%m%d')}-{uuid.uuid4().hex[:6].upper()}"
         super().save(*args, **kwargs)
+
+
+class DailyRevenueRollup(models.Model):
+    """
+    Ingresos pre-agregados por día, método de pago y estado.
+    Se mantiene incrementalmente desde Payment.save(); los dashboards leen
+    estas filas en lugar de recorrer la tabla de pagos.
+    """
+    
+    date = models.DateField(verbose_name='Fecha')
+    payment_method = models.CharField(
+        max_length=20,
+        choices=Payment.PAYMENT_METHODS,
+        verbose_name='Método de pago'
+    )
+    status = models.CharField(
+        max_length=20,
+        choices=Payment.STATUS_CHOICES,
+        verbose_name='Estado'
+    )
+    total_amount = models.DecimalField(
+        max_digits=14,
+        decimal_places=2,
+        default=0,
+        verbose_name='Monto total'
+    )
+    payment_count = models.IntegerField(
+        default=0,
+        verbose_name='Cantidad de pagos'
+    )
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        verbose_name = 'Resumen diario de ingresos'
+        verbose_name_plural = 'Resúmenes diarios de ingresos'
+        ordering = ['-date']
+        unique_together = ['date', 'payment_method', 'status']
+    
+    def __str__(self):
+        return f"{self.date} - {self.get_payment_method_display()} - {self.get_status_display()}: ${self.total_amount}"
@@ -0,0 +1,214 @@
+"""
+Rollup diario de ingresos
+Mantiene DailyRevenueRollup a partir de los pagos y expone las consultas de los dashboards
+"""
+from datetime import date, datetime
+from decimal import Decimal
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Sum
+from django.db.models.functions import TruncDate, TruncMonth
+from django.utils import timezone
+
+from apps.audit.tracking import get_snapshot
+
+# Campos de Payment que definen a qué fila del rollup pertenece un pago
+ROLLUP_FIELDS = ('payment_date', 'payment_method', 'status', 'amount')
+
+
+def _local_date(value):
+    if isinstance(value, datetime):
+        if timezone.is_aware(value):
+            value = timezone.localtime(value)
+        return value.date()
+    return value
+
+
+def _state(payment_date, payment_method, status, amount):
+    if payment_date is None or amount is None:
+        return None
+    return {
+        'date': _local_date(payment_date),
+        'payment_method': payment_method,
+        'status': status,
+        'amount': Decimal(str(amount)),
+    }
+
+
+def get_previous_state(payment):
+    """
+    Estado del pago tal como está en la base de datos, antes de guardarlo.
+    Usa los valores cargados por AuditTrackedMixin; solo consulta la base
+    si la instancia no se obtuvo de un queryset.
+    """
+    from .models import Payment
+
+    if payment._state.adding or payment.pk is None:
+        return None
+
+    snapshot = get_snapshot(payment)
+    if snapshot is None or any(field not in snapshot for field in ROLLUP_FIELDS):
+        snapshot = Payment.objects.filter(pk=payment.pk).values(*ROLLUP_FIELDS).first()
+        if snapshot is None:
+            return None
+
+    return _state(*(snapshot[field] for field in ROLLUP_FIELDS))
+
+
+def get_saved_state(payment, previous=None, update_fields=None):
+    """
+    Estado que quedó en la base de datos después de save().
+    Con update_fields, los campos no guardados conservan el valor anterior.
+    """
+    state = _state(*(getattr(payment, field) for field in ROLLUP_FIELDS))
+    if state is None or previous is None or update_fields is None:
+        return state
+
+    update_fields = set(update_fields)
+    if 'payment_date' not in update_fields:
+        state['date'] = previous['date']
+    for field in ('payment_method', 'status', 'amount'):
+        if field not in update_fields:
+            state[field] = previous[field]
+    return state
+
+
+def apply_delta(day, payment_method, status, amount, count):
+    """
+    Suma (o resta) un monto y una cantidad a la fila del rollup.
+    El UPDATE con F() es atómico; la fila se crea la primera vez.
+    """
+    from .models import DailyRevenueRollup
+
+    rows = DailyRevenueRollup.objects.filter(date=day, payment_method=payment_method, status=status)
+    values = {
+        'total_amount': F('total_amount') + amount,
+        'payment_count': F('payment_count') + count,
+        'updated_at': timezone.now(),
+    }
+
+    if rows.update(**values):
+        return
+
+    try:
+        with transaction.atomic():
+            DailyRevenueRollup.objects.create(
+                date=day,
+                payment_method=payment_method,
+                status=status,
+                total_amount=amount,
+                payment_count=count,
+            )
+    except IntegrityError:
+        # Otra transacción creó la fila al mismo tiempo
+        rows.update(**values)
+
+
+def apply_payment_change(previous, current):
+    """Mueve un pago de su fila anterior del rollup a la nueva."""
+    if previous == current:
+        return
+    if previous is not None:
+        apply_delta(previous['date'], previous['payment_method'], previous['status'], -previous['amount'], -1)
+    if current is not None:
+        apply_delta(current['date'], current['payment_method'], current['status'], current['amount'], 1)
+
+
+def rebuild(start=None, end=None):
+    """
+    Recalcula el rollup desde la tabla de pagos para un rango de fechas
+    (ambos extremos inclusive; sin rango se recalcula todo).
+
+    Returns:
+        int: Filas del rollup generadas
+    """
+    from .models import Payment, DailyRevenueRollup
+
+    payments = Payment.objects.all()
+    rollups = DailyRevenueRollup.objects.all()
+    if start:
+        payments = payments.filter(payment_date__date__gte=start)
+        rollups = rollups.filter(date__gte=start)
+    if end:
+        payments = payments.filter(payment_date__date__lte=end)
+        rollups = rollups.filter(date__lte=end)
+
+    aggregated = payments.annotate(
+        day=TruncDate('payment_date')
+    ).values('day', 'payment_method', 'status').annotate(
+        total=Sum('amount'),
+        count=Count('id')
+    ).order_by()
+
+    with transaction.atomic():
+        rollups.delete()
+        created = DailyRevenueRollup.objects.bulk_create([
+            DailyRevenueRollup(
+                date=row['day'],
+                payment_method=row['payment_method'],
+                status=row['status'],
+                total_amount=row['total'] or 0,
+                payment_count=row['count'],
+            )
+            for row in aggregated
+        ], batch_size=1000)
+    return len(created)
+
+
+def _filter(start=None, end=None, status='completed'):
+    from .models import DailyRevenueRollup
+
+    rows = DailyRevenueRollup.objects.filter(status=status)
+    if start:
+        rows = rows.filter(date__gte=start)
+    if end:
+        rows = rows.filter(date__lte=end)
+    return rows
+
+
+def revenue_totals(start=None, end=None, status='completed'):
+    """
+    Total y cantidad de pagos en un rango de fechas (inclusive).
+
+    Returns:
+        dict: {'total': Decimal, 'count': int}
+    """
+    totals = _filter(start, end, status).aggregate(total=Sum('total_amount'), count=Sum('payment_count'))
+    return {
+        'total': totals['total'] or Decimal('0'),
+        'count': totals['count'] or 0,
+    }
+
+
+def monthly_revenue(start, end=None, status='completed'):
+    """
+    Ingresos agrupados por mes.
+
+    Returns:
+        dict: {primer día del mes (date): total (Decimal)}
+    """
+    rows = _filter(start, end, status).annotate(
+        month=TruncMonth('date')
+    ).values('month').annotate(total=Sum('total_amount')).order_by('month')
+
+    result = {}
+    for row in rows:
+        month = row['month']
+        if isinstance(month, datetime):
+            month = month.date()
+        result[date(month.year, month.month, 1)] = row['total'] or Decimal('0')
+    return result
+
+
+def payment_method_counts(start=None, end=None, status='completed'):
+    """
+    Cantidad de pagos por método, de mayor a menor.
+
+    Returns:
+        list: [{'payment_method': str, 'count': int}, ...]
+    """
+    return list(
+        _filter(start, end, status).values('payment_method').annotate(
+            count=Sum('payment_count')
+        ).filter(count__gt=0).order_by('-count')
+    )
@@ -0,0 +1,16 @@
+"""
+Signals de Pagos
+Mantienen el rollup diario de ingresos cuando se eliminan pagos
+"""
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+
+from .models import Payment
+from .rollups import get_previous_state, get_saved_state, apply_payment_change
+
+
+@receiver(post_delete, sender=Payment)
+def remove_payment_from_rollup(sender, instance, **kwargs):
+    """Resta el pago eliminado de su fila del rollup"""
+    previous = get_previous_state(instance) or get_saved_state(instance)
+    apply_payment_change(previous, None)
@@ -0,0 +1,140 @@
+"""
+Unit tests for the daily revenue rollup.
+Tests verify the rollup follows payment saves, transitions and deletes, and that rebuild matches.
+"""
+import pytest
+from datetime import timedelta
+from decimal import Decimal
+from django.core.management import call_command
+from django.utils import timezone
+from apps.members.models import Member
+from apps.payments import rollups
+from apps.payments.models import Payment, DailyRevenueRollup
+from apps.users.models import User
+
+
+@pytest.fixture
+def rollup_member(db):
+    user = User.objects.create_user(username='rollup', email='rollup@gym.com', password='x')
+    return Member.objects.create(user=user)
+
+
+def make_payment(member, amount, method='cash', status='completed', **kwargs):
+    return Payment.objects.create(
+        member=member,
+        amount=Decimal(amount),
+        payment_method=method,
+        status=status,
+        **kwargs
+    )
+
+
+def rollup_rows():
+    return {
+        (row.date, row.payment_method, row.status): (row.total_amount, row.payment_count)
+        for row in DailyRevenueRollup.objects.exclude(payment_count=0)
+    }
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+class TestRevenueRollupMaintenance:
+    """Incremental updates from Payment.save() and deletes."""
+
+    def test_create_adds_to_rollup(self, rollup_member):
+        make_payment(rollup_member, '50.00')
+        make_payment(rollup_member, '25.50')
+
+        today = timezone.localdate()
+        assert rollup_rows() == {(today, 'cash', 'completed'): (Decimal('75.50'), 2)}
+
+    def test_approve_moves_payment_between_statuses(self, rollup_member):
+        payment = make_payment(rollup_member, '40.00', method='transfer', status='pending')
+
+        Payment.objects.get(pk=payment.pk).approve(None)
+
+        today = timezone.localdate()
+        assert rollup_rows() == {(today, 'transfer', 'completed'): (Decimal('40.00'), 1)}
+        assert rollups.revenue_totals(today, today) == {'total': Decimal('40.00'), 'count': 1}
+
+    def test_save_after_refresh_does_not_move_the_rollup_again(self, rollup_member):
+        payment = make_payment(rollup_member, '40.00', status='pending')
+        stale = Payment.objects.get(pk=payment.pk)
+        Payment.objects.get(pk=payment.pk).approve(None)
+
+        stale.refresh_from_db()
+        stale.notes = 'Revisado'
+        stale.save()
+
+        today = timezone.localdate()
+        assert rollup_rows() == {(today, 'cash', 'completed'): (Decimal('40.00'), 1)}
+
+    def test_reject_does_not_count_as_revenue(self, rollup_member):
+        payment = make_payment(rollup_member, '40.00', status='pending')
+
+        payment.reject('Comprobante ilegible', None)
+
+        assert rollups.revenue_totals()['count'] == 0
+
+    def test_amount_and_date_changes_are_moved(self, rollup_member):
+        payment = make_payment(rollup_member, '30.00')
+        yesterday = timezone.now() - timedelta(days=1)
+
+        payment.amount = Decimal('35.00')
+        payment.payment_date = yesterday
+        payment.save()
+
+        assert rollup_rows() == {
+            (timezone.localdate(yesterday), 'cash', 'completed'): (Decimal('35.00'), 1)
+        }
+
+    def test_delete_removes_from_rollup(self, rollup_member):
+        payment = make_payment(rollup_member, '30.00')
+        Payment.objects.get(pk=payment.pk).delete()
+
+        assert rollup_rows() == {}
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+class TestRevenueRollupRebuild:
+    """Backfill command and read helpers."""
+
+    def test_rebuild_matches_incremental_rollup(self, rollup_member):
+        make_payment(rollup_member, '10.00')
+        make_payment(rollup_member, '20.00', method='card', payment_date=timezone.now() - timedelta(days=40))
+        make_payment(rollup_member, '5.00', status='pending')
+        expected = rollup_rows()
+
+        # Changes that bypass save() leave the rollup stale until rebuilt
+        Payment.objects.filter(status='pending').update(status='completed')
+        DailyRevenueRollup.objects.all().delete()
+
+        call_command('rebuild_revenue_rollup')
+
+        today = timezone.localdate()
+        expected.pop((today, 'cash', 'pending'))
+        expected[(today, 'cash', 'completed')] = (Decimal('15.00'), 2)
+        assert rollup_rows() == expected
+
+    def test_rebuild_range_keeps_other_days(self, rollup_member):
+        old = make_payment(rollup_member, '20.00', payment_date=timezone.now() - timedelta(days=10))
+        make_payment(rollup_member, '10.00')
+        today = timezone.localdate()
+
+        call_command('rebuild_revenue_rollup', start=str(today), end=str(today))
+
+        assert rollup_rows()[(timezone.localdate(old.payment_date), 'cash', 'completed')] == (Decimal('20.00'), 1)
+        assert rollup_rows()[(today, 'cash', 'completed')] == (Decimal('10.00'), 1)
+
+    def test_monthly_revenue_and_method_counts(self, rollup_member):
+        make_payment(rollup_member, '10.00', method='cash')
+        make_payment(rollup_member, '15.00', method='card')
+        make_payment(rollup_member, '20.00', method='card')
+        today = timezone.localdate()
+
+        assert rollups.monthly_revenue(today.replace(day=1), today) == {today.replace(day=1): Decimal('45.00')}
+        assert rollups.payment_method_counts(today, today) == [
+            {'payment_method': 'card', 'count': 2},
+            {'payment_method': 'cash', 'count': 1},
+        ]
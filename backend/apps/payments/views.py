@@ -9,6 +9,7 @@ from django.utils import timezone
 from datetime import timedelta
 from .models import Payment, Invoice
 from .serializers import PaymentSerializer, PaymentCreateSerializer, InvoiceSerializer
+from apps.common.pagination import KeysetPagination
 
 
 class PaymentViewSet(viewsets.ModelViewSet):
@@ -17,6 +18,8 @@ class PaymentViewSet(viewsets.ModelViewSet):
     filter_backends = [filters.OrderingFilter]
     ordering_fields = ['payment_date', 'amount']
     ordering = ['-payment_date']
+    pagination_class = KeysetPagination
+    cursor_ordering = '-payment_date'
     
     def get_serializer_class(self):
         if self.action == 'create':
@@ -39,73 +42,50 @@ class PaymentViewSet(viewsets.ModelViewSet):
     
     @action(detail=False, methods=['get'])
     def stats(self, request):
-        """Estadísticas de pagos"""
-        today = timezone.now().date()
+        """Estadísticas de pagos (leídas del rollup diario)"""
+        from . import rollups
+        
+        today = timezone.localdate()
         month_start = today.replace(day=1)
         
         # Pagos del mes
-        month_payments = Payment.objects.filter(
-            payment_date__date__gte=month_start,
-            status='completed'
-        )
-        
-        total_month = month_payments.aggregate(total=Sum('amount'))['total'] or 0
-        count_month = month_payments.count()
+        month = rollups.revenue_totals(month_start, today)
         
         # Pagos de hoy
-        today_payments = Payment.objects.filter(
-            payment_date__date=today,
-            status='completed'
-        )
-        total_today = today_payments.aggregate(total=Sum('amount'))['total'] or 0
+        day = rollups.revenue_totals(today, today)
         
         return Response({
             'month': {
-                'total': total_month,
-                'count': count_month
+                'total': month['total'],
+                'count': month['count']
             },
             'today': {
-                'total': total_today,
-                'count': today_payments.count()
+                'total': day['total'],
+                'count': day['count']
             }
         })
     
     @action(detail=False, methods=['get'])
     def chart_data(self, request):
-        """Datos para gráficas del dashboard"""
-        from django.db.models import Sum, Count
-        from datetime import timedelta
+        """Datos para gráficas del dashboard (leídos del rollup diario)"""
         from dateutil.relativedelta import relativedelta
+        from . import rollups
         
-        today = timezone.now().date()
-        six_months_ago = today - relativedelta(months=5)
+        today = timezone.localdate()
+        six_months_ago = (today - relativedelta(months=5)).replace(day=1)
+        
+        revenue_by_month = rollups.monthly_revenue(six_months_ago, today)
         
         monthly_revenue = []
         monthly_labels = []
         
         for i in range(6):
-            month_date = six_months_ago + relativedelta(months=i)
-            month_start = month_date.replace(day=1)
-            month_end = (month_start + relativedelta(months=1)) - timedelta(days=1)
-            if month_end > today:
-                month_end = today
-            
-            revenue = Payment.objects.filter(
-                payment_date__gte=month_start,
-                payment_date__lte=month_end,
-                status='completed'
-            ).aggregate(total=Sum('amount'))['total'] or 0
-            
-            monthly_revenue.append(float(revenue))
+            month_start = six_months_ago + relativedelta(months=i)
+            monthly_revenue.append(float(revenue_by_month.get(month_start, 0)))
             monthly_labels.append(month_start.strftime('%b %Y'))
         
         three_months_ago = today - relativedelta(months=3)
-        payment_methods = Payment.objects.filter(
-            payment_date__gte=three_months_ago,
-            status='completed'
-        ).values('payment_method').annotate(
-            count=Count('id')
-        ).order_by('-count')
+        payment_methods = rollups.payment_method_counts(three_months_ago, today)
         
         method_labels = []
         method_values = []
@@ -185,89 +165,44 @@ class PaymentViewSet(viewsets.ModelViewSet):
     
     @action(detail=False, methods=['get'], permission_classes=[permissions.IsAuthenticated])
     def export_report(self, request):
-        """Exportar reporte de pagos a Excel"""
+        """
+        Exportar reporte de pagos a Excel o CSV (?export_format=csv)
+        Se genera en streaming: la memoria no crece con la cantidad de pagos
+        """
         # Verificar que el usuario sea staff
         if not request.user.is_staff:
             return Response({'detail': 'No tienes permisos'}, status=403)
         
-        from openpyxl import Workbook
-        from openpyxl.styles import Font, Alignment, PatternFill
-        from django.http import HttpResponse
-        from datetime import datetime
+        from apps.reports.exports import export_response, get_export_format
+        from apps.reports.specs import PAYMENT_COLUMNS
         
         # Obtener filtros de fecha
         start_date = request.query_params.get('start_date')
         end_date = request.query_params.get('end_date')
         
         # Filtrar pagos
-        queryset = Payment.objects.select_related('member__user', 'membership__plan').order_by('-payment_date')
+        queryset = Payment.objects.order_by('-payment_date')
         
         if start_date:
             queryset = queryset.filter(payment_date__gte=start_date)
         if end_date:
             queryset = queryset.filter(payment_date__lte=end_date)
         
-        # Crear workbook
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "Reporte de Pagos"
-        
-        # Estilos
-        header_fill = PatternFill(start_color="4F46E5", end_color="4F46E5", fill_type="solid")
-        header_font = Font(color="FFFFFF", bold=True)
-        
-        # Headers
-        headers = ['ID', 'Fecha', 'Miembro', 'Plan', 'Monto', 'Método', 'Estado', 'Referencia']
-        ws.append(headers)
-        
-        # Aplicar estilo a headers
-        for cell in ws[1]:
-            cell.fill = header_fill
-            cell.font = header_font
-            cell.alignment = Alignment(horizontal='center')
-        
-        # Datos
-        total = 0
-        for payment in queryset:
-            ws.append([
-                payment.id,
-                payment.payment_date.strftime('%Y-%m-%d') if payment.payment_date else '',
-                payment.member.user.get_full_name(),
-                payment.membership.plan.name if payment.membership else 'N/A',
-                float(payment.amount),
-                payment.get_payment_method_display(),
-                payment.get_status_display(),
-                payment.reference_number or ''
-            ])
-            if payment.status == 'completed':
-                total += float(payment.amount)
-        
-        # Totales
-        ws.append([])
-        total_row = ws.max_row + 1
-        ws.append(['', '', '', 'TOTAL', total, '', '', ''])
-        for cell in ws[total_row]:
-            cell.font = Font(bold=True)
-        
-        # Ajustar anchos
-        ws.column_dimensions['A'].width = 8
-        ws.column_dimensions['B'].width = 12
-        ws.column_dimensions['C'].width = 25
-        ws.column_dimensions['D'].width = 20
-        ws.column_dimensions['E'].width = 12
-        ws.column_dimensions['F'].width = 15
-        ws.column_dimensions['G'].width = 12
-        ws.column_dimensions['H'].width = 20
-        
-        # Preparar respuesta
-        response = HttpResponse(
-            content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+        # Totales (una sola consulta agregada)
+        total = queryset.filter(status='completed').aggregate(total=Sum('amount'))['total'] or 0
+        footer = [
+            [],
+            ['', '', '', 'TOTAL', float(total), '', '', ''],
+        ]
+        
+        return export_response(
+            queryset,
+            PAYMENT_COLUMNS,
+            'reporte_pagos',
+            export_format=get_export_format(request),
+            title='Reporte de Pagos',
+            footer=footer
         )
-        filename = f'reporte_pagos_{datetime.now().strftime("%Y%m%d_%H%M%S")}.xlsx'
-        response['Content-Disposition'] = f'attachment; filename={filename}'
-        
-        wb.save(response)
-        return response
 
 
 class InvoiceViewSet(viewsets.ModelViewSet):
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 19:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('progress', '0002_workoutsession_exerciselog'),
+        ('workouts', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='exerciselog',
+            index=models.Index(fields=['-completed_at'], name='progress_ex_complet_226db8_idx'),
+        ),
+    ]
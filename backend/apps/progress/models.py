@@ -287,6 +287,10 @@ class ExerciseLog(models.Model):
         verbose_name = 'Log de Ejercicio'
         verbose_name_plural = 'Logs de Ejercicios'
         ordering = ['-completed_at']
+        indexes = [
+            # Listado paginado por cursor
+            models.Index(fields=['-completed_at']),
+        ]
     
     def __str__(self):
         return f"{self.exercise.name} - {self.actual_sets}x{self.actual_reps} @ {self.weight_used}kg"
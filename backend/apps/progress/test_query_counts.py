@@ -0,0 +1,73 @@
+"""
+Query-count tests for the progress list endpoints.
+Tests verify every list runs the same number of queries for 2 rows as for 6 (no per-row queries).
+"""
+import pytest
+from datetime import date, timedelta
+from decimal import Decimal
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+from apps.progress.models import Achievement, ExerciseLog, ProgressLog, WorkoutSession
+from apps.users.models import Role, User
+from apps.workouts.models import Exercise, MuscleGroup
+
+LIST_URLS = [
+    '/api/progress/logs/',
+    '/api/progress/achievements/',
+    '/api/progress/sessions/',
+    '/api/progress/exercise-logs/',
+]
+
+
+def make_user(username, role_name):
+    role, _ = Role.objects.get_or_create(name=role_name)
+    return User.objects.create_user(username=username, email=f'{username}@gym.com', password='x', role=role)
+
+
+def add_history(member, start, count):
+    """Progress logs, achievements and sessions with two exercise logs each."""
+    for i in range(start, start + count):
+        exercise = Exercise.objects.create(
+            name=f'Ejercicio {i}', muscle_group=MuscleGroup.objects.create(name=f'Grupo {i}')
+        )
+        ProgressLog.objects.create(member=member, date=date(2025, 1, 1) + timedelta(days=i), weight=Decimal('80'))
+        Achievement.objects.create(member=member, title=f'Logro {i}', achieved_date=date(2025, 1, 1))
+        session = WorkoutSession.objects.create(member=member, date=timezone.now() - timedelta(days=i))
+        for _ in range(2):
+            ExerciseLog.objects.create(
+                session=session, exercise=exercise, planned_sets=3, planned_reps=10,
+                actual_sets=3, actual_reps=10, weight_used=Decimal('40')
+            )
+
+
+def count_queries(user, url):
+    client = APIClient()
+    client.force_authenticate(user)
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(url)
+    assert response.status_code == 200
+    assert response.data['results']
+    return len(context.captured_queries), response.data['results']
+
+
+@pytest.mark.integration
+@pytest.mark.django_db
+class TestProgressQueryCounts:
+    """List endpoints cost a fixed number of queries, for trainers and members."""
+
+    @pytest.mark.parametrize('url', LIST_URLS)
+    @pytest.mark.parametrize('role', ['trainer', 'member'])
+    def test_list_query_count_is_constant(self, url, role):
+        trainer = make_user('coach', 'trainer')
+        member = make_user('ana', 'member').member_profile
+        user = trainer if role == 'trainer' else member.user
+        add_history(member, 0, 2)
+        few, _ = count_queries(user, url)
+
+        add_history(member, 2, 4)
+        many, rows = count_queries(user, url)
+
+        assert len(rows) >= 6
+        assert many == few
@@ -8,9 +8,12 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from django.utils import timezone
-from django.db.models import Count, Avg, Max, Min
+from django.db.models import Count, Avg, Max, Min, Sum, F, FloatField, ExpressionWrapper, Prefetch
 from datetime import timedelta
 
+from apps.common import timeseries
+from apps.common.pagination import KeysetPagination
+
 from .models import ProgressLog, Achievement, WorkoutSession, ExerciseLog
 from .serializers import (
     ProgressLogSerializer,
@@ -46,21 +49,11 @@ class ProgressLogViewSet(viewsets.ModelViewSet):
     def get_queryset(self):
         user = self.request.user
         
-        print(f"🔍 DEBUG: User: {user.email}, Role: {user.role.name}")
-        
         if user.role.name == 'member':
-            queryset = ProgressLog.objects.filter(member__user=user)
-            print(f"🔍 DEBUG: Member queryset count: {queryset.count()}")
-            print(f"🔍 DEBUG: Member has member_profile: {hasattr(user, 'member_profile')}")
-            if hasattr(user, 'member_profile'):
-                print(f"🔍 DEBUG: Member profile ID: {user.member_profile.id}")
-            return queryset
+            return ProgressLog.objects.filter(member__user=user).select_related('member__user')
         elif user.role.name in ['trainer', 'admin', 'staff']:
-            queryset = ProgressLog.objects.all().select_related('member__user')
-            print(f"🔍 DEBUG: Admin/trainer queryset count: {queryset.count()}")
-            return queryset
+            return ProgressLog.objects.all().select_related('member__user')
         
-        print(f"🔍 DEBUG: No matching role, returning empty queryset")
         return ProgressLog.objects.none()
     
     @action(detail=False, methods=['get'])
@@ -68,9 +61,13 @@ class ProgressLogViewSet(viewsets.ModelViewSet):
         """
         Datos de evolución física para gráficas
         GET /progress/logs/evolution/
-        Query params: ?days=30
+        Query params: ?days=30&resolution=auto&max_points=500
         """
-        days = int(request.query_params.get('days', 90))
+        try:
+            days = int(request.query_params.get('days', 90))
+            resolution, max_points = timeseries.parse_params(request.query_params)
+        except ValueError as exc:
+            return Response({'error': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
         
         if request.user.role.name == 'member':
             # Get member profile, or create if doesn't exist
@@ -109,19 +106,24 @@ class ProgressLogViewSet(viewsets.ModelViewSet):
         logs = ProgressLog.objects.filter(
             member=member,
             date__gte=since_date
-        ).order_by('date')
+        )
         
-        # Preparar datos para gráficas
-        evolution_data = {
-            'dates': [log.date.isoformat() for log in logs],
-            'weight': [float(log.weight) if log.weight else None for log in logs],
-            'body_fat': [float(log.body_fat_percentage) if log.body_fat_percentage else None for log in logs],
-            'muscle_mass': [float(log.muscle_mass) if log.muscle_mass else None for log in logs],
-            'chest': [float(log.chest) if log.chest else None for log in logs],
-            'waist': [float(log.waist) if log.waist else None for log in logs],
-            'hips': [float(log.hips) if log.hips else None for log in logs],
-            'bmi': [log.bmi for log in logs],
-        }
+        # Preparar datos para gráficas (columnas, acotadas a max_points)
+        evolution_data, bucket = timeseries.series(logs, 'date', [
+            timeseries.Column('weight', 'weight'),
+            timeseries.Column('body_fat', 'body_fat_percentage'),
+            timeseries.Column('muscle_mass', 'muscle_mass'),
+            timeseries.Column('chest', 'chest'),
+            timeseries.Column('waist', 'waist'),
+            timeseries.Column('hips', 'hips'),
+            timeseries.Column('height', 'height'),
+        ], resolution, max_points)
+        heights = evolution_data.pop('height')
+        evolution_data['bmi'] = [
+            round(weight / (height / 100) ** 2, 2) if weight and height else None
+            for weight, height in zip(evolution_data['weight'], heights)
+        ]
+        evolution_data['resolution'] = {'bucket': bucket}
         
         return Response(evolution_data)
 
@@ -136,7 +138,7 @@ class AchievementViewSet(viewsets.ModelViewSet):
         user = self.request.user
         
         if user.role.name == 'member':
-            return Achievement.objects.filter(member__user=user)
+            return Achievement.objects.filter(member__user=user).select_related('member__user')
         elif user.role.name in ['trainer', 'admin', 'staff']:
             return Achievement.objects.all().select_related('member__user')
         
@@ -165,10 +167,13 @@ class WorkoutSessionViewSet(viewsets.ModelViewSet):
     def get_queryset(self):
         user = self.request.user
         
+        sessions = WorkoutSession.objects.select_related('member__user', 'routine').prefetch_related(
+            Prefetch('exercise_logs', queryset=ExerciseLog.objects.select_related('exercise__muscle_group'))
+        )
         if user.role.name == 'member':
-            return WorkoutSession.objects.filter(member__user=user).prefetch_related('exercise_logs__exercise')
+            return sessions.filter(member__user=user)
         elif user.role.name in ['trainer', 'admin', 'staff']:
-            return WorkoutSession.objects.all().select_related('member__user', 'routine').prefetch_related('exercise_logs__exercise')
+            return sessions
         
         return WorkoutSession.objects.none()
     
@@ -241,14 +246,16 @@ class ExerciseLogViewSet(viewsets.ReadOnlyModelViewSet):
     
     serializer_class = ExerciseLogSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = KeysetPagination
+    cursor_ordering = '-completed_at'
     
     def get_queryset(self):
         user = self.request.user
         
-        if user.role.name == 'Miembro':
-            return ExerciseLog.objects.filter(session__member__user=user).select_related('exercise', 'session')
-        elif user.role.name in ['Entrenador', 'Administrador']:
-            return ExerciseLog.objects.all().select_related('exercise', 'session__member')
+        if user.role.name == 'member':
+            return ExerciseLog.objects.filter(session__member__user=user).select_related('exercise__muscle_group', 'session')
+        elif user.role.name in ['trainer', 'admin', 'staff']:
+            return ExerciseLog.objects.all().select_related('exercise__muscle_group', 'session__member')
         
         return ExerciseLog.objects.none()
     
@@ -256,8 +263,15 @@ class ExerciseLogViewSet(viewsets.ReadOnlyModelViewSet):
     def exercise_history(self, request):
         """
         Historial de un ejercicio específico
-        GET /progress/exercise-logs/exercise_history/?exercise_id=1
+        GET /progress/exercise-logs/exercise_history/?exercise_id=1&resolution=auto&max_points=500
+        
+        Por período: peso máximo, series y repeticiones promedio y volumen total.
         """
+        try:
+            resolution, max_points = timeseries.parse_params(request.query_params)
+        except ValueError as exc:
+            return Response({'error': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        
         exercise_id = request.query_params.get('exercise_id')
         if not exercise_id:
             return Response(
@@ -281,14 +295,17 @@ class ExerciseLogViewSet(viewsets.ReadOnlyModelViewSet):
             session__member=member,
             exercise_id=exercise_id,
             completed=True
-        ).select_related('session').order_by('session__date')
+        )
+        volume = ExpressionWrapper(
+            F('weight_used') * F('actual_sets') * F('actual_reps'), output_field=FloatField()
+        )
         
-        history_data = {
-            'dates': [log.session.date.isoformat() for log in logs],
-            'weights': [float(log.weight_used) for log in logs],
-            'sets': [log.actual_sets for log in logs],
-            'reps': [log.actual_reps for log in logs],
-            'total_volume': [float(log.weight_used) * log.actual_sets * log.actual_reps for log in logs],
-        }
+        history_data, bucket = timeseries.series(logs, 'session__date', [
+            timeseries.Column('weights', 'weight_used', Max),
+            timeseries.Column('sets', 'actual_sets'),
+            timeseries.Column('reps', 'actual_reps'),
+            timeseries.Column('total_volume', volume, Sum),
+        ], resolution, max_points)
+        history_data['resolution'] = {'bucket': bucket}
         
         return Response(history_data)
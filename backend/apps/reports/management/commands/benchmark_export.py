@@ -0,0 +1,79 @@
+"""
+Management command para medir la memoria del motor de exportación
+El pico de memoria debe mantenerse plano al crecer la cantidad de filas
+
+Ejemplo:
+    python manage.py benchmark_export --rows 10000 100000 1000000 --format csv xlsx
+"""
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+
+from apps.reports.exports import FORMATS, FORMAT_CSV, column_fields, iter_csv, render_rows, write_xlsx
+from apps.reports.specs import PAYMENT_COLUMNS
+
+
+def synthetic_rows(count):
+    """Valores de cada campo de las columnas de pagos, generados sin base de datos"""
+    base = datetime(2024, 1, 1)
+    names = ('Ana', 'Luis', 'María', 'José')
+    methods = ('cash', 'card', 'transfer', 'mobile')
+    for i in range(count):
+        yield {
+            'id': i,
+            'payment_date': base + timedelta(minutes=i),
+            'member__user__first_name': names[i % 4],
+            'member__user__last_name': 'Pérez',
+            'membership__plan__name': 'Mensual' if i % 3 else None,
+            'amount': Decimal('50.00') + i % 100,
+            'payment_method': methods[i % 4],
+            'status': 'completed',
+            'reference_number': f'REF{i:08d}',
+        }
+
+
+def formatted_rows(count):
+    """Aplica las columnas de pagos igual que iter_rows, con tuplas en el orden de values_list"""
+    fields, positions = column_fields(PAYMENT_COLUMNS)
+    rows = (tuple(values[field] for field in fields) for values in synthetic_rows(count))
+    return render_rows(rows, PAYMENT_COLUMNS, positions)
+
+
+class Command(BaseCommand):
+    help = 'Mide tiempo y pico de memoria de las exportaciones CSV/XLSX con filas sintéticas'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, nargs='+', default=[10000, 100000, 1000000])
+        parser.add_argument('--format', nargs='+', choices=FORMATS, default=list(FORMATS), dest='formats')
+    
+    def handle(self, *args, **options):
+        self.stdout.write(f'{"Formato":<8}{"Filas":>12}{"Segundos":>12}{"Pico MB":>12}{"Archivo MB":>12}')
+        
+        for export_format in options['formats']:
+            # Descarta asignaciones únicas (imports, estilos) de la primera exportación
+            self.measure(export_format, 100)
+            for count in options['rows']:
+                seconds, peak, size = self.measure(export_format, count)
+                self.stdout.write(
+                    f'{export_format:<8}{count:>12,}{seconds:>12.1f}{peak / 2**20:>12.1f}{size / 2**20:>12.1f}'
+                )
+    
+    def measure(self, export_format, count):
+        with tempfile.TemporaryFile() as out:
+            tracemalloc.start()
+            start = time.perf_counter()
+            
+            if export_format == FORMAT_CSV:
+                for chunk in iter_csv(formatted_rows(count), PAYMENT_COLUMNS):
+                    out.write(chunk.encode('utf-8'))
+            else:
+                write_xlsx(formatted_rows(count), PAYMENT_COLUMNS, out, title='Benchmark')
+            
+            seconds = time.perf_counter() - start
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            return seconds, peak, out.tell()
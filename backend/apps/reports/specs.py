@@ -0,0 +1,64 @@
+"""
+Columnas de los reportes exportables
+Cada lista se usa con apps.reports.exports.export_response
+"""
+from apps.access.models import AccessLog
+from apps.audit.models import AuditLog
+from apps.members.models import Member
+from apps.memberships.models import Membership
+from apps.payments.models import Payment
+
+from .exports import Column, full_name, choice_display, local_datetime, yes_no
+
+DATE = local_datetime('%Y-%m-%d')
+DATETIME = local_datetime('%Y-%m-%d %H:%M:%S')
+
+
+PAYMENT_COLUMNS = [
+    Column('ID', 'id', width=8),
+    Column('Fecha', 'payment_date', DATE, width=12),
+    Column('Miembro', ('member__user__first_name', 'member__user__last_name'), full_name, width=25),
+    Column('Plan', 'membership__plan__name', lambda name: name or 'N/A', width=20),
+    Column('Monto', 'amount', float, width=12),
+    Column('Método', 'payment_method', choice_display(Payment.PAYMENT_METHODS), width=15),
+    Column('Estado', 'status', choice_display(Payment.STATUS_CHOICES), width=12),
+    Column('Referencia', 'reference_number', width=20),
+]
+
+AUDIT_LOG_COLUMNS = [
+    Column('ID', 'id', width=8),
+    Column('Usuario', ('user_id', 'user__first_name', 'user__last_name'),
+           lambda user_id, first, last: full_name(first, last) if user_id else 'Sistema', width=25),
+    Column('Acción', 'action', choice_display(AuditLog.ACTION_CHOICES), width=15),
+    Column('Modelo', 'model_name', width=20),
+    Column('Objeto', 'object_repr', width=30),
+    Column('Timestamp', 'timestamp', DATETIME, width=20),
+    Column('IP', 'ip_address', width=15),
+    Column('Éxito', 'success', yes_no, width=10),
+]
+
+MEMBER_COLUMNS = [
+    Column('ID', 'id', width=8),
+    Column('Nombre', ('user__first_name', 'user__last_name'), full_name, width=25),
+    Column('Email', 'user__email', width=30),
+    Column('Teléfono', 'phone', width=15),
+    Column('Estado', 'subscription_status', choice_display(Member.SUBSCRIPTION_STATUS), width=12),
+    Column('Fecha de registro', 'joined_date', DATE, width=15),
+    Column('Último acceso', 'last_access', DATETIME, width=20),
+]
+
+MEMBERSHIP_COLUMNS = [
+    Column('ID', 'id', width=8),
+    Column('Miembro', ('member__user__first_name', 'member__user__last_name'), full_name, width=25),
+    Column('Plan', 'plan__name', width=20),
+    Column('Inicio', 'start_date', DATE, width=12),
+    Column('Fin', 'end_date', DATE, width=12),
+    Column('Estado', 'status', choice_display(Membership.STATUS_CHOICES), width=12),
+]
+
+ACCESS_LOG_COLUMNS = [
+    Column('ID', 'id', width=8),
+    Column('Miembro', ('member__user__first_name', 'member__user__last_name'), full_name, width=25),
+    Column('Tipo', 'access_type', choice_display(AccessLog.ACCESS_TYPES), width=10),
+    Column('Fecha y hora', 'timestamp', DATETIME, width=20),
+]
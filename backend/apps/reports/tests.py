@@ -1,3 +1,82 @@
-from django.test import TestCase
+"""
+Tests for the streaming export engine.
+"""
+import csv
+import io
+import pytest
+from decimal import Decimal
+from openpyxl import load_workbook
+from apps.members.models import Member
+from apps.payments.models import Payment
+from apps.reports.exports import Column, choice_display, export_response, iter_rows, full_name
+from apps.reports.specs import PAYMENT_COLUMNS
+from apps.users.models import User
 
-# Create your tests here.
+
+@pytest.fixture
+def payments(db):
+    user = User.objects.create_user(
+        username='export', email='export@gym.com', password='x', first_name='Ana', last_name='Pérez'
+    )
+    member = Member.objects.create(user=user)
+    return [
+        Payment.objects.create(member=member, amount=Decimal('50.00'), payment_method='cash', status='completed'),
+        Payment.objects.create(member=member, amount=Decimal('20.00'), payment_method='card', status='pending'),
+    ]
+
+
+def read_body(response):
+    return b''.join(response.streaming_content)
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+class TestIterRows:
+    """Rows come from one values_list query, formatted per column."""
+
+    def test_rows_are_formatted_without_loading_models(self, payments, django_assert_num_queries):
+        columns = [
+            Column('ID', 'id'),
+            Column('Miembro', ('member__user__first_name', 'member__user__last_name'), full_name),
+            Column('Método', 'payment_method', choice_display(Payment.PAYMENT_METHODS)),
+            Column('Referencia', 'reference_number'),
+        ]
+
+        with django_assert_num_queries(1):
+            rows = list(iter_rows(Payment.objects.order_by('id'), columns))
+
+        assert rows == [
+            [payments[0].id, 'Ana Pérez', 'Efectivo', ''],
+            [payments[1].id, 'Ana Pérez', 'Tarjeta', ''],
+        ]
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+class TestExportResponse:
+    """CSV is streamed; XLSX is written in write-only mode."""
+
+    def test_csv_is_streamed(self, payments):
+        response = export_response(
+            Payment.objects.order_by('id'), PAYMENT_COLUMNS, 'pagos', export_format='csv',
+            footer=[['', '', '', 'TOTAL', 50.0, '', '', '']]
+        )
+
+        assert response.streaming
+        assert response['Content-Type'].startswith('text/csv')
+        rows = list(csv.reader(io.StringIO(read_body(response).decode('utf-8-sig'))))
+        assert rows[0] == [column.header for column in PAYMENT_COLUMNS]
+        assert rows[1][2:4] == ['Ana Pérez', 'N/A']
+        assert rows[2][6] == 'Pendiente'
+        assert rows[-1][3:5] == ['TOTAL', '50.0']
+
+    def test_xlsx_can_be_opened(self, payments):
+        response = export_response(Payment.objects.order_by('id'), PAYMENT_COLUMNS, 'pagos', title='Pagos')
+
+        assert 'attachment' in response['Content-Disposition']
+        wb = load_workbook(io.BytesIO(read_body(response)))
+        ws = wb['Pagos']
+        values = list(ws.iter_rows(values_only=True))
+        assert values[0][0] == 'ID'
+        assert values[1][4] == 50.0
+        assert len(values) == 3
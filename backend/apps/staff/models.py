@@ -5,8 +5,10 @@ Sistema de Gestión de Gimnasio
 
 from django.db import models
 
+from apps.audit.tracking import AuditTrackedMixin
 
-class Staff(models.Model):
+
+class Staff(AuditTrackedMixin, models.Model):
     """Perfil de personal: entrenadores, empleados, etc."""
     
     STAFF_TYPE_CHOICES = [
@@ -1,3 +1,90 @@
-from django.test import TestCase
+"""
+Integration tests for the trainer endpoints of StaffViewSet.
+These tests verify the trainer dashboard runs a constant number of queries.
+"""
+import pytest
+from datetime import timedelta
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+from apps.classes.models import ClassType, GymClass, Reservation
+from apps.members.models import Member
+from apps.users.models import User, Role
 
-# Create your tests here.
+
+@pytest.fixture
+def trainer_client(db):
+    role, _ = Role.objects.get_or_create(name=Role.TRAINER)
+    trainer = User.objects.create_user(username='coach', email='coach@gym.com', password='x', role=role)
+    client = APIClient()
+    client.force_authenticate(user=trainer)
+    client.staff_profile = trainer.staff_profile
+    return client
+
+
+def add_clients(staff_profile, count, start=0):
+    class_type, _ = ClassType.objects.get_or_create(name='Spinning')
+    now = timezone.now()
+    gym_classes = []
+    for offset in (1, 2):
+        gym_classes.append(GymClass.objects.create(
+            class_type=class_type,
+            instructor=staff_profile,
+            title='Spinning',
+            start_datetime=now - timedelta(hours=offset),
+            end_datetime=now - timedelta(hours=offset) + timedelta(minutes=45),
+            capacity=50,
+        ))
+    for i in range(start, start + count):
+        user = User.objects.create_user(username=f'client{i}', email=f'client{i}@gym.com', password='x')
+        member = Member.objects.create(user=user)
+        for gym_class in gym_classes:
+            Reservation.objects.create(gym_class=gym_class, member=member, status='attended')
+    return gym_classes
+
+
+def count_queries(client, url):
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get(url)
+    assert response.status_code == 200
+    return len(queries), response
+
+
+@pytest.mark.integration
+@pytest.mark.django_db
+class TestTrainerDashboardQueries:
+    """Query count must not grow with the number of clients or classes."""
+
+    @pytest.mark.parametrize('url', [
+        '/api/staff/my_stats/',
+        '/api/staff/my_clients/',
+        '/api/staff/my_classes/',
+    ])
+    def test_constant_queries(self, trainer_client, url):
+        add_clients(trainer_client.staff_profile, 2)
+        few, _ = count_queries(trainer_client, url)
+
+        add_clients(trainer_client.staff_profile, 10, start=2)
+        many, _ = count_queries(trainer_client, url)
+
+        assert few == many
+
+    def test_my_clients_annotations(self, trainer_client):
+        gym_classes = add_clients(trainer_client.staff_profile, 3)
+
+        _, response = count_queries(trainer_client, '/api/staff/my_clients/')
+
+        assert len(response.data) == 3
+        assert all(client['total_classes_with_trainer'] == 2 for client in response.data)
+        assert response.data[0]['last_class_date'] == gym_classes[0].start_datetime
+
+    def test_my_classes_counts_confirmed(self, trainer_client):
+        gym_class = add_clients(trainer_client.staff_profile, 1)[0]
+        member = Member.objects.create(user=User.objects.create_user(username='new', email='new@gym.com'))
+        Reservation.objects.create(gym_class=gym_class, member=member, status='confirmed')
+
+        _, response = count_queries(trainer_client, '/api/staff/my_classes/')
+
+        counts = {item['id']: item['confirmed_reservations'] for item in response.data}
+        assert counts[gym_class.id] == 1
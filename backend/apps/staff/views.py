@@ -5,13 +5,43 @@ from rest_framework import viewsets, permissions, filters, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from django.utils import timezone
-from django.db.models import Count, Q
+from django.db.models import Count, Max, Q
 from datetime import timedelta, datetime
 from .models import Staff, Schedule
 from .serializers import StaffSerializer, StaffListSerializer, ScheduleSerializer, TrainerListSerializer, TrainerSerializer
 from apps.common.permissions import role_required, is_trainer
 
 
+def _trainer_clients(staff_profile, month_start):
+    """
+    Clientes del trainer (miembros con reservas confirmadas o asistidas en sus clases)
+    anotados en una sola consulta:
+        - total_classes_with_trainer: clases asistidas con el trainer
+        - classes_month: clases asistidas con el trainer desde month_start
+        - last_class_date: inicio de la última clase asistida con el trainer
+    """
+    from apps.classes.models import Reservation
+    from apps.members.models import Member
+    
+    client_ids = Reservation.objects.filter(
+        gym_class__instructor=staff_profile,
+        status__in=['confirmed', 'attended']
+    ).values('member_id')
+    
+    attended = Q(reservations__gym_class__instructor=staff_profile, reservations__status='attended')
+    
+    return Member.objects.filter(
+        id__in=client_ids
+    ).select_related('user').annotate(
+        total_classes_with_trainer=Count('reservations', filter=attended),
+        classes_month=Count(
+            'reservations',
+            filter=attended & Q(reservations__gym_class__start_datetime__gte=month_start)
+        ),
+        last_class_date=Max('reservations__gym_class__start_datetime', filter=attended),
+    )
+
+
 class StaffViewSet(viewsets.ModelViewSet):
     queryset = Staff.objects.select_related('user').all()
     permission_classes = [permissions.IsAuthenticated]
@@ -174,10 +204,10 @@ class StaffViewSet(viewsets.ModelViewSet):
         top_trainers = Staff.objects.filter(
             staff_type='trainer',
             is_active=True
-        ).annotate(
+        ).select_related('user').annotate(
             classes_this_month=Count(
-                'gymclass',
-                filter=Q(gymclass__start_datetime__gte=month_start)
+                'classes',
+                filter=Q(classes__start_datetime__gte=month_start)
             )
         ).order_by('-classes_this_month')[:5]
         
@@ -209,49 +239,27 @@ class StaffViewSet(viewsets.ModelViewSet):
             - renewals: Renovaciones pendientes
             - classes: Clases programadas hoy
         """
-        from apps.payments.models import Payment
-        from apps.classes.models import Reservation, GymClass
-        from apps.members.models import Member
-        from apps.memberships.models import Membership
-        from django.db.models import Sum, Count
-        from datetime import timedelta
-        
-        now = timezone.now()
-        today = now.date()
-        
-        # Pagos de hoy
-        payments_today = Payment.objects.filter(
-            payment_date=today,
-            status='completed'
-        ).aggregate(total=Sum('amount'))['total'] or 0
-        
-        # Reservas de hoy
-        reservations_today = Reservation.objects.filter(
-            gym_class__start_datetime__date=today,
-            status='confirmed'
-        ).count()
+        from apps.classes.models import GymClass
+        from apps.common.dashboard_cache import get_metrics
+        from apps.common.dates import day_bounds
         
-        # Miembros nuevos del mes
-        month_start = now.replace(day=1, hour=0, minute=0, second=0)
-        members_new = Member.objects.filter(
-            joined_date__gte=month_start.date(),
-            joined_date__lte=today
-        ).count()
-        
-        # Renovaciones pendientes (membresías que vencen en los próximos 7 días)
-        renewals_pending = Membership.objects.filter(
-            end_date__lte=today + timedelta(days=7),
-            end_date__gte=today,
-            is_active=True
-        ).count()
+        # Conteos y sumas desde la caché del dashboard (se invalida al cambiar los datos)
+        metrics = get_metrics(
+            'revenue_today', 'reservations_today', 'members_new_month', 'memberships_expiring'
+        )
+        payments_today = metrics['revenue_today']
+        reservations_today = metrics['reservations_today']
+        members_new = metrics['members_new_month']
+        # Renovaciones pendientes (membresías activas que vencen en los próximos 7 días)
+        renewals_pending = metrics['memberships_expiring']
         
         # Clases de hoy con información detallada
+        start, end = day_bounds(timezone.localdate())
         classes_today = GymClass.objects.filter(
-            start_datetime__date=today,
+            start_datetime__gte=start,
+            start_datetime__lt=end,
             is_cancelled=False
-        ).select_related('instructor__user', 'class_type').annotate(
-            reservations_count=Count('reservations', filter=Q(reservations__status='confirmed'))
-        ).order_by('start_datetime')
+        ).select_related('instructor__user', 'class_type').order_by('start_datetime')
         
         # Formatear clases
         classes_data = []
@@ -261,7 +269,7 @@ class StaffViewSet(viewsets.ModelViewSet):
                 'name': gym_class.class_type.name if gym_class.class_type else gym_class.title,
                 'trainer': gym_class.instructor.user.get_full_name() if gym_class.instructor else 'Sin asignar',
                 'time': gym_class.start_datetime.strftime('%I:%M %p'),
-                'reservations': gym_class.reservations_count,
+                'reservations': gym_class.confirmed_count,
                 'capacity': gym_class.capacity
             })
         
@@ -309,22 +317,21 @@ class StaffViewSet(viewsets.ModelViewSet):
         now = timezone.now()
         today = now.date()
         
-        # Clases de hoy
-        classes_today = GymClass.objects.filter(
-            instructor=staff_profile,
-            start_datetime__date=today,
-            is_cancelled=False
-        ).count()
-        
-        # Clases de esta semana (lunes a domingo)
+        # Clases de hoy, de esta semana (lunes a domingo) y sesiones del mes en una sola consulta
         week_start = today - timedelta(days=today.weekday())
         week_end = week_start + timedelta(days=6)
-        classes_week = GymClass.objects.filter(
+        month_start = now.replace(day=1, hour=0, minute=0, second=0)
+        class_counts = GymClass.objects.filter(
             instructor=staff_profile,
-            start_datetime__date__gte=week_start,
-            start_datetime__date__lte=week_end,
             is_cancelled=False
-        ).count()
+        ).aggregate(
+            today=Count('id', filter=Q(start_datetime__date=today)),
+            week=Count('id', filter=Q(start_datetime__date__gte=week_start, start_datetime__date__lte=week_end)),
+            month=Count('id', filter=Q(start_datetime__gte=month_start, start_datetime__lte=now)),
+        )
+        classes_today = class_counts['today']
+        classes_week = class_counts['week']
+        total_sessions_month = class_counts['month']
         
         # Clientes asignados (miembros que han tomado clases con este trainer)
         # Usamos un enfoque simplificado: contar reservas únicas
@@ -334,23 +341,12 @@ class StaffViewSet(viewsets.ModelViewSet):
             status__in=['confirmed', 'attended']
         ).values('member').distinct().count()
         
-        # Total de sesiones del mes
-        month_start = now.replace(day=1, hour=0, minute=0, second=0)
-        total_sessions_month = GymClass.objects.filter(
-            instructor=staff_profile,
-            start_datetime__gte=month_start,
-            start_datetime__lte=now,
-            is_cancelled=False
-        ).count()
-        
         # Obtener lista de próximas clases
         upcoming_classes = GymClass.objects.filter(
             instructor=staff_profile,
             start_datetime__gte=now,
             is_cancelled=False
-        ).select_related('class_type').annotate(
-            participants_count=Count('reservations', filter=Q(reservations__status='confirmed'))
-        ).order_by('start_datetime')[:5]
+        ).select_related('class_type').order_by('start_datetime')[:5]
         
         # Formatear clases
         classes_list = []
@@ -369,41 +365,21 @@ class StaffViewSet(viewsets.ModelViewSet):
                 'name': gym_class.class_type.name if gym_class.class_type else gym_class.title,
                 'time': gym_class.start_datetime.strftime('%I:%M %p'),
                 'date': date_str,
-                'participants': gym_class.participants_count,
+                'participants': gym_class.confirmed_count,
                 'capacity': gym_class.capacity
             })
         
         # Obtener lista de clientes top
-        # Clientes con más clases tomadas ordenados descendentemente
+        # Clientes con más clases tomadas este mes, ordenados descendentemente
         clients_list = []
-        member_ids = Reservation.objects.filter(
-            gym_class__instructor=staff_profile,
-            status__in=['confirmed', 'attended']
-        ).values_list('member_id', flat=True).distinct()
-        
-        from apps.members.models import Member
-        members = Member.objects.filter(
-            id__in=member_ids
-        ).select_related('user')[:5]
+        members = _trainer_clients(staff_profile, month_start).order_by('-classes_month', 'id')[:5]
         
         for member in members:
-            # Total de clases este mes
-            classes_month = Reservation.objects.filter(
-                member=member,
-                gym_class__instructor=staff_profile,
-                status='attended',
-                gym_class__start_datetime__gte=month_start
-            ).count()
+            classes_month = member.classes_month
             
             # Última visita
-            last_reservation = Reservation.objects.filter(
-                member=member,
-                gym_class__instructor=staff_profile,
-                status='attended'
-            ).order_by('-gym_class__start_datetime').first()
-            
-            if last_reservation:
-                last_date = last_reservation.gym_class.start_datetime.date()
+            if member.last_class_date:
+                last_date = timezone.localtime(member.last_class_date).date()
                 if last_date == today:
                     last_visit = 'Hoy'
                 elif last_date == today - timedelta(days=1):
@@ -430,9 +406,6 @@ class StaffViewSet(viewsets.ModelViewSet):
                 'progress': progress
             })
         
-        # Ordenar por clases este mes
-        clients_list.sort(key=lambda x: x['classes'], reverse=True)
-        
         return Response({
             'classes': {
                 'today': classes_today,
@@ -484,7 +457,7 @@ class StaffViewSet(viewsets.ModelViewSet):
         queryset = GymClass.objects.filter(
             instructor=staff_profile,
             is_cancelled=False
-        ).select_related('class_type').prefetch_related('reservations')
+        ).select_related('class_type')
         
         if upcoming_param:
             # Solo clases futuras
@@ -508,7 +481,7 @@ class StaffViewSet(viewsets.ModelViewSet):
         # Serializar manualmente para incluir info adicional
         classes_data = []
         for gym_class in queryset:
-            confirmed_count = gym_class.reservations.filter(status='confirmed').count()
+            confirmed_count = gym_class.confirmed_count
             classes_data.append({
                 'id': gym_class.id,
                 'title': gym_class.title,
@@ -549,49 +522,23 @@ class StaffViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_404_NOT_FOUND
             )
         
-        from apps.classes.models import Reservation, GymClass
-        from apps.members.models import Member
-        
-        # Obtener clientes únicos que han reservado clases con este trainer
-        member_ids = Reservation.objects.filter(
-            gym_class__instructor=staff_profile,
-            status__in=['confirmed', 'attended']
-        ).values_list('member_id', flat=True).distinct()
-        
-        members = Member.objects.filter(
-            id__in=member_ids
-        ).select_related('user')
+        # Clientes únicos que han reservado clases con este trainer, con sus totales
+        # (clientes más activos primero)
+        month_start = timezone.now().replace(day=1, hour=0, minute=0, second=0)
+        members = _trainer_clients(staff_profile, month_start).order_by('-total_classes_with_trainer', 'id')
         
-        # Serializar con información adicional
         clients_data = []
         for member in members:
-            # Total de clases tomadas con este trainer
-            total_classes = Reservation.objects.filter(
-                member=member,
-                gym_class__instructor=staff_profile,
-                status='attended'
-            ).count()
-            
-            # Última clase asistida
-            last_class = Reservation.objects.filter(
-                member=member,
-                gym_class__instructor=staff_profile,
-                status='attended'
-            ).order_by('-gym_class__start_datetime').first()
-            
             clients_data.append({
                 'id': member.id,
                 'name': member.user.get_full_name(),
                 'email': member.user.email,
                 'phone': member.phone,
-                'total_classes_with_trainer': total_classes,
-                'last_class_date': last_class.gym_class.start_datetime if last_class else None,
+                'total_classes_with_trainer': member.total_classes_with_trainer,
+                'last_class_date': member.last_class_date,
                 'subscription_status': member.subscription_status
             })
         
-        # Ordenar por total de clases (clientes más activos primero)
-        clients_data.sort(key=lambda x: x['total_classes_with_trainer'], reverse=True)
-        
         return Response(clients_data)
 
 
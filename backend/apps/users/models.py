@@ -6,6 +6,8 @@ Sistema de Gestión de Gimnasio
 from django.contrib.auth.models import AbstractUser
 from django.db import models
 
+from apps.audit.tracking import AuditTrackedMixin
+
 
 class Role(models.Model):
     """Roles del sistema con permisos"""
@@ -50,7 +52,7 @@ class Role(models.Model):
         return self.get_name_display()
 
 
-class User(AbstractUser):
+class User(AuditTrackedMixin, AbstractUser):
     """Usuario personalizado del sistema"""
     
     email = models.EmailField(
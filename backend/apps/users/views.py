@@ -132,45 +132,24 @@ class UserViewSet(viewsets.ModelViewSet):
         Estadísticas para el dashboard
         GET /api/users/dashboard_stats/
         """
-        from apps.members.models import Member
-        from apps.memberships.models import Membership
-        from apps.payments.models import Payment
-        from django.utils import timezone
-        from datetime import timedelta
-        from django.db.models import Sum, Count
+        from apps.common.dashboard_cache import get_metrics
+        from apps.members.summary import get_summary
         
         user = request.user
-        now = timezone.now()
-        today = now.date()
         
         # Stats básicas para admin/staff - devolver estructura compatible
         if user.is_staff or (user.role and user.role.name in ['admin', 'manager']):
-            # Total miembros
-            total_members = Member.objects.count()
-            active_members = Member.objects.filter(subscription_status='active').count()
-            
-            # Membresías por vencer (próximos 7 días)
-            expiring_soon = Membership.objects.filter(
-                status='active',
-                end_date__lte=today + timedelta(days=7),
-                end_date__gte=today
-            ).count()
-            
-            # Ingresos del mes
-            month_start = now.replace(day=1, hour=0, minute=0, second=0)
-            revenue_month = Payment.objects.filter(
-                payment_date__gte=month_start,
-                status='completed'
-            ).aggregate(total=Sum('amount'))['total'] or 0
-            
-            # Ingresos de hoy
-            revenue_today = Payment.objects.filter(
-                payment_date__date=today,
-                status='completed'
-            ).aggregate(total=Sum('amount'))['total'] or 0
-            
-            # Pagos pendientes
-            pending_payments = Payment.objects.filter(status='pending').count()
+            # Conteos y sumas desde la caché del dashboard (se invalida al cambiar los datos)
+            metrics = get_metrics(
+                'members_total', 'members_active', 'memberships_expiring',
+                'revenue_month', 'revenue_today', 'payments_pending'
+            )
+            total_members = metrics['members_total']
+            active_members = metrics['members_active']
+            expiring_soon = metrics['memberships_expiring']
+            revenue_month = metrics['revenue_month']
+            revenue_today = metrics['revenue_today']
+            pending_payments = metrics['payments_pending']
             
             # Retornar stats de admin pero en estructura compatible con frontend
             return Response({
@@ -226,38 +205,59 @@ class UserViewSet(viewsets.ModelViewSet):
                 }
             }, status=status.HTTP_200_OK)
         
-        # Membresía activa
-        active_membership = Membership.objects.filter(
-            member=member,
-            status='active'
-        ).first()
-        
-        days_until_expiry = None
-        if active_membership:
-            delta = active_membership.end_date - today
-            days_until_expiry = delta.days
+        summary = get_summary(member)
+        membership = summary['membership']
+        next_class = summary['reservations']['list'][0] if summary['reservations']['list'] else None
+        activity = summary['activity']
         
         return Response({
             'membership': {
-                'is_active': bool(active_membership),
-                'plan_name': active_membership.plan.name if active_membership else None,
-                'days_until_expiry': days_until_expiry,
-                'expiring_soon': days_until_expiry is not None and days_until_expiry <= 7
+                'is_active': membership['is_active'],
+                'plan_name': membership['plan_name'],
+                'days_until_expiry': membership['days_remaining'],
+                'expiring_soon': membership['expiring_soon']
             },
             'next_class': {
-                'has_reservation': False,
-                'class_name': None,
-                'date': None,
-                'time': None
+                'has_reservation': next_class is not None,
+                'class_name': next_class['class_name'] if next_class else None,
+                'date': next_class['date'] if next_class else None,
+                'time': next_class['time'] if next_class else None
             },
             'activity': {
-                'sessions_this_month': 0,
-                'classes_last_30_days': 0,
-                'last_progress_date': None,
-                'current_weight': None
+                'sessions_this_month': activity['sessions_this_month'],
+                'classes_last_30_days': summary['attendance']['last_30_days'],
+                'last_progress_date': activity['last_progress_date'],
+                'current_weight': float(activity['current_weight']) if activity['current_weight'] is not None else None
             }
         })
     
+    @action(detail=False, methods=['get'], permission_classes=[permissions.IsAdminUser])
+    def dashboard_cache_stats(self, request):
+        """
+        Aciertos y fallos de la caché de métricas del dashboard
+        GET /api/users/dashboard_cache_stats/
+        """
+        from apps.common.dashboard_cache import get_stats
+        return Response(get_stats())
+    
+    @action(detail=False, methods=['get'], url_path='me/summary')
+    def me_summary(self, request):
+        """
+        Resumen completo del miembro actual (cacheado por miembro)
+        GET /api/users/me/summary/
+        """
+        from apps.members.models import Member
+        from apps.members.summary import get_summary
+        
+        try:
+            member = request.user.member_profile
+        except Member.DoesNotExist:
+            return Response(
+                {'detail': 'El usuario no tiene perfil de miembro'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        return Response(get_summary(member))
+    
     @action(detail=False, methods=['get'])
     def stats(self, request):
         """
@@ -268,94 +268,36 @@ class UserViewSet(viewsets.ModelViewSet):
         Para trainers/admin/staff retorna stats básicas
         """
         from apps.members.models import Member
-        from apps.memberships.models import Membership
-        from apps.classes.models import Reservation
-        from apps.payments.models import Payment
-        from django.utils import timezone
-        from datetime import timedelta
-        from django.db.models import Sum, Count
+        from apps.members.summary import get_summary
         
         user = request.user
-        now = timezone.now()
-        today = now.date()
         
-        # Si es member, retornar stats completas
+        # Si es member, retornar stats completas (resumen cacheado del miembro)
         try:
-            member = user.member_profile
-            
-            # Membresía activa
-            active_membership = Membership.objects.filter(
-                member=member,
-                status='active'
-            ).first()
-            
-            days_remaining = None
-            if active_membership:
-                delta = active_membership.end_date - today
-                days_remaining = delta.days
-            
-            # Reservas próximas
-            upcoming_reservations = Reservation.objects.filter(
-                member=member,
-                gym_class__start_datetime__gte=now,
-                status__in=['confirmed', 'waitlist']
-            ).count()
-            
-            # Clases asistidas este mes
-            month_start = now.replace(day=1, hour=0, minute=0, second=0)
-            classes_attended = Reservation.objects.filter(
-                member=member,
-                gym_class__start_datetime__gte=month_start,
-                status='attended'
-            ).count()
-            
-            # Racha actual (días consecutivos con asistencia)
-            # Simplificado: contar días únicos de asistencia en últimas 2 semanas
-            two_weeks_ago = now - timedelta(days=14)
-            attended_dates = Reservation.objects.filter(
-                member=member,
-                gym_class__start_datetime__gte=two_weeks_ago,
-                status='attended'
-            ).values_list('gym_class__start_datetime__date', flat=True).distinct()
-            
-            current_streak = len(set(attended_dates))
+            summary = get_summary(user.member_profile)
+            days_remaining = summary['membership']['days_remaining']
             
             # Objetivo mensual (asumido: 12 clases/mes)
             monthly_goal = 12
-            monthly_progress = classes_attended
-            
-            # Obtener lista de próximas clases reservadas
-            upcoming_classes_list = []
-            upcoming_reservations_qs = Reservation.objects.filter(
-                member=member,
-                gym_class__start_datetime__gte=now,
-                status__in=['confirmed', 'waitlist']
-            ).select_related('gym_class__class_type', 'gym_class__instructor__user').order_by('gym_class__start_datetime')[:5]
-            
-            for reservation in upcoming_reservations_qs:
-                upcoming_classes_list.append({
-                    'id': reservation.id,
-                    'class_name': reservation.gym_class.class_type.name if reservation.gym_class.class_type else reservation.gym_class.title,
-                    'trainer_name': reservation.gym_class.instructor.user.get_full_name() if reservation.gym_class.instructor else 'Sin asignar',
-                    'date': reservation.gym_class.start_datetime.strftime('%d/%m/%Y'),
-                    'time': reservation.gym_class.start_datetime.strftime('%I:%M %p')
-                })
             
             return Response({
                 'membership': {
                     'days_remaining': days_remaining if days_remaining is not None else 0,
-                    'expiring_soon': days_remaining is not None and days_remaining <= 7,
+                    'expiring_soon': summary['membership']['expiring_soon'],
                 },
                 'reservations': {
-                    'upcoming': upcoming_reservations,
-                    'list': upcoming_classes_list
+                    'upcoming': summary['reservations']['upcoming'],
+                    'list': [
+                        {key: item[key] for key in ('id', 'class_name', 'trainer_name', 'date', 'time')}
+                        for item in summary['reservations']['list']
+                    ]
                 },
                 'attendance': {
-                    'month': classes_attended
+                    'month': summary['attendance']['month']
                 },
                 'streak': {
-                    'days': current_streak,
-                    'best': current_streak  # Simplificado por ahora
+                    'days': summary['streak']['current'],
+                    'best': summary['streak']['best']
                 },
                 'goals': {
                     'monthlyClasses': monthly_goal
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 20:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('workouts', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='musclegroup',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+    ]
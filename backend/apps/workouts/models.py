@@ -19,6 +19,7 @@ class MuscleGroup(models.Model):
         blank=True,
         verbose_name='Descripción'
     )
+    updated_at = models.DateTimeField(auto_now=True)
     
     class Meta:
         verbose_name = 'Grupo Muscular'
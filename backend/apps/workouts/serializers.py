@@ -4,6 +4,7 @@ Sistema de Gestión de Gimnasio
 """
 
 from rest_framework import serializers
+from apps.common.serializers import PrefetchAwareMixin
 from .models import MuscleGroup, Exercise, WorkoutRoutine, RoutineExercise
 from apps.progress.models import WorkoutSession, ExerciseLog
 
@@ -49,7 +50,7 @@ class RoutineExerciseCreateSerializer(serializers.ModelSerializer):
         fields = ['exercise', 'day_of_week', 'order', 'sets', 'reps', 'rest_seconds', 'weight_kg', 'notes']
 
 
-class WorkoutRoutineSerializer(serializers.ModelSerializer):
+class WorkoutRoutineSerializer(PrefetchAwareMixin, serializers.ModelSerializer):
     """Serializer completo para rutinas con optimización de queries"""
     
     member_name = serializers.CharField(source='member.user.get_full_name', read_only=True)
@@ -65,7 +66,7 @@ class WorkoutRoutineSerializer(serializers.ModelSerializer):
     
     def get_exercise_count(self, obj):
         """Contador de ejercicios en la rutina"""
-        return obj.exercises.count()
+        return self.count_related(obj, 'exercises')
 
 
 class WorkoutRoutineCreateSerializer(serializers.ModelSerializer):
@@ -177,7 +178,7 @@ class ExerciseLogSerializer(serializers.ModelSerializer):
         return 0
 
 
-class WorkoutSessionSerializer(serializers.ModelSerializer):
+class WorkoutSessionSerializer(PrefetchAwareMixin, serializers.ModelSerializer):
     """Serializer para sesiones de entrenamiento"""
     
     member_name = serializers.CharField(source='member.user.get_full_name', read_only=True)
@@ -194,12 +195,14 @@ class WorkoutSessionSerializer(serializers.ModelSerializer):
     
     def get_completed_exercises_count(self, obj):
         """Contador de ejercicios completados"""
-        return obj.exercise_logs.count()
+        return self.count_related(obj, 'exercise_logs')
     
     def get_total_exercises_count(self, obj):
         """Total de ejercicios planeados para este día"""
-        if obj.routine and obj.day_of_week:
-            return obj.routine.exercises.filter(day_of_week=obj.day_of_week).count()
+        if obj.routine_id and obj.day_of_week:
+            if hasattr(obj, 'planned_exercises_count'):
+                return obj.planned_exercises_count
+            return self.count_related(obj.routine, 'exercises', day_of_week=obj.day_of_week)
         return 0
 
 
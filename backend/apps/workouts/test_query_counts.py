@@ -0,0 +1,119 @@
+"""
+Query-count tests for the workouts list endpoints.
+Tests verify every list runs the same number of queries for 2 rows as for 6 (no per-row queries).
+"""
+import pytest
+from datetime import timedelta
+from decimal import Decimal
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+from apps.progress.models import ExerciseLog, WorkoutSession
+from apps.users.models import Role, User
+from apps.workouts.models import Exercise, MuscleGroup, RoutineExercise, WorkoutRoutine
+
+LIST_URLS = [
+    '/api/workouts/muscle-groups/',
+    '/api/workouts/exercises/',
+    '/api/workouts/routines/',
+    '/api/workouts/routine-exercises/',
+    '/api/workouts/sessions/',
+    '/api/workouts/sessions/my_sessions/',
+    '/api/workouts/exercise-logs/',
+]
+
+
+def make_user(username, role_name):
+    role, _ = Role.objects.get_or_create(name=role_name)
+    return User.objects.create_user(username=username, email=f'{username}@gym.com', password='x', role=role)
+
+
+class Gym:
+    """A trainer and a member; add() appends routines, sessions and logs for the member."""
+
+    def __init__(self):
+        self.trainer = make_user('coach', 'trainer')
+        self.member = make_user('ana', 'member').member_profile
+        self.rows = 0
+
+    def add(self, count):
+        staff = self.trainer.staff_profile
+        for i in range(self.rows, self.rows + count):
+            group = MuscleGroup.objects.create(name=f'Grupo {i}')
+            exercise = Exercise.objects.create(name=f'Ejercicio {i}', muscle_group=group, created_by=staff)
+            routine = WorkoutRoutine.objects.create(
+                member=self.member, trainer=staff, name=f'Rutina {i}', duration_weeks=4
+            )
+            planned = [
+                RoutineExercise.objects.create(
+                    routine=routine, exercise=exercise, day_of_week=1, order=order,
+                    sets=3, reps=10, rest_seconds=60
+                )
+                for order in range(2)
+            ]
+            session = WorkoutSession.objects.create(
+                member=self.member, routine=routine, day_of_week=1,
+                date=timezone.now() - timedelta(days=i)
+            )
+            for routine_exercise in planned:
+                ExerciseLog.objects.create(
+                    session=session, exercise=exercise, routine_exercise=routine_exercise,
+                    planned_sets=3, planned_reps=10, actual_sets=3, actual_reps=10, weight_used=Decimal('40')
+                )
+        self.rows += count
+
+
+def count_queries(user, url):
+    client = APIClient()
+    client.force_authenticate(user)
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(url)
+    assert response.status_code == 200
+    rows = response.data['results'] if isinstance(response.data, dict) else response.data
+    assert rows
+    return len(context.captured_queries), rows
+
+
+@pytest.mark.integration
+@pytest.mark.django_db
+class TestWorkoutsQueryCounts:
+    """List endpoints cost a fixed number of queries, for trainers and members."""
+
+    @pytest.mark.parametrize('url', LIST_URLS)
+    @pytest.mark.parametrize('role', ['trainer', 'member'])
+    def test_list_query_count_is_constant(self, url, role):
+        if url.endswith('my_sessions/') and role == 'trainer':
+            pytest.skip('my_sessions es solo para miembros')
+        gym = Gym()
+        user = gym.trainer if role == 'trainer' else gym.member.user
+        gym.add(2)
+        few, _ = count_queries(user, url)
+
+        gym.add(4)
+        many, rows = count_queries(user, url)
+
+        assert len(rows) >= 6
+        assert many == few
+
+    def test_session_counts_come_from_prefetch_and_annotation(self, django_assert_num_queries):
+        gym = Gym()
+        gym.add(3)
+        client = APIClient()
+        client.force_authenticate(gym.trainer)
+
+        # Página, COUNT de la paginación y los logs prefetcheados
+        with django_assert_num_queries(3):
+            response = client.get('/api/workouts/sessions/')
+
+        session = response.data['results'][0]
+        assert (session['completed_exercises_count'], session['total_exercises_count']) == (2, 2)
+
+    def test_serializer_falls_back_to_queries_without_prefetch(self):
+        from apps.workouts.serializers import WorkoutRoutineSerializer, WorkoutSessionSerializer
+        gym = Gym()
+        gym.add(1)
+
+        session = WorkoutSession.objects.get()
+        assert WorkoutSessionSerializer(session).data['total_exercises_count'] == 2
+        assert WorkoutRoutineSerializer(WorkoutRoutine.objects.get()).data['exercise_count'] == 2
@@ -8,8 +8,10 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from django.utils import timezone
-from django.db.models import Count, Q
+from django.db.models import Count, F, Prefetch, Q
 
+from apps.common.mixins import ConditionalGetMixin
+from apps.common.pagination import KeysetPagination
 from .models import MuscleGroup, Exercise, WorkoutRoutine, RoutineExercise
 from apps.progress.models import WorkoutSession, ExerciseLog
 from .permissions import (
@@ -31,6 +33,31 @@ from .serializers import (
 )
 
 
+def routine_queryset():
+    """Rutinas con todo lo que serializa WorkoutRoutineSerializer, en consultas fijas."""
+    return WorkoutRoutine.objects.select_related('member__user', 'trainer__user').prefetch_related(
+        Prefetch('exercises', queryset=RoutineExercise.objects.select_related(
+            'exercise__muscle_group', 'exercise__created_by__user'
+        ))
+    )
+
+
+def session_queryset():
+    """
+    Sesiones con todo lo que serializa WorkoutSessionSerializer: los logs
+    prefetcheados y el total de ejercicios planeados del día anotado.
+    """
+    return WorkoutSession.objects.select_related('member__user', 'routine').annotate(
+        planned_exercises_count=Count(
+            'routine__exercises', filter=Q(routine__exercises__day_of_week=F('day_of_week'))
+        )
+    ).prefetch_related(
+        Prefetch('exercise_logs', queryset=ExerciseLog.objects.select_related(
+            'routine_exercise__exercise__muscle_group'
+        ))
+    ).order_by('-date')  # Meta.ordering no se aplica a consultas con GROUP BY
+
+
 class MuscleGroupViewSet(viewsets.ModelViewSet):
     """ViewSet para grupos musculares"""
     
@@ -39,7 +66,7 @@ class MuscleGroupViewSet(viewsets.ModelViewSet):
     permission_classes = [IsAuthenticated]
 
 
-class ExerciseViewSet(viewsets.ModelViewSet):
+class ExerciseViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     """
     ViewSet para biblioteca de ejercicios
     
@@ -51,7 +78,9 @@ class ExerciseViewSet(viewsets.ModelViewSet):
     - DELETE /exercises/{id}/ - Desactivar ejercicio
     """
     
-    queryset = Exercise.objects.filter(is_active=True).select_related('muscle_group', 'created_by')
+    queryset = Exercise.objects.filter(is_active=True).select_related('muscle_group', 'created_by__user')
+    # La respuesta incluye el nombre del grupo muscular y del creador
+    last_modified_fields = ('updated_at', 'muscle_group__updated_at', 'created_by__user__updated_at')
     serializer_class = ExerciseSerializer
     permission_classes = [IsAuthenticated, IsTrainerOrAdminOrReadOnly]
     
@@ -108,10 +137,10 @@ class WorkoutRoutineViewSet(viewsets.ModelViewSet):
         
         if role_name == 'member':
             # Clientes solo ven sus rutinas
-            return WorkoutRoutine.objects.filter(member__user=user).prefetch_related('exercises__exercise__muscle_group')
+            return routine_queryset().filter(member__user=user)
         elif role_name in ['trainer', 'admin', 'staff']:
             # Staff/Trainers/Admins ven todas
-            return WorkoutRoutine.objects.all().select_related('member__user', 'trainer__user').prefetch_related('exercises__exercise__muscle_group')
+            return routine_queryset()
         
         return WorkoutRoutine.objects.none()
     
@@ -159,10 +188,10 @@ class WorkoutRoutineViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_403_FORBIDDEN
             )
         
-        routine = WorkoutRoutine.objects.filter(
+        routine = routine_queryset().filter(
             member=member,
             is_active=True
-        ).prefetch_related('exercises__exercise__muscle_group').first()
+        ).first()
         
         logger.info(f"Routine found: {routine}")
         
@@ -214,7 +243,7 @@ class WorkoutRoutineViewSet(viewsets.ModelViewSet):
 class RoutineExerciseViewSet(viewsets.ModelViewSet):
     """ViewSet para manejar ejercicios individuales en rutinas"""
     
-    queryset = RoutineExercise.objects.all().select_related('routine', 'exercise__muscle_group')
+    queryset = RoutineExercise.objects.all().select_related('routine', 'exercise__muscle_group', 'exercise__created_by__user')
     serializer_class = RoutineExerciseSerializer
     permission_classes = [IsAuthenticated]
     
@@ -248,16 +277,12 @@ class WorkoutSessionViewSet(viewsets.ModelViewSet):
     def get_queryset(self):
         user = self.request.user
         
-        if user.role.name == 'Miembro':
+        if user.role.name == 'member':
             # Miembros solo ven sus sesiones
-            return WorkoutSession.objects.filter(member__user=user).select_related(
-                'member__user', 'routine'
-            ).prefetch_related('exercise_logs__routine_exercise__exercise')
-        elif user.role.name in ['Entrenador', 'Administrador']:
+            return session_queryset().filter(member__user=user)
+        elif user.role.name in ['trainer', 'admin', 'staff']:
             # Staff ve todas
-            return WorkoutSession.objects.all().select_related(
-                'member__user', 'routine'
-            ).prefetch_related('exercise_logs__routine_exercise__exercise')
+            return session_queryset()
         
         return WorkoutSession.objects.none()
     
@@ -273,16 +298,14 @@ class WorkoutSessionViewSet(viewsets.ModelViewSet):
         GET /sessions/my_sessions/
         """
         try:
-            member = request.user.member
-        except:
+            member = request.user.member_profile
+        except Exception:
             return Response(
                 {'error': 'Usuario no es un miembro'},
                 status=status.HTTP_403_FORBIDDEN
             )
         
-        sessions = WorkoutSession.objects.filter(
-            member=member
-        ).select_related('routine').prefetch_related('exercise_logs').order_by('-date')
+        sessions = session_queryset().filter(member=member)
         
         serializer = WorkoutSessionSerializer(sessions, many=True)
         return Response(serializer.data)
@@ -320,17 +343,19 @@ class ExerciseLogViewSet(viewsets.ModelViewSet):
     """
     
     permission_classes = [IsAuthenticated]
+    pagination_class = KeysetPagination
+    cursor_ordering = '-completed_at'
     
     def get_queryset(self):
         user = self.request.user
         
-        if user.role.name == 'Miembro':
+        if user.role.name == 'member':
             return ExerciseLog.objects.filter(
                 session__member__user=user
-            ).select_related('session', 'routine_exercise__exercise', 'exercise')
-        elif user.role.name in ['Entrenador', 'Administrador']:
+            ).select_related('session', 'routine_exercise__exercise__muscle_group', 'exercise')
+        elif user.role.name in ['trainer', 'admin', 'staff']:
             return ExerciseLog.objects.all().select_related(
-                'session__member__user', 'routine_exercise__exercise', 'exercise'
+                'session__member__user', 'routine_exercise__exercise__muscle_group', 'exercise'
             )
         
         return ExerciseLog.objects.none()
@@ -356,7 +381,7 @@ class ExerciseLogViewSet(viewsets.ModelViewSet):
         
         logs = ExerciseLog.objects.filter(
             routine_exercise_id=routine_exercise_id
-        ).order_by('session__date')
+        ).select_related('routine_exercise__exercise__muscle_group').order_by('session__date')
         
         serializer = ExerciseLogSerializer(logs, many=True)
         return Response(serializer.data)
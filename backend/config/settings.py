@@ -6,6 +6,7 @@ Sistema de Gestión de Gimnasio
 from pathlib import Path
 from datetime import timedelta
 from decouple import config, Csv
+from django.core.exceptions import ImproperlyConfigured
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -71,6 +72,7 @@ MIDDLEWARE = [
     # CSRF disabled for JWT-based API
     # 'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'apps.audit.middleware.PerformanceMiddleware',  # Per-request timing, queries and Server-Timing
     'apps.audit.middleware.AuditMiddleware',  # Audit logging middleware
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
@@ -111,6 +113,31 @@ DATABASES = {
 }
 
 
+
+# Cache
+# locmem: memoria de cada proceso (desarrollo; cada worker tiene su propia caché)
+# file: directorio compartido entre los workers de un mismo servidor
+# redis: servidor Redis compartido (requiere el paquete redis)
+CACHE_BACKEND = config('CACHE_BACKEND', default='locmem')
+CACHE_BACKENDS = {
+    'locmem': ('django.core.cache.backends.locmem.LocMemCache', 'gimnasio'),
+    'file': ('django.core.cache.backends.filebased.FileBasedCache', str(BASE_DIR / 'cache')),
+    'redis': ('django.core.cache.backends.redis.RedisCache', 'redis://127.0.0.1:6379/1'),
+}
+if CACHE_BACKEND not in CACHE_BACKENDS:
+    raise ImproperlyConfigured(f'CACHE_BACKEND debe ser uno de: {", ".join(CACHE_BACKENDS)}')
+
+CACHES = {
+    'default': {
+        'BACKEND': CACHE_BACKENDS[CACHE_BACKEND][0],
+        'LOCATION': config('CACHE_LOCATION', default=CACHE_BACKENDS[CACHE_BACKEND][1]),
+        'TIMEOUT': config('CACHE_TIMEOUT', default=300, cast=int),
+        # Prefijo por entorno para compartir un Redis; subir la versión invalida todas las claves
+        'KEY_PREFIX': config('CACHE_KEY_PREFIX', default='gimnasio'),
+        'VERSION': config('CACHE_VERSION', default=1, cast=int),
+    }
+}
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator'},
@@ -224,3 +251,77 @@ EMAIL_USE_TLS = config('EMAIL_USE_TLS', default=True, cast=bool)
 EMAIL_HOST_USER = config('EMAIL_HOST_USER', default='')
 EMAIL_HOST_PASSWORD = config('EMAIL_HOST_PASSWORD', default='')
 DEFAULT_FROM_EMAIL = config('DEFAULT_FROM_EMAIL', default='noreply@gimnasio.com')
+
+
+# Auditoría
+# sync: escribe cada entrada al instante (útil en tests)
+# buffered: agrupa las entradas por request y las escribe con bulk_create tras el commit
+# async: igual que buffered, pero un hilo en segundo plano hace la escritura
+AUDIT_LOG_MODE = config('AUDIT_LOG_MODE', default='buffered')
+AUDIT_BATCH_SIZE = config('AUDIT_BATCH_SIZE', default=500, cast=int)
+AUDIT_QUEUE_MAXSIZE = config('AUDIT_QUEUE_MAXSIZE', default=1000, cast=int)
+AUDIT_QUEUE_PUT_TIMEOUT = config('AUDIT_QUEUE_PUT_TIMEOUT', default=0.5, cast=float)
+
+
+# Perfilado de requests (apps/audit/performance.py, GET /api/audit/performance/)
+# Tiempo, consultas, tiempo de BD y de serializers por request; la cabecera Server-Timing
+# solo se envía con DEBUG o a usuarios is_staff
+PERFORMANCE_MONITORING = config('PERFORMANCE_MONITORING', default=True, cast=bool)
+# Requests más lentos que esto (ms) se guardan, con sus consultas, en un buffer circular
+PERFORMANCE_SLOW_REQUEST_MS = config('PERFORMANCE_SLOW_REQUEST_MS', default=500, cast=int)
+PERFORMANCE_BUFFER_SIZE = config('PERFORMANCE_BUFFER_SIZE', default=200, cast=int)
+
+
+# Dashboard
+# Segundos que vive cada métrica cacheada; los cambios en los modelos la invalidan antes
+DASHBOARD_CACHE_TTL = config('DASHBOARD_CACHE_TTL', default=60, cast=int)
+# Tope del resumen "me" de cada miembro; se invalida con sus escrituras y vence al empezar su próxima clase
+MEMBER_SUMMARY_CACHE_TTL = config('MEMBER_SUMMARY_CACHE_TTL', default=60 * 15, cast=int)
+
+
+# Tasa de cambio BCV
+# Segundos que una tasa se considera fresca; después se sirve igual y se actualiza en segundo plano
+BCV_RATE_MAX_AGE = config('BCV_RATE_MAX_AGE', default=60 * 60, cast=int)
+# False si la actualización solo corre desde cron (manage.py refresh_exchange_rate)
+BCV_BACKGROUND_REFRESH = config('BCV_BACKGROUND_REFRESH', default=True, cast=bool)
+
+
+# Check-in de torniquetes
+# Segundos máximos que cada worker usa su índice de membresías activas sin recargarlo
+# (los cambios de membresía lo invalidan antes)
+CHECKIN_INDEX_TTL = config('CHECKIN_INDEX_TTL', default=300, cast=int)
+CHECKIN_MAX_BATCH = config('CHECKIN_MAX_BATCH', default=500, cast=int)
+
+
+# Recordatorios de renovación
+# Días antes del vencimiento para los avisos de seguimiento; el primero es
+# GymSettings.days_for_renewal_reminder
+RENEWAL_REMINDER_FOLLOWUPS = config('RENEWAL_REMINDER_FOLLOWUPS', default='3,1', cast=Csv(int))
+
+
+# Trabajos programados (manage.py run_scheduler)
+# Segundos entre vueltas del scheduler
+SCHEDULER_POLL_INTERVAL = config('SCHEDULER_POLL_INTERVAL', default=30, cast=int)
+# Segundos que un nodo retiene un trabajo; si muere, otro lo toma al vencer
+SCHEDULER_LOCK_TIMEOUT = config('SCHEDULER_LOCK_TIMEOUT', default=60 * 60, cast=int)
+SCHEDULER_RUN_RETENTION_DAYS = config('SCHEDULER_RUN_RETENTION_DAYS', default=30, cast=int)
+
+
+# Evolución de métricas del atleta
+# Días recientes que se leen de las mediciones; lo anterior sale de MetricSnapshot
+ANALYTICS_RAW_DAYS = config('ANALYTICS_RAW_DAYS', default=90, cast=int)
+# Hasta este rango se usan snapshots semanales; para rangos mayores, mensuales
+ANALYTICS_WEEKLY_MAX_DAYS = config('ANALYTICS_WEEKLY_MAX_DAYS', default=730, cast=int)
+
+
+# Series de tiempo de las gráficas de evolución (apps/common/timeseries.py)
+# Puntos por defecto y máximo que acepta ?max_points=
+TIMESERIES_DEFAULT_POINTS = config('TIMESERIES_DEFAULT_POINTS', default=500, cast=int)
+TIMESERIES_MAX_POINTS = config('TIMESERIES_MAX_POINTS', default=2000, cast=int)
+
+
+# Paginación por cursor y conteo aproximado (apps/common/pagination.py, ?count=approx)
+# PostgreSQL: por debajo de esta estimación del planificador se cuenta exacto
+PAGINATION_EXACT_COUNT_BELOW = config('PAGINATION_EXACT_COUNT_BELOW', default=10000, cast=int)
+# Otros motores: segundos que se guarda el COUNT en caché
+PAGINATION_COUNT_CACHE_TTL = config('PAGINATION_COUNT_CACHE_TTL', default=60, cast=int)
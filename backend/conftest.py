@@ -15,6 +15,19 @@ from django.utils import timezone
 User = get_user_model()
 
 
+@pytest.fixture(autouse=True)
+def audit_sync_mode(settings):
+    """Write audit entries immediately; test transactions never commit."""
+    settings.AUDIT_LOG_MODE = 'sync'
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    """Start every test with an empty cache (dashboard metrics, BCV rate)."""
+    from django.core.cache import cache
+    cache.clear()
+
+
 @pytest.fixture
 def api_client():
     """Provide an unauthenticated API client."""